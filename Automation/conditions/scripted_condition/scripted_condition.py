@@ -34,11 +34,22 @@ class ScriptedCondition(abstract_condition.AbstractCondition):
         self.exchange_name: str = ""
 
         self._dsl_interpreter: typing.Optional[dsl_interpreter.Interpreter] = None
+        # (exchange manager id, script) the interpreter has been prepared with: scripts are only parsed again
+        # when they or their exchange manager change
+        self._prepared_interpreter_key: typing.Optional[tuple[typing.Optional[str], str]] = None
+        self._exchange_manager = None
+        self._exchange_ids: typing.Optional[tuple] = None
 
     async def evaluate(self) -> bool:
         if self._dsl_interpreter:
-            script_result = await self._dsl_interpreter.interprete(self.script)
-            return bool(script_result)
+            if self._has_exchanges_changed():
+                # operators are bound to the previous exchange manager: prepare the script again
+                self._prepare_interpreter()
+            script_result = await self._dsl_interpreter.compute_expression()
+            # indicators return time series arrays: the condition is evaluated on their most recent value
+            return bool(dsl_operators.python_std_operators.to_python_value(
+                dsl_operators.python_std_operators.get_latest_value(script_result)
+            ))
         raise ValueError("Scripted condition is not properly configured, the script is likely invalid.")
 
     @staticmethod
@@ -50,7 +61,7 @@ class ScriptedCondition(abstract_condition.AbstractCondition):
         return {
             self.SCRIPT: UI.user_input(
                 self.SCRIPT, commons_enums.UserInputTypes.TEXT, "", inputs,
-                title="Scripted condition: the OctoBot DSL expression to evaluate (more info in automation details). Its return value will be converted to a boolean using \"bool()\" to determine if the condition is met.",
+                title="Scripted condition: the OctoBot DSL expression to evaluate (more info in automation details). Its return value will be converted to a boolean using \"bool()\" to determine if the condition is met. When it returns an indicator time series, its most recent value is used.",
                 parent_input_name=step_name,
             ),
             self.EXCHANGE: UI.user_input(
@@ -65,14 +76,27 @@ class ScriptedCondition(abstract_condition.AbstractCondition):
         self.script = config[self.SCRIPT]
         self.exchange_name = config[self.EXCHANGE]
         if self.script and self.exchange_name:
-            self._dsl_interpreter = self._create_dsl_interpreter()
-            self._validate_script()
+            self._exchange_ids = None
+            self._prepare_interpreter()
         else:
             self._dsl_interpreter = None
-    
-    def _validate_script(self):
+            self._prepared_interpreter_key = None
+
+    def _prepare_interpreter(self):
+        exchange_manager = self._get_exchange_manager()
+        key = (None if exchange_manager is None else exchange_manager.id, self.script)
+        if self._dsl_interpreter is None or key != self._prepared_interpreter_key:
+            # reset first: a script that fails to be prepared can't be evaluated
+            self._dsl_interpreter = None
+            self._prepared_interpreter_key = None
+            interpreter = self._create_dsl_interpreter(exchange_manager)
+            self._validate_script(interpreter)
+            self._dsl_interpreter = interpreter
+            self._prepared_interpreter_key = key
+
+    def _validate_script(self, interpreter: dsl_interpreter.Interpreter):
         try:
-            self._dsl_interpreter.prepare(self.script)
+            interpreter.prepare(self.script)
             self.logger.info(
                 f"Formula interpreter successfully prepared \"{self.script}\" condition"
             )
@@ -80,8 +104,7 @@ class ScriptedCondition(abstract_condition.AbstractCondition):
             self.logger.error(f"Error when parsing condition {self.script}: {e}")
             raise e
 
-    def _create_dsl_interpreter(self):
-        exchange_manager = self._get_exchange_manager()
+    def _create_dsl_interpreter(self, exchange_manager):
         ohlcv_operators = []
         portfolio_operators = []
         if exchange_manager is not None:
@@ -91,12 +114,23 @@ class ScriptedCondition(abstract_condition.AbstractCondition):
             portfolio_operators = dsl_operators.exchange_operators.create_portfolio_operators(
                 exchange_manager
             )
-        return dsl_interpreter.Interpreter(
+        return dsl_operators.python_std_operators.CommonSubexpressionsInterpreter(
             dsl_interpreter.get_all_operators() + ohlcv_operators + portfolio_operators
         )
     
+    def _has_exchanges_changed(self) -> bool:
+        return tuple(trading_api.get_exchange_ids()) != self._exchange_ids
+
     def _get_exchange_manager(self):
-        for exchange_id in trading_api.get_exchange_ids():
+        # exchange managers are only looked up again when exchanges are added or removed
+        exchange_ids = tuple(trading_api.get_exchange_ids())
+        if exchange_ids != self._exchange_ids:
+            self._exchange_manager = self._find_exchange_manager(exchange_ids)
+            self._exchange_ids = exchange_ids
+        return self._exchange_manager
+
+    def _find_exchange_manager(self, exchange_ids: tuple):
+        for exchange_id in exchange_ids:
             exchange_manager = trading_api.get_exchange_manager_from_exchange_id(exchange_id)
             if exchange_manager.exchange_name == self.exchange_name and exchange_manager.is_backtesting == False:
                 return exchange_manager
@@ -0,0 +1,144 @@
+#  This file is part of OctoBot (https://github.com/Drakkar-Software/OctoBot)
+#  Copyright (c) 2023 Drakkar-Software, All rights reserved.
+#
+#  OctoBot is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  OctoBot is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with OctoBot. If not, see <https://www.gnu.org/licenses/>.
+import contextlib
+import mock
+import numpy as np
+import pytest
+
+# the scripted_condition package name is shadowed by its module when loading tentacles.Automation.conditions
+from tentacles.Automation.conditions.scripted_condition import scripted_condition
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+EXCHANGE = "binance"
+
+
+def _exchange_manager(exchange_id, exchange_name=EXCHANGE):
+    return mock.Mock(id=exchange_id, exchange_name=exchange_name, is_backtesting=False)
+
+
+@contextlib.contextmanager
+def _exchanges(exchange_managers: list):
+    exchange_manager_by_id = {exchange_manager.id: exchange_manager for exchange_manager in exchange_managers}
+    with mock.patch.object(scripted_condition.trading_api, "get_exchange_ids",
+                           mock.Mock(side_effect=lambda: list(exchange_manager_by_id))), \
+            mock.patch.object(scripted_condition.trading_api, "get_exchange_manager_from_exchange_id",
+                              mock.Mock(side_effect=exchange_manager_by_id.__getitem__)), \
+            mock.patch.object(scripted_condition.ScriptedCondition, "_create_dsl_interpreter",
+                              mock.Mock(side_effect=_create_dsl_interpreter)) as create_dsl_interpreter_mock:
+        yield exchange_manager_by_id, create_dsl_interpreter_mock
+
+
+def _create_dsl_interpreter(exchange_manager):
+    # exchange operators are not required by the tested scripts
+    return scripted_condition.dsl_operators.python_std_operators.CommonSubexpressionsInterpreter(
+        scripted_condition.dsl_interpreter.get_all_operators()
+    )
+
+
+def _scripted_condition(script):
+    condition = scripted_condition.ScriptedCondition()
+    condition.apply_config({condition.SCRIPT: script, condition.EXCHANGE: EXCHANGE})
+    return condition
+
+
+async def test_script_is_prepared_once():
+    with _exchanges([_exchange_manager("1")]) as (_, create_dsl_interpreter_mock):
+        condition = _scripted_condition("1 + 1 > 1")
+        create_dsl_interpreter_mock.assert_called_once()
+        interpreter = condition._dsl_interpreter
+        with mock.patch.object(interpreter, "prepare", mock.Mock()) as prepare_mock:
+            for _ in range(3):
+                assert await condition.evaluate() is True
+            prepare_mock.assert_not_called()
+        create_dsl_interpreter_mock.assert_called_once()
+        assert condition._dsl_interpreter is interpreter
+        # same config: nothing to prepare
+        condition.apply_config({condition.SCRIPT: "1 + 1 > 1", condition.EXCHANGE: EXCHANGE})
+        create_dsl_interpreter_mock.assert_called_once()
+        assert condition._dsl_interpreter is interpreter
+        # interpreters are not shared between conditions
+        other_condition = _scripted_condition("1 + 1 > 1")
+        assert create_dsl_interpreter_mock.call_count == 2
+        assert other_condition._dsl_interpreter is not interpreter
+
+
+async def test_script_is_prepared_again_on_script_change():
+    with _exchanges([_exchange_manager("1")]) as (_, create_dsl_interpreter_mock):
+        condition = _scripted_condition("1 + 1 > 1")
+        interpreter = condition._dsl_interpreter
+        condition.apply_config({condition.SCRIPT: "1 + 1 > 3", condition.EXCHANGE: EXCHANGE})
+        assert create_dsl_interpreter_mock.call_count == 2
+        assert condition._dsl_interpreter is not interpreter
+        assert condition._prepared_interpreter_key == ("1", "1 + 1 > 3")
+        assert await condition.evaluate() is False
+        # invalid script: the condition can't be evaluated
+        with pytest.raises(Exception):
+            condition.apply_config({condition.SCRIPT: "1 +", condition.EXCHANGE: EXCHANGE})
+        assert condition._dsl_interpreter is None
+        with pytest.raises(ValueError):
+            await condition.evaluate()
+        # no script
+        condition.apply_config({condition.SCRIPT: "", condition.EXCHANGE: EXCHANGE})
+        assert condition._dsl_interpreter is None
+        assert condition._prepared_interpreter_key is None
+
+
+async def test_script_is_prepared_again_on_exchange_change():
+    with _exchanges([_exchange_manager("1")]) as (exchange_manager_by_id, create_dsl_interpreter_mock):
+        condition = _scripted_condition("1 + 1 > 1")
+        interpreter = condition._dsl_interpreter
+        create_dsl_interpreter_mock.assert_called_once_with(exchange_manager_by_id["1"])
+        # another exchange is added: the condition exchange manager is unchanged
+        exchange_manager_by_id["2"] = _exchange_manager("2", exchange_name="kucoin")
+        assert await condition.evaluate() is True
+        create_dsl_interpreter_mock.assert_called_once()
+        assert condition._dsl_interpreter is interpreter
+        # the condition exchange is restarted: prepare the script for its new exchange manager
+        exchange_manager_by_id.pop("1")
+        exchange_manager_by_id["3"] = _exchange_manager("3")
+        assert await condition.evaluate() is True
+        assert create_dsl_interpreter_mock.call_count == 2
+        create_dsl_interpreter_mock.assert_called_with(exchange_manager_by_id["3"])
+        assert condition._dsl_interpreter is not interpreter
+        assert condition._prepared_interpreter_key == ("3", "1 + 1 > 1")
+        # the exchange changes through the configuration
+        condition.apply_config({condition.SCRIPT: "1 + 1 > 1", condition.EXCHANGE: "kucoin"})
+        assert create_dsl_interpreter_mock.call_count == 3
+        create_dsl_interpreter_mock.assert_called_with(exchange_manager_by_id["2"])
+        assert condition._prepared_interpreter_key == ("2", "1 + 1 > 1")
+
+
+async def test_evaluate_time_series_result():
+    with _exchanges([_exchange_manager("1")]):
+        condition = _scripted_condition("1 + 1 > 1")
+        with mock.patch.object(condition._dsl_interpreter, "compute_expression", mock.AsyncMock()) as compute_mock:
+            # the most recent value is evaluated
+            compute_mock.return_value = np.array([False, False, False])
+            assert await condition.evaluate() is False
+            compute_mock.return_value = np.array([True, True, False])
+            assert await condition.evaluate() is False
+            compute_mock.return_value = np.array([False, False, True])
+            assert await condition.evaluate() is True
+            compute_mock.return_value = np.array([12.2, 0.0])
+            assert await condition.evaluate() is False
+            compute_mock.return_value = True
+            assert await condition.evaluate() is True
+            # no value to evaluate
+            compute_mock.return_value = np.array([])
+            with pytest.raises(ValueError, match="non-empty time series"):
+                await condition.evaluate()
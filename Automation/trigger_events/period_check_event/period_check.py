@@ -14,12 +14,77 @@
 #  You should have received a copy of the GNU General Public
 #  License along with OctoBot. If not, see <https://www.gnu.org/licenses/>.
 import asyncio
+import heapq
 
 import octobot_commons.enums as commons_enums
 import octobot_commons.configuration as configuration
 import octobot.automation.bases.abstract_trigger_event as abstract_trigger_event
 
 
+class PeriodicChecksScheduler:
+    """
+    Triggers every PeriodicCheck from a single task. Checks are scheduled against absolute deadlines of the event
+    loop monotonic clock: the time spent to process a check does not delay its next deadlines.
+    """
+    def __init__(self):
+        # (deadline, registration index, periodic check) heap, the next deadline first
+        self.deadlines: list = []
+        self._registrations_count = 0
+        self._deadlines_update: asyncio.Event = None
+        self._task: asyncio.Task = None
+
+    def register(self, periodic_check):
+        loop = asyncio.get_running_loop()
+        self._push(loop.time() + periodic_check.waiting_time, periodic_check)
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._deadlines_update = asyncio.Event()
+            self._task = loop.create_task(self._run())
+        else:
+            # wake up the scheduler in case the new deadline is the next one
+            self._deadlines_update.set()
+
+    def unregister(self, periodic_check):
+        self.deadlines = [deadline for deadline in self.deadlines if deadline[2] is not periodic_check]
+        heapq.heapify(self.deadlines)
+        if self._deadlines_update is not None:
+            self._deadlines_update.set()
+
+    def _push(self, deadline: float, periodic_check):
+        self._registrations_count += 1
+        heapq.heappush(self.deadlines, (deadline, self._registrations_count, periodic_check))
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while self.deadlines:
+            self._deadlines_update.clear()
+            timeout = self.deadlines[0][0] - loop.time()
+            if timeout > 0:
+                try:
+                    await asyncio.wait_for(self._deadlines_update.wait(), timeout)
+                    # deadlines changed: compute the next wakeup time again
+                    continue
+                except asyncio.TimeoutError:
+                    pass
+            self._trigger_due_checks(loop.time())
+            # let triggered automations run
+            await asyncio.sleep(0)
+
+    def _trigger_due_checks(self, now: float):
+        due_checks = []
+        while self.deadlines and self.deadlines[0][0] <= now:
+            deadline, _, periodic_check = heapq.heappop(self.deadlines)
+            due_checks.append((deadline, periodic_check))
+        for deadline, periodic_check in due_checks:
+            period = periodic_check.waiting_time
+            # deadlines that passed while waiting for this one
+            missed_ticks = int((now - deadline) // period) if period > 0 else 0
+            periodic_check.on_tick(missed_ticks)
+            self._push(deadline + (missed_ticks + 1) * period, periodic_check)
+
+
+PERIODIC_CHECKS_SCHEDULER = PeriodicChecksScheduler()
+
+
 class PeriodicCheck(abstract_trigger_event.AbstractTriggerEvent):
     UPDATE_PERIOD = "update_period"
 
@@ -27,17 +92,39 @@ class PeriodicCheck(abstract_trigger_event.AbstractTriggerEvent):
         super().__init__()
         self.waiter_task = None
         self.waiting_time = None
+        self.trigger_event = asyncio.Event()
+        self.registered = False
+        self.missed_ticks = 0
 
     async def stop(self):
         await super().stop()
         if self.waiter_task is not None and not self.waiter_task.done():
             self.waiter_task.cancel()
+        if self.registered:
+            PERIODIC_CHECKS_SCHEDULER.unregister(self)
+            self.registered = False
+
+    def on_tick(self, missed_ticks: int):
+        if self.trigger_event.is_set():
+            # the previous tick has not been processed yet
+            missed_ticks += 1
+        if missed_ticks:
+            self.missed_ticks += missed_ticks
+            self.logger.warning(
+                f"Missed {missed_ticks} tick(s) of the {self.waiting_time} seconds update period "
+                f"({self.missed_ticks} in total): the automation takes longer than its update period to run."
+            )
+        self.trigger_event.set()
 
     async def _get_next_event(self):
         if self.should_stop:
             raise StopIteration
-        self.waiter_task = asyncio.create_task(asyncio.sleep(self.waiting_time))
+        if not self.registered:
+            self.registered = True
+            PERIODIC_CHECKS_SCHEDULER.register(self)
+        self.waiter_task = asyncio.create_task(self.trigger_event.wait())
         await self.waiter_task
+        self.trigger_event.clear()
 
     @staticmethod
     def get_description() -> str:
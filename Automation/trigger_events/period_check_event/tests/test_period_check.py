@@ -0,0 +1,83 @@
+#  This file is part of OctoBot (https://github.com/Drakkar-Software/OctoBot)
+#  Copyright (c) 2023 Drakkar-Software, All rights reserved.
+#
+#  OctoBot is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  OctoBot is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with OctoBot. If not, see <https://www.gnu.org/licenses/>.
+import asyncio
+import pytest
+
+import tentacles.Automation.trigger_events.period_check_event.period_check as period_check
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+PERIOD = 0.05
+
+
+def _create_periodic_check(period=PERIOD):
+    check = period_check.PeriodicCheck()
+    check.apply_config({check.UPDATE_PERIOD: period})
+    return check
+
+
+async def _get_events_times(check, events_count, processing_time=0):
+    loop = asyncio.get_running_loop()
+    times = []
+    async for _ in check.next_event():
+        times.append(loop.time())
+        if len(times) == events_count:
+            break
+        await asyncio.sleep(processing_time)
+    return times
+
+
+async def test_ticks_do_not_drift():
+    check = _create_periodic_check()
+    try:
+        start_time = asyncio.get_running_loop().time()
+        # processing time is not added to the period
+        times = await _get_events_times(check, 6, processing_time=PERIOD / 2)
+        for index, event_time in enumerate(times):
+            assert (index + 1) * PERIOD <= event_time - start_time < (index + 2) * PERIOD
+        assert check.missed_ticks == 0
+    finally:
+        await check.stop()
+
+
+async def test_checks_share_the_scheduler_task():
+    checks = [_create_periodic_check(PERIOD * (index % 2 + 1)) for index in range(10)]
+    try:
+        events_times = await asyncio.gather(*(_get_events_times(check, 2) for check in checks))
+        assert all(len(times) == 2 for times in events_times)
+        assert sum(
+            1 for task in asyncio.all_tasks()
+            if task.get_coro().__qualname__ == period_check.PeriodicChecksScheduler._run.__qualname__
+        ) == 1
+    finally:
+        for check in checks:
+            await check.stop()
+    assert period_check.PERIODIC_CHECKS_SCHEDULER.deadlines == []
+    # the scheduler task stops when no check is left
+    await asyncio.wait_for(period_check.PERIODIC_CHECKS_SCHEDULER._task, 1)
+
+
+async def test_missed_ticks():
+    check = _create_periodic_check()
+    try:
+        # processing takes longer than the period
+        times = await _get_events_times(check, 3, processing_time=PERIOD * 2.5)
+        assert check.missed_ticks >= 2
+        # next event is triggered on the next deadline
+        assert times[2] - times[1] < PERIOD * 3
+    finally:
+        await check.stop()
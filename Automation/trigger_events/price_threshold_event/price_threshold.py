@@ -15,6 +15,7 @@
 #  License along with OctoBot. If not, see <https://www.gnu.org/licenses/>.
 import asyncio
 import decimal
+import sortedcontainers
 
 import async_channel.enums as channel_enums
 import octobot_commons.enums as commons_enums
@@ -25,6 +26,105 @@ import octobot_trading.exchange_channel as exchanges_channel
 import octobot_trading.api as trading_api
 
 
+class SymbolPriceThresholds:
+    """
+    Price thresholds of a symbol on an exchange, sorted by target price: on each mark price, only the thresholds
+    crossed since the previous mark price are looked up
+    """
+    def __init__(self, exchange_id: str, symbol: str):
+        self.exchange_id = exchange_id
+        self.symbol = symbol
+        # (target price, price threshold) sorted by target price
+        self.thresholds = sortedcontainers.SortedKeyList(key=lambda threshold: threshold[0])
+        # thresholds added since the last mark price, they can only be crossed from the next mark price
+        self.pending_thresholds = []
+        # target price of each threshold when it was added: its target price can change afterwards
+        self.registered_target_prices = {}
+        self.last_price = None
+        self.consumer = None
+
+    async def start(self):
+        self.consumer = await exchanges_channel.get_chan(
+            channels_name.OctoBotTradingChannelsName.MARK_PRICE_CHANNEL.value,
+            self.exchange_id
+        ).new_consumer(
+            self.mark_price_callback,
+            priority_level=channel_enums.ChannelConsumerPriorityLevels.MEDIUM.value,
+            symbol=self.symbol
+        )
+
+    async def stop(self):
+        if self.consumer is not None:
+            await self.consumer.stop()
+            self.consumer = None
+
+    def add(self, price_threshold):
+        self.registered_target_prices[price_threshold] = price_threshold.target_price
+        self.pending_thresholds.append((price_threshold.target_price, price_threshold))
+
+    def remove(self, price_threshold):
+        if (target_price := self.registered_target_prices.pop(price_threshold, None)) is None:
+            return
+        self.pending_thresholds = [
+            threshold for threshold in self.pending_thresholds if threshold[1] is not price_threshold
+        ]
+        for threshold in list(self.thresholds.irange_key(target_price, target_price)):
+            if threshold[1] is price_threshold:
+                self.thresholds.remove(threshold)
+
+    def is_empty(self) -> bool:
+        return not self.registered_target_prices
+
+    async def mark_price_callback(
+            self, exchange: str, exchange_id: str, cryptocurrency: str, symbol: str, mark_price
+    ):
+        for _, price_threshold in self.get_crossed_thresholds(mark_price):
+            price_threshold.on_threshold_crossed()
+        self.last_price = mark_price
+        if self.pending_thresholds:
+            self.thresholds.update(self.pending_thresholds)
+            self.pending_thresholds = []
+
+    def get_crossed_thresholds(self, mark_price) -> list:
+        if self.last_price is None or mark_price == self.last_price:
+            return []
+        if mark_price > self.last_price:
+            # mark_price >= target_price > last_price
+            return list(self.thresholds.irange_key(self.last_price, mark_price, inclusive=(False, True)))
+        # mark_price <= target_price < last_price
+        return list(self.thresholds.irange_key(mark_price, self.last_price, inclusive=(True, False)))
+
+
+class PriceThresholdsRegistry:
+    """
+    Shares a single mark price consumer and sorted thresholds by exchange and symbol between every PriceThreshold
+    """
+    def __init__(self):
+        self.thresholds_by_exchange_and_symbol: dict[tuple[str, str], SymbolPriceThresholds] = {}
+        # (exchange id, symbol) keys of each threshold when it was registered: its symbol can change afterwards
+        self.registered_keys_by_threshold: dict = {}
+
+    async def register(self, exchange_id: str, price_threshold):
+        key = (exchange_id, price_threshold.symbol)
+        if key not in self.thresholds_by_exchange_and_symbol:
+            symbol_thresholds = SymbolPriceThresholds(exchange_id, price_threshold.symbol)
+            self.thresholds_by_exchange_and_symbol[key] = symbol_thresholds
+            await symbol_thresholds.start()
+        self.thresholds_by_exchange_and_symbol[key].add(price_threshold)
+        self.registered_keys_by_threshold.setdefault(price_threshold, set()).add(key)
+
+    async def unregister(self, price_threshold):
+        for key in self.registered_keys_by_threshold.pop(price_threshold, ()):
+            symbol_thresholds = self.thresholds_by_exchange_and_symbol[key]
+            symbol_thresholds.remove(price_threshold)
+            if symbol_thresholds.is_empty():
+                self.thresholds_by_exchange_and_symbol.pop(key)
+                await symbol_thresholds.stop()
+
+
+PRICE_THRESHOLDS_REGISTRY = PriceThresholdsRegistry()
+
+
 class PriceThreshold(abstract_trigger_event.AbstractTriggerEvent):
     TARGET_PRICE = "target_price"
     SYMBOL = "symbol"
@@ -36,51 +136,27 @@ class PriceThreshold(abstract_trigger_event.AbstractTriggerEvent):
         self.waiter_task = None
         self.symbol = None
         self.target_price = None
-        self.last_price = None
         self.trigger_event = asyncio.Event()
         self.registered_consumer = False
-        self.consumers = []
 
     async def _register_consumer(self):
         self.registered_consumer = True
         for exchange_id in trading_api.get_exchange_ids():
-            self.consumers.append(
-                await exchanges_channel.get_chan(
-                    channels_name.OctoBotTradingChannelsName.MARK_PRICE_CHANNEL.value,
-                    exchange_id
-                ).new_consumer(
-                    self.mark_price_callback,
-                    priority_level=channel_enums.ChannelConsumerPriorityLevels.MEDIUM.value,
-                    symbol=self.symbol
-                )
-            )
+            await PRICE_THRESHOLDS_REGISTRY.register(exchange_id, self)
 
-    async def mark_price_callback(
-            self, exchange: str, exchange_id: str, cryptocurrency: str, symbol: str, mark_price
-    ):
+    def on_threshold_crossed(self):
         if self.should_stop:
             # do not go any further if the action has been stopped
             return
-        self._check_threshold(mark_price)
-        self._update_last_price(mark_price)
-
-    def _update_last_price(self, mark_price):
-        self.last_price = mark_price
-
-    def _check_threshold(self, mark_price):
-        if self.last_price is None:
-            return
-        if mark_price >= self.target_price > self.last_price or mark_price <= self.target_price < self.last_price:
-            # mark_price crossed self.target_price threshold
-            self.trigger_event.set()
+        self.trigger_event.set()
 
     async def stop(self):
         await super().stop()
         if self.waiter_task is not None and not self.waiter_task.done():
             self.waiter_task.cancel()
-        for consumer in self.consumers:
-            await consumer.stop()
-        self.consumers = []
+        if self.registered_consumer:
+            await PRICE_THRESHOLDS_REGISTRY.unregister(self)
+            self.registered_consumer = False
 
     async def _get_next_event(self):
         if self.should_stop:
@@ -123,7 +199,6 @@ class PriceThreshold(abstract_trigger_event.AbstractTriggerEvent):
 
     def apply_config(self, config):
         self.trigger_event.clear()
-        self.last_price = None
         self.symbol = config[self.SYMBOL]
         self.target_price = decimal.Decimal(str(config[self.TARGET_PRICE]))
         self.trigger_only_once = config[self.TRIGGER_ONLY_ONCE]
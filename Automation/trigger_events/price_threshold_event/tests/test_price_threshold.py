@@ -0,0 +1,198 @@
+#  This file is part of OctoBot (https://github.com/Drakkar-Software/OctoBot)
+#  Copyright (c) 2023 Drakkar-Software, All rights reserved.
+#
+#  OctoBot is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  OctoBot is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with OctoBot. If not, see <https://www.gnu.org/licenses/>.
+import decimal
+import mock
+import pytest
+
+import tentacles.Automation.trigger_events.price_threshold_event.price_threshold as price_threshold
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+EXCHANGE_ID = "exchange_id"
+SYMBOL = "BTC/USDT"
+
+
+def _price_threshold(target_price, symbol=SYMBOL):
+    event = price_threshold.PriceThreshold()
+    event.apply_config({
+        event.SYMBOL: symbol,
+        event.TARGET_PRICE: target_price,
+        event.TRIGGER_ONLY_ONCE: False,
+        event.MAX_TRIGGER_FREQUENCY: 0,
+    })
+    return event
+
+
+async def _mark_price(symbol_thresholds, price):
+    await symbol_thresholds.mark_price_callback(
+        "binance", EXCHANGE_ID, "BTC", symbol_thresholds.symbol, decimal.Decimal(str(price))
+    )
+
+
+def _triggered(events) -> list:
+    triggered = [event.target_price for event in events if event.trigger_event.is_set()]
+    for event in events:
+        event.trigger_event.clear()
+    return triggered
+
+
+@pytest.fixture
+def channel():
+    consumer = mock.Mock(stop=mock.AsyncMock())
+    chan = mock.Mock(new_consumer=mock.AsyncMock(return_value=consumer))
+    with mock.patch.object(price_threshold.exchanges_channel, "get_chan", mock.Mock(return_value=chan)):
+        yield chan
+
+
+async def test_upward_and_downward_crossings():
+    symbol_thresholds = price_threshold.SymbolPriceThresholds(EXCHANGE_ID, SYMBOL)
+    events = [_price_threshold(target_price) for target_price in (90, 100, 100, 110)]
+    for event in events:
+        symbol_thresholds.add(event)
+    await _mark_price(symbol_thresholds, 95)
+    assert _triggered(events) == []
+    # reached target price is crossed
+    await _mark_price(symbol_thresholds, 100)
+    assert _triggered(events) == [100, 100]
+    # price going away from 100 does not cross it again
+    await _mark_price(symbol_thresholds, 105)
+    assert _triggered(events) == []
+    await _mark_price(symbol_thresholds, 105)
+    assert _triggered(events) == []
+    await _mark_price(symbol_thresholds, 120)
+    assert _triggered(events) == [110]
+    # crossing down
+    await _mark_price(symbol_thresholds, 100)
+    assert _triggered(events) == [100, 100, 110]
+    await _mark_price(symbol_thresholds, 80)
+    assert _triggered(events) == [90]
+    # several thresholds at once
+    await _mark_price(symbol_thresholds, 200)
+    assert _triggered(events) == [90, 100, 100, 110]
+
+
+async def test_thresholds_registered_before_first_price():
+    symbol_thresholds = price_threshold.SymbolPriceThresholds(EXCHANGE_ID, SYMBOL)
+    event = _price_threshold(100)
+    symbol_thresholds.add(event)
+    assert not symbol_thresholds.is_empty()
+    # no previous price: nothing is crossed
+    await _mark_price(symbol_thresholds, 150)
+    assert _triggered([event]) == []
+    await _mark_price(symbol_thresholds, 90)
+    assert _triggered([event]) == [100]
+    # thresholds added after a price are only crossed from the next price
+    late_event = _price_threshold(95)
+    symbol_thresholds.add(late_event)
+    await _mark_price(symbol_thresholds, 96)
+    assert _triggered([event, late_event]) == []
+    await _mark_price(symbol_thresholds, 94)
+    assert _triggered([event, late_event]) == [95]
+
+
+async def test_stopped_price_threshold_is_not_triggered():
+    symbol_thresholds = price_threshold.SymbolPriceThresholds(EXCHANGE_ID, SYMBOL)
+    event = _price_threshold(100)
+    symbol_thresholds.add(event)
+    await _mark_price(symbol_thresholds, 90)
+    event.should_stop = True
+    await _mark_price(symbol_thresholds, 110)
+    assert _triggered([event]) == []
+
+
+async def test_remove():
+    symbol_thresholds = price_threshold.SymbolPriceThresholds(EXCHANGE_ID, SYMBOL)
+    pending_event = _price_threshold(100)
+    symbol_thresholds.add(pending_event)
+    symbol_thresholds.remove(pending_event)
+    assert symbol_thresholds.is_empty()
+    events = [_price_threshold(100), _price_threshold(100)]
+    for event in events:
+        symbol_thresholds.add(event)
+    await _mark_price(symbol_thresholds, 90)
+    # only the given threshold is removed, even with the same target price
+    symbol_thresholds.remove(events[0])
+    assert not symbol_thresholds.is_empty()
+    await _mark_price(symbol_thresholds, 110)
+    assert [event.trigger_event.is_set() for event in events] == [False, True]
+    symbol_thresholds.remove(events[1])
+    assert symbol_thresholds.is_empty()
+
+
+async def test_registry_shares_symbol_consumer(channel):
+    registry = price_threshold.PriceThresholdsRegistry()
+    events = [_price_threshold(100), _price_threshold(110), _price_threshold(120)]
+    other_symbol_event = _price_threshold(10, symbol="ETH/USDT")
+    for event in events + [other_symbol_event]:
+        await registry.register(EXCHANGE_ID, event)
+    # one consumer by symbol
+    assert channel.new_consumer.await_count == 2
+    assert [call.kwargs["symbol"] for call in channel.new_consumer.await_args_list] == [SYMBOL, "ETH/USDT"]
+    symbol_thresholds = registry.thresholds_by_exchange_and_symbol[(EXCHANGE_ID, SYMBOL)]
+    callback = channel.new_consumer.await_args_list[0].args[0]
+    assert callback == symbol_thresholds.mark_price_callback
+    await callback("binance", EXCHANGE_ID, "BTC", SYMBOL, decimal.Decimal(90))
+    await callback("binance", EXCHANGE_ID, "BTC", SYMBOL, decimal.Decimal(115))
+    assert _triggered(events + [other_symbol_event]) == [100, 110]
+
+    # unregistering keeps the consumer while other thresholds use it
+    await registry.unregister(events[0])
+    symbol_consumer = symbol_thresholds.consumer
+    symbol_consumer.stop.assert_not_called()
+    await callback("binance", EXCHANGE_ID, "BTC", SYMBOL, decimal.Decimal(50))
+    assert _triggered(events) == [110]
+    await registry.unregister(events[1])
+    await registry.unregister(events[2])
+    # last threshold of the symbol: its consumer is stopped
+    symbol_consumer.stop.assert_awaited_once()
+    assert symbol_thresholds.consumer is None
+    assert list(registry.thresholds_by_exchange_and_symbol) == [(EXCHANGE_ID, "ETH/USDT")]
+    # registering again starts a new consumer
+    await registry.register(EXCHANGE_ID, events[0])
+    assert channel.new_consumer.await_count == 3
+    await registry.unregister(events[0])
+    await registry.unregister(other_symbol_event)
+    assert registry.thresholds_by_exchange_and_symbol == {}
+
+
+async def test_registry_unregister_after_reconfiguration(channel):
+    registry = price_threshold.PriceThresholdsRegistry()
+    event = _price_threshold(100)
+    other_event = _price_threshold(100)
+    await registry.register(EXCHANGE_ID, event)
+    await registry.register(EXCHANGE_ID, other_event)
+    symbol_thresholds = registry.thresholds_by_exchange_and_symbol[(EXCHANGE_ID, SYMBOL)]
+    await _mark_price(symbol_thresholds, 90)
+    # target price and symbol are updated while registered
+    event.apply_config({
+        event.SYMBOL: "ETH/USDT",
+        event.TARGET_PRICE: 200,
+        event.TRIGGER_ONLY_ONCE: False,
+        event.MAX_TRIGGER_FREQUENCY: 0,
+    })
+    await registry.unregister(event)
+    # the threshold registered with its previous target price and symbol is removed
+    assert [threshold[1] for threshold in symbol_thresholds.thresholds] == [other_event]
+    assert list(symbol_thresholds.registered_target_prices) == [other_event]
+    await _mark_price(symbol_thresholds, 110)
+    assert [event.trigger_event.is_set(), other_event.trigger_event.is_set()] == [False, True]
+    await registry.unregister(other_event)
+    assert symbol_thresholds.consumer is None
+    assert registry.thresholds_by_exchange_and_symbol == {}
+    assert registry.registered_keys_by_threshold == {}
+    # unregistering again does nothing
+    await registry.unregister(event)
@@ -0,0 +1,81 @@
+#  This file is part of OctoBot (https://github.com/Drakkar-Software/OctoBot)
+#  Copyright (c) 2023 Drakkar-Software, All rights reserved.
+#
+#  OctoBot is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU General Public License
+#  as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  OctoBot is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  General Public License for more details.
+#
+#  You should have received a copy of the GNU General Public
+#  License along with OctoBot. If not, see <https://www.gnu.org/licenses/>.
+import decimal
+import mock
+import pytest
+
+import tentacles.Automation.trigger_events.profitability_threshold_event.profitability_threshold as \
+    profitability_threshold
+
+START_TIME = 1700000000.5
+
+
+@pytest.fixture
+def profitability_threshold_event():
+    event = profitability_threshold.ProfitabilityThreshold()
+    event.apply_config({
+        event.PERCENT_CHANGE: 10,
+        event.TIME_PERIOD: 60,  # minutes
+        event.TRIGGER_ONLY_ONCE: False,
+        event.MAX_TRIGGER_FREQUENCY: 0,
+    })
+    return event
+
+
+def _update(event, update_time, profitability_percent):
+    with mock.patch.object(profitability_threshold.time, "time", mock.Mock(return_value=update_time)):
+        event._update_profitability_by_time(decimal.Decimal(str(profitability_percent)))
+
+
+def test_update_profitability_by_time(profitability_threshold_event):
+    _update(profitability_threshold_event, START_TIME, 1)
+    # same second: latest value is kept
+    _update(profitability_threshold_event, START_TIME + 0.2, 2)
+    assert list(profitability_threshold_event.profitability_by_time) == [(int(START_TIME), decimal.Decimal(2))]
+    _update(profitability_threshold_event, START_TIME + 1800, 3)
+    _update(profitability_threshold_event, START_TIME + 3600, 4)
+    assert [value for _, value in profitability_threshold_event.profitability_by_time] == [2, 3, 4]
+    # first value is now out of the time period
+    _update(profitability_threshold_event, START_TIME + 3601, 5)
+    assert [value for _, value in profitability_threshold_event.profitability_by_time] == [3, 4, 5]
+    # latest value is always kept
+    _update(profitability_threshold_event, START_TIME + 100000, 6)
+    assert [value for _, value in profitability_threshold_event.profitability_by_time] == [6]
+
+
+def test_check_threshold_compares_to_oldest_value_in_time_period(profitability_threshold_event):
+    _update(profitability_threshold_event, START_TIME, 0)
+    _update(profitability_threshold_event, START_TIME + 60, 8)
+    profitability_threshold_event._check_threshold(decimal.Decimal(8))
+    assert not profitability_threshold_event.trigger_event.is_set()
+    _update(profitability_threshold_event, START_TIME + 120, 10)
+    profitability_threshold_event._check_threshold(decimal.Decimal(10))
+    assert profitability_threshold_event.trigger_event.is_set()
+    profitability_threshold_event.trigger_event.clear()
+    # 0 is out of the time period: compare to 8
+    _update(profitability_threshold_event, START_TIME + 3700, 12)
+    profitability_threshold_event._check_threshold(decimal.Decimal(12))
+    assert not profitability_threshold_event.trigger_event.is_set()
+
+
+def test_profitability_by_time_size_is_bounded(profitability_threshold_event):
+    # two weeks of updates every 10 seconds: only the last hour is kept
+    with mock.patch.object(profitability_threshold.time, "time", mock.Mock(return_value=START_TIME)) as time_mock:
+        for index in range(14 * 24 * 360):
+            time_mock.return_value += 10
+            profitability_threshold_event._update_profitability_by_time(decimal.Decimal(index % 100))
+            assert len(profitability_threshold_event.profitability_by_time) <= 361
+    assert len(profitability_threshold_event.profitability_by_time) == 361
@@ -19,7 +19,7 @@ import os
 import json
 import time
 import shutil
-import collections
+import numpy as np
 
 import octobot_backtesting.collectors as collector
 import octobot_backtesting.importers as importers
@@ -42,6 +42,8 @@ class ExchangeBotSnapshotWithHistoryCollector(collector.AbstractExchangeBotSnaps
     IMPORTER = generic_exchange_importer.GenericExchangeDataImporter
     OHLCV = "ohlcv"
     KLINE = "kline"
+    # maximum number of candles to delete in a single statement (SQLite variables count is limited)
+    MAX_DELETED_CANDLES_PER_REQUEST = 500
 
     def __init__(self, config, exchange_name, exchange_type, tentacles_setup_config, symbols, time_frames,
                  use_all_available_timeframes=False,
@@ -253,48 +255,72 @@ class ExchangeBotSnapshotWithHistoryCollector(collector.AbstractExchangeBotSnaps
                 return candle[-1], candle[0]
         return None, None
 
+    def get_candles_by_time(self, candles) -> dict:
+        """
+        :return: (candle, database timestamp) by candle time, only the first candle of a time is kept as in find_candle
+        """
+        candles_by_time = {}
+        for candle in candles:
+            candles_by_time.setdefault(candle[-1][commons_enums.PriceIndexes.IND_PRICE_TIME.value],
+                                       (candle[-1], candle[0]))
+        return candles_by_time
+
     async def update_ohlcv(self, exchange, symbol, time_frame, time_frame_sec,
                            database_candles, current_bot_candles):
-        to_add_candles = []
-        symbol_id = str(symbol)
+        database_candles_by_time = self.get_candles_by_time(database_candles)
+        to_save_candles = []
+        to_save_timestamps = []
+        replaced_timestamps = []
         for up_to_date_candle in current_bot_candles:
             current_candle_time = up_to_date_candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value]
-            equivalent_db_candle, candle_timestamp = self.find_candle(database_candles, current_candle_time)
+            equivalent_db_candle, candle_timestamp = database_candles_by_time.get(current_candle_time, (None, None))
             if equivalent_db_candle is None:
-                to_add_candles.append(up_to_date_candle)
+                to_save_candles.append(up_to_date_candle)
+                to_save_timestamps.append(current_candle_time + time_frame_sec)
             elif equivalent_db_candle != up_to_date_candle:
-                updated_value_by_column = {
-                    "candle": json.dumps(up_to_date_candle)
-                }
-                await self.database.update(backtesting_enums.ExchangeDataTables.OHLCV,
-                                           updated_value_by_column=updated_value_by_column,
-                                           exchange_name=exchange,
-                                           cryptocurrency=
-                                           self.exchange_manager.exchange.get_pair_cryptocurrency(symbol_id),
-                                           symbol=symbol.symbol_str,
-                                           time_frame=time_frame.value,
-                                           timestamp=str(candle_timestamp))
-        if to_add_candles:
-            await self.save_ohlcv(
-                exchange=exchange,
-                cryptocurrency=self.exchange_manager.exchange.get_pair_cryptocurrency(symbol_id),
-                symbol=symbol, time_frame=time_frame, candle=to_add_candles,
-                timestamp=[candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value] + time_frame_sec
-                           for candle in to_add_candles],
-                multiple=True
-            )
+                # replace the database candle, keeping its timestamp
+                replaced_timestamps.append(candle_timestamp)
+                to_save_candles.append(up_to_date_candle)
+                to_save_timestamps.append(candle_timestamp)
+        if to_save_candles:
+            cryptocurrency = self.exchange_manager.exchange.get_pair_cryptocurrency(str(symbol))
+            try:
+                if replaced_timestamps:
+                    # committed alongside the saved candles: replaced candles are upserted in a single transaction
+                    await self._delete_ohlcv(exchange, cryptocurrency, symbol, time_frame, replaced_timestamps)
+                await self.save_ohlcv(
+                    exchange=exchange,
+                    cryptocurrency=cryptocurrency,
+                    symbol=symbol.symbol_str, time_frame=time_frame, candle=to_save_candles,
+                    timestamp=to_save_timestamps,
+                    multiple=True
+                )
+            except Exception:
+                # don't leave replaced candles deleted in the pending transaction: it would be committed by the
+                # next write
+                await self.database.connection.rollback()
+                raise
+
+    async def _delete_ohlcv(self, exchange, cryptocurrency, symbol, time_frame, timestamps):
+        async with self.database.aio_cursor() as cursor:
+            for index in range(0, len(timestamps), self.MAX_DELETED_CANDLES_PER_REQUEST):
+                deleted_timestamps = timestamps[index:index + self.MAX_DELETED_CANDLES_PER_REQUEST]
+                await cursor.execute(
+                    f"DELETE FROM {backtesting_enums.ExchangeDataTables.OHLCV.value} "
+                    f"WHERE exchange_name = ? AND cryptocurrency = ? AND symbol = ? AND time_frame = ? "
+                    f"AND {databases.SQLiteDatabase.TIMESTAMP_COLUMN} IN "
+                    f"({', '.join('?' for _ in deleted_timestamps)})",
+                    (exchange, cryptocurrency, symbol.symbol_str, time_frame.value, *deleted_timestamps)
+                )
 
     async def _check_ohlcv_integrity(self, database_candles):
         # ensure no timestamp is here twice
-        all_timestamps = [candle[-1][0] for candle in database_candles]
-        unique_timestamps = set(all_timestamps)
-        if len(unique_timestamps) != len(database_candles):
-            return {
-                timestamp: counter
-                for timestamp, counter in collections.Counter(all_timestamps).items()
-                if counter > 1
-            }
-        return {}
+        if not database_candles:
+            return {}
+        all_timestamps = np.array([candle[-1][0] for candle in database_candles])
+        timestamps, counters = np.unique(all_timestamps, return_counts=True)
+        duplicates = counters > 1
+        return dict(zip(timestamps[duplicates].tolist(), counters[duplicates].tolist()))
 
     async def get_ohlcv_history(self, exchange, symbol, time_frame):
         try:
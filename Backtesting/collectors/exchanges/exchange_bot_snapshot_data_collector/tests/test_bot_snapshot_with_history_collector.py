@@ -0,0 +1,137 @@
+#  Drakkar-Software OctoBot
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import os
+import mock
+import pytest
+import pytest_asyncio
+
+import octobot_commons.databases as databases
+import octobot_commons.enums as commons_enums
+import octobot_commons.symbols as commons_symbols
+import octobot_trading.enums as trading_enums
+import tentacles.Backtesting.collectors.exchanges as collector_exchanges
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+EXCHANGE = "binance"
+SYMBOL = commons_symbols.parse_symbol("BTC/USDT")
+OTHER_SYMBOL = commons_symbols.parse_symbol("ETH/USDT")
+TIME_FRAME = commons_enums.TimeFrames.ONE_HOUR
+TIME_FRAME_SEC = 3600
+START_TIME = 1569412800
+
+
+def _get_candle(candle_time, close=1.5):
+    return [candle_time, 1, 2, 0.5, close, 10]
+
+
+@pytest_asyncio.fixture
+async def collector(tmp_path):
+    collector_instance = collector_exchanges.ExchangeBotSnapshotWithHistoryCollector(
+        {}, EXCHANGE, trading_enums.ExchangeTypes.SPOT, None, [SYMBOL], [TIME_FRAME]
+    )
+    collector_instance.exchange_manager = mock.Mock(
+        exchange=mock.Mock(get_pair_cryptocurrency=mock.Mock(side_effect=lambda symbol: symbol.split("/")[0]))
+    )
+    async with databases.new_sqlite_database(os.path.join(tmp_path, "snapshot.data")) as database:
+        collector_instance.database = database
+        yield collector_instance
+
+
+async def _save_candles(collector_instance, symbol, candles):
+    await collector_instance.save_ohlcv(
+        exchange=EXCHANGE, cryptocurrency=symbol.base, symbol=symbol.symbol_str, time_frame=TIME_FRAME,
+        candle=candles, timestamp=[candle[0] + TIME_FRAME_SEC for candle in candles], multiple=True
+    )
+
+
+async def test_update_ohlcv(collector):
+    database_candles = [_get_candle(START_TIME + i * TIME_FRAME_SEC) for i in range(5)]
+    await _save_candles(collector, SYMBOL, database_candles)
+    await _save_candles(collector, OTHER_SYMBOL, database_candles)
+    imported_candles = await collector._import_candles_from_datafile(EXCHANGE, SYMBOL, TIME_FRAME)
+    current_bot_candles = [
+        # up-to-date candle
+        database_candles[2],
+        # updated candles
+        _get_candle(START_TIME + 3 * TIME_FRAME_SEC, close=1.8),
+        _get_candle(START_TIME + 4 * TIME_FRAME_SEC, close=1.9),
+        # new candles
+        _get_candle(START_TIME + 5 * TIME_FRAME_SEC),
+        _get_candle(START_TIME + 6 * TIME_FRAME_SEC),
+    ]
+    with mock.patch.object(collector.database, "insert_all",
+                           mock.AsyncMock(wraps=collector.database.insert_all)) as insert_all_mock, \
+         mock.patch.object(collector.database, "update", mock.AsyncMock()) as update_mock:
+        await collector.update_ohlcv(EXCHANGE, SYMBOL, TIME_FRAME, TIME_FRAME_SEC,
+                                     imported_candles, current_bot_candles)
+        # updated and new candles are saved at once
+        insert_all_mock.assert_awaited_once()
+        update_mock.assert_not_called()
+    updated_candles = await collector._import_candles_from_datafile(EXCHANGE, SYMBOL, TIME_FRAME)
+    assert sorted((candle[0], candle[-1]) for candle in updated_candles) == [
+        (candle[0] + TIME_FRAME_SEC, candle) for candle in database_candles[:3] + current_bot_candles[1:]
+    ]
+    assert await collector._check_ohlcv_integrity(updated_candles) == {}
+    # other symbols are not updated
+    other_symbol_candles = await collector._import_candles_from_datafile(EXCHANGE, OTHER_SYMBOL, TIME_FRAME)
+    assert sorted(candle[-1] for candle in other_symbol_candles) == database_candles
+
+    # nothing to update
+    with mock.patch.object(collector.database, "insert_all", mock.AsyncMock()) as insert_all_mock:
+        await collector.update_ohlcv(EXCHANGE, SYMBOL, TIME_FRAME, TIME_FRAME_SEC,
+                                     updated_candles, current_bot_candles)
+        insert_all_mock.assert_not_called()
+
+
+async def test_update_ohlcv_save_error(collector):
+    database_candles = [_get_candle(START_TIME + i * TIME_FRAME_SEC) for i in range(3)]
+    await _save_candles(collector, SYMBOL, database_candles)
+    imported_candles = await collector._import_candles_from_datafile(EXCHANGE, SYMBOL, TIME_FRAME)
+    current_bot_candles = [
+        _get_candle(START_TIME + 2 * TIME_FRAME_SEC, close=1.8),
+        _get_candle(START_TIME + 3 * TIME_FRAME_SEC),
+    ]
+    with mock.patch.object(collector.database, "insert_all", mock.AsyncMock(side_effect=OSError)):
+        with pytest.raises(OSError):
+            await collector.update_ohlcv(EXCHANGE, SYMBOL, TIME_FRAME, TIME_FRAME_SEC,
+                                         imported_candles, current_bot_candles)
+    # replaced candles deletion is rolled back and not committed by the next write
+    await _save_candles(collector, OTHER_SYMBOL, database_candles)
+    candles = await collector._import_candles_from_datafile(EXCHANGE, SYMBOL, TIME_FRAME)
+    assert sorted(candle[-1] for candle in candles) == database_candles
+
+
+async def test_update_ohlcv_many_candles(collector):
+    candles_count = collector.MAX_DELETED_CANDLES_PER_REQUEST * 2 + 10
+    database_candles = [_get_candle(START_TIME + i * TIME_FRAME_SEC) for i in range(candles_count)]
+    await _save_candles(collector, SYMBOL, database_candles)
+    imported_candles = await collector._import_candles_from_datafile(EXCHANGE, SYMBOL, TIME_FRAME)
+    current_bot_candles = [_get_candle(candle[0], close=2) for candle in database_candles]
+    await collector.update_ohlcv(EXCHANGE, SYMBOL, TIME_FRAME, TIME_FRAME_SEC, imported_candles, current_bot_candles)
+    updated_candles = await collector._import_candles_from_datafile(EXCHANGE, SYMBOL, TIME_FRAME)
+    assert sorted(candle[-1] for candle in updated_candles) == current_bot_candles
+
+
+async def test_check_ohlcv_integrity(collector):
+    assert await collector._check_ohlcv_integrity([]) == {}
+    candles = [_get_candle(START_TIME + i * TIME_FRAME_SEC) for i in range(5)]
+    assert await collector._check_ohlcv_integrity([[candle[0], candle] for candle in candles]) == {}
+    duplicated_candles = candles + [candles[1], candles[3], candles[1]]
+    counters = await collector._check_ohlcv_integrity([[candle[0], candle] for candle in duplicated_candles])
+    assert counters == {START_TIME + TIME_FRAME_SEC: 3, START_TIME + 3 * TIME_FRAME_SEC: 2}
+    assert all(type(timestamp) is int and type(counter) is int for timestamp, counter in counters.items())
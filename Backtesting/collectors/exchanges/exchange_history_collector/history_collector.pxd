@@ -20,3 +20,11 @@ from octobot_backtesting.collectors.exchanges.exchange_collector cimport Abstrac
 cdef class ExchangeHistoryDataCollector(AbstractExchangeHistoryCollector):
     cdef public object exchange
     cdef public object exchange_manager
+    cdef public int max_concurrent_requests
+    cdef public bint use_columnar_ohlcv
+    cdef public str file_ending
+    cdef public str collection_id
+    cdef public bint is_resumed
+    cdef public object market_data_writer
+    cdef object _database_lock
+    cdef dict _steps_percent
@@ -13,17 +13,28 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import asyncio
+import enum
+import functools
+import hashlib
+import json
 import logging
 import os
 import time
 
 import octobot_backtesting.collectors as collector
+import octobot_backtesting.constants as backtesting_constants
+import octobot_backtesting.data as backtesting_data
 import octobot_backtesting.enums as backtesting_enums
 import octobot_backtesting.errors as errors
 import octobot_commons.constants as commons_constants
+import octobot_commons.databases as databases
 import octobot_commons.enums as commons_enums
+import octobot_commons.errors as commons_errors
 import octobot_commons.time_frame_manager as time_frame_manager
 import tentacles.Backtesting.importers.exchanges.generic_exchange_importer as generic_exchange_importer
+import tentacles.Backtesting.importers.exchanges.generic_exchange_importer.columnar_ohlcv as columnar_ohlcv
+import tentacles.Backtesting.importers.exchanges.generic_exchange_importer.compact_market_data as compact_market_data
 
 try:
     import octobot_trading.api as trading_api
@@ -33,19 +44,78 @@ except ImportError:
     logging.error("ExchangeHistoryDataCollector requires OctoBot-Trading package installed")
 
 
+class HistoryCollectorTables(enum.Enum):
+    CHECKPOINT = "checkpoint"
+
+
 class ExchangeHistoryDataCollector(collector.AbstractExchangeHistoryCollector):
     IMPORTER = generic_exchange_importer.GenericExchangeDataImporter
+    # symbol and time frame histories collected at the same time, requests are also throttled by the exchange
+    # rate limiter
+    MAX_CONCURRENT_REQUESTS = 5
+    ORDER_BOOK_LIMIT = 100
+    RECENT_TRADES_LIMIT = 1000
 
     def __init__(self, config, exchange_name, exchange_type, tentacles_setup_config, symbols, time_frames,
                  use_all_available_timeframes=False,
                  data_format=backtesting_enums.DataFormats.REGULAR_COLLECTOR_DATA,
                  start_timestamp=None,
-                 end_timestamp=None):
+                 end_timestamp=None,
+                 max_concurrent_requests=None,
+                 use_columnar_ohlcv=False):
         super().__init__(config, exchange_name, exchange_type, tentacles_setup_config, symbols, time_frames,
                          use_all_available_timeframes, data_format=data_format,
                          start_timestamp=start_timestamp, end_timestamp=end_timestamp)
         self.exchange = None
         self.exchange_manager = None
+        self.max_concurrent_requests = max_concurrent_requests or self.MAX_CONCURRENT_REQUESTS
+        # when True, candles are saved as columnar OHLCV chunks instead of OHLCV rows
+        self.use_columnar_ohlcv = use_columnar_ohlcv
+        self.file_ending = backtesting_data.get_file_ending(data_format)
+        # only history collections with a start timestamp can be resumed: others only fetch the latest candles
+        self.collection_id = None if start_timestamp is None else self._get_collection_id()
+        self.is_resumed = False
+        self.market_data_writer = None
+        self._database_lock = asyncio.Lock()
+        # progress of each symbol and time frame history: steps are collected concurrently
+        self._steps_percent = {}
+
+    def _get_collection_id(self) -> str:
+        return hashlib.sha256(json.dumps([
+            self.exchange_name,
+            self.exchange_type.value if isinstance(self.exchange_type, enum.Enum) else self.exchange_type,
+            [str(symbol) for symbol in self.symbols],
+            [time_frame.value for time_frame in self.time_frames],
+            self.use_all_available_timeframes,
+            self.start_timestamp,
+            self.end_timestamp,
+        ]).encode()).hexdigest()
+
+    async def initialize(self):
+        if self.collection_id is not None:
+            await self._use_interrupted_collection_file_if_any()
+        await super().initialize()
+        self.market_data_writer = compact_market_data.CompactMarketDataWriter(self.database)
+
+    async def _use_interrupted_collection_file_if_any(self):
+        # interrupted collections keep their temporary file, which identifies its collection in its checkpoint
+        file_prefix = f"{self.__class__.__name__}{backtesting_constants.BACKTESTING_DATA_FILE_SEPARATOR}"
+        temp_file_ending = f"{self.file_ending}{backtesting_constants.BACKTESTING_DATA_FILE_TEMP_EXT}"
+        for file_name in sorted(os.listdir(self.path)):
+            if not (file_name.startswith(file_prefix) and file_name.endswith(temp_file_ending)):
+                continue
+            try:
+                async with databases.new_sqlite_database(os.path.join(self.path, file_name)) as database:
+                    if not await database.check_table_exists(HistoryCollectorTables.CHECKPOINT) or \
+                       not await database.select(HistoryCollectorTables.CHECKPOINT, collection_id=self.collection_id):
+                        continue
+            except commons_errors.DatabaseNotFoundError:
+                continue
+            self.file_name = file_name[:-len(backtesting_constants.BACKTESTING_DATA_FILE_TEMP_EXT)]
+            self.set_file_path()
+            self.is_resumed = True
+            self.logger.info(f"Resuming interrupted {self.exchange_name} history collection from {self.file_name}")
+            return
 
     async def start(self):
         self.should_stop = False
@@ -67,29 +137,37 @@ class ExchangeHistoryDataCollector(collector.AbstractExchangeHistoryCollector):
             await self.check_timestamps()
 
             # create description
+            if self.is_resumed:
+                await self.database.delete(backtesting_enums.DataTables.DESCRIPTION, exchange=self.exchange_name)
             await self._create_description()
+            if self.collection_id is not None and not self.is_resumed:
+                await self.database.insert(HistoryCollectorTables.CHECKPOINT, time.time(),
+                                           collection_id=self.collection_id)
 
             self.total_steps = len(self.time_frames) * len(self.symbols)
+            self.current_step_index = 0
+            self._steps_percent = {}
             self.in_progress = True
 
             self.logger.info(f"Start collecting history on {self.exchange_name}")
-            for symbol_index, symbol in enumerate(self.symbols):
-                self.logger.info(f"Collecting history for {symbol}...")
+            for symbol in self.symbols:
                 await self.get_ticker_history(self.exchange_name, symbol)
                 await self.get_order_book_history(self.exchange_name, symbol)
                 await self.get_recent_trades_history(self.exchange_name, symbol)
-
-                for time_frame_index, time_frame in enumerate(self.time_frames):
-                    self.current_step_index = (symbol_index * len(self.time_frames)) + time_frame_index + 1
-                    self.logger.info(
-                        f"[{time_frame_index}/{len(self.time_frames)}] Collecting {symbol} history on {time_frame}...")
-                    await self.get_ohlcv_history(self.exchange_name, symbol, time_frame)
-                    await self.get_kline_history(self.exchange_name, symbol, time_frame)
+            await self._run_concurrently([
+                functools.partial(self._collect_time_frame_history, symbol, time_frame)
+                for symbol in self.symbols
+                for time_frame in self.time_frames
+            ])
         except Exception as err:
+            can_be_resumed = not self.should_stop and await self._has_persisted_candles()
             await self.database.stop()
             should_stop_database = False
+            if can_be_resumed:
+                self.logger.warning(f"Keeping {self.temp_file_path} collected data: this collection will resume "
+                                    f"from its last collected candles when started again with the same parameters.")
             # Do not keep errored data file
-            if os.path.isfile(self.temp_file_path):
+            elif os.path.isfile(self.temp_file_path):
                 os.remove(self.temp_file_path)
             if not self.should_stop:
                 self.logger.exception(err, True, f"Error when collecting {self.exchange_name} history for "
@@ -98,6 +176,114 @@ class ExchangeHistoryDataCollector(collector.AbstractExchangeHistoryCollector):
         finally:
             await self.stop(should_stop_database=should_stop_database)
 
+    async def _run_concurrently(self, coroutine_factories) -> list:
+        """
+        Run the coroutines created by coroutine_factories, at most max_concurrent_requests at a time.
+        Every coroutine is cancelled as soon as one of them raises.
+        :return: the coroutines results in the order of coroutine_factories
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+        async def _run(coroutine_factory):
+            async with semaphore:
+                return await coroutine_factory()
+
+        tasks = [asyncio.create_task(_run(coroutine_factory)) for coroutine_factory in coroutine_factories]
+        try:
+            return await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def save_ohlcv(self, timestamp, exchange, cryptocurrency, symbol, time_frame, candle, multiple=False):
+        # histories are collected concurrently: tables should not be created twice
+        async with self._database_lock:
+            if self.use_columnar_ohlcv:
+                # columnar candles timestamps are always their closing time
+                await columnar_ohlcv.save_ohlcv_columns(self.database, exchange, cryptocurrency, symbol, time_frame,
+                                                        candle if multiple else [candle])
+            else:
+                await super().save_ohlcv(timestamp, exchange, cryptocurrency, symbol, time_frame, candle,
+                                         multiple=multiple)
+
+    async def save_kline(self, timestamp, exchange, cryptocurrency, symbol, time_frame, kline, multiple=False):
+        # histories are collected concurrently: tables should not be created twice
+        async with self._database_lock:
+            await super().save_kline(timestamp, exchange, cryptocurrency, symbol, time_frame, kline,
+                                     multiple=multiple)
+
+    async def save_order_book(self, timestamp, exchange, cryptocurrency, symbol, asks, bids, multiple=False):
+        # order books are saved as deltas from the previous order book of their symbol
+        timestamps = timestamp if multiple else [timestamp]
+        await self.market_data_writer.save_order_books(timestamps, {
+            "exchange_name": [exchange] * len(timestamps),
+            "cryptocurrency": [cryptocurrency] * len(timestamps),
+            "symbol": [symbol] * len(timestamps),
+            "asks": asks if multiple else [asks],
+            "bids": bids if multiple else [bids],
+        })
+
+    async def save_recent_trades(self, timestamp, exchange, cryptocurrency, symbol, recent_trades, multiple=False):
+        # recent trades are saved as tapes of the trades that were not already saved
+        timestamps = timestamp if multiple else [timestamp]
+        await self.market_data_writer.save_recent_trades(timestamps, {
+            "exchange_name": [exchange] * len(timestamps),
+            "cryptocurrency": [cryptocurrency] * len(timestamps),
+            "symbol": [symbol] * len(timestamps),
+            "recent_trades": recent_trades if multiple else [recent_trades],
+        })
+
+    async def _collect_time_frame_history(self, symbol, time_frame):
+        self.logger.info(f"Collecting {symbol} history on {time_frame}...")
+        await self.get_ohlcv_history(self.exchange_name, symbol, time_frame)
+        await self.get_kline_history(self.exchange_name, symbol, time_frame)
+        self._update_step_percent(symbol, time_frame, 100)
+        self.current_step_index += 1
+        self.logger.info(f"[{self.current_step_index}/{self.total_steps}] Collected {symbol} history on {time_frame}")
+
+    def _update_step_percent(self, symbol, time_frame, step_percent):
+        """
+        Set the progress of the symbol and time frame step, current_step_percent is the progress over all steps
+        """
+        self._steps_percent[(str(symbol), time_frame)] = step_percent
+        self.current_step_percent = \
+            sum(self._steps_percent.values()) / max(self.total_steps, len(self._steps_percent))
+
+    async def _has_persisted_candles(self) -> bool:
+        if self.collection_id is None:
+            return False
+        try:
+            return (
+                await self.database.check_table_exists(backtesting_enums.ExchangeDataTables.OHLCV)
+                and await self.database.check_table_not_empty(backtesting_enums.ExchangeDataTables.OHLCV)
+            ) or await columnar_ohlcv.has_ohlcv_columns(self.database)
+        except Exception as err:
+            self.logger.exception(err, True, f"Error when checking collected candles: {err}")
+            return False
+
+    async def _get_last_persisted_candle_time(self, symbol, time_frame, time_frame_sec):
+        """
+        :return: the open time in seconds of the last persisted candle of the given symbol and time frame if any
+        """
+        if not self.is_resumed:
+            return None
+        # candles are saved with their closing time as timestamp
+        last_candle_close_times = []
+        if await self.database.check_table_exists(backtesting_enums.ExchangeDataTables.OHLCV):
+            last_candle_close_times.append((await self.database.select_max(
+                backtesting_enums.ExchangeDataTables.OHLCV, [self.database.TIMESTAMP_COLUMN],
+                exchange_name=self.exchange_name, symbol=symbol.symbol_str, time_frame=time_frame.value
+            ))[0][0])
+        if await self.database.check_table_exists(columnar_ohlcv.ColumnarExchangeDataTables.OHLCV_COLUMNS):
+            last_candle_close_times.append(await columnar_ohlcv.select_max_timestamp(
+                self.database, exchange_name=self.exchange_name, symbol=symbol.symbol_str, time_frame=time_frame.value
+            ))
+        last_candle_close_times = [
+            float(close_time) for close_time in last_candle_close_times if close_time is not None
+        ]
+        return max(last_candle_close_times) - time_frame_sec if last_candle_close_times else None
+
     def _load_all_available_timeframes(self):
         allowed_timeframes = set(tf.value for tf in commons_enums.TimeFrames)
         self.time_frames = [commons_enums.TimeFrames(time_frame)
@@ -116,17 +302,73 @@ class ExchangeHistoryDataCollector(collector.AbstractExchangeHistoryCollector):
         self.finished = True
         return self.finished
 
+    def _is_collecting_until_now(self) -> bool:
+        # exchanges only provide current tickers, order books and klines as well as their most recent trades
+        return self.end_timestamp is None
+
+    async def _fetch_market_data(self, data_name, symbol, fetch_method, *args, **kwargs):
+        """
+        :return: the fetch_method result, None when it failed or is not supported by the exchange
+        """
+        try:
+            return await fetch_method(*args, **kwargs)
+        except trading_errors.NotSupported as err:
+            self.logger.warning(f"Ignored {symbol} {data_name}: not supported on {self.exchange_name} ({err})")
+        except trading_errors.FailedRequest as err:
+            self.logger.exception(err, False)
+            self.logger.warning(f"Ignored {symbol} {data_name} on {self.exchange_name} ({err})")
+        return None
+
+    def _get_current_time(self):
+        return self.exchange.get_exchange_current_time()
+
     async def get_ticker_history(self, exchange, symbol):
-        pass
+        if not self._is_collecting_until_now():
+            return
+        ticker = await self._fetch_market_data("ticker", symbol, self.exchange.get_price_ticker, str(symbol))
+        if ticker:
+            await self.save_ticker(
+                timestamp=ticker.get(trading_enums.ExchangeConstantsTickersColumns.TIMESTAMP.value)
+                or self._get_current_time(),
+                exchange=exchange, cryptocurrency=self.exchange.get_pair_cryptocurrency(str(symbol)),
+                symbol=symbol.symbol_str, ticker=ticker
+            )
 
     async def get_order_book_history(self, exchange, symbol):
-        pass
+        if not self._is_collecting_until_now():
+            return
+        order_book = await self._fetch_market_data("order book", symbol, self.exchange.get_order_book, str(symbol),
+                                                   limit=self.ORDER_BOOK_LIMIT)
+        if order_book:
+            await self.save_order_book(
+                timestamp=order_book.get(trading_enums.ExchangeConstantsOrderBookInfoColumns.TIMESTAMP.value)
+                or self._get_current_time(),
+                exchange=exchange, cryptocurrency=self.exchange.get_pair_cryptocurrency(str(symbol)),
+                symbol=symbol.symbol_str,
+                asks=order_book[trading_enums.ExchangeConstantsOrderBookInfoColumns.ASKS.value],
+                bids=order_book[trading_enums.ExchangeConstantsOrderBookInfoColumns.BIDS.value]
+            )
 
     async def get_recent_trades_history(self, exchange, symbol):
-        pass
+        if not self._is_collecting_until_now():
+            return
+        recent_trades = await self._fetch_market_data("recent trades", symbol, self.exchange.get_recent_trades,
+                                                      str(symbol), limit=self.RECENT_TRADES_LIMIT)
+        if recent_trades and self.start_timestamp is not None:
+            recent_trades = [
+                recent_trade
+                for recent_trade in recent_trades
+                if recent_trade[compact_market_data.TRADE_TIMESTAMP_KEY] * 1000 >= self.start_timestamp
+            ]
+        if recent_trades:
+            await self.save_recent_trades(
+                timestamp=max(recent_trade[compact_market_data.TRADE_TIMESTAMP_KEY] for recent_trade in recent_trades),
+                exchange=exchange, cryptocurrency=self.exchange.get_pair_cryptocurrency(str(symbol)),
+                symbol=symbol.symbol_str, recent_trades=recent_trades
+            )
 
     async def get_ohlcv_history(self, exchange, symbol, time_frame):
-        self.current_step_percent = 0
+        self._update_step_percent(symbol, time_frame, 0)
         # use time_frame_sec to add time to save the candle closing time
         time_frame_sec = commons_enums.TimeFramesMinutes[time_frame] * commons_constants.MINUTE_TO_SECONDS
         symbol_id = str(symbol)
@@ -134,18 +376,25 @@ class ExchangeHistoryDataCollector(collector.AbstractExchangeHistoryCollector):
         if self.start_timestamp is not None:
             start_time = self.start_timestamp
             end_time = self.end_timestamp or time.time() * 1000
-            first_candle_timestamp = await self.get_first_candle_timestamp(
-                self.start_timestamp, symbol, time_frame
-            ) * 1000
-            if self.start_timestamp < first_candle_timestamp:
-                start_time = first_candle_timestamp
+            last_candle_time = await self._get_last_persisted_candle_time(symbol, time_frame, time_frame_sec)
+            if last_candle_time is not None:
+                # resume after the last persisted candle
+                start_time = max(start_time, last_candle_time * 1000 + 1)
+                self.logger.info(f"Resuming {symbol} {time_frame} history collection from {start_time}")
+            else:
+                first_candle_timestamp = await self.get_first_candle_timestamp(
+                    self.start_timestamp, symbol, time_frame
+                ) * 1000
+                if self.start_timestamp < first_candle_timestamp:
+                    start_time = first_candle_timestamp
             async for hist_candles in trading_api.get_historical_ohlcv(self.exchange_manager, symbol_id, time_frame,
                                                                        start_time, end_time):
                 if hist_candles:
-                    self.current_step_percent = \
+                    step_percent = \
                         (hist_candles[-1][commons_enums.PriceIndexes.IND_PRICE_TIME.value] - start_time / 1000) / \
                         ((end_time - start_time) / 1000) * 100
-                    self.logger.info(f"[{self.current_step_percent}%] historical data fetched for {symbol} {time_frame}")
+                    self._update_step_percent(symbol, time_frame, step_percent)
+                    self.logger.info(f"[{step_percent}%] historical data fetched for {symbol} {time_frame}")
                     await self.save_ohlcv(
                         exchange=exchange,
                         cryptocurrency=cryptocurrency,
@@ -168,16 +417,24 @@ class ExchangeHistoryDataCollector(collector.AbstractExchangeHistoryCollector):
                 self.logger.warning(f"Ignored {symbol} {time_frame} candles on {exchange} ({err})")
 
     async def get_kline_history(self, exchange, symbol, time_frame):
-        pass
+        if not self._is_collecting_until_now():
+            return
+        kline = await self._fetch_market_data(f"{time_frame.value} kline", symbol, self.exchange.get_kline_price,
+                                              str(symbol), time_frame)
+        if kline:
+            await self.save_kline(
+                timestamp=self._get_current_time(), exchange=exchange,
+                cryptocurrency=self.exchange.get_pair_cryptocurrency(str(symbol)),
+                symbol=symbol.symbol_str, time_frame=time_frame, kline=kline[0]
+            )
 
     async def check_timestamps(self):
         if self.start_timestamp is not None:
-            lowest_timestamp = min([
-                await self.get_first_candle_timestamp(
-                    self.start_timestamp, symbol, time_frame_manager.find_min_time_frame(self.time_frames)
-                )
+            min_time_frame = time_frame_manager.find_min_time_frame(self.time_frames)
+            lowest_timestamp = min(await self._run_concurrently([
+                functools.partial(self.get_first_candle_timestamp, self.start_timestamp, symbol, min_time_frame)
                 for symbol in self.symbols
-            ])
+            ]))
             if lowest_timestamp > self.start_timestamp:
                 self.start_timestamp = lowest_timestamp
             if self.start_timestamp > (self.end_timestamp if self.end_timestamp else (time.time() * 1000)):
@@ -0,0 +1,299 @@
+#  Drakkar-Software OctoBot
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import contextlib
+import json
+import os
+import mock
+import pytest
+
+import octobot_commons.databases as databases
+import octobot_commons.enums as commons_enums
+import octobot_commons.symbols as commons_symbols
+import octobot_backtesting.enums as enums
+import octobot_backtesting.errors as errors
+import octobot_trading.api as trading_api
+import octobot_trading.enums as trading_enums
+import octobot_trading.errors as trading_errors
+import tentacles.Backtesting.collectors.exchanges as collector_exchanges
+import tentacles.Backtesting.collectors.exchanges.exchange_history_collector.history_collector as history_collector
+import tentacles.Backtesting.importers.exchanges.generic_exchange_importer as generic_exchange_importer
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+EXCHANGE = "binanceus"
+SYMBOLS = ["ETH/BTC", "BTC/USDT"]
+TIME_FRAMES = [commons_enums.TimeFrames.ONE_HOUR, commons_enums.TimeFrames.FOUR_HOURS]
+HOUR_MS = 3600 * 1000
+CURRENT_TIME = 1700000000
+START_TIME = 1569412800000
+END_TIME = START_TIME + 100 * HOUR_MS
+CANDLES_PER_REQUEST = 10
+
+
+def _get_candles(time_frame, start_time, end_time):
+    time_frame_ms = commons_enums.TimeFramesMinutes[time_frame] * 60 * 1000
+    start_time = int(start_time)
+    first_candle_time = start_time + (-start_time % time_frame_ms)
+    return [
+        [candle_time // 1000, 1, 2, 0.5, 1.5, 10]
+        for candle_time in range(first_candle_time, int(end_time) + 1, time_frame_ms)
+    ]
+
+
+class _ExchangeHistory:
+    def __init__(self, failing_request_index=None):
+        self.failing_request_index = failing_request_index
+        self.requests_count = 0
+        self.start_times = {}
+        self.running_requests = 0
+        self.max_running_requests = 0
+
+    async def get_historical_ohlcv(self, exchange_manager, symbol, time_frame, start_time, end_time):
+        self.start_times[(symbol, time_frame)] = start_time
+        candles = _get_candles(time_frame, start_time, end_time)
+        for index in range(0, len(candles), CANDLES_PER_REQUEST):
+            self.running_requests += 1
+            self.max_running_requests = max(self.max_running_requests, self.running_requests)
+            try:
+                await asyncio.sleep(0.001)
+                self.requests_count += 1
+                if self.requests_count == self.failing_request_index:
+                    raise asyncio.TimeoutError("network error")
+            finally:
+                self.running_requests -= 1
+            yield candles[index:index + CANDLES_PER_REQUEST]
+
+
+@contextlib.asynccontextmanager
+async def history_collector_mocks(exchange_history):
+    exchange_manager = mock.Mock(
+        exchange=mock.Mock(
+            get_pair_cryptocurrency=mock.Mock(side_effect=lambda symbol: symbol.split("/")[0]),
+            get_symbol_prices=mock.AsyncMock(return_value=[[START_TIME // 1000, 1, 2, 0.5, 1.5, 10]]),
+            get_exchange_current_time=mock.Mock(return_value=CURRENT_TIME),
+            get_price_ticker=mock.AsyncMock(return_value={"symbol": "ETH/BTC", "close": 1.5, "timestamp": None}),
+            get_order_book=mock.AsyncMock(return_value={"asks": [[1.6, 2], [1.7, 1]], "bids": [[1.4, 3]],
+                                                        "timestamp": CURRENT_TIME - 1}),
+            get_recent_trades=mock.AsyncMock(return_value=[
+                {"timestamp": CURRENT_TIME - 2, "price": 1.5, "amount": 1, "side": "buy"},
+                {"timestamp": CURRENT_TIME - 1, "price": 1.55, "amount": 2, "side": "sell"},
+            ]),
+            get_kline_price=mock.AsyncMock(return_value=[[CURRENT_TIME - 60, 1, 2, 0.5, 1.5, 10]]),
+        ),
+        stop=mock.AsyncMock()
+    )
+    exchange_builder = mock.Mock()
+    for builder_method in ("is_simulated", "is_rest_only", "is_exchange_only", "is_future",
+                           "disable_trading_mode", "use_tentacles_setup_config"):
+        getattr(exchange_builder, builder_method).return_value = exchange_builder
+    exchange_builder.build = mock.AsyncMock(return_value=exchange_manager)
+    with mock.patch.object(trading_api, "create_exchange_builder", mock.Mock(return_value=exchange_builder)), \
+         mock.patch.object(trading_api, "get_historical_ohlcv", exchange_history.get_historical_ohlcv):
+        yield
+
+
+@contextlib.asynccontextmanager
+async def data_collector(use_columnar_ohlcv=False, start_timestamp=START_TIME, end_timestamp=END_TIME):
+    collector_instance = collector_exchanges.ExchangeHistoryDataCollector(
+        {}, EXCHANGE, trading_enums.ExchangeTypes.SPOT, None,
+        [commons_symbols.parse_symbol(symbol) for symbol in SYMBOLS], TIME_FRAMES,
+        start_timestamp=start_timestamp, end_timestamp=end_timestamp, max_concurrent_requests=3,
+        use_columnar_ohlcv=use_columnar_ohlcv
+    )
+    await collector_instance.initialize()
+    yield collector_instance
+
+
+@contextlib.contextmanager
+def removed_data_files(*collectors):
+    try:
+        yield
+    finally:
+        for collector in collectors:
+            for file_path in (collector.file_path, collector.temp_file_path):
+                if file_path and os.path.isfile(file_path):
+                    os.remove(file_path)
+
+
+async def _get_collected_candles(file_path):
+    async with databases.new_sqlite_database(file_path) as database:
+        return {
+            (symbol, time_frame.value): sorted(
+                json.loads(candle[-1])[commons_enums.PriceIndexes.IND_PRICE_TIME.value]
+                for candle in await database.select(enums.ExchangeDataTables.OHLCV,
+                                                    symbol=symbol, time_frame=time_frame.value)
+            )
+            for symbol in SYMBOLS
+            for time_frame in TIME_FRAMES
+        }
+
+
+async def test_collect_concurrently():
+    exchange_history = _ExchangeHistory()
+    async with history_collector_mocks(exchange_history), data_collector() as collector:
+        with removed_data_files(collector):
+            await collector.start()
+            assert collector.is_resumed is False
+            assert collector.current_step_index == collector.total_steps == len(SYMBOLS) * len(TIME_FRAMES)
+            assert 1 < exchange_history.max_running_requests <= collector.max_concurrent_requests
+            # current market data is not part of past histories
+            collector.exchange.get_order_book.assert_not_called()
+            collector.exchange.get_recent_trades.assert_not_called()
+            collected_candles = await _get_collected_candles(collector.file_path)
+            for (symbol, time_frame), candles_times in collected_candles.items():
+                assert candles_times == [
+                    candle[0] for candle in _get_candles(commons_enums.TimeFrames(time_frame), START_TIME, END_TIME)
+                ]
+
+
+async def test_collect_concurrently_progress():
+    exchange_history = _ExchangeHistory()
+    async with history_collector_mocks(exchange_history), data_collector() as collector:
+        with removed_data_files(collector):
+            steps_percent = []
+            save_ohlcv = collector.save_ohlcv
+
+            async def _save_ohlcv(*args, **kwargs):
+                steps_percent.append(collector.current_step_percent)
+                await save_ohlcv(*args, **kwargs)
+
+            with mock.patch.object(collector, "save_ohlcv", _save_ohlcv):
+                await collector.start()
+            # progress is aggregated over concurrently collected steps
+            assert 0 < steps_percent[0] < steps_percent[-1] <= 100
+            assert steps_percent == sorted(steps_percent)
+            assert collector.current_step_percent == 100
+
+
+async def test_collect_columnar_ohlcv():
+    exchange_history = _ExchangeHistory(failing_request_index=7)
+    async with history_collector_mocks(exchange_history), \
+            data_collector(use_columnar_ohlcv=True) as interrupted_collector:
+        with removed_data_files(interrupted_collector):
+            with pytest.raises(errors.DataCollectorError):
+                await interrupted_collector.start()
+            exchange_history = _ExchangeHistory()
+            async with history_collector_mocks(exchange_history), \
+                    data_collector(use_columnar_ohlcv=True) as collector:
+                with removed_data_files(collector):
+                    assert collector.is_resumed is True
+                    await collector.start()
+                    # candles are only saved as columnar OHLCV
+                    assert not any((await _get_collected_candles(collector.file_path)).values())
+                    importer = generic_exchange_importer.GenericExchangeDataImporter({}, collector.file_path)
+                    await importer.initialize()
+                    try:
+                        for symbol in SYMBOLS:
+                            for time_frame in TIME_FRAMES:
+                                # no missing or duplicated candle
+                                assert [
+                                    candle[-1][commons_enums.PriceIndexes.IND_PRICE_TIME.value]
+                                    for candle in await importer.get_ohlcv(exchange_name=EXCHANGE, symbol=symbol,
+                                                                           time_frame=time_frame)
+                                ][::-1] == [
+                                    candle[0] for candle in _get_candles(time_frame, START_TIME, END_TIME)
+                                ]
+                    finally:
+                        await importer.stop()
+
+
+async def test_collect_current_market_data():
+    exchange_history = _ExchangeHistory()
+    async with history_collector_mocks(exchange_history), \
+            data_collector(start_timestamp=None, end_timestamp=None) as collector:
+        with removed_data_files(collector):
+            # unsupported data is ignored
+            collector_exchange = trading_api.create_exchange_builder().build.return_value.exchange
+            collector_exchange.get_order_book.side_effect = [trading_errors.NotSupported("order book"),
+                                                             collector_exchange.get_order_book.return_value]
+            await collector.start()
+            importer = generic_exchange_importer.GenericExchangeDataImporter({}, collector.file_path)
+            await importer.initialize()
+            try:
+                assert sorted(table.value for table in importer.available_data_types) == [
+                    enums.ExchangeDataTables.KLINE.value, enums.ExchangeDataTables.OHLCV.value,
+                    enums.ExchangeDataTables.ORDER_BOOK.value, enums.ExchangeDataTables.RECENT_TRADES.value,
+                    enums.ExchangeDataTables.TICKER.value,
+                ]
+                tickers = await importer.get_ticker(symbol=SYMBOLS[1])
+                assert [(ticker[0], ticker[-1]["close"]) for ticker in tickers] == [(CURRENT_TIME, 1.5)]
+                assert await importer.get_order_book(symbol=SYMBOLS[0]) == []
+                assert await importer.get_order_book(symbol=SYMBOLS[1]) == [
+                    [CURRENT_TIME - 1, EXCHANGE, "BTC", SYMBOLS[1], [[1.6, 2], [1.7, 1]], [[1.4, 3]]]
+                ]
+                recent_trades = await importer.get_recent_trades(symbol=SYMBOLS[1])
+                assert [(trades[0], [trade["price"] for trade in trades[-1]]) for trades in recent_trades] == [
+                    (CURRENT_TIME - 1, [1.5, 1.55])
+                ]
+                klines = await importer.get_kline(symbol=SYMBOLS[0], time_frame=TIME_FRAMES[1])
+                assert [(kline[0], kline[-1]) for kline in klines] == [
+                    (CURRENT_TIME, [CURRENT_TIME - 60, 1, 2, 0.5, 1.5, 10])
+                ]
+            finally:
+                await importer.stop()
+
+
+async def test_resume_interrupted_collection():
+    exchange_history = _ExchangeHistory(failing_request_index=7)
+    async with history_collector_mocks(exchange_history), data_collector() as interrupted_collector:
+        with removed_data_files(interrupted_collector):
+            with pytest.raises(errors.DataCollectorError):
+                await interrupted_collector.start()
+            # collected data is kept
+            assert not os.path.isfile(interrupted_collector.file_path)
+            assert os.path.isfile(interrupted_collector.temp_file_path)
+            interrupted_candles = await _get_collected_candles(interrupted_collector.temp_file_path)
+            assert 0 < sum(len(candles) for candles in interrupted_candles.values())
+
+            exchange_history = _ExchangeHistory()
+            async with history_collector_mocks(exchange_history), data_collector() as collector:
+                with removed_data_files(collector):
+                    assert collector.is_resumed is True
+                    assert collector.temp_file_path == interrupted_collector.temp_file_path
+                    await collector.start()
+                    assert not os.path.isfile(collector.temp_file_path)
+                    # collection restarted from the last persisted candle of each symbol and time frame
+                    for (symbol, time_frame), candles_times in interrupted_candles.items():
+                        if candles_times:
+                            assert exchange_history.start_times[(symbol, commons_enums.TimeFrames(time_frame))] \
+                                == candles_times[-1] * 1000 + 1
+                    collected_candles = await _get_collected_candles(collector.file_path)
+                    for (symbol, time_frame), candles_times in collected_candles.items():
+                        # no missing or duplicated candle
+                        assert candles_times == [
+                            candle[0]
+                            for candle in _get_candles(commons_enums.TimeFrames(time_frame), START_TIME, END_TIME)
+                        ]
+                    async with databases.new_sqlite_database(collector.file_path) as database:
+                        assert len(await database.select(enums.DataTables.DESCRIPTION)) == 1
+                        assert len(await database.select(history_collector.HistoryCollectorTables.CHECKPOINT)) == 1
+
+
+async def test_stopped_collection_is_not_resumed():
+    exchange_history = _ExchangeHistory()
+    async with history_collector_mocks(exchange_history), data_collector() as collector:
+        with removed_data_files(collector):
+            async def stop_and_fail(*_):
+                await collector.stop(should_stop_database=False)
+                # requests fail on stopped exchanges
+                raise RuntimeError("stopped exchange")
+
+            with mock.patch.object(collector, "get_kline_history", mock.AsyncMock(side_effect=stop_and_fail)):
+                await collector.start()
+            assert not os.path.isfile(collector.temp_file_path)
+            assert not os.path.isfile(collector.file_path)
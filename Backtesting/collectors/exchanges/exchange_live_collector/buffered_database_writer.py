@@ -0,0 +1,180 @@
+#  Drakkar-Software OctoBot
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import contextlib
+import time
+import typing
+
+import octobot_commons.logging as commons_logging
+
+
+class BufferedDatabaseWriter:
+    """
+    Accumulates rows by table and inserts the rows of a table in a single transaction when max_buffered_rows rows
+    are waiting or every flush_interval seconds.
+    Rows of tables in table_writers are saved by calling their writer with the buffered timestamps and values by
+    column instead.
+    When saving fails, rows are kept and saving is retried after an exponential backoff delay. The oldest rows are
+    dropped when more than max_kept_rows rows are waiting to be saved.
+    """
+    MAX_RETRY_DELAY = 5 * 60
+    DEFAULT_MAX_KEPT_ROWS_MULTIPLIER = 100
+
+    def __init__(self, database, max_buffered_rows: int, flush_interval: float, table_writers: dict = None,
+                 max_kept_rows: int = None):
+        self.database = database
+        self.max_buffered_rows: int = max_buffered_rows
+        self.flush_interval: float = flush_interval
+        self.table_writers: dict = table_writers or {}
+        self.max_kept_rows: int = max_kept_rows or max_buffered_rows * self.DEFAULT_MAX_KEPT_ROWS_MULTIPLIER
+        if self.max_kept_rows < self.max_buffered_rows:
+            raise ValueError(
+                f"max_kept_rows ({self.max_kept_rows}) can't be lower than max_buffered_rows ({self.max_buffered_rows})"
+            )
+        self.logger = commons_logging.get_logger(self.__class__.__name__)
+        # (timestamps, values by column) by table
+        self._rows_by_table: dict = {}
+        self._buffered_rows_count: int = 0
+        self._failed_flushes_count: int = 0
+        # time.monotonic() value before which saving is not retried after a failed flush
+        self._next_flush_retry_time: float = 0
+        self._dropped_rows_count: int = 0
+        self._flush_lock: asyncio.Lock = asyncio.Lock()
+        self._periodic_flush_task: typing.Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._periodic_flush_task is None or self._periodic_flush_task.done():
+            self._periodic_flush_task = asyncio.create_task(self._periodic_flush())
+
+    async def stop(self):
+        if self._periodic_flush_task is not None and not self._periodic_flush_task.done():
+            self._periodic_flush_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._periodic_flush_task
+        self._periodic_flush_task = None
+        await self.flush()
+
+    async def insert(self, table, timestamp, **kwargs):
+        """
+        Buffer a row, columns should always be given in the same order for a table
+        """
+        try:
+            timestamps, values_by_column = self._rows_by_table[table]
+        except KeyError:
+            timestamps, values_by_column = self._rows_by_table[table] = ([], {column: [] for column in kwargs})
+        timestamps.append(timestamp)
+        for column, value in kwargs.items():
+            values_by_column[column].append(value)
+        self._buffered_rows_count += 1
+        if self._buffered_rows_count >= self.max_buffered_rows:
+            if self._can_flush():
+                await self.flush()
+            elif self._buffered_rows_count > self.max_kept_rows:
+                # saving is failing: make room for the next max_buffered_rows rows at once
+                self._drop_oldest_rows(self._buffered_rows_count - self.max_kept_rows + self.max_buffered_rows)
+
+    def get_buffered_rows_count(self) -> int:
+        return self._buffered_rows_count
+
+    async def flush(self):
+        """
+        Save buffered rows. Rows of a table that could not be saved are buffered again to be saved on the next flush.
+        """
+        async with self._flush_lock:
+            rows_by_table = self._rows_by_table
+            # rows inserted while saving are buffered for the next flush
+            self._rows_by_table = {}
+            self._buffered_rows_count = 0
+            failed = False
+            for table, (timestamps, values_by_column) in rows_by_table.items():
+                try:
+                    if table in self.table_writers:
+                        await self.table_writers[table](timestamps, values_by_column)
+                    else:
+                        # one insert statement committed at once
+                        await self.database.insert_all(table, timestamp=timestamps, **values_by_column)
+                    self.logger.debug(f"Saved {len(timestamps)} {table.value} rows")
+                except Exception as err:
+                    failed = True
+                    message = f"Error when saving {len(timestamps)} {table.value} rows, " \
+                              f"they will be saved on the next flush: {err}"
+                    if self._failed_flushes_count:
+                        # already logged with its traceback
+                        self.logger.error(message)
+                    else:
+                        self.logger.exception(err, True, message)
+                    self._restore_rows(table, timestamps, values_by_column)
+            if failed:
+                self._on_failed_flush()
+            elif self._failed_flushes_count:
+                self.logger.info(f"Saving collected data succeeded after {self._failed_flushes_count} failed attempts")
+                self._failed_flushes_count = 0
+                self._next_flush_retry_time = 0
+                self._dropped_rows_count = 0
+            if self._buffered_rows_count > self.max_kept_rows:
+                self._drop_oldest_rows(self._buffered_rows_count - self.max_kept_rows)
+
+    def _can_flush(self) -> bool:
+        return time.monotonic() >= self._next_flush_retry_time
+
+    def _on_failed_flush(self):
+        self._failed_flushes_count += 1
+        retry_delay = min(self.flush_interval * 2 ** (self._failed_flushes_count - 1), self.MAX_RETRY_DELAY)
+        self._next_flush_retry_time = time.monotonic() + retry_delay
+        self.logger.error(f"Saving collected data will be retried in {retry_delay} seconds")
+
+    def _drop_oldest_rows(self, count):
+        if not self._dropped_rows_count:
+            # warn once until saving succeeds again
+            self.logger.warning(
+                f"Too many collected rows are waiting to be saved, dropping the oldest ones to keep at most "
+                f"{self.max_kept_rows} rows until saving succeeds again"
+            )
+        while count > 0 and self._rows_by_table:
+            # drop from the table with the most waiting rows
+            table = max(self._rows_by_table, key=lambda buffered_table: len(self._rows_by_table[buffered_table][0]))
+            timestamps, values_by_column = self._rows_by_table[table]
+            dropped_count = min(count, len(timestamps))
+            del timestamps[:dropped_count]
+            for values in values_by_column.values():
+                del values[:dropped_count]
+            if not timestamps:
+                self._rows_by_table.pop(table)
+            self._buffered_rows_count -= dropped_count
+            self._dropped_rows_count += dropped_count
+            count -= dropped_count
+
+    def _restore_rows(self, table, timestamps, values_by_column):
+        try:
+            buffered_timestamps, buffered_values_by_column = self._rows_by_table[table]
+        except KeyError:
+            self._rows_by_table[table] = (timestamps, values_by_column)
+        else:
+            # keep rows in insertion order
+            buffered_timestamps[:0] = timestamps
+            for column, values in values_by_column.items():
+                buffered_values_by_column[column][:0] = values
+        self._buffered_rows_count += len(timestamps)
+
+    async def _periodic_flush(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            if not self._can_flush():
+                continue
+            try:
+                await self.flush()
+            except Exception as err:
+                self.logger.exception(err, True, f"Error when saving collected data: {err}")
@@ -18,4 +18,7 @@
 from octobot_backtesting.collectors.exchanges.exchange_collector cimport ExchangeDataCollector
 
 cdef class ExchangeLiveDataCollector(ExchangeDataCollector):
-    pass
+    cdef public object exchange_manager
+    cdef public object buffered_writer
+    cdef public bint use_columnar_ohlcv
+    cdef public bint use_compact_market_data
@@ -14,12 +14,19 @@
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
 import asyncio
+import json
 import logging
 import time
 
 import octobot_backtesting.collectors.exchanges as exchanges
+import octobot_backtesting.enums as backtesting_enums
 import octobot_commons.channels_name as channels_name
+import octobot_commons.enums as commons_enums
 import tentacles.Backtesting.importers.exchanges.generic_exchange_importer as generic_exchange_importer
+import tentacles.Backtesting.importers.exchanges.generic_exchange_importer.columnar_ohlcv as columnar_ohlcv
+import tentacles.Backtesting.importers.exchanges.generic_exchange_importer.compact_market_data as compact_market_data
+import tentacles.Backtesting.collectors.exchanges.exchange_live_collector.buffered_database_writer as \
+    buffered_database_writer
 
 try:
     import octobot_trading.exchange_channel as exchange_channel
@@ -30,9 +37,45 @@ except ImportError:
 
 class ExchangeLiveDataCollector(exchanges.AbstractExchangeLiveCollector):
     IMPORTER = generic_exchange_importer.GenericExchangeDataImporter
+    # collected data is saved when this number of rows are waiting to be saved or every FLUSH_INTERVAL seconds
+    MAX_BUFFERED_ROWS = 500
+    FLUSH_INTERVAL = 5
+    # the oldest collected data is dropped when this number of rows are waiting to be saved because saving fails
+    MAX_KEPT_ROWS = 100000
+
+    def __init__(self, config, exchange_name, exchange_type, tentacles_setup_config, symbols, time_frames,
+                 use_all_available_timeframes=False,
+                 data_format=backtesting_enums.DataFormats.REGULAR_COLLECTOR_DATA,
+                 start_timestamp=None,
+                 end_timestamp=None,
+                 use_columnar_ohlcv=False,
+                 use_compact_market_data=False):
+        super().__init__(config, exchange_name, exchange_type, tentacles_setup_config, symbols, time_frames,
+                         use_all_available_timeframes, data_format=data_format,
+                         start_timestamp=start_timestamp, end_timestamp=end_timestamp)
+        self.exchange_manager = None
+        self.buffered_writer = None
+        # when True, candles are saved as columnar OHLCV chunks instead of OHLCV rows
+        self.use_columnar_ohlcv = use_columnar_ohlcv
+        # when True, order books are saved as deltas and recent trades as deduplicated tapes
+        self.use_compact_market_data = use_compact_market_data
+
+    async def initialize(self):
+        await super().initialize()
+        table_writers = {}
+        if self.use_columnar_ohlcv:
+            table_writers[backtesting_enums.ExchangeDataTables.OHLCV] = self._save_ohlcv_columns
+        if self.use_compact_market_data:
+            market_data_writer = compact_market_data.CompactMarketDataWriter(self.database)
+            table_writers[backtesting_enums.ExchangeDataTables.ORDER_BOOK] = market_data_writer.save_order_books
+            table_writers[backtesting_enums.ExchangeDataTables.RECENT_TRADES] = market_data_writer.save_recent_trades
+        self.buffered_writer = buffered_database_writer.BufferedDatabaseWriter(
+            self.database, self.MAX_BUFFERED_ROWS, self.FLUSH_INTERVAL, table_writers=table_writers,
+            max_kept_rows=self.MAX_KEPT_ROWS
+        )
 
     async def start(self):
-        exchange_manager = await trading_api.create_exchange_builder(self.config, self.exchange_name) \
+        self.exchange_manager = await trading_api.create_exchange_builder(self.config, self.exchange_name) \
             .is_simulated() \
             .is_rest_only() \
             .is_without_auth() \
@@ -46,7 +89,8 @@ class ExchangeLiveDataCollector(exchanges.AbstractExchangeLiveCollector):
         # create description
         await self._create_description()
 
-        exchange_id = exchange_manager.id
+        self.buffered_writer.start()
+        exchange_id = self.exchange_manager.id
         await exchange_channel.get_chan(channels_name.OctoBotTradingChannelsName.TICKER_CHANNEL.value,
                                         exchange_id).new_consumer(self.ticker_callback)
         await exchange_channel.get_chan(channels_name.OctoBotTradingChannelsName.RECENT_TRADES_CHANNEL.value,
@@ -60,36 +104,73 @@ class ExchangeLiveDataCollector(exchanges.AbstractExchangeLiveCollector):
 
         await asyncio.gather(*asyncio.all_tasks(asyncio.get_event_loop()))
 
+    async def stop(self, should_stop_database=True):
+        self.should_stop = True
+        if self.exchange_manager is not None:
+            await self.exchange_manager.stop()
+            self.exchange_manager = None
+        if self.buffered_writer is not None:
+            # save every collected data before closing the database
+            await self.buffered_writer.stop()
+        if should_stop_database:
+            await self.database.stop()
+            self.finalize_database()
+        self.in_progress = False
+        self.finished = True
+        return self.finished
+
     async def ticker_callback(self, exchange: str, exchange_id: str,
                               cryptocurrency: str, symbol: str, ticker):
-        self.logger.info(f"TICKER : CRYPTOCURRENCY = {cryptocurrency} || SYMBOL = {symbol} || TICKER = {ticker}")
-        await self.save_ticker(timestamp=time.time(), exchange=exchange,
-                               cryptocurrency=cryptocurrency, symbol=symbol, ticker=ticker)
+        self.logger.debug(f"TICKER : CRYPTOCURRENCY = {cryptocurrency} || SYMBOL = {symbol} || TICKER = {ticker}")
+        await self.buffered_writer.insert(backtesting_enums.ExchangeDataTables.TICKER, time.time(),
+                                          exchange_name=exchange, cryptocurrency=cryptocurrency,
+                                          symbol=symbol, recent_trades=json.dumps(ticker))
 
     async def order_book_callback(self, exchange: str, exchange_id: str,
                                   cryptocurrency: str, symbol: str, asks, bids):
-        self.logger.info(f"ORDERBOOK : CRYPTOCURRENCY = {cryptocurrency} || SYMBOL = {symbol} "
-                         f"|| ASKS = {asks} || BIDS = {bids}")
-        await self.save_order_book(timestamp=time.time(), exchange=exchange,
-                                   cryptocurrency=cryptocurrency, symbol=symbol, asks=asks, bids=bids)
+        self.logger.debug(f"ORDERBOOK : CRYPTOCURRENCY = {cryptocurrency} || SYMBOL = {symbol} "
+                          f"|| ASKS = {asks} || BIDS = {bids}")
+        await self.buffered_writer.insert(backtesting_enums.ExchangeDataTables.ORDER_BOOK, time.time(),
+                                          exchange_name=exchange, cryptocurrency=cryptocurrency, symbol=symbol,
+                                          asks=asks if self.use_compact_market_data else json.dumps(asks),
+                                          bids=bids if self.use_compact_market_data else json.dumps(bids))
 
     async def recent_trades_callback(self, exchange: str, exchange_id: str,
                                      cryptocurrency: str, symbol: str, recent_trades):
-        self.logger.info(f"RECENT TRADE : CRYPTOCURRENCY = {cryptocurrency} || SYMBOL = {symbol} "
-                         f"|| RECENT TRADE = {recent_trades}")
-        await self.save_recent_trades(timestamp=time.time(), exchange=exchange,
-                                      cryptocurrency=cryptocurrency, symbol=symbol, recent_trades=recent_trades)
+        self.logger.debug(f"RECENT TRADE : CRYPTOCURRENCY = {cryptocurrency} || SYMBOL = {symbol} "
+                          f"|| RECENT TRADE = {recent_trades}")
+        await self.buffered_writer.insert(backtesting_enums.ExchangeDataTables.RECENT_TRADES, time.time(),
+                                          exchange_name=exchange, cryptocurrency=cryptocurrency,
+                                          symbol=symbol,
+                                          recent_trades=recent_trades if self.use_compact_market_data
+                                          else json.dumps(recent_trades))
 
     async def ohlcv_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, candle):
-        self.logger.info(f"OHLCV : CRYPTOCURRENCY = {cryptocurrency} || SYMBOL = {symbol} "
-                         f"|| TIME FRAME = {time_frame} || CANDLE = {candle}")
-        await self.save_ohlcv(timestamp=time.time(), exchange=exchange,
-                              cryptocurrency=cryptocurrency, symbol=symbol, time_frame=time_frame, candle=candle)
+        self.logger.debug(f"OHLCV : CRYPTOCURRENCY = {cryptocurrency} || SYMBOL = {symbol} "
+                          f"|| TIME FRAME = {time_frame} || CANDLE = {candle}")
+        await self.buffered_writer.insert(backtesting_enums.ExchangeDataTables.OHLCV, time.time(),
+                                          exchange_name=exchange, cryptocurrency=cryptocurrency,
+                                          symbol=symbol, time_frame=time_frame.value,
+                                          candle=candle if self.use_columnar_ohlcv else json.dumps(candle))
+
+    async def _save_ohlcv_columns(self, timestamps, values_by_column):
+        # columnar candles timestamps are their closing time: receiving timestamps are not saved
+        candles_by_symbol_time_frame = {}
+        for exchange, cryptocurrency, symbol, time_frame, candle in zip(
+            values_by_column["exchange_name"], values_by_column["cryptocurrency"], values_by_column["symbol"],
+            values_by_column["time_frame"], values_by_column["candle"]
+        ):
+            candles_by_symbol_time_frame.setdefault((exchange, cryptocurrency, symbol, time_frame), []).append(candle)
+        for (exchange, cryptocurrency, symbol, time_frame), candles in candles_by_symbol_time_frame.items():
+            await columnar_ohlcv.save_ohlcv_columns(self.database, exchange, cryptocurrency, symbol,
+                                                    commons_enums.TimeFrames(time_frame), candles)
 
     async def kline_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, kline):
-        self.logger.info(f"KLINE : CRYPTOCURRENCY = {cryptocurrency} || SYMBOL = {symbol} "
-                         f"|| TIME FRAME = {time_frame} || KLINE = {kline}")
-        await self.save_kline(timestamp=time.time(), exchange=exchange,
-                              cryptocurrency=cryptocurrency, symbol=symbol, time_frame=time_frame, kline=kline)
+        self.logger.debug(f"KLINE : CRYPTOCURRENCY = {cryptocurrency} || SYMBOL = {symbol} "
+                          f"|| TIME FRAME = {time_frame} || KLINE = {kline}")
+        await self.buffered_writer.insert(backtesting_enums.ExchangeDataTables.KLINE, time.time(),
+                                          exchange_name=exchange, cryptocurrency=cryptocurrency,
+                                          symbol=symbol, time_frame=time_frame.value,
+                                          candle=json.dumps(kline))
@@ -0,0 +1,264 @@
+#  Drakkar-Software OctoBot
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import json
+import os
+import mock
+import pytest
+import pytest_asyncio
+
+import octobot_commons.databases as databases
+import octobot_backtesting.enums as enums
+import tentacles.Backtesting.collectors.exchanges.exchange_live_collector.buffered_database_writer as \
+    buffered_database_writer
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def database(tmp_path):
+    async with databases.new_sqlite_database(os.path.join(tmp_path, "live.data")) as sqlite_database:
+        yield sqlite_database
+
+
+async def _insert_ticker(writer, timestamp, symbol):
+    await writer.insert(enums.ExchangeDataTables.TICKER, timestamp, exchange_name="binance", cryptocurrency="BTC",
+                        symbol=symbol, recent_trades=json.dumps({"close": timestamp}))
+
+
+async def _insert_candle(writer, timestamp, symbol):
+    await writer.insert(enums.ExchangeDataTables.OHLCV, timestamp, exchange_name="binance", cryptocurrency="BTC",
+                        symbol=symbol, time_frame="1m", candle=json.dumps([timestamp, 1, 2, 0.5, 1.5, 10]))
+
+
+async def test_flush_when_max_buffered_rows_is_reached(database):
+    writer = buffered_database_writer.BufferedDatabaseWriter(database, 5, 100)
+    with mock.patch.object(database, "insert_all", mock.AsyncMock(wraps=database.insert_all)) as insert_all_mock:
+        for timestamp in range(3):
+            await _insert_ticker(writer, timestamp, "BTC/USDT")
+        await _insert_candle(writer, 10, "BTC/USDT")
+        assert writer.get_buffered_rows_count() == 4
+        insert_all_mock.assert_not_called()
+        await _insert_candle(writer, 11, "BTC/USDC")
+        # one insert per table
+        assert insert_all_mock.call_count == 2
+        assert writer.get_buffered_rows_count() == 0
+    tickers = await database.select(enums.ExchangeDataTables.TICKER, sort="ASC")
+    assert [(ticker[0], ticker[3], json.loads(ticker[4])) for ticker in tickers] == [
+        (timestamp, "BTC/USDT", {"close": timestamp}) for timestamp in range(3)
+    ]
+    candles = await database.select(enums.ExchangeDataTables.OHLCV, sort="ASC")
+    assert [(candle[3], json.loads(candle[5])[0]) for candle in candles] == [("BTC/USDT", 10), ("BTC/USDC", 11)]
+
+
+async def test_flush_with_table_writer(database):
+    saved_rows = []
+
+    async def save_ohlcv(timestamps, values_by_column):
+        saved_rows.append((timestamps, values_by_column))
+
+    writer = buffered_database_writer.BufferedDatabaseWriter(
+        database, 3, 100, table_writers={enums.ExchangeDataTables.OHLCV: save_ohlcv}
+    )
+    await _insert_candle(writer, 10, "BTC/USDT")
+    await _insert_candle(writer, 11, "BTC/USDC")
+    await _insert_ticker(writer, 1, "BTC/USDT")
+    assert writer.get_buffered_rows_count() == 0
+    # candles are given to their writer, other tables rows are inserted
+    assert len(saved_rows) == 1
+    timestamps, values_by_column = saved_rows[0]
+    assert timestamps == [10, 11]
+    assert values_by_column["symbol"] == ["BTC/USDT", "BTC/USDC"]
+    assert not await database.check_table_exists(enums.ExchangeDataTables.OHLCV)
+    assert len(await database.select(enums.ExchangeDataTables.TICKER)) == 1
+
+
+async def test_periodic_flush(database):
+    writer = buffered_database_writer.BufferedDatabaseWriter(database, 1000, 10)
+    sleep_calls = 0
+
+    async def _sleep(delay):
+        nonlocal sleep_calls
+        assert delay == 10
+        sleep_calls += 1
+        if sleep_calls == 1:
+            await _insert_ticker(writer, 1, "BTC/USDT")
+        elif sleep_calls == 2:
+            # flushed after the first sleep
+            assert writer.get_buffered_rows_count() == 0
+            assert len(await database.select(enums.ExchangeDataTables.TICKER)) == 1
+            await _insert_ticker(writer, 2, "BTC/USDT")
+            await _insert_ticker(writer, 3, "BTC/USDT")
+        else:
+            raise asyncio.CancelledError
+
+    with mock.patch.object(buffered_database_writer.asyncio, "sleep", mock.AsyncMock(side_effect=_sleep)):
+        with pytest.raises(asyncio.CancelledError):
+            await writer._periodic_flush()
+    assert sleep_calls == 3
+    assert writer.get_buffered_rows_count() == 0
+    assert len(await database.select(enums.ExchangeDataTables.TICKER)) == 3
+
+
+async def test_stop(database):
+    writer = buffered_database_writer.BufferedDatabaseWriter(database, 1000, 100)
+    writer.start()
+    periodic_flush_task = writer._periodic_flush_task
+    await _insert_ticker(writer, 1, "BTC/USDT")
+    assert writer.get_buffered_rows_count() == 1
+    # stopping saves buffered rows
+    await writer.stop()
+    assert periodic_flush_task.cancelled()
+    assert writer._periodic_flush_task is None
+    assert writer.get_buffered_rows_count() == 0
+    assert len(await database.select(enums.ExchangeDataTables.TICKER)) == 1
+
+
+async def test_flush_error_keeps_rows(database):
+    writer = buffered_database_writer.BufferedDatabaseWriter(database, 3, 100)
+    with mock.patch.object(database, "insert_all", mock.AsyncMock(side_effect=OSError)) as insert_all_mock, \
+            mock.patch.object(writer.logger, "exception", mock.Mock()) as exception_mock:
+        await _insert_ticker(writer, 1, "BTC/USDT")
+        await _insert_ticker(writer, 2, "BTC/USDT")
+        await _insert_candle(writer, 10, "BTC/USDT")
+        # both tables failed to be saved and are kept
+        assert insert_all_mock.call_count == 2
+        assert exception_mock.call_count == 2
+        assert writer.get_buffered_rows_count() == 3
+    # saving is retried after the retry delay
+    with mock.patch.object(buffered_database_writer.time, "monotonic",
+                           mock.Mock(return_value=writer._next_flush_retry_time)):
+        await _insert_ticker(writer, 3, "BTC/USDT")
+    assert writer.get_buffered_rows_count() == 0
+    tickers = await database.select(enums.ExchangeDataTables.TICKER, sort="ASC")
+    assert [ticker[0] for ticker in tickers] == [1, 2, 3]
+    assert len(await database.select(enums.ExchangeDataTables.OHLCV)) == 1
+
+
+async def test_flush_error_keeps_rows_inserted_while_saving_in_order(database):
+    saved_rows = []
+    inserted_during_flush = False
+
+    async def save_ohlcv(timestamps, values_by_column):
+        nonlocal inserted_during_flush
+        if not inserted_during_flush:
+            inserted_during_flush = True
+            await _insert_candle(writer, 12, "BTC/USDT")
+            raise OSError
+        saved_rows.append((list(timestamps), list(values_by_column["symbol"])))
+
+    writer = buffered_database_writer.BufferedDatabaseWriter(
+        database, 100, 100, table_writers={enums.ExchangeDataTables.OHLCV: save_ohlcv}
+    )
+    await _insert_candle(writer, 10, "BTC/USDT")
+    await _insert_candle(writer, 11, "BTC/USDC")
+    with mock.patch.object(writer.logger, "exception", mock.Mock()) as exception_mock:
+        await writer.flush()
+        exception_mock.assert_called_once()
+    assert writer.get_buffered_rows_count() == 3
+    await writer.flush()
+    assert saved_rows == [([10, 11, 12], ["BTC/USDT", "BTC/USDC", "BTC/USDT"])]
+    assert writer.get_buffered_rows_count() == 0
+
+
+async def test_flush_error_retry_backoff(database):
+    writer = buffered_database_writer.BufferedDatabaseWriter(database, 2, 10)
+    with mock.patch.object(buffered_database_writer.time, "monotonic", mock.Mock(return_value=1000)), \
+            mock.patch.object(database, "insert_all", mock.AsyncMock(side_effect=OSError)) as insert_all_mock, \
+            mock.patch.object(writer.logger, "exception", mock.Mock()) as exception_mock, \
+            mock.patch.object(writer.logger, "error", mock.Mock()) as error_mock:
+        await _insert_ticker(writer, 1, "BTC/USDT")
+        await _insert_ticker(writer, 2, "BTC/USDT")
+        insert_all_mock.assert_called_once()
+        exception_mock.assert_called_once()
+        assert writer._next_flush_retry_time == 1010
+        # in backoff delay: inserted rows are buffered without saving them
+        for timestamp in range(3, 10):
+            await _insert_ticker(writer, timestamp, "BTC/USDT")
+        insert_all_mock.assert_called_once()
+        assert writer.get_buffered_rows_count() == 9
+        # periodic flush also waits for the retry delay
+        assert writer._can_flush() is False
+        buffered_database_writer.time.monotonic.return_value = 1010
+        await _insert_ticker(writer, 10, "BTC/USDT")
+        assert insert_all_mock.call_count == 2
+        # traceback is only logged once
+        exception_mock.assert_called_once()
+        error_mock.assert_called()
+        # delay is doubled
+        assert writer._next_flush_retry_time == 1030
+        buffered_database_writer.time.monotonic.return_value = 10000
+        for _ in range(10):
+            await writer.flush()
+        assert writer._next_flush_retry_time == 10000 + writer.MAX_RETRY_DELAY
+    with mock.patch.object(buffered_database_writer.time, "monotonic", mock.Mock(return_value=20000)):
+        await _insert_ticker(writer, 11, "BTC/USDT")
+        assert writer.get_buffered_rows_count() == 0
+        assert writer._failed_flushes_count == 0
+        assert writer._can_flush() is True
+    tickers = await database.select(enums.ExchangeDataTables.TICKER, sort="ASC")
+    assert [ticker[0] for ticker in tickers] == list(range(1, 12))
+
+
+async def test_flush_error_drops_oldest_rows(database):
+    writer = buffered_database_writer.BufferedDatabaseWriter(database, 2, 10, max_kept_rows=5)
+    with mock.patch.object(buffered_database_writer.time, "monotonic", mock.Mock(return_value=1000)), \
+            mock.patch.object(database, "insert_all", mock.AsyncMock(side_effect=OSError)), \
+            mock.patch.object(writer.logger, "exception", mock.Mock()), \
+            mock.patch.object(writer.logger, "error", mock.Mock()), \
+            mock.patch.object(writer.logger, "warning", mock.Mock()) as warning_mock:
+        # saving fails when inserting the 2nd ticker
+        for timestamp in range(1, 6):
+            await _insert_ticker(writer, timestamp, "BTC/USDT")
+        assert writer.get_buffered_rows_count() == 5
+        warning_mock.assert_not_called()
+        await _insert_candle(writer, 10, "BTC/USDT")
+        # oldest rows of the biggest table are dropped to make room for max_buffered_rows rows
+        assert writer.get_buffered_rows_count() == 3
+        assert writer._rows_by_table[enums.ExchangeDataTables.TICKER][0] == [4, 5]
+        assert writer._rows_by_table[enums.ExchangeDataTables.TICKER][1]["symbol"] == ["BTC/USDT"] * 2
+        assert writer._rows_by_table[enums.ExchangeDataTables.OHLCV][0] == [10]
+        warning_mock.assert_called_once()
+        for timestamp in range(11, 14):
+            await _insert_candle(writer, timestamp, "BTC/USDT")
+        assert writer.get_buffered_rows_count() == 3
+        assert writer._rows_by_table[enums.ExchangeDataTables.TICKER][0] == [4, 5]
+        assert writer._rows_by_table[enums.ExchangeDataTables.OHLCV][0] == [13]
+        # a single warning
+        warning_mock.assert_called_once()
+        assert writer._dropped_rows_count == 6
+        # rows restored after a failed flush are also limited
+        await _insert_candle(writer, 14, "BTC/USDT")
+        writer.max_kept_rows = 3
+        await writer.flush()
+        assert writer.get_buffered_rows_count() == 3
+        assert writer._rows_by_table[enums.ExchangeDataTables.TICKER][0] == [5]
+        assert writer._rows_by_table[enums.ExchangeDataTables.OHLCV][0] == [13, 14]
+        warning_mock.assert_called_once()
+    await writer.flush()
+    assert writer._dropped_rows_count == 0
+    tickers = await database.select(enums.ExchangeDataTables.TICKER, sort="ASC")
+    assert [ticker[0] for ticker in tickers] == [5]
+    candles = await database.select(enums.ExchangeDataTables.OHLCV, sort="ASC")
+    assert [candle[0] for candle in candles] == [13, 14]
+
+
+def test_max_kept_rows():
+    assert buffered_database_writer.BufferedDatabaseWriter(None, 10, 1).max_kept_rows == 1000
+    assert buffered_database_writer.BufferedDatabaseWriter(None, 10, 1, max_kept_rows=10).max_kept_rows == 10
+    with pytest.raises(ValueError):
+        buffered_database_writer.BufferedDatabaseWriter(None, 10, 1, max_kept_rows=9)
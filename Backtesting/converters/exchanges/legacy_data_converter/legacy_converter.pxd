@@ -22,9 +22,10 @@ cdef class LegacyDataConverter(DataConverter):
     cdef str symbol
     cdef str time_data
     cdef list time_frames
-    cdef dict file_content
+    cdef public object columns_directory
+    cdef public dict candles_count_by_time_frame
     cdef DataBase database
 
-    cdef list _get_formatted_candles(self, object time_frame)
-    cdef dict _read_data_file(self)
-    cdef dict _read_data_file(self)
+    cdef list _get_formatted_candles(self, object columns, object integers_masks)
+    cdef dict _split_data_file(self)
+    cdef void _clear_columns(self)
@@ -13,11 +13,13 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
-import gzip
 import json
 import enum
 import os.path as path
 import datetime
+import tempfile
+import time
+import numpy as np
 
 import octobot_backtesting.collectors.exchanges as exchanges
 import octobot_backtesting.constants as backtesting_constants
@@ -28,6 +30,7 @@ import octobot_commons.databases as databases
 import octobot_commons.constants as commons_constants
 import octobot_commons.enums as commons_enums
 import octobot_commons.symbols.symbol_util as symbol_util
+import tentacles.Backtesting.converters.exchanges.legacy_data_converter.legacy_file_reader as legacy_file_reader
 
 
 class LegacyDataConverter(converters.DataConverter):
@@ -37,6 +40,9 @@ class LegacyDataConverter(converters.DataConverter):
     DATA_FILE_EXT = ".data"
     VERSION = "1.0"
     DATA_FILE_TIME_DATE_FORMAT = '%Y%m%d%H%M%S'
+    # candles converted and saved at once, each insert statement is cached by the sqlite connection: small chunks
+    # keep this cache small (about 13MB for 500k candles)
+    CANDLES_CHUNK_SIZE = 1000
 
     class PriceIndexes(enum.Enum):
         IND_PRICE_TIME = 0
@@ -52,28 +58,23 @@ class LegacyDataConverter(converters.DataConverter):
         self.symbol = ""
         self.time_data = ""
         self.time_frames = []
-        self.file_content = {}
+        # candles columns files directory, files are removed when it is cleaned up
+        self.columns_directory = None
+        self.candles_count_by_time_frame = {}
         self.database = None
-        self.converted_file = backtesting_data.get_backtesting_file_name(exchanges.AbstractExchangeHistoryCollector)
+        self.converted_file = backtesting_data.get_backtesting_file_name(exchanges.AbstractExchangeHistoryCollector,
+                                                                         time.time)
 
     async def can_convert(self, ) -> bool:
         self.exchange_name, self.symbol, self.time_data = LegacyDataConverter._interpret_file_name(self.file_to_convert)
         if None in (self.exchange_name, self.symbol, self.time_data):
             return False
-        self.file_content = self._read_data_file()
-        if not self.file_content:
-            return False
-        for time_frame, candles_data in self.file_content.items():
-            try:
-                # check time frame validity
-                time_frame = commons_enums.TimeFrames(time_frame)
-                # check candle data validity
-                if isinstance(candles_data, list) and len(candles_data) == 6:
-                    # check candle data non-emptiness
-                    if all(data for data in candles_data):
-                        self.time_frames.append(time_frame)
-            except ValueError:
-                pass
+        self.candles_count_by_time_frame = self._split_data_file()
+        self.time_frames = [
+            commons_enums.TimeFrames(time_frame) for time_frame in self.candles_count_by_time_frame
+        ]
+        if not self.time_frames:
+            self._clear_columns()
         return bool(self.time_frames)
 
     async def convert(self) -> bool:
@@ -91,6 +92,7 @@ class LegacyDataConverter(converters.DataConverter):
         finally:
             if self.database is not None:
                 await self.database.stop()
+            self._clear_columns()
 
     async def _create_description(self):
         time_object = datetime.datetime.strptime(self.time_data, self.DATA_FILE_TIME_DATE_FORMAT)
@@ -104,43 +106,52 @@ class LegacyDataConverter(converters.DataConverter):
     async def _convert_ohlcv(self, time_frame):
         # use time_frame_sec to add time to save the candle closing time
         time_frame_sec = commons_enums.TimeFramesMinutes[time_frame] * commons_constants.MINUTE_TO_SECONDS
-        candles = self._get_formatted_candles(time_frame)
-        await self.database.insert_all(backtesting_enums.ExchangeDataTables.OHLCV,
-                                       timestamp=[candle[0] + time_frame_sec for candle in candles],
-                                       exchange_name=self.exchange_name, symbol=self.symbol,
-                                       time_frame=time_frame.value, candle=[json.dumps(c) for c in candles])
+        time_index = LegacyDataConverter.PriceIndexes.IND_PRICE_TIME.value
+        for columns, integers_masks in legacy_file_reader.read_columns(
+            self.columns_directory.name, time_frame.value, len(LegacyDataConverter.PriceIndexes),
+            self.candles_count_by_time_frame[time_frame.value], self.CANDLES_CHUNK_SIZE
+        ):
+            candles = self._get_formatted_candles(columns, integers_masks)
+            if candles:
+                await self.database.insert_all(backtesting_enums.ExchangeDataTables.OHLCV,
+                                               timestamp=[candle[time_index] + time_frame_sec for candle in candles],
+                                               exchange_name=self.exchange_name, symbol=self.symbol,
+                                               time_frame=time_frame.value,
+                                               candle=[json.dumps(candle) for candle in candles])
 
-    def _get_formatted_candles(self, time_frame):
-        data = self.file_content[time_frame.value]
-        candles = []
-        for i in range(len(data[LegacyDataConverter.PriceIndexes.IND_PRICE_TIME.value])):
-            candles.insert(i, [None] * len(LegacyDataConverter.PriceIndexes))
-            candles[i][LegacyDataConverter.PriceIndexes.IND_PRICE_CLOSE.value] = \
-                data[LegacyDataConverter.PriceIndexes.IND_PRICE_CLOSE.value][i]
-            candles[i][LegacyDataConverter.PriceIndexes.IND_PRICE_OPEN.value] = \
-                data[LegacyDataConverter.PriceIndexes.IND_PRICE_OPEN.value][i]
-            candles[i][LegacyDataConverter.PriceIndexes.IND_PRICE_HIGH.value] = \
-                data[LegacyDataConverter.PriceIndexes.IND_PRICE_HIGH.value][i]
-            candles[i][LegacyDataConverter.PriceIndexes.IND_PRICE_LOW.value] = \
-                data[LegacyDataConverter.PriceIndexes.IND_PRICE_LOW.value][i]
-            candles[i][LegacyDataConverter.PriceIndexes.IND_PRICE_TIME.value] = \
-                data[LegacyDataConverter.PriceIndexes.IND_PRICE_TIME.value][i]
-            candles[i][LegacyDataConverter.PriceIndexes.IND_PRICE_VOL.value] = \
-                data[LegacyDataConverter.PriceIndexes.IND_PRICE_VOL.value][i]
-        return candles
+    def _get_formatted_candles(self, columns, integers_masks):
+        """
+        :param columns: legacy columns, ordered as PriceIndexes
+        :param integers_masks: masks of the columns values written as integers in the legacy file
+        :return: the candles, values keep their legacy type and null values are kept as None. Candles without
+        time are skipped.
+        """
+        values = columns.astype(object)
+        values[integers_masks] = columns[integers_masks].astype(np.int64).astype(object)
+        null_values = np.isnan(columns)
+        values[null_values] = None
+        time_index = LegacyDataConverter.PriceIndexes.IND_PRICE_TIME.value
+        timed_candles = ~null_values[time_index]
+        if not timed_candles.all():
+            self.logger.warning(f"Skipping {np.count_nonzero(~timed_candles)} {self.symbol} candles without time")
+            values = values[:, timed_candles]
+        return values.T.tolist()
 
-    def _read_data_file(self):
+    def _split_data_file(self):
+        self._clear_columns()
+        self.columns_directory = tempfile.TemporaryDirectory()
         try:
-            # try zipfile
-            with gzip.open(self.file_to_convert, 'r') as file_to_parse:
-                file_content = json.loads(file_to_parse.read())
-        except OSError:
-            # try without unzip
-            with open(self.file_to_convert) as file_to_parse:
-                file_content = json.loads(file_to_parse.read())
-        except Exception:
+            return legacy_file_reader.split_columns(
+                self.file_to_convert, self.columns_directory.name, len(LegacyDataConverter.PriceIndexes)
+            )
+        except Exception as e:
+            self.logger.debug(f"Impossible to read {self.file_to_convert} as a legacy data file: {e}")
             return {}
-        return file_content
+
+    def _clear_columns(self):
+        if self.columns_directory is not None:
+            self.columns_directory.cleanup()
+            self.columns_directory = None
 
     @staticmethod
     def _interpret_file_name(file_name):
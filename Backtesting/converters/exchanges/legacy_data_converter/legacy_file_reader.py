@@ -0,0 +1,227 @@
+#  Drakkar-Software OctoBot
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import gzip
+import json
+import os.path as path
+import re
+import numpy as np
+
+import octobot_commons.enums as commons_enums
+
+GZIP_MAGIC_NUMBER = b"\x1f\x8b"
+READ_SIZE = 1 << 18
+COLUMN_DTYPE = np.float64
+INTEGERS_MASK_DTYPE = np.bool_
+INTEGERS_MASK_FILE_SUFFIX = "_integers"
+JSON_NULL = "null"
+# characters of JSON numbers that are not integers, "n" is in null
+NON_INTEGER_CHARS = (".", "e", "E", "n")
+
+_WHITESPACE = re.compile(r"\s*")
+_DECODER = json.JSONDecoder()
+
+
+class _TextStream:
+    """
+    Reads a text file by chunks of read_size characters, only the not yet parsed part of the file is kept in memory
+    """
+
+    def __init__(self, text_file, read_size):
+        self._text_file = text_file
+        self._read_size = read_size
+        self.text = ""
+        self.position = 0
+        self.is_exhausted = False
+
+    def read_more(self) -> bool:
+        if self.is_exhausted:
+            return False
+        chunk = self._text_file.read(self._read_size)
+        if not chunk:
+            self.is_exhausted = True
+            return False
+        self.text = self.text[self.position:] + chunk
+        self.position = 0
+        return True
+
+    def next_char(self) -> str:
+        """
+        :return: the next non whitespace character without consuming it, "" at the end of the file
+        """
+        while True:
+            self.position = _WHITESPACE.match(self.text, self.position).end()
+            if self.position < len(self.text):
+                return self.text[self.position]
+            if not self.read_more():
+                return ""
+
+    def consume(self, expected_char):
+        if self.next_char() != expected_char:
+            raise ValueError(f"Expected '{expected_char}', got '{self.text[self.position:self.position + 20]}'")
+        self.position += 1
+
+    def read_value(self):
+        self.next_char()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, self.position)
+                # a value ending with the text might be truncated (ex: numbers)
+                if end < len(self.text) or self.is_exhausted:
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.is_exhausted:
+                    raise
+            self.read_more()
+
+    def read_numbers(self):
+        """
+        Yields the (numbers, integers mask) of the current array by chunks, the opening bracket should already be
+        consumed. null values are read as nan.
+        """
+        while True:
+            end = self.text.find("]", self.position)
+            if end == -1:
+                last_separator = self.text.rfind(",", self.position)
+                if last_separator != -1:
+                    yield _parse_numbers(self.text[self.position:last_separator])
+                    self.position = last_separator + 1
+                if not self.read_more():
+                    raise ValueError("Unexpected end of file")
+            else:
+                numbers = self.text[self.position:end]
+                self.position = end + 1
+                if numbers.strip():
+                    yield _parse_numbers(numbers)
+                return
+
+
+def _parse_numbers(numbers) -> (np.ndarray, np.ndarray):
+    """
+    :return: the parsed numbers and the mask of the numbers written as integers
+    """
+    values = numbers.split(",")
+    integers_mask = np.array(
+        [not any(char in value for char in NON_INTEGER_CHARS) for value in values], dtype=INTEGERS_MASK_DTYPE
+    )
+    if JSON_NULL in numbers:
+        values = [value.replace(JSON_NULL, "nan") for value in values]
+    return np.array(values, dtype=COLUMN_DTYPE), integers_mask
+
+
+def _open_data_file(file_path):
+    with open(file_path, "rb") as data_file:
+        is_gzip_file = data_file.read(len(GZIP_MAGIC_NUMBER)) == GZIP_MAGIC_NUMBER
+    return gzip.open(file_path, "rt") if is_gzip_file else open(file_path)
+
+
+def _is_time_frame(key) -> bool:
+    try:
+        commons_enums.TimeFrames(key)
+        return True
+    except ValueError:
+        return False
+
+
+def get_column_file_path(directory, time_frame_value, column_index) -> str:
+    return path.join(directory, f"{time_frame_value}_{column_index}")
+
+
+def get_integers_mask_file_path(directory, time_frame_value, column_index) -> str:
+    return f"{get_column_file_path(directory, time_frame_value, column_index)}{INTEGERS_MASK_FILE_SUFFIX}"
+
+
+def _split_time_frame_columns(stream, directory, time_frame_value, columns_count) -> int:
+    columns_lengths = []
+    stream.consume("[")
+    if stream.next_char() != "]":
+        while True:
+            stream.consume("[")
+            column_length = 0
+            column_index = len(columns_lengths)
+            with open(get_column_file_path(directory, time_frame_value, column_index), "wb") as column_file, \
+                    open(get_integers_mask_file_path(directory, time_frame_value, column_index), "wb") as mask_file:
+                for numbers, integers_mask in stream.read_numbers():
+                    numbers.tofile(column_file)
+                    integers_mask.tofile(mask_file)
+                    column_length += numbers.size
+            columns_lengths.append(column_length)
+            if stream.next_char() == "]":
+                break
+            stream.consume(",")
+    stream.consume("]")
+    if len(columns_lengths) == columns_count and columns_lengths[0] and len(set(columns_lengths)) == 1:
+        return columns_lengths[0]
+    return 0
+
+
+def split_columns(file_path, directory, columns_count, read_size=None) -> dict:
+    """
+    Incrementally parses a legacy {time_frame: [[column values], ...]} data file, gzipped or not, and writes each
+    column of each time frame into a binary file of directory: the whole file is never loaded in memory.
+    Values written as integers are recorded in a mask file next to each column file, null values are kept as nan.
+    Values of keys that are not time frames are ignored.
+    :return: the candles count by time frame value of the time frames with columns_count non-empty columns of the
+    same length
+    :raise ValueError: when the file is not a valid legacy data file
+    """
+    candles_count_by_time_frame = {}
+    with _open_data_file(file_path) as data_file:
+        stream = _TextStream(data_file, read_size or READ_SIZE)
+        stream.consume("{")
+        if stream.next_char() == "}":
+            return candles_count_by_time_frame
+        while True:
+            key = stream.read_value()
+            stream.consume(":")
+            if _is_time_frame(key) and stream.next_char() == "[":
+                candles_count = _split_time_frame_columns(stream, directory, key, columns_count)
+                if candles_count:
+                    candles_count_by_time_frame[key] = candles_count
+                else:
+                    candles_count_by_time_frame.pop(key, None)
+            else:
+                stream.read_value()
+            if stream.next_char() == "}":
+                return candles_count_by_time_frame
+            stream.consume(",")
+
+
+def _read_chunk(file_paths, dtype, start_index, count) -> np.ndarray:
+    return np.stack([
+        np.fromfile(file_path, dtype=dtype, count=count, offset=start_index * np.dtype(dtype).itemsize)
+        for file_path in file_paths
+    ])
+
+
+def read_columns(directory, time_frame_value, columns_count, candles_count, chunk_size):
+    """
+    Yields (columns_count, chunk size) arrays of the time frame columns written by split_columns and the
+    (columns_count, chunk size) masks of their values written as integers
+    """
+    columns_paths = [
+        get_column_file_path(directory, time_frame_value, column_index) for column_index in range(columns_count)
+    ]
+    masks_paths = [
+        get_integers_mask_file_path(directory, time_frame_value, column_index)
+        for column_index in range(columns_count)
+    ]
+    for start_index in range(0, candles_count, chunk_size):
+        count = min(chunk_size, candles_count - start_index)
+        yield (
+            _read_chunk(columns_paths, COLUMN_DTYPE, start_index, count),
+            _read_chunk(masks_paths, INTEGERS_MASK_DTYPE, start_index, count),
+        )
@@ -0,0 +1,119 @@
+#  Drakkar-Software OctoBot
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+"""
+Compares in memory and streaming legacy data files conversion times and peak memory usage.
+Usage: python -m tentacles.Backtesting.converters.exchanges.legacy_data_converter.tests.benchmark_legacy_converter
+"""
+import asyncio
+import gzip
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+import mock
+
+import octobot_backtesting.constants as backtesting_constants
+import octobot_backtesting.enums as backtesting_enums
+import octobot_commons.databases as databases
+import octobot_commons.enums as commons_enums
+import tentacles.Backtesting.converters.exchanges.legacy_data_converter as legacy_data_converter
+
+CANDLES_COUNTS = (10000, 100000, 500000)
+TIME_FRAME = commons_enums.TimeFrames.ONE_MINUTE
+TIME_FRAME_SEC = 60
+START_TIME = 1519905600
+FILE_NAME = "binance_BTC_USDT_20180301_120000.data"
+
+
+def _write_legacy_file(directory, candles_count):
+    file_path = os.path.join(directory, FILE_NAME)
+    with gzip.open(file_path, "wt") as legacy_file:
+        json.dump({
+            TIME_FRAME.value: [
+                [START_TIME + i * TIME_FRAME_SEC for i in range(candles_count)],
+                [10000 + (i % 1000) * 0.25 for i in range(candles_count)],
+                [10010 + (i % 1000) * 0.25 for i in range(candles_count)],
+                [9990 + (i % 1000) * 0.25 for i in range(candles_count)],
+                [10005 + (i % 1000) * 0.25 for i in range(candles_count)],
+                [(i % 100) * 1.123 for i in range(candles_count)],
+            ]
+        }, legacy_file)
+    return file_path
+
+
+async def _convert_in_memory(file_path, converted_file_path):
+    # conversion loading the whole file and saving every candle at once
+    with gzip.open(file_path, "r") as file_to_parse:
+        data = json.loads(file_to_parse.read())[TIME_FRAME.value]
+    candles = []
+    for i in range(len(data[0])):
+        candles.insert(i, [None] * len(data))
+        for column_index, column in enumerate(data):
+            candles[i][column_index] = column[i]
+    async with databases.new_sqlite_database(converted_file_path) as database:
+        await database.insert_all(backtesting_enums.ExchangeDataTables.OHLCV,
+                                  timestamp=[candle[0] + TIME_FRAME_SEC for candle in candles],
+                                  exchange_name="binance", symbol="BTC/USDT",
+                                  time_frame=TIME_FRAME.value, candle=[json.dumps(c) for c in candles])
+
+
+async def _convert_streaming(file_path, directory):
+    converter = legacy_data_converter.LegacyDataConverter(file_path)
+    with mock.patch.object(backtesting_constants, "BACKTESTING_FILE_PATH", directory):
+        if not (await converter.can_convert() and await converter.convert()):
+            raise AssertionError(f"Failed to convert {file_path}")
+    return os.path.join(directory, converter.converted_file)
+
+
+async def _measure(coroutine) -> (float, int, object):
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    try:
+        result = await coroutine
+        return time.perf_counter() - start_time, tracemalloc.get_traced_memory()[1], result
+    finally:
+        tracemalloc.stop()
+
+
+async def _count_candles(converted_file_path):
+    async with databases.new_sqlite_database(converted_file_path) as database:
+        return len(await database.select(backtesting_enums.ExchangeDataTables.OHLCV,
+                                         size=databases.SQLiteDatabase.DEFAULT_SIZE))
+
+
+async def main():
+    print(f"{'candles':>8} | {'file (MB)':>9} | {'in memory (s)':>13} | {'streaming (s)':>13} | "
+          f"{'in memory peak (MB)':>19} | {'streaming peak (MB)':>19}")
+    for candles_count in CANDLES_COUNTS:
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = _write_legacy_file(directory, candles_count)
+            in_memory_time, in_memory_peak, _ = await _measure(
+                _convert_in_memory(file_path, os.path.join(directory, "in_memory.data"))
+            )
+            streaming_time, streaming_peak, converted_file_path = await _measure(
+                _convert_streaming(file_path, directory)
+            )
+            if await _count_candles(converted_file_path) != candles_count:
+                raise AssertionError(f"Missing converted candles for {candles_count} candles")
+            print(
+                f"{candles_count:>8} | {os.path.getsize(file_path) / 1e6:>9.2f} | {in_memory_time:>13.2f} | "
+                f"{streaming_time:>13.2f} | {in_memory_peak / 1e6:>19.1f} | {streaming_peak / 1e6:>19.1f}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,172 @@
+#  Drakkar-Software OctoBot
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import gzip
+import json
+import os
+import mock
+import pytest
+
+import octobot_backtesting.constants as backtesting_constants
+import octobot_backtesting.enums as backtesting_enums
+import octobot_commons.databases as databases
+import octobot_commons.enums as commons_enums
+import tentacles.Backtesting.converters.exchanges.legacy_data_converter as legacy_data_converter
+import tentacles.Backtesting.converters.exchanges.legacy_data_converter.legacy_file_reader as legacy_file_reader
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+FILE_NAME = "binance_BTC_USDT_20180301_120000.data"
+START_TIME = 1519905600
+
+
+def _get_legacy_candles(candles_count, time_frame_sec):
+    return [
+        [START_TIME + i * time_frame_sec for i in range(candles_count)],
+        [100 + i * 0.5 for i in range(candles_count)],
+        [101 + i * 0.5 for i in range(candles_count)],
+        [99 + i * 0.5 for i in range(candles_count)],
+        [100.25 + i * 0.5 for i in range(candles_count)],
+        [i * 1.1 for i in range(candles_count)],
+    ]
+
+
+def _write_legacy_file(directory, content, use_gzip):
+    file_path = os.path.join(directory, FILE_NAME)
+    with (gzip.open(file_path, "wt") if use_gzip else open(file_path, "w")) as legacy_file:
+        # legacy files are indented: whitespaces are also split by chunks
+        json.dump(content, legacy_file, indent=1)
+    return file_path
+
+
+async def _get_converted_candles(file_path, time_frame):
+    async with databases.new_sqlite_database(file_path) as database:
+        return [
+            (candle[0], candle[1], candle[2], candle[3], json.loads(candle[-1]))
+            for candle in await database.select(backtesting_enums.ExchangeDataTables.OHLCV,
+                                                time_frame=time_frame.value, sort="ASC")
+        ]
+
+
+@pytest.mark.parametrize("use_gzip", [True, False])
+async def test_convert(tmp_path, use_gzip):
+    content = {
+        commons_enums.TimeFrames.ONE_HOUR.value: _get_legacy_candles(2500, 3600),
+        commons_enums.TimeFrames.ONE_DAY.value: _get_legacy_candles(40, 86400),
+        # ignored values
+        "other": {"key": [1, 2, [3, "]"]]},
+        commons_enums.TimeFrames.FOUR_HOURS.value: [[], [], [], [], [], []],
+        commons_enums.TimeFrames.ONE_WEEK.value: _get_legacy_candles(10, 86400 * 7)[:5],
+    }
+    file_path = _write_legacy_file(tmp_path, content, use_gzip)
+    converter = legacy_data_converter.LegacyDataConverter(file_path)
+    with mock.patch.object(backtesting_constants, "BACKTESTING_FILE_PATH", str(tmp_path)), \
+         mock.patch.object(legacy_file_reader, "READ_SIZE", 1000), \
+         mock.patch.object(converter, "CANDLES_CHUNK_SIZE", 1000):
+        assert await converter.can_convert() is True
+        assert converter.time_frames == [commons_enums.TimeFrames.ONE_HOUR, commons_enums.TimeFrames.ONE_DAY]
+        columns_directory = converter.columns_directory.name
+        assert await converter.convert() is True
+    # temporary columns are removed
+    assert converter.columns_directory is None
+    assert not os.path.exists(columns_directory)
+    converted_file_path = os.path.join(tmp_path, converter.converted_file)
+    async with databases.new_sqlite_database(converted_file_path) as database:
+        description = (await database.select(backtesting_enums.DataTables.DESCRIPTION))[0]
+        assert description[2] == "binance"
+        assert json.loads(description[3]) == ["BTC/USDT"]
+        assert json.loads(description[4]) == ["1h", "1d"]
+    for time_frame, time_frame_sec in ((commons_enums.TimeFrames.ONE_HOUR, 3600),
+                                       (commons_enums.TimeFrames.ONE_DAY, 86400)):
+        legacy_candles = content[time_frame.value]
+        assert await _get_converted_candles(converted_file_path, time_frame) == [
+            (candle[0] + time_frame_sec, "binance", "BTC/USDT", time_frame.value, list(candle))
+            for candle in zip(*legacy_candles)
+        ]
+
+
+async def test_convert_by_chunks(tmp_path):
+    file_path = _write_legacy_file(
+        tmp_path, {commons_enums.TimeFrames.ONE_HOUR.value: _get_legacy_candles(2500, 3600)}, True
+    )
+    converter = legacy_data_converter.LegacyDataConverter(file_path)
+    with mock.patch.object(backtesting_constants, "BACKTESTING_FILE_PATH", str(tmp_path)), \
+         mock.patch.object(converter, "CANDLES_CHUNK_SIZE", 1000), \
+         mock.patch.object(databases.SQLiteDatabase, "insert_all", autospec=True,
+                           side_effect=databases.SQLiteDatabase.insert_all) as insert_all_mock:
+        assert await converter.can_convert() is True
+        assert await converter.convert() is True
+        # one insert per chunk
+        assert [
+            len(call.kwargs["timestamp"])
+            for call in insert_all_mock.call_args_list
+            if call.args[1] is backtesting_enums.ExchangeDataTables.OHLCV
+        ] == [1000, 1000, 500]
+    candles = await _get_converted_candles(os.path.join(tmp_path, converter.converted_file),
+                                           commons_enums.TimeFrames.ONE_HOUR)
+    assert len(candles) == 2500
+    assert all(type(candle[-1][0]) is int for candle in candles)
+
+
+async def test_convert_keeps_values_types_and_nulls(tmp_path):
+    content = {
+        commons_enums.TimeFrames.ONE_HOUR.value: [
+            [START_TIME, START_TIME + 3600.5, None, START_TIME + 3 * 3600],
+            [100, 100.0, 101, 1e2],
+            [101, None, 102, 102],
+            [99, 99.5, 100, 100],
+            [100, 100, 101, -1],
+            [None, 0, 12, 1.5],
+        ]
+    }
+    file_path = _write_legacy_file(tmp_path, content, False)
+    converter = legacy_data_converter.LegacyDataConverter(file_path)
+    with mock.patch.object(backtesting_constants, "BACKTESTING_FILE_PATH", str(tmp_path)):
+        assert await converter.can_convert() is True
+        assert await converter.convert() is True
+    candles = await _get_converted_candles(os.path.join(tmp_path, converter.converted_file),
+                                           commons_enums.TimeFrames.ONE_HOUR)
+    # candles without time are skipped
+    assert [candle[-1] for candle in candles] == [
+        [START_TIME, 100, 101, 99, 100, None],
+        [START_TIME + 3600.5, 100.0, None, 99.5, 100, 0],
+        [START_TIME + 3 * 3600, 100.0, 102, 100, -1, 1.5],
+    ]
+    assert [candle[0] for candle in candles] == [START_TIME + 3600, START_TIME + 7200.5, START_TIME + 4 * 3600]
+    assert [[type(value) for value in candle[-1]] for candle in candles] == [
+        [int, int, int, int, int, type(None)],
+        [float, float, type(None), float, int, int],
+        [int, float, int, int, int, float],
+    ]
+
+
+@pytest.mark.parametrize("content", [
+    "",
+    "not json",
+    "[1, 2]",
+    '{"1h": [[1, 2], [1, 2], [1, 2], [1, 2], [1, 2], [1, 2]]',
+    '{"1h": [1, 2, 3, 4, 5, 6]}',
+    '{"1h": [[1, 2], [1, 2], [1, 2], [1, 2], [1, 2]]}',
+    '{"1h": [[1, 2], [1, 2], [1, 2], [1, 2], [1, 2], [1]]}',
+    '{"other": [[1, 2], [1, 2], [1, 2], [1, 2], [1, 2], [1, 2]]}',
+])
+async def test_cannot_convert(tmp_path, content):
+    file_path = os.path.join(tmp_path, FILE_NAME)
+    with open(file_path, "w") as legacy_file:
+        legacy_file.write(content)
+    converter = legacy_data_converter.LegacyDataConverter(file_path)
+    assert await converter.can_convert() is False
+    assert converter.columns_directory is None
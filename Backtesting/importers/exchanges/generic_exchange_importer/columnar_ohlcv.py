@@ -0,0 +1,233 @@
+#  Drakkar-Software OctoBot-Backtesting
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+"""
+Columnar OHLCV storage: candles are saved by chunks of candles of the same symbol and time frame, each chunk being a
+single row holding the packed candles times (int64) followed by their open, high, low, close and volume (float64)
+columns. Chunks timestamps are the closing time of their first and last candles, as OHLCV rows timestamps.
+"""
+import enum
+import numpy as np
+
+import octobot_backtesting.enums as backtesting_enums
+import octobot_commons.constants as commons_constants
+import octobot_commons.databases as databases
+import octobot_commons.enums as commons_enums
+
+MAX_CANDLES_PER_ROW = 5000
+TIME_DTYPE = np.dtype(np.int64)
+VALUE_DTYPE = np.dtype(np.float64)
+# open, high, low, close, volume
+VALUES_COUNT = 5
+
+_SELECTED_COLUMNS = "exchange_name, cryptocurrency, symbol, time_frame, candles_count, candles"
+_OPERATIONS = {
+    commons_enums.DataBaseOperations.SUP.value: np.greater,
+    commons_enums.DataBaseOperations.INF.value: np.less,
+    commons_enums.DataBaseOperations.EQUALS.value: np.equal,
+    commons_enums.DataBaseOperations.INF_EQUALS.value: np.less_equal,
+    commons_enums.DataBaseOperations.SUP_EQUALS.value: np.greater_equal,
+}
+
+
+class ColumnarExchangeDataTables(enum.Enum):
+    OHLCV_COLUMNS = "ohlcv_columns"
+
+
+def get_time_frame_seconds(time_frame_value) -> int:
+    return commons_enums.TimeFramesMinutes[commons_enums.TimeFrames(time_frame_value)] * \
+        commons_constants.MINUTE_TO_SECONDS
+
+
+def pack_candles(candles) -> bytes:
+    """
+    :param candles: [time, open, high, low, close, volume] candles, None values are saved as NaN
+    """
+    candles_array = np.array(candles, dtype=VALUE_DTYPE).reshape(-1, VALUES_COUNT + 1)
+    times = candles_array[:, commons_enums.PriceIndexes.IND_PRICE_TIME.value].astype(TIME_DTYPE)
+    return times.tobytes() + np.ascontiguousarray(candles_array[:, 1:].T).tobytes()
+
+
+def unpack_candles(packed_candles, candles_count) -> (np.ndarray, np.ndarray):
+    """
+    :return: the candles times and their (candles_count, VALUES_COUNT) values
+    """
+    times = np.frombuffer(packed_candles, dtype=TIME_DTYPE, count=candles_count)
+    values = np.frombuffer(packed_candles, dtype=VALUE_DTYPE, count=candles_count * VALUES_COUNT,
+                           offset=candles_count * TIME_DTYPE.itemsize)
+    return times, values.reshape(VALUES_COUNT, candles_count).T
+
+
+def _to_candles(times, values) -> list:
+    candles = [[candle_time] + candle_values for candle_time, candle_values in zip(times.tolist(), values.tolist())]
+    if np.isnan(values).any():
+        for candle in candles:
+            candle[1:] = [None if value != value else value for value in candle[1:]]
+    return candles
+
+
+async def has_ohlcv_columns(database) -> bool:
+    return await database.check_table_exists(ColumnarExchangeDataTables.OHLCV_COLUMNS) \
+        and await database.check_table_not_empty(ColumnarExchangeDataTables.OHLCV_COLUMNS)
+
+
+async def _create_tables(database):
+    async with database.aio_cursor() as cursor:
+        await cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {ColumnarExchangeDataTables.OHLCV_COLUMNS.value} "
+            f"({databases.SQLiteDatabase.TIMESTAMP_COLUMN} datetime, exchange_name text, cryptocurrency text, "
+            f"symbol text, time_frame text, last_timestamp datetime, candles_count integer, candles blob)"
+        )
+        await cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS index_{ColumnarExchangeDataTables.OHLCV_COLUMNS.value}_symbol_time_frame "
+            f"ON {ColumnarExchangeDataTables.OHLCV_COLUMNS.value} "
+            f"(exchange_name, symbol, time_frame, {databases.SQLiteDatabase.TIMESTAMP_COLUMN})"
+        )
+        # data files description reads the OHLCV table: it should exist even when candles are columnar
+        await cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {backtesting_enums.ExchangeDataTables.OHLCV.value} "
+            f"({databases.SQLiteDatabase.TIMESTAMP_COLUMN} datetime, exchange_name text, cryptocurrency text, "
+            f"symbol text, time_frame text, candle)"
+        )
+    for table in (ColumnarExchangeDataTables.OHLCV_COLUMNS, backtesting_enums.ExchangeDataTables.OHLCV):
+        if table.value not in database.tables:
+            database.tables.append(table.value)
+
+
+async def save_ohlcv_columns(database, exchange_name, cryptocurrency, symbol, time_frame, candles):
+    """
+    Saves candles by chunks of at most MAX_CANDLES_PER_ROW candles in a single transaction
+    :param time_frame: the candles commons_enums.TimeFrames
+    """
+    if not candles:
+        return
+    if ColumnarExchangeDataTables.OHLCV_COLUMNS.value not in database.tables:
+        await _create_tables(database)
+    time_frame_sec = get_time_frame_seconds(time_frame.value)
+    rows = []
+    for start_index in range(0, len(candles), MAX_CANDLES_PER_ROW):
+        chunk = candles[start_index:start_index + MAX_CANDLES_PER_ROW]
+        packed_candles = pack_candles(chunk)
+        times = np.frombuffer(packed_candles, dtype=TIME_DTYPE, count=len(chunk))
+        rows.append((
+            int(times.min()) + time_frame_sec, exchange_name, cryptocurrency, symbol, time_frame.value,
+            int(times.max()) + time_frame_sec, len(chunk), packed_candles
+        ))
+    async with database.aio_cursor() as cursor:
+        await cursor.executemany(
+            f"INSERT INTO {ColumnarExchangeDataTables.OHLCV_COLUMNS.value} VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )
+    await database.connection.commit()
+
+
+def _get_where_clauses(exchange_name, symbol, time_frame, timestamps, operations) -> (str, list):
+    clauses = []
+    parameters = []
+    for key, value in (("exchange_name", exchange_name), ("symbol", symbol), ("time_frame", time_frame)):
+        if value is not None:
+            clauses.append(f"{key} = ?")
+            parameters.append(value)
+    for timestamp, operation in zip(timestamps or [], operations or []):
+        # select chunks that can contain matching candles
+        if operation in (commons_enums.DataBaseOperations.SUP.value,
+                         commons_enums.DataBaseOperations.SUP_EQUALS.value):
+            clauses.append(f"last_timestamp {operation} ?")
+            parameters.append(float(timestamp))
+        elif operation in (commons_enums.DataBaseOperations.INF.value,
+                           commons_enums.DataBaseOperations.INF_EQUALS.value):
+            clauses.append(f"{databases.SQLiteDatabase.TIMESTAMP_COLUMN} {operation} ?")
+            parameters.append(float(timestamp))
+        elif operation == commons_enums.DataBaseOperations.EQUALS.value:
+            clauses.append(f"{databases.SQLiteDatabase.TIMESTAMP_COLUMN} <= ? AND last_timestamp >= ?")
+            parameters += [float(timestamp), float(timestamp)]
+    return f"WHERE {' AND '.join(clauses)}" if clauses else "", parameters
+
+
+async def select_ohlcv_columns(database, exchange_name=None, symbol=None, time_frame=None,
+                               timestamps=None, operations=None, limit=databases.SQLiteDatabase.DEFAULT_SIZE) -> list:
+    """
+    Same as importers.import_ohlcvs(database.select_from_timestamp(ExchangeDataTables.OHLCV, ...)) on columnar data
+    :param time_frame: the time frame value, None values are not filtered
+    :param timestamps: candles closing times filtered using operations
+    :return: the [timestamp, exchange_name, cryptocurrency, symbol, time_frame, candle] rows, latest first
+    """
+    where_clauses, parameters = _get_where_clauses(exchange_name, symbol, time_frame, timestamps, operations)
+    async with database.aio_cursor() as cursor:
+        await cursor.execute(
+            f"SELECT {_SELECTED_COLUMNS} FROM {ColumnarExchangeDataTables.OHLCV_COLUMNS.value} {where_clauses}",
+            parameters
+        )
+        rows = await cursor.fetchall()
+    if not rows:
+        return []
+    chunks_metadata = []
+    chunk_indexes = []
+    all_times = []
+    all_values = []
+    for chunk_index, (chunk_exchange, chunk_crypto, chunk_symbol, chunk_time_frame, candles_count, packed_candles) \
+            in enumerate(rows):
+        times, values = unpack_candles(packed_candles, candles_count)
+        chunks_metadata.append((chunk_exchange, chunk_crypto, chunk_symbol, chunk_time_frame,
+                                get_time_frame_seconds(chunk_time_frame)))
+        chunk_indexes.append(np.full(candles_count, chunk_index))
+        all_times.append(times)
+        all_values.append(values)
+    chunk_indexes = np.concatenate(chunk_indexes)
+    times = np.concatenate(all_times)
+    values = np.concatenate(all_values)
+    close_times = times + np.array([metadata[-1] for metadata in chunks_metadata])[chunk_indexes]
+    selected = np.ones(len(times), dtype=bool)
+    for timestamp, operation in zip(timestamps or [], operations or []):
+        selected &= _OPERATIONS[operation](close_times, float(timestamp))
+    selected_indexes = np.flatnonzero(selected)
+    # latest first, as OHLCV default select order
+    selected_indexes = selected_indexes[np.argsort(-close_times[selected_indexes], kind="stable")]
+    if limit != databases.SQLiteDatabase.DEFAULT_SIZE:
+        selected_indexes = selected_indexes[:limit]
+    return [
+        [close_time, *chunks_metadata[chunk_index][:-1], candle]
+        for close_time, chunk_index, candle in zip(
+            close_times[selected_indexes].tolist(),
+            chunk_indexes[selected_indexes].tolist(),
+            _to_candles(times[selected_indexes], values[selected_indexes])
+        )
+    ]
+
+
+async def select_min_timestamps(database, time_frame=None) -> dict:
+    """
+    :return: the first candle timestamp by time frame value
+    """
+    where_clauses, parameters = _get_where_clauses(None, None, time_frame, None, None)
+    async with database.aio_cursor() as cursor:
+        await cursor.execute(
+            f"SELECT MIN({databases.SQLiteDatabase.TIMESTAMP_COLUMN}), time_frame "
+            f"FROM {ColumnarExchangeDataTables.OHLCV_COLUMNS.value} {where_clauses} GROUP BY time_frame",
+            parameters
+        )
+        return {time_frame_value: min_timestamp for min_timestamp, time_frame_value in await cursor.fetchall()}
+
+
+async def select_max_timestamp(database, exchange_name=None, symbol=None, time_frame=None):
+    """
+    :return: the last candle timestamp, None when there is no candle
+    """
+    where_clauses, parameters = _get_where_clauses(exchange_name, symbol, time_frame, None, None)
+    async with database.aio_cursor() as cursor:
+        await cursor.execute(
+            f"SELECT MAX(last_timestamp) FROM {ColumnarExchangeDataTables.OHLCV_COLUMNS.value} {where_clauses}",
+            parameters
+        )
+        return (await cursor.fetchone())[0]
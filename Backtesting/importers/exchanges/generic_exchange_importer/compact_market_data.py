@@ -0,0 +1,317 @@
+#  Drakkar-Software OctoBot-Backtesting
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+"""
+Compact append-only order books and recent trades storage:
+- order books are saved as the levels that changed since the previous order book of their symbol, a full snapshot
+being saved every ORDER_BOOK_SNAPSHOT_INTERVAL order books. Removed levels are saved with a 0 size.
+- recent trades are saved as tapes of the trades that were not in the previous tape of their symbol, each tape
+holding its trades values by column instead of trade dicts.
+"""
+import enum
+import json
+
+import octobot_backtesting.enums as backtesting_enums
+import octobot_commons.databases as databases
+import octobot_commons.enums as commons_enums
+
+ORDER_BOOK_SNAPSHOT_INTERVAL = 100
+LEVEL_PRICE_INDEX = 0
+LEVEL_SIZE_INDEX = 1
+TRADE_TIMESTAMP_KEY = "timestamp"
+
+_LOWER_BOUND_OPERATIONS = (
+    commons_enums.DataBaseOperations.SUP.value,
+    commons_enums.DataBaseOperations.SUP_EQUALS.value,
+    commons_enums.DataBaseOperations.EQUALS.value,
+)
+_UPPER_BOUND_OPERATIONS = (
+    commons_enums.DataBaseOperations.INF.value,
+    commons_enums.DataBaseOperations.INF_EQUALS.value,
+    commons_enums.DataBaseOperations.EQUALS.value,
+)
+_OPERATIONS = {
+    commons_enums.DataBaseOperations.SUP.value: lambda value, timestamp: value > timestamp,
+    commons_enums.DataBaseOperations.INF.value: lambda value, timestamp: value < timestamp,
+    commons_enums.DataBaseOperations.EQUALS.value: lambda value, timestamp: value == timestamp,
+    commons_enums.DataBaseOperations.INF_EQUALS.value: lambda value, timestamp: value <= timestamp,
+    commons_enums.DataBaseOperations.SUP_EQUALS.value: lambda value, timestamp: value >= timestamp,
+}
+
+
+class CompactExchangeDataTables(enum.Enum):
+    ORDER_BOOK_DELTAS = "order_book_deltas"
+    RECENT_TRADES_TAPES = "recent_trades_tapes"
+
+
+COMPACT_TABLES = {
+    backtesting_enums.ExchangeDataTables.ORDER_BOOK: CompactExchangeDataTables.ORDER_BOOK_DELTAS,
+    backtesting_enums.ExchangeDataTables.RECENT_TRADES: CompactExchangeDataTables.RECENT_TRADES_TAPES,
+}
+_TABLES_COLUMNS = {
+    CompactExchangeDataTables.ORDER_BOOK_DELTAS: "is_snapshot integer, asks text, bids text",
+    CompactExchangeDataTables.RECENT_TRADES_TAPES: "trades_count integer, recent_trades text",
+}
+
+
+def _get_levels_by_price(levels) -> dict:
+    return {level[LEVEL_PRICE_INDEX]: level for level in levels}
+
+
+def get_levels_delta(previous_levels_by_price, levels_by_price) -> list:
+    """
+    :return: the new and updated levels followed by the removed levels as [price, 0]
+    """
+    return [
+        level
+        for price, level in levels_by_price.items()
+        if previous_levels_by_price.get(price) != level
+    ] + [
+        [price, 0]
+        for price in previous_levels_by_price
+        if price not in levels_by_price
+    ]
+
+
+def apply_levels_delta(levels_by_price, levels_delta):
+    for level in levels_delta:
+        if level[LEVEL_SIZE_INDEX]:
+            levels_by_price[level[LEVEL_PRICE_INDEX]] = level
+        else:
+            levels_by_price.pop(level[LEVEL_PRICE_INDEX], None)
+
+
+def _sorted_levels(levels_by_price, reverse) -> list:
+    return [levels_by_price[price] for price in sorted(levels_by_price, reverse=reverse)]
+
+
+def encode_trades(trades) -> dict:
+    """
+    :return: the trades values by key when every trade has the same keys, the trades otherwise
+    """
+    keys = list(trades[0]) if trades else []
+    if any(list(trade) != keys for trade in trades):
+        return {"trades": trades}
+    return {"columns": {key: [trade[key] for trade in trades] for key in keys}}
+
+
+def decode_trades(encoded_trades) -> list:
+    if "trades" in encoded_trades:
+        return encoded_trades["trades"]
+    columns = encoded_trades["columns"]
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+async def has_data(database, compact_table) -> bool:
+    return await database.check_table_exists(compact_table) and await database.check_table_not_empty(compact_table)
+
+
+async def _create_table(database, compact_table):
+    async with database.aio_cursor() as cursor:
+        await cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {compact_table.value} "
+            f"({databases.SQLiteDatabase.TIMESTAMP_COLUMN} datetime, exchange_name text, cryptocurrency text, "
+            f"symbol text, {_TABLES_COLUMNS[compact_table]})"
+        )
+        await cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS index_{compact_table.value}_symbol "
+            f"ON {compact_table.value} (exchange_name, symbol, {databases.SQLiteDatabase.TIMESTAMP_COLUMN})"
+        )
+    database.tables.append(compact_table.value)
+
+
+async def _insert_rows(database, compact_table, rows):
+    if not rows:
+        return
+    if compact_table.value not in database.tables:
+        await _create_table(database, compact_table)
+    async with database.aio_cursor() as cursor:
+        await cursor.executemany(
+            f"INSERT INTO {compact_table.value} VALUES ({', '.join(['?'] * len(rows[0]))})", rows
+        )
+    await database.connection.commit()
+
+
+class CompactMarketDataWriter:
+    """
+    Appends order books and recent trades to their compact tables. The last saved order book and trades of each
+    symbol are kept to compute the next deltas: use a single writer per database.
+    """
+
+    def __init__(self, database):
+        self.database = database
+        # (asks by price, bids by price, order books saved since the last snapshot) by (exchange, symbol)
+        self._order_books: dict = {}
+        # (last trades timestamp, trades of this timestamp) by (exchange, symbol)
+        self._last_trades: dict = {}
+
+    async def save_order_books(self, timestamps, values_by_column):
+        """
+        :param values_by_column: exchange_name, cryptocurrency, symbol, asks and bids values of each order book
+        """
+        rows = []
+        for timestamp, exchange_name, cryptocurrency, symbol, asks, bids in zip(
+            timestamps, values_by_column["exchange_name"], values_by_column["cryptocurrency"],
+            values_by_column["symbol"], values_by_column["asks"], values_by_column["bids"]
+        ):
+            asks_by_price, bids_by_price = _get_levels_by_price(asks), _get_levels_by_price(bids)
+            previous_asks_by_price, previous_bids_by_price, deltas_count = \
+                self._order_books.get((exchange_name, symbol), (None, None, ORDER_BOOK_SNAPSHOT_INTERVAL))
+            is_snapshot = deltas_count >= ORDER_BOOK_SNAPSHOT_INTERVAL
+            if is_snapshot:
+                saved_asks, saved_bids = asks, bids
+                deltas_count = 0
+            else:
+                saved_asks = get_levels_delta(previous_asks_by_price, asks_by_price)
+                saved_bids = get_levels_delta(previous_bids_by_price, bids_by_price)
+            self._order_books[(exchange_name, symbol)] = (asks_by_price, bids_by_price, deltas_count + 1)
+            rows.append((timestamp, exchange_name, cryptocurrency, symbol, int(is_snapshot),
+                         json.dumps(saved_asks), json.dumps(saved_bids)))
+        await _insert_rows(self.database, CompactExchangeDataTables.ORDER_BOOK_DELTAS, rows)
+
+    async def save_recent_trades(self, timestamps, values_by_column):
+        """
+        Trades that were already saved in the previous tape of their symbol are skipped
+        :param values_by_column: exchange_name, cryptocurrency, symbol and recent_trades values of each tape
+        """
+        rows = []
+        for timestamp, exchange_name, cryptocurrency, symbol, trades in zip(
+            timestamps, values_by_column["exchange_name"], values_by_column["cryptocurrency"],
+            values_by_column["symbol"], values_by_column["recent_trades"]
+        ):
+            last_timestamp, last_trades = self._last_trades.get((exchange_name, symbol), (None, []))
+            if last_timestamp is not None:
+                trades = [
+                    trade
+                    for trade in trades
+                    if trade[TRADE_TIMESTAMP_KEY] > last_timestamp
+                    or (trade[TRADE_TIMESTAMP_KEY] == last_timestamp and trade not in last_trades)
+                ]
+            if not trades:
+                continue
+            new_last_timestamp = max(trade[TRADE_TIMESTAMP_KEY] for trade in trades)
+            if new_last_timestamp != last_timestamp:
+                last_trades = []
+            self._last_trades[(exchange_name, symbol)] = (
+                new_last_timestamp,
+                last_trades + [trade for trade in trades if trade[TRADE_TIMESTAMP_KEY] == new_last_timestamp]
+            )
+            rows.append((timestamp, exchange_name, cryptocurrency, symbol, len(trades),
+                         json.dumps(encode_trades(trades))))
+        await _insert_rows(self.database, CompactExchangeDataTables.RECENT_TRADES_TAPES, rows)
+
+
+def _get_where_clauses(exchange_name, symbol, timestamps=None, operations=None) -> (str, list):
+    clauses = []
+    parameters = []
+    for key, value in (("exchange_name", exchange_name), ("symbol", symbol)):
+        if value is not None:
+            clauses.append(f"{key} = ?")
+            parameters.append(value)
+    for timestamp, operation in zip(timestamps or [], operations or []):
+        clauses.append(f"{databases.SQLiteDatabase.TIMESTAMP_COLUMN} {operation} ?")
+        parameters.append(float(timestamp))
+    return " AND ".join(clauses), parameters
+
+
+def _where(clauses) -> str:
+    return f"WHERE {clauses}" if clauses else ""
+
+
+def _filter_sort_and_limit(rows, timestamps, operations, limit) -> list:
+    """
+    :return: rows matching timestamps operations, latest first, as select default order
+    """
+    for timestamp, operation in zip(timestamps or [], operations or []):
+        rows = [row for row in rows if _OPERATIONS[operation](row[0], float(timestamp))]
+    rows = sorted(rows, key=lambda row: row[0], reverse=True)
+    return rows if limit == databases.SQLiteDatabase.DEFAULT_SIZE else rows[:limit]
+
+
+async def select_order_books(database, exchange_name=None, symbol=None,
+                             timestamps=None, operations=None, limit=databases.SQLiteDatabase.DEFAULT_SIZE) -> list:
+    """
+    Same as importers.import_order_books(database.select_from_timestamp(ExchangeDataTables.ORDER_BOOK, ...)) on
+    order book deltas: each symbol order books are rebuilt from its last snapshot before the selected timestamps
+    :return: the [timestamp, exchange_name, cryptocurrency, symbol, asks, bids] rows, latest first
+    """
+    table = CompactExchangeDataTables.ORDER_BOOK_DELTAS.value
+    lower_bounds = [float(timestamp) for timestamp, operation in zip(timestamps or [], operations or [])
+                    if operation in _LOWER_BOUND_OPERATIONS]
+    upper_bounds = [float(timestamp) for timestamp, operation in zip(timestamps or [], operations or [])
+                    if operation in _UPPER_BOUND_OPERATIONS]
+    where_clauses, parameters = _get_where_clauses(exchange_name, symbol)
+    order_books = []
+    async with database.aio_cursor() as cursor:
+        await cursor.execute(f"SELECT DISTINCT exchange_name, symbol FROM {table} {_where(where_clauses)}",
+                             parameters)
+        for symbol_exchange_name, symbol_name in await cursor.fetchall():
+            symbol_clauses, symbol_parameters = _get_where_clauses(symbol_exchange_name, symbol_name)
+            first_row_id = 0
+            if lower_bounds:
+                await cursor.execute(
+                    f"SELECT MAX(rowid) FROM {table} WHERE {symbol_clauses} AND is_snapshot = 1 "
+                    f"AND {databases.SQLiteDatabase.TIMESTAMP_COLUMN} <= ?",
+                    symbol_parameters + [max(lower_bounds)]
+                )
+                first_row_id = (await cursor.fetchone())[0] or 0
+            upper_bound_clause = f"AND {databases.SQLiteDatabase.TIMESTAMP_COLUMN} <= ?" if upper_bounds else ""
+            await cursor.execute(
+                f"SELECT {databases.SQLiteDatabase.TIMESTAMP_COLUMN}, cryptocurrency, is_snapshot, asks, bids "
+                f"FROM {table} WHERE {symbol_clauses} AND rowid >= ? {upper_bound_clause} ORDER BY rowid",
+                symbol_parameters + [first_row_id] + ([min(upper_bounds)] if upper_bounds else [])
+            )
+            asks_by_price, bids_by_price = {}, {}
+            for timestamp, cryptocurrency, is_snapshot, asks, bids in await cursor.fetchall():
+                if is_snapshot:
+                    asks_by_price, bids_by_price = {}, {}
+                apply_levels_delta(asks_by_price, json.loads(asks))
+                apply_levels_delta(bids_by_price, json.loads(bids))
+                order_books.append([
+                    timestamp, symbol_exchange_name, cryptocurrency, symbol_name,
+                    _sorted_levels(asks_by_price, False), _sorted_levels(bids_by_price, True)
+                ])
+    return _filter_sort_and_limit(order_books, timestamps, operations, limit)
+
+
+async def select_recent_trades(database, exchange_name=None, symbol=None,
+                               timestamps=None, operations=None, limit=databases.SQLiteDatabase.DEFAULT_SIZE) -> list:
+    """
+    Same as importers.import_recent_trades(database.select_from_timestamp(ExchangeDataTables.RECENT_TRADES, ...))
+    on recent trades tapes
+    :return: the [timestamp, exchange_name, cryptocurrency, symbol, recent_trades] rows, latest first
+    """
+    where_clauses, parameters = _get_where_clauses(exchange_name, symbol, timestamps, operations)
+    limit_clause = "" if limit == databases.SQLiteDatabase.DEFAULT_SIZE else f"LIMIT {int(limit)}"
+    async with database.aio_cursor() as cursor:
+        await cursor.execute(
+            f"SELECT {databases.SQLiteDatabase.TIMESTAMP_COLUMN}, exchange_name, cryptocurrency, symbol, "
+            f"recent_trades FROM {CompactExchangeDataTables.RECENT_TRADES_TAPES.value} {_where(where_clauses)} "
+            f"ORDER BY {databases.SQLiteDatabase.TIMESTAMP_COLUMN} DESC {limit_clause}",
+            parameters
+        )
+        return [
+            [*row[:-1], decode_trades(json.loads(row[-1]))]
+            for row in await cursor.fetchall()
+        ]
+
+
+async def select_timestamp_interval(database, compact_table) -> (float, float):
+    async with database.aio_cursor() as cursor:
+        await cursor.execute(
+            f"SELECT MIN({databases.SQLiteDatabase.TIMESTAMP_COLUMN}), MAX({databases.SQLiteDatabase.TIMESTAMP_COLUMN}) "
+            f"FROM {compact_table.value}"
+        )
+        return await cursor.fetchone()
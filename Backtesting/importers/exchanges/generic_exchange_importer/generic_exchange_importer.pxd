@@ -17,4 +17,7 @@
 from octobot_backtesting.importers.exchanges.exchange_importer cimport ExchangeDataImporter
 
 cdef class GenericExchangeDataImporter(ExchangeDataImporter):
-    pass
\ No newline at end of file
+    cdef public bint has_ohlcv_rows
+    cdef public bint has_ohlcv_columns
+    cdef public list row_data_types
+    cdef public list compact_data_types
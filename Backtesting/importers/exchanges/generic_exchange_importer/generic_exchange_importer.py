@@ -13,8 +13,194 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import octobot_backtesting.enums as enums
+import octobot_backtesting.errors as errors
 import octobot_backtesting.importers as importers
+import octobot_commons.constants as common_constants
+import octobot_commons.databases as databases
+import octobot_commons.enums as common_enums
+import octobot_commons.errors as common_errors
+import tentacles.Backtesting.importers.exchanges.generic_exchange_importer.columnar_ohlcv as columnar_ohlcv
+import tentacles.Backtesting.importers.exchanges.generic_exchange_importer.compact_market_data as compact_market_data
 
 
 class GenericExchangeDataImporter(importers.ExchangeDataImporter):
-    pass
+    """
+    Reads OHLCV rows as well as columnar OHLCV chunks and order books and recent trades rows as well as their
+    compact tables, files without columnar or compact data are read as usual
+    """
+
+    def __init__(self, config, file_path):
+        super().__init__(config, file_path)
+        self.has_ohlcv_rows = False
+        self.has_ohlcv_columns = False
+        # data types saved as regular rows
+        self.row_data_types = []
+        # data types saved in compact_market_data tables
+        self.compact_data_types = []
+
+    async def _init_available_data_types(self):
+        await super()._init_available_data_types()
+        self.row_data_types = list(self.available_data_types)
+        self.has_ohlcv_rows = enums.ExchangeDataTables.OHLCV in self.row_data_types
+        self.has_ohlcv_columns = await columnar_ohlcv.has_ohlcv_columns(self.database)
+        self.compact_data_types = [
+            data_type
+            for data_type, compact_table in compact_market_data.COMPACT_TABLES.items()
+            if await compact_market_data.has_data(self.database, compact_table)
+        ]
+        for data_type in ([enums.ExchangeDataTables.OHLCV] if self.has_ohlcv_columns else []) + \
+                self.compact_data_types:
+            if data_type not in self.available_data_types:
+                self.available_data_types.append(data_type)
+
+    async def _get_rows(self, data_type, import_rows, exchange_name=None, symbol=None, time_frame=None,
+                        limit=databases.SQLiteDatabase.DEFAULT_SIZE, timestamps=None, operations=None) -> list:
+        # import_rows updates the selected rows in place: they can't be tuples
+        return import_rows([
+            list(row)
+            for row in await self._get_from_db(exchange_name, symbol, data_type, time_frame=time_frame, limit=limit,
+                                               timestamps=timestamps, operations=operations)
+        ])
+
+    async def _merge_with_rows(self, rows, data_type, import_rows, limit, **kwargs) -> list:
+        """
+        :return: rows merged with the data_type regular rows, latest first
+        """
+        if data_type not in self.row_data_types:
+            return rows
+        rows = sorted(rows + await self._get_rows(data_type, import_rows, limit=limit, **kwargs),
+                      key=lambda row: row[0], reverse=True)
+        return rows if limit == databases.SQLiteDatabase.DEFAULT_SIZE else rows[:limit]
+
+    async def get_ohlcv(self, exchange_name=None, symbol=None,
+                        time_frame=common_enums.TimeFrames.ONE_HOUR,
+                        limit=databases.SQLiteDatabase.DEFAULT_SIZE,
+                        timestamps=None,
+                        operations=None):
+        if not self.has_ohlcv_columns:
+            return await super().get_ohlcv(exchange_name=exchange_name, symbol=symbol, time_frame=time_frame,
+                                           limit=limit, timestamps=timestamps, operations=operations)
+        return await self._merge_with_rows(
+            await columnar_ohlcv.select_ohlcv_columns(
+                self.database, exchange_name=exchange_name, symbol=symbol,
+                time_frame=None if time_frame is None else time_frame.value,
+                timestamps=timestamps, operations=operations, limit=limit
+            ),
+            enums.ExchangeDataTables.OHLCV, importers.import_ohlcvs, limit,
+            exchange_name=exchange_name, symbol=symbol, time_frame=time_frame,
+            timestamps=timestamps, operations=operations
+        )
+
+    async def get_ticker(self, exchange_name=None, symbol=None,
+                         limit=databases.SQLiteDatabase.DEFAULT_SIZE,
+                         timestamps=None,
+                         operations=None):
+        return await self._get_rows(enums.ExchangeDataTables.TICKER, importers.import_tickers,
+                                    exchange_name=exchange_name, symbol=symbol, limit=limit,
+                                    timestamps=timestamps, operations=operations)
+
+    async def get_order_book(self, exchange_name=None, symbol=None,
+                             limit=databases.SQLiteDatabase.DEFAULT_SIZE,
+                             timestamps=None,
+                             operations=None):
+        if enums.ExchangeDataTables.ORDER_BOOK not in self.compact_data_types:
+            return await self._get_rows(enums.ExchangeDataTables.ORDER_BOOK, importers.import_order_books,
+                                        exchange_name=exchange_name, symbol=symbol, limit=limit,
+                                        timestamps=timestamps, operations=operations)
+        return await self._merge_with_rows(
+            await compact_market_data.select_order_books(
+                self.database, exchange_name=exchange_name, symbol=symbol,
+                timestamps=timestamps, operations=operations, limit=limit
+            ),
+            enums.ExchangeDataTables.ORDER_BOOK, importers.import_order_books, limit,
+            exchange_name=exchange_name, symbol=symbol, timestamps=timestamps, operations=operations
+        )
+
+    async def get_recent_trades(self, exchange_name=None, symbol=None,
+                                limit=databases.SQLiteDatabase.DEFAULT_SIZE,
+                                timestamps=None,
+                                operations=None):
+        if enums.ExchangeDataTables.RECENT_TRADES not in self.compact_data_types:
+            return await self._get_rows(enums.ExchangeDataTables.RECENT_TRADES, importers.import_recent_trades,
+                                        exchange_name=exchange_name, symbol=symbol, limit=limit,
+                                        timestamps=timestamps, operations=operations)
+        return await self._merge_with_rows(
+            await compact_market_data.select_recent_trades(
+                self.database, exchange_name=exchange_name, symbol=symbol,
+                timestamps=timestamps, operations=operations, limit=limit
+            ),
+            enums.ExchangeDataTables.RECENT_TRADES, importers.import_recent_trades, limit,
+            exchange_name=exchange_name, symbol=symbol, timestamps=timestamps, operations=operations
+        )
+
+    async def get_kline(self, exchange_name=None, symbol=None,
+                        time_frame=common_enums.TimeFrames.ONE_HOUR,
+                        limit=databases.SQLiteDatabase.DEFAULT_SIZE,
+                        timestamps=None,
+                        operations=None):
+        return await self._get_rows(enums.ExchangeDataTables.KLINE, importers.import_klines,
+                                    exchange_name=exchange_name, symbol=symbol, time_frame=time_frame, limit=limit,
+                                    timestamps=timestamps, operations=operations)
+
+    async def get_data_timestamp_interval(self, time_frame=None):
+        if not self.has_ohlcv_columns and not self.compact_data_types:
+            return await super().get_data_timestamp_interval(time_frame=time_frame)
+        minimum_timestamp: float = 0.0
+        maximum_timestamp: float = 0.0
+
+        for table in [enums.ExchangeDataTables.KLINE, enums.ExchangeDataTables.ORDER_BOOK,
+                      enums.ExchangeDataTables.RECENT_TRADES, enums.ExchangeDataTables.TICKER]:
+            if table in self.available_data_types:
+                try:
+                    min_timestamp, max_timestamp = await self._get_table_timestamp_interval(table)
+                    if not minimum_timestamp or minimum_timestamp > min_timestamp:
+                        minimum_timestamp = min_timestamp
+                    if not maximum_timestamp or maximum_timestamp < max_timestamp:
+                        maximum_timestamp = max_timestamp
+                except (IndexError, common_errors.DatabaseNotFoundError):
+                    pass
+
+        min_ohlcv_timestamp, max_ohlcv_timestamp = await self._get_ohlcv_timestamp_interval(time_frame)
+        if minimum_timestamp > 0 and maximum_timestamp > 0:
+            return max(minimum_timestamp, min_ohlcv_timestamp), max(maximum_timestamp, max_ohlcv_timestamp)
+        return min_ohlcv_timestamp, max_ohlcv_timestamp
+
+    async def _get_table_timestamp_interval(self, table):
+        intervals = []
+        if table in self.row_data_types:
+            intervals.append((
+                (await self.database.select_min(table, [databases.SQLiteDatabase.TIMESTAMP_COLUMN]))[0][0],
+                (await self.database.select_max(table, [databases.SQLiteDatabase.TIMESTAMP_COLUMN]))[0][0],
+            ))
+        if table in self.compact_data_types:
+            intervals.append(await compact_market_data.select_timestamp_interval(
+                self.database, compact_market_data.COMPACT_TABLES[table]
+            ))
+        return min(interval[0] for interval in intervals), max(interval[1] for interval in intervals)
+
+    async def _get_ohlcv_timestamp_interval(self, time_frame):
+        min_timestamps = {}
+        max_timestamps = []
+        if self.has_ohlcv_columns:
+            min_timestamps = await columnar_ohlcv.select_min_timestamps(self.database, time_frame=time_frame)
+            max_timestamps.append(await columnar_ohlcv.select_max_timestamp(self.database, time_frame=time_frame))
+        if self.has_ohlcv_rows:
+            ohlcv_kwargs = {"time_frame": time_frame} if time_frame else {}
+            for min_timestamp, time_frame_value in await self.database.select_min(
+                enums.ExchangeDataTables.OHLCV, [databases.SQLiteDatabase.TIMESTAMP_COLUMN],
+                [common_constants.CONFIG_TIME_FRAME], group_by=common_constants.CONFIG_TIME_FRAME, **ohlcv_kwargs
+            ):
+                min_timestamps[time_frame_value] = min(min_timestamp,
+                                                       min_timestamps.get(time_frame_value, min_timestamp))
+            max_timestamps.append((await self.database.select_max(
+                enums.ExchangeDataTables.OHLCV, [databases.SQLiteDatabase.TIMESTAMP_COLUMN], **ohlcv_kwargs
+            ))[0][0])
+        if not min_timestamps:
+            if time_frame and (self.has_ohlcv_rows or self.has_ohlcv_columns):
+                raise errors.MissingTimeFrame(f"Missing time frame in data file: {time_frame}")
+            return 0.0, 0.0
+        # if the required time frame is not included in this database, it is not in min_timestamps: ignore it
+        return max(min_timestamps.values()), max(
+            max_timestamp for max_timestamp in max_timestamps if max_timestamp is not None
+        )
@@ -0,0 +1,191 @@
+#  Drakkar-Software OctoBot-Backtesting
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import contextlib
+import json
+import os
+import mock
+import numpy as np
+import pytest
+
+import octobot_backtesting.enums as enums
+import octobot_backtesting.errors as errors
+import octobot_backtesting.importers as importers
+import octobot_commons.databases as databases
+import octobot_commons.enums as commons_enums
+import tentacles.Backtesting.importers.exchanges.generic_exchange_importer as generic_exchange_importer
+import tentacles.Backtesting.importers.exchanges.generic_exchange_importer.columnar_ohlcv as columnar_ohlcv
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+EXCHANGE = "binance"
+SYMBOLS = ["BTC/USDT", "ETH/USDT"]
+TIME_FRAMES = [commons_enums.TimeFrames.ONE_HOUR, commons_enums.TimeFrames.FOUR_HOURS]
+START_TIME = 1569412800
+CANDLES_COUNT = 50
+
+
+def _get_candles(symbol, time_frame, candles_count):
+    time_frame_sec = columnar_ohlcv.get_time_frame_seconds(time_frame.value)
+    symbol_index = SYMBOLS.index(symbol)
+    return [
+        [START_TIME + i * time_frame_sec, 100.5 + i + symbol_index, 102 + i, 99.25 + i, 101.125 + i, i * 1.1]
+        for i in range(candles_count)
+    ]
+
+
+async def _create_data_file(file_path, saved_ohlcv_columns, candles_count=CANDLES_COUNT):
+    """
+    :param saved_ohlcv_columns: return True when a candle should be saved as columnar OHLCV
+    """
+    async with databases.new_sqlite_database(file_path) as database:
+        await database.insert(enums.DataTables.DESCRIPTION, START_TIME, version="1.1", exchange=EXCHANGE,
+                              symbols=json.dumps(SYMBOLS),
+                              time_frames=json.dumps([time_frame.value for time_frame in TIME_FRAMES]),
+                              start_timestamp=START_TIME, end_timestamp=START_TIME + 3600 * 24 * 30)
+        for symbol in SYMBOLS:
+            for time_frame in TIME_FRAMES:
+                candles = _get_candles(symbol, time_frame, candles_count)
+                ohlcv_rows = [candle for candle in candles if not saved_ohlcv_columns(candle)]
+                if ohlcv_rows:
+                    time_frame_sec = columnar_ohlcv.get_time_frame_seconds(time_frame.value)
+                    await database.insert_all(enums.ExchangeDataTables.OHLCV,
+                                              timestamp=[candle[0] + time_frame_sec for candle in ohlcv_rows],
+                                              exchange_name=EXCHANGE, cryptocurrency=symbol.split("/")[0],
+                                              symbol=symbol, time_frame=time_frame.value,
+                                              candle=[json.dumps(candle) for candle in ohlcv_rows])
+                await columnar_ohlcv.save_ohlcv_columns(
+                    database, EXCHANGE, symbol.split("/")[0], symbol, time_frame,
+                    [candle for candle in candles if saved_ohlcv_columns(candle)]
+                )
+
+
+@contextlib.asynccontextmanager
+async def data_importers(tmp_path):
+    importer_by_storage = {}
+    try:
+        with mock.patch.object(columnar_ohlcv, "MAX_CANDLES_PER_ROW", 7):
+            for storage, saved_ohlcv_columns in (
+                ("rows", lambda _: False),
+                ("columns", lambda _: True),
+                ("mixed", lambda candle: candle[1] % 2 > 1),
+            ):
+                file_path = os.path.join(tmp_path, f"{storage}.data")
+                await _create_data_file(file_path, saved_ohlcv_columns)
+                importer_by_storage[storage] = generic_exchange_importer.GenericExchangeDataImporter({}, file_path)
+                await importer_by_storage[storage].initialize()
+        yield importer_by_storage
+    finally:
+        for importer in importer_by_storage.values():
+            await importer.stop()
+
+
+def test_pack_candles():
+    candles = [[START_TIME, 1.5, 2, 1, 1.75, None], [START_TIME + 60, 1.75, 2.5, 1.5, 2, 10.5]]
+    times, values = columnar_ohlcv.unpack_candles(columnar_ohlcv.pack_candles(candles), len(candles))
+    assert times.tolist() == [START_TIME, START_TIME + 60]
+    assert np.isnan(values[0][-1])
+    assert columnar_ohlcv._to_candles(times, values) == candles
+    assert all(type(candle[0]) is int for candle in columnar_ohlcv._to_candles(times, values))
+
+
+async def test_available_data_types(tmp_path):
+    async with data_importers(tmp_path) as importer_by_storage:
+        for storage, has_ohlcv_rows, has_ohlcv_columns in (
+            ("rows", True, False), ("columns", False, True), ("mixed", True, True)
+        ):
+            importer = importer_by_storage[storage]
+            assert importer.available_data_types == [enums.ExchangeDataTables.OHLCV]
+            assert importer.has_ohlcv_rows is has_ohlcv_rows
+            assert importer.has_ohlcv_columns is has_ohlcv_columns
+
+
+@pytest.mark.parametrize("get_ohlcv_kwargs", [
+    {},
+    {"exchange_name": EXCHANGE, "symbol": SYMBOLS[0], "time_frame": TIME_FRAMES[1]},
+    {"symbol": SYMBOLS[1], "time_frame": TIME_FRAMES[0], "limit": 12},
+    {"time_frame": None},
+    {"symbol": "XRP/USDT"},
+    {"symbol": SYMBOLS[0], "time_frame": TIME_FRAMES[0],
+     "timestamps": [str(START_TIME + 3600 * 40), str(START_TIME + 3600 * 10)],
+     "operations": [commons_enums.DataBaseOperations.INF_EQUALS.value,
+                    commons_enums.DataBaseOperations.SUP_EQUALS.value]},
+    {"symbol": SYMBOLS[0], "time_frame": TIME_FRAMES[0], "limit": 3,
+     "timestamps": [str(START_TIME + 3600 * 20)], "operations": [commons_enums.DataBaseOperations.SUP.value]},
+    {"symbol": SYMBOLS[0], "time_frame": TIME_FRAMES[0],
+     "timestamps": [str(START_TIME + 3600 * 20)], "operations": [commons_enums.DataBaseOperations.INF.value]},
+    {"symbol": SYMBOLS[0], "time_frame": TIME_FRAMES[1],
+     "timestamps": [str(START_TIME + 3600 * 4 * 21)], "operations": [commons_enums.DataBaseOperations.EQUALS.value]},
+])
+async def test_get_ohlcv(tmp_path, get_ohlcv_kwargs):
+    async with data_importers(tmp_path) as importer_by_storage:
+        expected_candles = await importer_by_storage["rows"].get_ohlcv(**get_ohlcv_kwargs)
+        if get_ohlcv_kwargs.get("symbol") != "XRP/USDT":
+            assert expected_candles
+        for storage in ("columns", "mixed"):
+            candles = await importer_by_storage[storage].get_ohlcv(**get_ohlcv_kwargs)
+            if get_ohlcv_kwargs.get("symbol") is None:
+                # candles of the same timestamp are not sorted the same way
+                assert sorted(candles) == sorted(expected_candles)
+            else:
+                assert candles == expected_candles
+
+
+async def test_get_ohlcv_from_timestamps(tmp_path):
+    async with data_importers(tmp_path) as importer_by_storage:
+        for superior_timestamp, inferior_timestamp in ((-1, -1), (START_TIME + 3600 * 30, START_TIME + 3600 * 5)):
+            expected_candles = await importer_by_storage["rows"].get_ohlcv_from_timestamps(
+                EXCHANGE, SYMBOLS[1], TIME_FRAMES[0],
+                inferior_timestamp=inferior_timestamp, superior_timestamp=superior_timestamp
+            )
+            assert expected_candles
+            for storage in ("columns", "mixed"):
+                assert await importer_by_storage[storage].get_ohlcv_from_timestamps(
+                    EXCHANGE, SYMBOLS[1], TIME_FRAMES[0],
+                    inferior_timestamp=inferior_timestamp, superior_timestamp=superior_timestamp
+                ) == expected_candles
+
+
+async def test_get_data_timestamp_interval(tmp_path):
+    async with data_importers(tmp_path) as importer_by_storage:
+        for time_frame in (None, TIME_FRAMES[0].value, TIME_FRAMES[1].value):
+            expected_interval = await importer_by_storage["rows"].get_data_timestamp_interval(time_frame)
+            for storage in ("columns", "mixed"):
+                assert await importer_by_storage[storage].get_data_timestamp_interval(time_frame) == \
+                    expected_interval
+        for storage in ("rows", "columns", "mixed"):
+            with pytest.raises(errors.MissingTimeFrame):
+                await importer_by_storage[storage].get_data_timestamp_interval(commons_enums.TimeFrames.ONE_DAY.value)
+
+
+async def test_columnar_ohlcv_storage_size(tmp_path):
+    async with data_importers(tmp_path) as importer_by_storage:
+        # empty OHLCV table is kept for data files descriptions
+        async with databases.new_sqlite_database(importer_by_storage["columns"].file_path) as database:
+            assert await database.check_table_exists(enums.ExchangeDataTables.OHLCV)
+            assert not await database.check_table_not_empty(enums.ExchangeDataTables.OHLCV)
+    for storage, saved_ohlcv_columns in (("large_rows", lambda _: False), ("large_columns", lambda _: True)):
+        await _create_data_file(os.path.join(tmp_path, f"{storage}.data"), saved_ohlcv_columns, candles_count=5000)
+    assert os.path.getsize(os.path.join(tmp_path, "large_columns.data")) < \
+        os.path.getsize(os.path.join(tmp_path, "large_rows.data")) / 2
+
+
+async def test_select_ohlcv_columns_without_table(tmp_path):
+    async with databases.new_sqlite_database(os.path.join(tmp_path, "empty.data")) as database:
+        assert await columnar_ohlcv.has_ohlcv_columns(database) is False
+        with pytest.raises(Exception):
+            await columnar_ohlcv.select_ohlcv_columns(database)
+    assert importers.import_ohlcvs([]) == []
@@ -0,0 +1,216 @@
+#  Drakkar-Software OctoBot-Backtesting
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import contextlib
+import json
+import os
+import random
+import mock
+import pytest
+
+import octobot_backtesting.enums as enums
+import octobot_commons.databases as databases
+import octobot_commons.enums as commons_enums
+import tentacles.Backtesting.importers.exchanges.generic_exchange_importer as generic_exchange_importer
+import tentacles.Backtesting.importers.exchanges.generic_exchange_importer.compact_market_data as \
+    compact_market_data
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+EXCHANGE = "binance"
+SYMBOLS = ["BTC/USDT", "ETH/USDT"]
+START_TIME = 1569412800
+UPDATES_COUNT = 30
+
+
+def _get_order_books(symbol, updates_count):
+    # random walk of the order book levels: most levels are unchanged from an order book to the next one
+    randomizer = random.Random(SYMBOLS.index(symbol))
+    asks = {100 + i * 0.5: [100 + i * 0.5, 1 + i] for i in range(20)}
+    bids = {99.5 - i * 0.5: [99.5 - i * 0.5, 1 + i] for i in range(20)}
+    order_books = []
+    for _ in range(updates_count):
+        for levels, side in ((asks, 1), (bids, -1)):
+            price = 99.75 + side * (0.25 + randomizer.randrange(25) * 0.5)
+            if price in levels and randomizer.random() < 0.3:
+                levels.pop(price)
+            else:
+                levels[price] = [price, round(randomizer.random() * 10, 4)]
+        order_books.append((sorted(asks.values()), sorted(bids.values(), reverse=True)))
+    return order_books
+
+
+def _get_recent_trades(symbol, updates_count):
+    # overlapping recent trades windows, as received when polling recent trades
+    trades = [
+        {"timestamp": START_TIME + i // 3, "symbol": symbol, "side": "buy" if i % 2 else "sell",
+         "price": 100 + i * 0.25, "amount": 0.1 * (i % 7 + 1), "cost": (100 + i * 0.25) * 0.1 * (i % 7 + 1)}
+        for i in range(updates_count * 5)
+    ]
+    return [trades[max(0, i * 5 - 10):i * 5 + 5] for i in range(updates_count)]
+
+
+async def _create_data_file(file_path, use_compact_market_data, updates_count=UPDATES_COUNT):
+    async with databases.new_sqlite_database(file_path) as database:
+        await database.insert(enums.DataTables.DESCRIPTION, START_TIME, version="1.1", exchange=EXCHANGE,
+                              symbols=json.dumps(SYMBOLS),
+                              time_frames=json.dumps([commons_enums.TimeFrames.ONE_MINUTE.value]),
+                              start_timestamp=0, end_timestamp=0)
+        await database.insert(enums.ExchangeDataTables.OHLCV, START_TIME, exchange_name=EXCHANGE,
+                              cryptocurrency="BTC", symbol=SYMBOLS[0],
+                              time_frame=commons_enums.TimeFrames.ONE_MINUTE.value,
+                              candle=json.dumps([START_TIME - 60, 1, 2, 0.5, 1.5, 10]))
+        writer = compact_market_data.CompactMarketDataWriter(database)
+        for symbol in SYMBOLS:
+            timestamps = [START_TIME + i * 10 for i in range(updates_count)]
+            values = {
+                "exchange_name": [EXCHANGE] * updates_count,
+                "cryptocurrency": [symbol.split("/")[0]] * updates_count,
+                "symbol": [symbol] * updates_count,
+            }
+            order_books = _get_order_books(symbol, updates_count)
+            recent_trades = _get_recent_trades(symbol, updates_count)
+            if use_compact_market_data:
+                await writer.save_order_books(timestamps, {
+                    **values, "asks": [asks for asks, _ in order_books], "bids": [bids for _, bids in order_books]
+                })
+                await writer.save_recent_trades(timestamps, {**values, "recent_trades": recent_trades})
+            else:
+                await database.insert_all(enums.ExchangeDataTables.ORDER_BOOK, timestamps, **values,
+                                          asks=[json.dumps(asks) for asks, _ in order_books],
+                                          bids=[json.dumps(bids) for _, bids in order_books])
+                # rows hold trades that were not in the previous row, as compact tapes
+                new_trades = [
+                    [trade for trade in trades if trade not in (recent_trades[i - 1] if i else [])]
+                    for i, trades in enumerate(recent_trades)
+                ]
+                await database.insert_all(enums.ExchangeDataTables.RECENT_TRADES, timestamps, **values,
+                                          recent_trades=[json.dumps(trades) for trades in new_trades])
+
+
+@contextlib.asynccontextmanager
+async def data_importers(tmp_path):
+    importer_by_storage = {}
+    try:
+        with mock.patch.object(compact_market_data, "ORDER_BOOK_SNAPSHOT_INTERVAL", 7):
+            for storage, use_compact_market_data in (("rows", False), ("compact", True)):
+                file_path = os.path.join(tmp_path, f"{storage}.data")
+                await _create_data_file(file_path, use_compact_market_data)
+                importer_by_storage[storage] = generic_exchange_importer.GenericExchangeDataImporter({}, file_path)
+                await importer_by_storage[storage].initialize()
+        yield importer_by_storage
+    finally:
+        for importer in importer_by_storage.values():
+            await importer.stop()
+
+
+def test_levels_delta():
+    previous_levels = {1: [1, 2], 2: [2, 3], 3: [3, 1]}
+    levels = {1: [1, 2], 2: [2, 4], 4: [4, 1]}
+    delta = compact_market_data.get_levels_delta(previous_levels, levels)
+    assert delta == [[2, 4], [4, 1], [3, 0]]
+    compact_market_data.apply_levels_delta(previous_levels, delta)
+    assert previous_levels == levels
+
+
+def test_encode_trades():
+    trades = _get_recent_trades(SYMBOLS[0], 3)[-1]
+    assert "columns" in compact_market_data.encode_trades(trades)
+    assert compact_market_data.decode_trades(json.loads(json.dumps(compact_market_data.encode_trades(trades)))) \
+        == trades
+    # trades with different keys are kept as is
+    trades = [{"price": 1}, {"price": 2, "amount": 1}]
+    assert compact_market_data.encode_trades(trades) == {"trades": trades}
+    assert compact_market_data.decode_trades(compact_market_data.encode_trades(trades)) == trades
+
+
+async def test_available_data_types(tmp_path):
+    async with data_importers(tmp_path) as importer_by_storage:
+        compact_importer = importer_by_storage["compact"]
+        assert compact_importer.compact_data_types == [enums.ExchangeDataTables.ORDER_BOOK,
+                                                       enums.ExchangeDataTables.RECENT_TRADES]
+        assert sorted(compact_importer.available_data_types, key=lambda table: table.value) == \
+            sorted(importer_by_storage["rows"].available_data_types, key=lambda table: table.value)
+        assert importer_by_storage["rows"].compact_data_types == []
+
+
+@pytest.mark.parametrize("get_kwargs", [
+    {},
+    {"exchange_name": EXCHANGE, "symbol": SYMBOLS[1]},
+    {"symbol": SYMBOLS[0], "limit": 4},
+    {"symbol": SYMBOLS[0], "timestamps": [str(START_TIME + 255), str(START_TIME + 95)],
+     "operations": [commons_enums.DataBaseOperations.INF_EQUALS.value,
+                    commons_enums.DataBaseOperations.SUP_EQUALS.value]},
+    {"symbol": SYMBOLS[1], "limit": 2, "timestamps": [str(START_TIME + 200)],
+     "operations": [commons_enums.DataBaseOperations.SUP.value]},
+    {"symbol": SYMBOLS[1], "timestamps": [str(START_TIME + 130)],
+     "operations": [commons_enums.DataBaseOperations.INF.value]},
+    {"symbol": SYMBOLS[0], "timestamps": [str(START_TIME + 150)],
+     "operations": [commons_enums.DataBaseOperations.EQUALS.value]},
+    {"symbol": "XRP/USDT"},
+])
+async def test_get_order_book_and_recent_trades(tmp_path, get_kwargs):
+    async with data_importers(tmp_path) as importer_by_storage:
+        for get_method in ("get_order_book", "get_recent_trades"):
+            expected_rows = await getattr(importer_by_storage["rows"], get_method)(**get_kwargs)
+            if get_kwargs.get("symbol") != "XRP/USDT":
+                assert expected_rows
+            rows = await getattr(importer_by_storage["compact"], get_method)(**get_kwargs)
+            if get_kwargs.get("symbol") is None:
+                # rows of the same timestamp are not sorted the same way
+                assert sorted(rows, key=json.dumps) == sorted(expected_rows, key=json.dumps)
+            else:
+                assert rows == expected_rows
+
+
+async def test_get_from_timestamps(tmp_path):
+    async with data_importers(tmp_path) as importer_by_storage:
+        for get_method in ("get_order_book_from_timestamps", "get_recent_trades_from_timestamps"):
+            for inferior_timestamp in (START_TIME, START_TIME + 100, START_TIME + 200):
+                expected_rows = await getattr(importer_by_storage["rows"], get_method)(
+                    EXCHANGE, SYMBOLS[0], inferior_timestamp=inferior_timestamp, limit=1
+                )
+                assert expected_rows
+                assert await getattr(importer_by_storage["compact"], get_method)(
+                    EXCHANGE, SYMBOLS[0], inferior_timestamp=inferior_timestamp, limit=1
+                ) == expected_rows
+
+
+async def test_get_data_timestamp_interval(tmp_path):
+    async with data_importers(tmp_path) as importer_by_storage:
+        assert await importer_by_storage["compact"].get_data_timestamp_interval() == \
+            await importer_by_storage["rows"].get_data_timestamp_interval()
+
+
+async def test_recent_trades_already_saved_are_skipped(tmp_path):
+    async with databases.new_sqlite_database(os.path.join(tmp_path, "trades.data")) as database:
+        writer = compact_market_data.CompactMarketDataWriter(database)
+        recent_trades = _get_recent_trades(SYMBOLS[0], 3)
+        values = {"exchange_name": [EXCHANGE], "cryptocurrency": ["BTC"], "symbol": [SYMBOLS[0]]}
+        for index, trades in enumerate(recent_trades + [recent_trades[-1]]):
+            await writer.save_recent_trades([START_TIME + index], {**values, "recent_trades": [trades]})
+        # the last tape has no new trade
+        tapes = await compact_market_data.select_recent_trades(database)
+        assert [tape[0] for tape in tapes] == [START_TIME + 2, START_TIME + 1, START_TIME]
+        assert [trade for tape in reversed(tapes) for trade in tape[-1]] == recent_trades[-1]
+
+
+async def test_compact_market_data_storage_size(tmp_path):
+    for storage, use_compact_market_data in (("large_rows", False), ("large_compact", True)):
+        await _create_data_file(os.path.join(tmp_path, f"{storage}.data"), use_compact_market_data,
+                                updates_count=1000)
+    assert os.path.getsize(os.path.join(tmp_path, "large_compact.data")) < \
+        os.path.getsize(os.path.join(tmp_path, "large_rows.data")) / 2
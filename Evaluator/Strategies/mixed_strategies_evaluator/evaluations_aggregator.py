@@ -0,0 +1,243 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import math
+
+import octobot_commons.constants as commons_constants
+import octobot_commons.evaluators_util as evaluators_util
+import octobot_evaluators.api as evaluators_api
+import octobot_evaluators.constants as evaluators_constants
+import octobot_evaluators.errors as errors
+import octobot_evaluators.matrix as matrix
+
+_SUM = 0
+_VALID_COUNT = 1
+_SET_COUNT = 2
+_UPDATES_COUNT = 3
+
+
+class SymbolEvaluations:
+    """
+    Running sums of the evaluations of a symbol by evaluator type and time frame: updating an evaluation is O(1)
+    and averaging the evaluations of a time frame does not require to walk the evaluation matrix.
+    Sums are recomputed from their time frame evaluations every MAX_UPDATES_BEFORE_SUM_RECOMPUTE updates and when
+    the evaluations are reset to avoid accumulating floating point errors.
+    """
+    MAX_UPDATES_BEFORE_SUM_RECOMPUTE = 1000
+
+    def __init__(self):
+        # (eval note, eval note type, valid value or None) by evaluator_name by (evaluator_type, time_frame)
+        self._evaluations: dict[tuple, dict[str, tuple]] = {}
+        # [valid evaluations sum, valid evaluations count, set evaluations count, updates count since the sum has
+        # been computed] by (evaluator_type, time_frame)
+        self._sums: dict[tuple, list] = {}
+
+    def set_evaluation(self, evaluator_type, time_frame, evaluator_name, eval_note, eval_note_type):
+        key = (evaluator_type, time_frame)
+        try:
+            evaluations = self._evaluations[key]
+            sums = self._sums[key]
+        except KeyError:
+            evaluations = self._evaluations[key] = {}
+            sums = self._sums[key] = [0.0, 0, 0, 0]
+        previous_eval_note, previous_eval_note_type, previous_value = evaluations.get(
+            evaluator_name, (None, None, None)
+        )
+        # as in the evaluation matrix, None values and types do not replace the current ones
+        if eval_note is None:
+            eval_note = previous_eval_note
+        if eval_note_type is None:
+            eval_note_type = previous_eval_note_type
+        value = float(eval_note) if evaluators_util.check_valid_eval_note(
+            eval_note, eval_type=eval_note_type, expected_eval_type=evaluators_constants.EVALUATOR_EVAL_DEFAULT_TYPE
+        ) else None
+        evaluations[evaluator_name] = (eval_note, eval_note_type, value)
+        if previous_value is not None:
+            sums[_SUM] -= previous_value
+            sums[_VALID_COUNT] -= 1
+        if value is not None:
+            sums[_SUM] += value
+            sums[_VALID_COUNT] += 1
+        sums[_SET_COUNT] += (eval_note is not None) - (previous_eval_note is not None)
+        sums[_UPDATES_COUNT] += 1
+        if sums[_UPDATES_COUNT] >= self.MAX_UPDATES_BEFORE_SUM_RECOMPUTE:
+            self.recompute_sum(evaluator_type, time_frame)
+
+    def recompute_sum(self, evaluator_type, time_frame):
+        """
+        Compute the sum of the valid evaluations of the given evaluator type and time frame from their values
+        """
+        key = (evaluator_type, time_frame)
+        if key in self._sums:
+            sums = self._sums[key]
+            sums[_SUM] = math.fsum(
+                value
+                for _, _, value in self._evaluations[key].values()
+                if value is not None
+            )
+            sums[_UPDATES_COUNT] = 0
+
+    def get_sum_and_count(self, evaluator_type, time_frame) -> (float, int):
+        """
+        :return: the sum and count of the valid evaluations of the given evaluator type and time frame
+        """
+        try:
+            sums = self._sums[(evaluator_type, time_frame)]
+            return sums[_SUM], sums[_VALID_COUNT]
+        except KeyError:
+            return 0.0, 0
+
+    def has_set_evaluations(self, evaluator_type, time_frames) -> bool:
+        """
+        :return: True when an evaluation of the given type and time frames is set, even if it is pending
+        """
+        return any(
+            self._sums[(evaluator_type, time_frame)][_SET_COUNT] > 0
+            for time_frame in time_frames
+            if (evaluator_type, time_frame) in self._sums
+        )
+
+    def get_unset_evaluator_name(self, evaluator_type, time_frames):
+        """
+        :return: the name and time frame of an evaluator of the given type and time frames that has never been set,
+        None when every evaluation is set
+        """
+        for time_frame in time_frames:
+            key = (evaluator_type, time_frame)
+            if key in self._sums and self._sums[key][_SET_COUNT] < len(self._evaluations[key]):
+                for evaluator_name, (eval_note, _, _) in self._evaluations[key].items():
+                    if eval_note is None:
+                        return evaluator_name, time_frame
+        return None
+
+
+class EvaluationsAggregator:
+    """
+    SymbolEvaluations of each symbol, fed by matrix callbacks. Symbols are initialized from the evaluation matrix
+    once their required evaluations are set.
+    Evaluations can be reset in the matrix without matrix notification (ex: TAEvaluator.reset_evaluation): reset
+    evaluations notified by reset_evaluations() are read again from the matrix until their evaluation cycle is
+    completed.
+    """
+
+    def __init__(self, evaluator_types: list):
+        self.evaluator_types: list = evaluator_types
+        self._evaluations_by_symbol: dict[tuple, SymbolEvaluations] = {}
+        # reset time frames by evaluator type by symbol
+        self._reset_time_frames_by_symbol: dict[tuple, dict[str, set]] = {}
+
+    def update(self, matrix_id, evaluator_name, evaluator_type, eval_note, eval_note_type,
+               exchange_name, cryptocurrency, symbol, time_frame):
+        try:
+            symbol_evaluations = self._evaluations_by_symbol[(matrix_id, exchange_name, cryptocurrency, symbol)]
+        except KeyError:
+            # not initialized yet: this evaluation will be read from the matrix upon initialization
+            return
+        if evaluator_type in self.evaluator_types:
+            symbol_evaluations.set_evaluation(evaluator_type, time_frame, evaluator_name, eval_note, eval_note_type)
+
+    def reset_evaluations(self, matrix_id, exchange_name, cryptocurrency, symbol, evaluator_type, time_frames):
+        """
+        Called when the evaluations of evaluator_type and time_frames are being reset in the matrix without
+        notification: they will be read from the matrix until complete_evaluation_cycle() is called
+        """
+        key = (matrix_id, exchange_name, cryptocurrency, symbol)
+        if evaluator_type in self.evaluator_types and key in self._evaluations_by_symbol:
+            reset_time_frames = self._reset_time_frames_by_symbol.setdefault(key, {})
+            reset_time_frames.setdefault(evaluator_type, set()).update(time_frames)
+
+    def complete_evaluation_cycle(self, matrix_id, exchange_name, cryptocurrency, symbol, evaluator_type):
+        """
+        Called when every evaluation of evaluator_type has been updated through matrix callbacks since
+        their last reset
+        """
+        key = (matrix_id, exchange_name, cryptocurrency, symbol)
+        if key in self._reset_time_frames_by_symbol:
+            self._reset_time_frames_by_symbol[key].pop(evaluator_type, None)
+            if not self._reset_time_frames_by_symbol[key]:
+                self._reset_time_frames_by_symbol.pop(key)
+
+    def get_symbol_evaluations(self, matrix_id, exchange_name, cryptocurrency, symbol,
+                               required_evaluator_type, required_time_frames) -> SymbolEvaluations:
+        """
+        :return: the SymbolEvaluations of the given symbol, initialized from the matrix on first call. Only reset
+        evaluations are read from the matrix on later calls.
+        :raise UnsetTentacleEvaluation: when an evaluation of required_evaluator_type for the required_time_frames
+        is not set
+        """
+        key = (matrix_id, exchange_name, cryptocurrency, symbol)
+        try:
+            symbol_evaluations = self._evaluations_by_symbol[key]
+        except KeyError:
+            symbol_evaluations = SymbolEvaluations()
+            self._read_evaluations(
+                symbol_evaluations, matrix_id, exchange_name, cryptocurrency, symbol,
+                required_evaluator_type, required_time_frames
+            )
+            self._evaluations_by_symbol[key] = symbol_evaluations
+            return symbol_evaluations
+        for evaluator_type, time_frames in self._reset_time_frames_by_symbol.get(key, {}).items():
+            required_type_time_frames = required_time_frames if evaluator_type == required_evaluator_type else []
+            for time_frame in time_frames:
+                self._read_time_frame_evaluations(
+                    symbol_evaluations, matrix_id, exchange_name, cryptocurrency, symbol,
+                    evaluator_type, time_frame, time_frame in required_type_time_frames
+                )
+                symbol_evaluations.recompute_sum(evaluator_type, time_frame)
+        unset_evaluation = symbol_evaluations.get_unset_evaluator_name(required_evaluator_type, required_time_frames)
+        if unset_evaluation is not None:
+            evaluator_name, time_frame = unset_evaluation
+            raise errors.UnsetTentacleEvaluation(
+                f"Missing {time_frame} for {evaluator_name} on {symbol}, evaluation is None)."
+            )
+        return symbol_evaluations
+
+    def clear(self):
+        self._evaluations_by_symbol.clear()
+        self._reset_time_frames_by_symbol.clear()
+
+    def _read_evaluations(self, symbol_evaluations, matrix_id, exchange_name, cryptocurrency, symbol,
+                          required_evaluator_type, required_time_frames):
+        for evaluator_type in self.evaluator_types:
+            required_type_time_frames = required_time_frames if evaluator_type == required_evaluator_type else []
+            time_frames = matrix.get_available_time_frames(
+                matrix_id, exchange_name, evaluator_type, cryptocurrency, symbol
+            )
+            time_frames = time_frames + [
+                time_frame for time_frame in required_type_time_frames if time_frame not in time_frames
+            ]
+            for time_frame in time_frames:
+                self._read_time_frame_evaluations(
+                    symbol_evaluations, matrix_id, exchange_name, cryptocurrency, symbol,
+                    evaluator_type, time_frame, time_frame in required_type_time_frames
+                )
+
+    @staticmethod
+    def _read_time_frame_evaluations(symbol_evaluations, matrix_id, exchange_name, cryptocurrency, symbol,
+                                     evaluator_type, time_frame, is_required):
+        for evaluator_name, evaluation in matrix.get_evaluations_by_evaluator(
+            matrix_id,
+            exchange_name,
+            evaluator_type,
+            cryptocurrency,
+            symbol,
+            time_frame,
+            allow_missing=not is_required,
+            allowed_values=[commons_constants.START_PENDING_EVAL_NOTE]
+        ).items():
+            symbol_evaluations.set_evaluation(
+                evaluator_type, time_frame, evaluator_name,
+                evaluators_api.get_value(evaluation), evaluators_api.get_type(evaluation)
+            )
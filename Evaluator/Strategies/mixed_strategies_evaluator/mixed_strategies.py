@@ -30,6 +30,8 @@ import octobot_tentacles_manager.api.configurator as tentacles_manager_api
 import octobot_tentacles_manager.configuration as tm_configuration
 import octobot_trading.api as trading_api
 
+import tentacles.Evaluator.Strategies.mixed_strategies_evaluator.evaluations_aggregator as evaluations_aggregator
+
 
 class SimpleStrategyEvaluator(evaluators.StrategyEvaluator):
     SOCIAL_EVALUATORS_NOTIFICATION_TIMEOUT_KEY = "social_evaluators_notification_timeout"
@@ -43,6 +45,9 @@ class SimpleStrategyEvaluator(evaluators.StrategyEvaluator):
         self.social_evaluators_default_timeout = None
         self.re_evaluate_TA_when_social_or_realtime_notification = True
         self.background_social_evaluators = []
+        self.evaluations_aggregator = evaluations_aggregator.EvaluationsAggregator(
+            [evaluators_enums.EvaluatorMatrixTypes.TA.value, evaluators_enums.EvaluatorMatrixTypes.REAL_TIME.value]
+        )
 
     def init_user_inputs(self, inputs: dict) -> None:
         """
@@ -95,6 +100,53 @@ class SimpleStrategyEvaluator(evaluators.StrategyEvaluator):
             cls.BACKGROUND_SOCIAL_EVALUATORS: [],
         }
 
+    async def strategy_matrix_callback(self,
+                                       matrix_id,
+                                       evaluator_name,
+                                       evaluator_type,
+                                       eval_note,
+                                       eval_note_type,
+                                       exchange_name,
+                                       cryptocurrency,
+                                       symbol,
+                                       time_frame):
+        # keep track of every evaluation, including the ones that won't wake up the strategy
+        self.evaluations_aggregator.update(matrix_id, evaluator_name, evaluator_type, eval_note, eval_note_type,
+                                           exchange_name, cryptocurrency, symbol, time_frame)
+        await super().strategy_matrix_callback(matrix_id,
+                                               evaluator_name,
+                                               evaluator_type,
+                                               eval_note,
+                                               eval_note_type,
+                                               exchange_name,
+                                               cryptocurrency,
+                                               symbol,
+                                               time_frame)
+
+    async def evaluators_callback(self,
+                                  matrix_id,
+                                  evaluator_name,
+                                  evaluator_type,
+                                  exchange_name,
+                                  cryptocurrency,
+                                  symbol,
+                                  time_frame,
+                                  data):
+        await super().evaluators_callback(matrix_id,
+                                          evaluator_name,
+                                          evaluator_type,
+                                          exchange_name,
+                                          cryptocurrency,
+                                          symbol,
+                                          time_frame,
+                                          data)
+        if data[evaluators_constants.EVALUATOR_CHANNEL_DATA_ACTION] == evaluators_constants.RESET_EVALUATION:
+            # technical evaluators are resetting their evaluation without matrix notification
+            self.evaluations_aggregator.reset_evaluations(
+                matrix_id, exchange_name, cryptocurrency, symbol, evaluators_enums.EvaluatorMatrixTypes.TA.value,
+                [time_frame.value for time_frame in data[evaluators_constants.EVALUATOR_CHANNEL_DATA_TIME_FRAMES]]
+            )
+
     async def matrix_callback(self,
                               matrix_id,
                               evaluator_name,
@@ -105,6 +157,11 @@ class SimpleStrategyEvaluator(evaluators.StrategyEvaluator):
                               cryptocurrency,
                               symbol,
                               time_frame):
+        if evaluator_type == evaluators_enums.EvaluatorMatrixTypes.TA.value:
+            # technical evaluations only wake up the strategy once their evaluation cycle is complete
+            self.evaluations_aggregator.complete_evaluation_cycle(
+                matrix_id, exchange_name, cryptocurrency, symbol, evaluator_type
+            )
         if symbol is None and cryptocurrency is not None and evaluator_type == evaluators_enums.EvaluatorMatrixTypes.SOCIAL.value:
             # social evaluators can be cryptocurrency related but not symbol related, wakeup every symbol
             for available_symbol in matrix.get_available_symbols(matrix_id, exchange_name, cryptocurrency):
@@ -138,18 +195,11 @@ class SimpleStrategyEvaluator(evaluators.StrategyEvaluator):
                                   symbol):
         # ensure only start evaluations when technical evaluators have been initialized
         try:
-            TA_by_timeframe = {
-                available_time_frame: matrix.get_evaluations_by_evaluator(
-                    matrix_id,
-                    exchange_name,
-                    evaluators_enums.EvaluatorMatrixTypes.TA.value,
-                    cryptocurrency,
-                    symbol,
-                    available_time_frame.value,
-                    allow_missing=False,
-                    allowed_values=[commons_constants.START_PENDING_EVAL_NOTE])
-                for available_time_frame in self.strategy_time_frames
-            }
+            strategy_time_frames = [time_frame.value for time_frame in self.strategy_time_frames]
+            symbol_evaluations = self.evaluations_aggregator.get_symbol_evaluations(
+                matrix_id, exchange_name, cryptocurrency, symbol,
+                evaluators_enums.EvaluatorMatrixTypes.TA.value, strategy_time_frames
+            )
             # social evaluators by symbol
             social_evaluations_by_evaluator = matrix.get_evaluations_by_evaluator(matrix_id,
                                                                                   exchange_name,
@@ -166,18 +216,9 @@ class SimpleStrategyEvaluator(evaluators.StrategyEvaluator):
                                                                       evaluators_enums.EvaluatorMatrixTypes.REAL_TIME.value,
                                                                       cryptocurrency,
                                                                       symbol)
-            RT_evaluations_by_time_frame = {
-                available_time_frame: matrix.get_evaluations_by_evaluator(
-                    matrix_id,
-                    exchange_name,
-                    evaluators_enums.EvaluatorMatrixTypes.REAL_TIME.value,
-                    cryptocurrency,
-                    symbol,
-                    available_time_frame)
-                for available_time_frame in available_rt_time_frames
-            }
             if self.re_evaluate_TA_when_social_or_realtime_notification \
-                    and any(value for value in TA_by_timeframe.values()) \
+                    and symbol_evaluations.has_set_evaluations(evaluators_enums.EvaluatorMatrixTypes.TA.value,
+                                                               strategy_time_frames) \
                     and evaluator_type != evaluators_enums.EvaluatorMatrixTypes.TA.value \
                     and evaluator_type in self.re_evaluation_triggering_eval_types \
                     and evaluator_name not in self.background_social_evaluators:
@@ -198,21 +239,15 @@ class SimpleStrategyEvaluator(evaluators.StrategyEvaluator):
             counter = 0
             total_evaluation = 0
 
-            for eval_by_rt in RT_evaluations_by_time_frame.values():
-                for evaluation in eval_by_rt.values():
-                    eval_value = evaluators_api.get_value(evaluation)
-                    if evaluators_util.check_valid_eval_note(eval_value, eval_type=evaluators_api.get_type(evaluation),
-                                                             expected_eval_type=evaluators_constants.EVALUATOR_EVAL_DEFAULT_TYPE):
-                        total_evaluation += eval_value
-                        counter += 1
-
-            for eval_by_ta in TA_by_timeframe.values():
-                for evaluation in eval_by_ta.values():
-                    eval_value = evaluators_api.get_value(evaluation)
-                    if evaluators_util.check_valid_eval_note(eval_value, eval_type=evaluators_api.get_type(evaluation),
-                                                             expected_eval_type=evaluators_constants.EVALUATOR_EVAL_DEFAULT_TYPE):
-                        total_evaluation += eval_value
-                        counter += 1
+            for evaluator_type, time_frames in (
+                (evaluators_enums.EvaluatorMatrixTypes.REAL_TIME.value, available_rt_time_frames),
+                (evaluators_enums.EvaluatorMatrixTypes.TA.value, strategy_time_frames),
+            ):
+                for time_frame in time_frames:
+                    evaluations_sum, evaluations_count = symbol_evaluations.get_sum_and_count(evaluator_type,
+                                                                                              time_frame)
+                    total_evaluation += evaluations_sum
+                    counter += evaluations_count
 
             if social_evaluations_by_evaluator:
                 exchange_manager = trading_api.get_exchange_manager_from_exchange_name_and_id(
@@ -252,6 +287,9 @@ class TechnicalAnalysisStrategyEvaluator(evaluators.StrategyEvaluator):
         super().__init__(tentacles_setup_config)
         self.allowed_evaluator_types = [evaluators_enums.EvaluatorMatrixTypes.TA.value,
                                         evaluators_enums.EvaluatorMatrixTypes.REAL_TIME.value]
+        self.evaluations_aggregator = evaluations_aggregator.EvaluationsAggregator(
+            [evaluators_enums.EvaluatorMatrixTypes.TA.value]
+        )
         config = tentacles_manager_api.get_tentacle_config(self.tentacles_setup_config, self.__class__)
         if config:
             self.weight_by_time_frames = TechnicalAnalysisStrategyEvaluator._get_weight_by_time_frames(
@@ -294,6 +332,53 @@ class TechnicalAnalysisStrategyEvaluator(evaluators.StrategyEvaluator):
                                                "time frame with a weight of 1."),
         }
 
+    async def strategy_matrix_callback(self,
+                                       matrix_id,
+                                       evaluator_name,
+                                       evaluator_type,
+                                       eval_note,
+                                       eval_note_type,
+                                       exchange_name,
+                                       cryptocurrency,
+                                       symbol,
+                                       time_frame):
+        # keep track of every evaluation, including the ones that won't wake up the strategy
+        self.evaluations_aggregator.update(matrix_id, evaluator_name, evaluator_type, eval_note, eval_note_type,
+                                           exchange_name, cryptocurrency, symbol, time_frame)
+        await super().strategy_matrix_callback(matrix_id,
+                                               evaluator_name,
+                                               evaluator_type,
+                                               eval_note,
+                                               eval_note_type,
+                                               exchange_name,
+                                               cryptocurrency,
+                                               symbol,
+                                               time_frame)
+
+    async def evaluators_callback(self,
+                                  matrix_id,
+                                  evaluator_name,
+                                  evaluator_type,
+                                  exchange_name,
+                                  cryptocurrency,
+                                  symbol,
+                                  time_frame,
+                                  data):
+        await super().evaluators_callback(matrix_id,
+                                          evaluator_name,
+                                          evaluator_type,
+                                          exchange_name,
+                                          cryptocurrency,
+                                          symbol,
+                                          time_frame,
+                                          data)
+        if data[evaluators_constants.EVALUATOR_CHANNEL_DATA_ACTION] == evaluators_constants.RESET_EVALUATION:
+            # technical evaluators are resetting their evaluation without matrix notification
+            self.evaluations_aggregator.reset_evaluations(
+                matrix_id, exchange_name, cryptocurrency, symbol, evaluators_enums.EvaluatorMatrixTypes.TA.value,
+                [time_frame.value for time_frame in data[evaluators_constants.EVALUATOR_CHANNEL_DATA_TIME_FRAMES]]
+            )
+
     async def matrix_callback(self,
                               matrix_id,
                               evaluator_name,
@@ -307,20 +392,18 @@ class TechnicalAnalysisStrategyEvaluator(evaluators.StrategyEvaluator):
         if evaluator_type not in self.allowed_evaluator_types:
             # only wake up on relevant callbacks
             return
+        if evaluator_type == evaluators_enums.EvaluatorMatrixTypes.TA.value:
+            # technical evaluations only wake up the strategy once their evaluation cycle is complete
+            self.evaluations_aggregator.complete_evaluation_cycle(
+                matrix_id, exchange_name, cryptocurrency, symbol, evaluator_type
+            )
 
         try:
-            TA_by_timeframe = {
-                available_time_frame: matrix.get_evaluations_by_evaluator(
-                    matrix_id,
-                    exchange_name,
-                    evaluators_enums.EvaluatorMatrixTypes.TA.value,
-                    cryptocurrency,
-                    symbol,
-                    available_time_frame.value,
-                    allow_missing=False,
-                    allowed_values=[commons_constants.START_PENDING_EVAL_NOTE])
-                for available_time_frame in self.strategy_time_frames
-            }
+            symbol_evaluations = self.evaluations_aggregator.get_symbol_evaluations(
+                matrix_id, exchange_name, cryptocurrency, symbol,
+                evaluators_enums.EvaluatorMatrixTypes.TA.value,
+                [time_frame.value for time_frame in self.strategy_time_frames]
+            )
 
             if evaluator_type == evaluators_enums.EvaluatorMatrixTypes.REAL_TIME.value:
                 # trigger re-evaluation
@@ -339,14 +422,14 @@ class TechnicalAnalysisStrategyEvaluator(evaluators.StrategyEvaluator):
             total_evaluation = 0
             total_weights = 0
 
-            for time_frame, eval_by_ta in TA_by_timeframe.items():
-                for evaluation in eval_by_ta.values():
-                    eval_value = evaluators_api.get_value(evaluation)
-                    if evaluators_util.check_valid_eval_note(eval_value, eval_type=evaluators_api.get_type(evaluation),
-                                                             expected_eval_type=evaluators_constants.EVALUATOR_EVAL_DEFAULT_TYPE):
-                        weight = self.weight_by_time_frames.get(time_frame.value, self.DEFAULT_WEIGHT)
-                        total_evaluation += eval_value * weight
-                        total_weights += weight
+            for time_frame in self.strategy_time_frames:
+                evaluations_sum, evaluations_count = symbol_evaluations.get_sum_and_count(
+                    evaluators_enums.EvaluatorMatrixTypes.TA.value, time_frame.value
+                )
+                if evaluations_count:
+                    weight = self.weight_by_time_frames.get(time_frame.value, self.DEFAULT_WEIGHT)
+                    total_evaluation += evaluations_sum * weight
+                    total_weights += weight * evaluations_count
 
             if total_weights > 0:
                 self.eval_note = total_evaluation / total_weights
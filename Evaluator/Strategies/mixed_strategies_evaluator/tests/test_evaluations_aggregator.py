@@ -0,0 +1,246 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import random
+import mock
+import pytest
+
+import octobot_commons.constants as commons_constants
+import octobot_evaluators.api as evaluators_api
+import octobot_evaluators.constants as evaluators_constants
+import octobot_evaluators.enums as evaluators_enums
+import octobot_evaluators.errors as errors
+import octobot_evaluators.matrix as matrix
+import tentacles.Evaluator.Strategies.mixed_strategies_evaluator.evaluations_aggregator as evaluations_aggregator
+
+EXCHANGE = "binance"
+CRYPTO = "BTC"
+SYMBOL = "BTC/USDT"
+TA = evaluators_enums.EvaluatorMatrixTypes.TA.value
+RT = evaluators_enums.EvaluatorMatrixTypes.REAL_TIME.value
+DEFAULT_TYPE = evaluators_constants.EVALUATOR_EVAL_DEFAULT_TYPE
+
+
+@pytest.fixture
+def matrix_id():
+    created_matrix_id = evaluators_api.create_matrix()
+    yield created_matrix_id
+    evaluators_api.del_matrix(created_matrix_id)
+
+
+def _set_evaluation(matrix_id, aggregator, evaluator_name, evaluator_type, time_frame, eval_note,
+                    eval_note_type=DEFAULT_TYPE):
+    matrix.set_tentacle_value(
+        matrix_id,
+        matrix.get_matrix_default_value_path(evaluator_name, evaluator_type, EXCHANGE, CRYPTO, SYMBOL, time_frame),
+        eval_note_type,
+        eval_note
+    )
+    aggregator.update(matrix_id, evaluator_name, evaluator_type, eval_note, eval_note_type,
+                      EXCHANGE, CRYPTO, SYMBOL, time_frame)
+
+
+def _get_matrix_average(matrix_id, evaluator_type, time_frame):
+    values = [
+        evaluators_api.get_value(evaluation)
+        for evaluation in matrix.get_evaluations_by_evaluator(
+            matrix_id, EXCHANGE, evaluator_type, CRYPTO, SYMBOL, time_frame
+        ).values()
+        if evaluators_api.get_type(evaluation) == DEFAULT_TYPE
+    ]
+    return sum(values) / len(values) if values else None
+
+
+def _get_aggregated_average(symbol_evaluations, evaluator_type, time_frame):
+    evaluations_sum, evaluations_count = symbol_evaluations.get_sum_and_count(evaluator_type, time_frame)
+    return evaluations_sum / evaluations_count if evaluations_count else None
+
+
+def test_symbol_evaluations_set_evaluation():
+    symbol_evaluations = evaluations_aggregator.SymbolEvaluations()
+    assert symbol_evaluations.get_sum_and_count(TA, "1h") == (0, 0)
+    assert symbol_evaluations.has_set_evaluations(TA, ["1h"]) is False
+    symbol_evaluations.set_evaluation(TA, "1h", "RSI", 0.1, DEFAULT_TYPE)
+    symbol_evaluations.set_evaluation(TA, "1h", "MACD", 0.2, DEFAULT_TYPE)
+    symbol_evaluations.set_evaluation(TA, "4h", "RSI", -1, DEFAULT_TYPE)
+    assert symbol_evaluations.get_sum_and_count(TA, "1h") == (0.1 + 0.2, 2)
+    assert symbol_evaluations.get_sum_and_count(TA, "4h") == (-1, 1)
+    # replaced value
+    symbol_evaluations.set_evaluation(TA, "1h", "RSI", 0.3, DEFAULT_TYPE)
+    assert symbol_evaluations.get_sum_and_count(TA, "1h")[0] == pytest.approx(0.5, abs=1e-15)
+    # pending values are set but not valid
+    symbol_evaluations.set_evaluation(TA, "1h", "RSI", commons_constants.START_PENDING_EVAL_NOTE, DEFAULT_TYPE)
+    symbol_evaluations.set_evaluation(TA, "1h", "MACD", commons_constants.START_PENDING_EVAL_NOTE, DEFAULT_TYPE)
+    assert symbol_evaluations.get_sum_and_count(TA, "1h") == (0, 0)
+    assert symbol_evaluations.has_set_evaluations(TA, ["1h"]) is True
+    # unexpected evaluation types are ignored
+    symbol_evaluations.set_evaluation(TA, "1h", "RSI", 1, "other_type")
+    assert symbol_evaluations.get_sum_and_count(TA, "1h") == (0, 0)
+    # as in the matrix, None values do not replace the current value
+    symbol_evaluations.set_evaluation(TA, "4h", "RSI", None, DEFAULT_TYPE)
+    assert symbol_evaluations.get_sum_and_count(TA, "4h") == (-1, 1)
+    symbol_evaluations.set_evaluation(TA, "4h", "MACD", None, DEFAULT_TYPE)
+    assert symbol_evaluations.get_sum_and_count(TA, "4h") == (-1, 1)
+    assert symbol_evaluations.has_set_evaluations(TA, ["1m"]) is False
+    assert symbol_evaluations.has_set_evaluations(TA, ["1m", "1h"]) is True
+    assert symbol_evaluations.has_set_evaluations(RT, ["4h", "1h"]) is False
+
+
+def test_get_symbol_evaluations_requires_set_evaluations(matrix_id):
+    aggregator = evaluations_aggregator.EvaluationsAggregator([TA, RT])
+    _set_evaluation(matrix_id, aggregator, "RSI", TA, "1h", 0.5)
+    _set_evaluation(matrix_id, aggregator, "MACD", TA, "1h", None)
+    with pytest.raises(errors.UnsetTentacleEvaluation):
+        aggregator.get_symbol_evaluations(matrix_id, EXCHANGE, CRYPTO, SYMBOL, TA, ["1h"])
+    # missing evaluations of not required time frames are allowed
+    symbol_evaluations = aggregator.get_symbol_evaluations(matrix_id, EXCHANGE, CRYPTO, SYMBOL, TA, ["4h"])
+    assert symbol_evaluations.get_sum_and_count(TA, "1h") == (0.5, 1)
+    aggregator.clear()
+    _set_evaluation(matrix_id, aggregator, "MACD", TA, "1h", commons_constants.START_PENDING_EVAL_NOTE)
+    symbol_evaluations = aggregator.get_symbol_evaluations(matrix_id, EXCHANGE, CRYPTO, SYMBOL, TA, ["1h"])
+    assert symbol_evaluations.get_sum_and_count(TA, "1h") == (0.5, 1)
+    assert symbol_evaluations.has_set_evaluations(TA, ["1h"]) is True
+
+
+def test_updates_match_matrix_evaluations(matrix_id):
+    rand = random.Random(42)
+    aggregator = evaluations_aggregator.EvaluationsAggregator([TA, RT])
+    evaluator_names = [f"evaluator_{i}" for i in range(5)]
+    time_frames = ["1m", "1h", "4h"]
+    possible_values = [None, commons_constants.START_PENDING_EVAL_NOTE, 1, -1, 0]
+    for evaluator_name in evaluator_names:
+        for time_frame in time_frames:
+            _set_evaluation(matrix_id, aggregator, evaluator_name, TA, time_frame, rand.uniform(-1, 1))
+    # initialized from the matrix
+    symbol_evaluations = aggregator.get_symbol_evaluations(matrix_id, EXCHANGE, CRYPTO, SYMBOL, TA, time_frames)
+    assert aggregator.get_symbol_evaluations(matrix_id, EXCHANGE, CRYPTO, SYMBOL, TA, time_frames) \
+        is symbol_evaluations
+    for _ in range(2000):
+        eval_note = rand.choice(possible_values + [rand.uniform(-1, 1)] * 10)
+        _set_evaluation(
+            matrix_id, aggregator, rand.choice(evaluator_names), rand.choice([TA, RT]), rand.choice(time_frames),
+            eval_note, rand.choice([DEFAULT_TYPE] * 10 + ["other_type"])
+        )
+        for evaluator_type in (TA, RT):
+            for time_frame in time_frames:
+                assert _get_aggregated_average(symbol_evaluations, evaluator_type, time_frame) == pytest.approx(
+                    _get_matrix_average(matrix_id, evaluator_type, time_frame), abs=1e-12
+                )
+    # other evaluation types are ignored
+    _set_evaluation(matrix_id, aggregator, "social", evaluators_enums.EvaluatorMatrixTypes.SOCIAL.value, None, 1)
+    assert symbol_evaluations.get_sum_and_count(evaluators_enums.EvaluatorMatrixTypes.SOCIAL.value, None) == (0, 0)
+
+
+def test_symbol_evaluations_recompute_sum():
+    symbol_evaluations = evaluations_aggregator.SymbolEvaluations()
+    symbol_evaluations.set_evaluation(TA, "1h", "RSI", 0.1, DEFAULT_TYPE)
+    symbol_evaluations.set_evaluation(TA, "1h", "MACD", 0.2, DEFAULT_TYPE)
+    symbol_evaluations.set_evaluation(TA, "1h", "RSI", 0.9, DEFAULT_TYPE)
+    symbol_evaluations.set_evaluation(TA, "1h", "MACD", commons_constants.START_PENDING_EVAL_NOTE, DEFAULT_TYPE)
+    # running sum floating point error
+    assert symbol_evaluations.get_sum_and_count(TA, "1h") == (0.9000000000000001, 1)
+    symbol_evaluations.recompute_sum(TA, "1h")
+    assert symbol_evaluations.get_sum_and_count(TA, "1h") == (0.9, 1)
+    # unknown time frame: nothing to recompute
+    symbol_evaluations.recompute_sum(TA, "4h")
+    assert symbol_evaluations.get_sum_and_count(TA, "4h") == (0, 0)
+    # sums are periodically recomputed
+    with mock.patch.object(evaluations_aggregator.SymbolEvaluations, "MAX_UPDATES_BEFORE_SUM_RECOMPUTE", 5):
+        symbol_evaluations = evaluations_aggregator.SymbolEvaluations()
+        symbol_evaluations.set_evaluation(TA, "1h", "RSI", 0.1, DEFAULT_TYPE)
+        symbol_evaluations.set_evaluation(TA, "1h", "MACD", 0.2, DEFAULT_TYPE)
+        symbol_evaluations.set_evaluation(TA, "1h", "RSI", 0.9, DEFAULT_TYPE)
+        symbol_evaluations.set_evaluation(TA, "1h", "MACD", commons_constants.START_PENDING_EVAL_NOTE, DEFAULT_TYPE)
+        assert symbol_evaluations.get_sum_and_count(TA, "1h") == (0.9000000000000001, 1)
+        # 5th update
+        symbol_evaluations.set_evaluation(TA, "1h", "BBANDS", commons_constants.START_PENDING_EVAL_NOTE, DEFAULT_TYPE)
+        assert symbol_evaluations.get_sum_and_count(TA, "1h") == (0.9, 1)
+
+
+def test_get_symbol_evaluations_syncs_reset_evaluations(matrix_id):
+    aggregator = evaluations_aggregator.EvaluationsAggregator([TA, RT])
+    _set_evaluation(matrix_id, aggregator, "RSI", TA, "1h", 0.5)
+    _set_evaluation(matrix_id, aggregator, "MACD", TA, "1h", -0.1)
+    _set_evaluation(matrix_id, aggregator, "RSI", TA, "4h", 1)
+    # not initialized yet: ignored
+    aggregator.reset_evaluations(matrix_id, EXCHANGE, CRYPTO, SYMBOL, TA, ["1h"])
+    symbol_evaluations = aggregator.get_symbol_evaluations(matrix_id, EXCHANGE, CRYPTO, SYMBOL, TA, ["1h", "4h"])
+    assert symbol_evaluations.get_sum_and_count(TA, "1h")[0] == pytest.approx(0.4, abs=1e-15)
+    with mock.patch.object(matrix, "get_evaluations_by_evaluator", mock.Mock()) as get_evaluations_by_evaluator_mock:
+        # nothing reset: the matrix is not read
+        assert aggregator.get_symbol_evaluations(matrix_id, EXCHANGE, CRYPTO, SYMBOL, TA, ["1h", "4h"]) \
+            is symbol_evaluations
+        get_evaluations_by_evaluator_mock.assert_not_called()
+    # reset in the matrix without notifying the aggregator, as in TAEvaluator.reset_evaluation
+    aggregator.reset_evaluations(matrix_id, EXCHANGE, CRYPTO, SYMBOL, TA, ["1h"])
+    # other evaluator types are ignored
+    aggregator.reset_evaluations(matrix_id, EXCHANGE, CRYPTO, SYMBOL,
+                                 evaluators_enums.EvaluatorMatrixTypes.SOCIAL.value, ["1h"])
+    matrix.set_tentacle_value(
+        matrix_id,
+        matrix.get_matrix_default_value_path("RSI", TA, EXCHANGE, CRYPTO, SYMBOL, "1h"),
+        DEFAULT_TYPE,
+        commons_constants.START_PENDING_EVAL_NOTE
+    )
+    with mock.patch.object(matrix, "get_evaluations_by_evaluator",
+                           mock.Mock(wraps=matrix.get_evaluations_by_evaluator)) as get_evaluations_by_evaluator_mock:
+        assert aggregator.get_symbol_evaluations(matrix_id, EXCHANGE, CRYPTO, SYMBOL, TA, ["1h", "4h"]) \
+            is symbol_evaluations
+        # only reset evaluations are read
+        get_evaluations_by_evaluator_mock.assert_called_once_with(
+            matrix_id, EXCHANGE, TA, CRYPTO, SYMBOL, "1h",
+            allow_missing=False, allowed_values=[commons_constants.START_PENDING_EVAL_NOTE]
+        )
+    assert symbol_evaluations.get_sum_and_count(TA, "1h") == (-0.1, 1)
+    assert symbol_evaluations.get_sum_and_count(TA, "4h") == (1, 1)
+    assert symbol_evaluations.has_set_evaluations(TA, ["1h"]) is True
+    # reset evaluations are read until their evaluation cycle completes
+    matrix.set_tentacle_value(
+        matrix_id,
+        matrix.get_matrix_default_value_path("MACD", TA, EXCHANGE, CRYPTO, SYMBOL, "1h"),
+        DEFAULT_TYPE,
+        commons_constants.START_PENDING_EVAL_NOTE
+    )
+    assert aggregator.get_symbol_evaluations(matrix_id, EXCHANGE, CRYPTO, SYMBOL, TA, ["1h", "4h"]) \
+        is symbol_evaluations
+    assert symbol_evaluations.get_sum_and_count(TA, "1h") == (0, 0)
+    _set_evaluation(matrix_id, aggregator, "RSI", TA, "1h", 0.3)
+    _set_evaluation(matrix_id, aggregator, "MACD", TA, "1h", 0.2)
+    aggregator.complete_evaluation_cycle(matrix_id, EXCHANGE, CRYPTO, SYMBOL, TA)
+    with mock.patch.object(matrix, "get_evaluations_by_evaluator", mock.Mock()) as get_evaluations_by_evaluator_mock:
+        assert aggregator.get_symbol_evaluations(matrix_id, EXCHANGE, CRYPTO, SYMBOL, TA, ["1h", "4h"]) \
+            is symbol_evaluations
+        get_evaluations_by_evaluator_mock.assert_not_called()
+    assert symbol_evaluations.get_sum_and_count(TA, "1h")[0] == pytest.approx(0.5, abs=1e-15)
+    # nothing to complete
+    aggregator.complete_evaluation_cycle(matrix_id, EXCHANGE, CRYPTO, SYMBOL, TA)
+
+
+def test_get_symbol_evaluations_checks_unset_evaluations(matrix_id):
+    aggregator = evaluations_aggregator.EvaluationsAggregator([TA, RT])
+    _set_evaluation(matrix_id, aggregator, "RSI", TA, "1h", 0.5)
+    _set_evaluation(matrix_id, aggregator, "RSI", TA, "4h", 1)
+    symbol_evaluations = aggregator.get_symbol_evaluations(matrix_id, EXCHANGE, CRYPTO, SYMBOL, TA, ["1h", "4h"])
+    # unset evaluations are checked on each call, not only upon initialization
+    _set_evaluation(matrix_id, aggregator, "MACD", TA, "4h", None)
+    with pytest.raises(errors.UnsetTentacleEvaluation, match="4h for MACD"):
+        aggregator.get_symbol_evaluations(matrix_id, EXCHANGE, CRYPTO, SYMBOL, TA, ["1h", "4h"])
+    # not required time frames are not checked
+    assert aggregator.get_symbol_evaluations(matrix_id, EXCHANGE, CRYPTO, SYMBOL, TA, ["1h"]) is symbol_evaluations
+    assert symbol_evaluations.get_sum_and_count(TA, "1h") == (0.5, 1)
+    _set_evaluation(matrix_id, aggregator, "MACD", TA, "4h", 0)
+    assert aggregator.get_symbol_evaluations(matrix_id, EXCHANGE, CRYPTO, SYMBOL, TA, ["1h", "4h"]) \
+        is symbol_evaluations
+    assert symbol_evaluations.get_sum_and_count(TA, "4h") == (1, 2)
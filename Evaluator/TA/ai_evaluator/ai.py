@@ -13,6 +13,7 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import asyncio
 import tulipy
 import os
 
@@ -28,6 +29,7 @@ import octobot_trading.api as trading_api
 import octobot_services.api as services_api
 import octobot_services.errors as services_errors
 import tentacles.Services.Services_bases
+import tentacles.Evaluator.TA.ai_evaluator.evaluations_dispatcher as evaluations_dispatcher
 
 
 def _get_gpt_service():
@@ -58,6 +60,9 @@ class GPTEvaluator(evaluators.TAEvaluator):
     ALLOW_GPT_REEVALUATION_ENV = "ALLOW_GPT_REEVALUATIONS"
     GPT_MODELS = []
     ALLOW_TOKEN_LIMIT_UPDATE = False
+    DEFAULT_MAX_CONCURRENT_GPT_REQUESTS = 10
+    # time to wait for other candle closes before sending a batch of GPT requests
+    EVALUATIONS_BATCH_COLLECTION_DELAY = 1
 
     def __init__(self, tentacles_setup_config):
         super().__init__(tentacles_setup_config)
@@ -79,6 +84,13 @@ class GPTEvaluator(evaluators.TAEvaluator):
         self.allow_reevaluations = os_util.parse_boolean_environment_var(self.ALLOW_GPT_REEVALUATION_ENV, "True")
         self.gpt_tokens_limit = _get_gpt_service().NO_TOKEN_LIMIT_VALUE
         self.services_config = None
+        self.max_concurrent_gpt_requests = self.DEFAULT_MAX_CONCURRENT_GPT_REQUESTS
+        self.evaluations_dispatcher = evaluations_dispatcher.BatchedEvaluationsDispatcher(
+            self.max_concurrent_gpt_requests, self.EVALUATIONS_BATCH_COLLECTION_DELAY,
+            batch_context=self.async_evaluation
+        )
+        # evaluations can complete concurrently: self.eval_note is only set while holding this lock
+        self._evaluation_completion_lock = asyncio.Lock()
 
     def enable_reevaluation(self) -> bool:
         """
@@ -151,6 +163,13 @@ class GPTEvaluator(evaluators.TAEvaluator):
                 title=f"OpenAI token limit: maximum daily number of tokens to consume with a given OctoBot instance. "
                       f"Use {_get_gpt_service().NO_TOKEN_LIMIT_VALUE} to remove the limit."
             )
+        self.max_concurrent_gpt_requests = self.UI.user_input(
+            "max_concurrent_gpt_requests", enums.UserInputTypes.INT,
+            self.max_concurrent_gpt_requests, inputs, min_val=1,
+            title="Maximum concurrent GPT requests: maximum number of GPT requests to send at the same time when "
+                  "candles of different pairs or time frames close together."
+        )
+        self.evaluations_dispatcher.max_concurrent_evaluations = self.max_concurrent_gpt_requests
 
     async def _init_GPT_models(self):
         if not self.GPT_MODELS:
@@ -177,53 +196,80 @@ class GPTEvaluator(evaluators.TAEvaluator):
     async def ohlcv_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, candle, inc_in_construction_data):
         candle_data = self.get_candles_data(exchange, exchange_id, symbol, time_frame, inc_in_construction_data)
-        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle)
+        if self.is_backtesting:
+            # backtesting evaluations are instantly answered using stored signals
+            await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle)
+        else:
+            # don't wait for GPT: other pairs and time frames candles can be evaluated at the same time
+            self.evaluations_dispatcher.add_evaluation(
+                (cryptocurrency, symbol, time_frame),
+                lambda: self._evaluate_and_complete(cryptocurrency, symbol, time_frame, candle_data, candle)
+            )
 
     async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle):
         async with self.async_evaluation():
-            self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
-            if self._check_timeframe(time_frame):
-                try:
-                    candle_time = candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value]
-                    computed_data = self.call_indicator(candle_data)
-                    formatted_data = self.get_formatted_data(computed_data)
-                    prediction = await self.ask_gpt(self.PREPROMPT, formatted_data, symbol, time_frame, candle_time) \
-                        or ""
-                    cleaned_prediction = prediction.strip().replace("\n", "").replace(".", "").lower()
-                    prediction_side = self._parse_prediction_side(cleaned_prediction)
-                    if prediction_side == 0 and not self.is_backtesting:
-                        self.logger.warning(
-                            f"Ignored ChatGPT answer for {symbol} {time_frame}, answer: '{cleaned_prediction}': "
-                            f"missing prediction or % accuracy."
-                        )
-                        return
-                    confidence = self._parse_confidence(cleaned_prediction) / 100
-                    self.eval_note = prediction_side * confidence
-                except services_errors.InvalidRequestError as e:
-                    self.logger.error(f"Invalid GPT request: {e}")
-                except services_errors.RateLimitError as e:
-                    self.logger.error(f"Impossible to get ChatGPT evaluation for {symbol} on {time_frame}: "
-                                      f"No remaining free tokens for today : {e}. To prevent this, you can reduce the "
-                                      f"amount of traded pairs, use larger time frames or increase the maximum "
-                                      f"allowed tokens.")
-                except services_errors.UnavailableInBacktestingError:
-                    # error already logged error for backtesting in use_backtesting_init_timeout
-                    pass
-                except evaluators_errors.UnavailableEvaluatorError as e:
-                    self.logger.exception(e, True, f"Evaluation error: {e}")
-                except tulipy.lib.InvalidOptionError as e:
-                    self.logger.warning(
-                        f"Error when computing {self.indicator} on {self.period} period with {len(candle_data)} "
-                        f"candles: {e}"
-                    )
-                    self.logger.exception(e, False)
-            else:
-                self.logger.debug(f"Ignored {time_frame} time frame as the shorted allowed time frame is "
-                                  f"{self.min_allowed_timeframe}")
+            await self._evaluate_and_complete(cryptocurrency, symbol, time_frame, candle_data, candle)
+
+    async def _evaluate_and_complete(self, cryptocurrency, symbol, time_frame, candle_data, candle):
+        eval_note = await self._get_eval_note(symbol, time_frame, candle_data, candle)
+        if eval_note is None:
+            # ignored evaluation
+            return
+        async with self._evaluation_completion_lock:
+            self.eval_note = eval_note
             await self.evaluation_completed(cryptocurrency, symbol, time_frame,
                                             eval_time=evaluators_util.get_eval_time(full_candle=candle,
                                                                                     time_frame=time_frame))
 
+    async def _get_eval_note(self, symbol, time_frame, candle_data, candle):
+        """
+        :return: the evaluation of the given candles or None when the GPT answer should be ignored
+        """
+        eval_note = commons_constants.START_PENDING_EVAL_NOTE
+        if self._check_timeframe(time_frame):
+            try:
+                candle_time = candle[commons_enums.PriceIndexes.IND_PRICE_TIME.value]
+                computed_data = self.call_indicator(candle_data)
+                formatted_data = self.get_formatted_data(computed_data)
+                prediction = await self.ask_gpt(self.PREPROMPT, formatted_data, symbol, time_frame, candle_time) \
+                    or ""
+                cleaned_prediction = prediction.strip().replace("\n", "").replace(".", "").lower()
+                prediction_side = self._parse_prediction_side(cleaned_prediction)
+                if prediction_side == 0 and not self.is_backtesting:
+                    self.logger.warning(
+                        f"Ignored ChatGPT answer for {symbol} {time_frame}, answer: '{cleaned_prediction}': "
+                        f"missing prediction or % accuracy."
+                    )
+                    return None
+                confidence = self._parse_confidence(cleaned_prediction) / 100
+                eval_note = prediction_side * confidence
+            except services_errors.InvalidRequestError as e:
+                self.logger.error(f"Invalid GPT request: {e}")
+            except services_errors.RateLimitError as e:
+                self.logger.error(f"Impossible to get ChatGPT evaluation for {symbol} on {time_frame}: "
+                                  f"No remaining free tokens for today : {e}. To prevent this, you can reduce the "
+                                  f"amount of traded pairs, use larger time frames or increase the maximum "
+                                  f"allowed tokens.")
+            except services_errors.UnavailableInBacktestingError:
+                # error already logged error for backtesting in use_backtesting_init_timeout
+                pass
+            except evaluators_errors.UnavailableEvaluatorError as e:
+                self.logger.exception(e, True, f"Evaluation error: {e}")
+            except tulipy.lib.InvalidOptionError as e:
+                self.logger.warning(
+                    f"Error when computing {self.indicator} on {self.period} period with {len(candle_data)} "
+                    f"candles: {e}"
+                )
+                self.logger.exception(e, False)
+        else:
+            self.logger.debug(f"Ignored {time_frame} time frame as the shorted allowed time frame is "
+                              f"{self.min_allowed_timeframe}")
+        return eval_note
+
+    async def stop(self) -> None:
+        await self.evaluations_dispatcher.stop()
+        await super().stop()
+
     def get_formatted_data(self, computed_data) -> str:
         if self.source in self.get_unformated_sources():
             return str(computed_data)
@@ -0,0 +1,96 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import contextlib
+import typing
+
+import octobot_commons.logging as commons_logging
+
+
+class BatchedEvaluationsDispatcher:
+    """
+    Groups evaluations requested at the same time (usually by the same candle close) into batches.
+    Evaluations of a batch run concurrently, at most max_concurrent_evaluations at a time. Batches run one after
+    the other: evaluations of a given key are therefore always completed in the order they were requested.
+    """
+
+    def __init__(
+        self,
+        max_concurrent_evaluations: int,
+        batch_collection_delay: float,
+        batch_context: typing.Optional[typing.Callable[[], typing.AsyncContextManager]] = None,
+    ):
+        self.max_concurrent_evaluations: int = max_concurrent_evaluations
+        # time to wait for other evaluations to be requested before starting a batch
+        self.batch_collection_delay: float = batch_collection_delay
+        # context in which each batch is run
+        self.batch_context: typing.Callable[[], typing.AsyncContextManager] = (
+            batch_context or contextlib.nullcontext
+        )
+        self.logger = commons_logging.get_logger(self.__class__.__name__)
+        # evaluation by key: only the latest evaluation of a key is kept until its batch starts
+        self._pending_evaluations: dict[typing.Hashable, typing.Callable[[], typing.Awaitable]] = {}
+        self._batches_task: typing.Optional[asyncio.Task] = None
+
+    def add_evaluation(self, key: typing.Hashable, evaluation: typing.Callable[[], typing.Awaitable]):
+        """
+        :param key: identifies the evaluated element, a pending evaluation of the same key is replaced
+        :param evaluation: called without arguments when the batch of this evaluation starts
+        """
+        self._pending_evaluations[key] = evaluation
+        if self._batches_task is None or self._batches_task.done():
+            self._batches_task = asyncio.create_task(self._run_batches())
+
+    def get_pending_evaluations_count(self) -> int:
+        return len(self._pending_evaluations)
+
+    async def wait_for_evaluations(self):
+        """
+        Wait for every added evaluation to be completed
+        """
+        while self._batches_task is not None and not self._batches_task.done():
+            await asyncio.shield(self._batches_task)
+
+    async def stop(self):
+        self._pending_evaluations.clear()
+        if self._batches_task is not None and not self._batches_task.done():
+            self._batches_task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._batches_task
+        self._batches_task = None
+
+    async def _run_batches(self):
+        while self._pending_evaluations:
+            # let evaluations requested at the same time join this batch
+            await asyncio.sleep(self.batch_collection_delay)
+            batch = list(self._pending_evaluations.values())
+            self._pending_evaluations.clear()
+            async with self.batch_context():
+                await self._run_batch(batch)
+
+    async def _run_batch(self, evaluations: list[typing.Callable[[], typing.Awaitable]]):
+        semaphore = asyncio.Semaphore(self.max_concurrent_evaluations)
+
+        async def _run_evaluation(evaluation):
+            async with semaphore:
+                await evaluation()
+
+        for result in await asyncio.gather(
+            *(_run_evaluation(evaluation) for evaluation in evaluations),
+            return_exceptions=True
+        ):
+            if isinstance(result, Exception):
+                self.logger.exception(result, True, f"Unexpected error when running evaluation: {result}")
@@ -13,6 +13,7 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import asyncio
 import types
 import mock
 import pytest
@@ -62,3 +63,38 @@ def test_parse_confidence(GPT_evaluator):
     assert GPT_evaluator._parse_confidence("up 70%") == 100
     assert GPT_evaluator._parse_confidence("up 60%") == 100
     assert GPT_evaluator._parse_confidence("up 59%") == 59
+
+
+@pytest.mark.asyncio
+async def test_ohlcv_callback_evaluates_concurrently(GPT_evaluator):
+    GPT_evaluator.indicator = next(iter(GPT_evaluator.INDICATORS))
+    GPT_evaluator.source = GPT_evaluator.SOURCES[3]
+    GPT_evaluator.period = 2
+    GPT_evaluator.max_concurrent_gpt_requests = GPT_evaluator.evaluations_dispatcher.max_concurrent_evaluations = 5
+    GPT_evaluator.evaluations_dispatcher.batch_collection_delay = 0
+    running_requests = []
+    max_running_requests = []
+
+    async def _ask_gpt(preprompt, inputs, symbol, time_frame, candle_time):
+        running_requests.append(symbol)
+        max_running_requests.append(len(running_requests))
+        await asyncio.sleep(0.01)
+        running_requests.remove(symbol)
+        return "down 70%" if symbol.startswith("BTC") else "up 70%"
+
+    symbols = [f"{base}/USDT" for base in ("BTC", "ETH", "SOL", "ADA", "XRP", "DOT", "LTC", "BNB")]
+    candle = [1700000000, 1, 2, 0.5, 1.5, 1000]
+    with mock.patch.object(GPT_evaluator, "get_candles_data", mock.Mock(return_value=numpy.array([1, 2, 3]))), \
+            mock.patch.object(GPT_evaluator, "ask_gpt", mock.AsyncMock(side_effect=_ask_gpt)) as ask_gpt_mock, \
+            mock.patch.object(GPT_evaluator, "evaluation_completed", mock.AsyncMock()) as evaluation_completed_mock:
+        for symbol in symbols:
+            await GPT_evaluator.ohlcv_callback("binance", "123", symbol.split("/")[0], symbol, "1h", candle, False)
+        # evaluations are not awaited by the callback
+        ask_gpt_mock.assert_not_called()
+        await GPT_evaluator.evaluations_dispatcher.wait_for_evaluations()
+        assert ask_gpt_mock.await_count == len(symbols)
+        assert max(max_running_requests) == 5
+        assert evaluation_completed_mock.await_count == len(symbols)
+        assert sorted(call.args[1] for call in evaluation_completed_mock.mock_calls) == sorted(symbols)
+        assert GPT_evaluator.eval_note in (0.7, -0.7)
+    await GPT_evaluator.stop()
@@ -0,0 +1,111 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+
+import pytest
+
+import tentacles.Evaluator.TA.ai_evaluator.evaluations_dispatcher as evaluations_dispatcher
+
+pytestmark = pytest.mark.asyncio
+
+
+class _Evaluations:
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.completed = []
+
+    def get(self, name, duration=0.01):
+        async def _evaluation():
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            try:
+                await asyncio.sleep(duration)
+                self.completed.append(name)
+            finally:
+                self.running -= 1
+        return _evaluation
+
+
+async def test_add_evaluation_runs_batch_concurrently():
+    dispatcher = evaluations_dispatcher.BatchedEvaluationsDispatcher(3, 0)
+    evaluations = _Evaluations()
+    for index in range(10):
+        dispatcher.add_evaluation(index, evaluations.get(index))
+    assert dispatcher.get_pending_evaluations_count() == 10
+    await dispatcher.wait_for_evaluations()
+    assert sorted(evaluations.completed) == list(range(10))
+    assert evaluations.max_running == 3
+    assert dispatcher.get_pending_evaluations_count() == 0
+
+
+async def test_add_evaluation_replaces_pending_evaluation_of_the_same_key():
+    dispatcher = evaluations_dispatcher.BatchedEvaluationsDispatcher(5, 0)
+    evaluations = _Evaluations()
+    dispatcher.add_evaluation("BTC/USDT", evaluations.get("BTC/USDT 1"))
+    dispatcher.add_evaluation("ETH/USDT", evaluations.get("ETH/USDT 1"))
+    dispatcher.add_evaluation("BTC/USDT", evaluations.get("BTC/USDT 2"))
+    await dispatcher.wait_for_evaluations()
+    assert sorted(evaluations.completed) == ["BTC/USDT 2", "ETH/USDT 1"]
+
+
+async def test_batches_run_one_after_the_other():
+    batches = []
+
+    class _BatchContext:
+        async def __aenter__(self):
+            batches.append([])
+
+        async def __aexit__(self, *args):
+            pass
+
+    dispatcher = evaluations_dispatcher.BatchedEvaluationsDispatcher(5, 0, batch_context=_BatchContext)
+    evaluations = _Evaluations()
+    dispatcher.add_evaluation("BTC/USDT", evaluations.get("BTC/USDT 1", duration=0.05))
+    # wait for the 1st batch to start
+    await asyncio.sleep(0.01)
+    # added during the 1st batch: run in the next batch
+    dispatcher.add_evaluation("BTC/USDT", evaluations.get("BTC/USDT 2", duration=0))
+    dispatcher.add_evaluation("ETH/USDT", evaluations.get("ETH/USDT 1", duration=0))
+    await dispatcher.wait_for_evaluations()
+    assert len(batches) == 2
+    assert evaluations.completed[0] == "BTC/USDT 1"
+    assert sorted(evaluations.completed[1:]) == ["BTC/USDT 2", "ETH/USDT 1"]
+
+
+async def test_evaluation_errors_do_not_stop_batch():
+    dispatcher = evaluations_dispatcher.BatchedEvaluationsDispatcher(5, 0)
+    evaluations = _Evaluations()
+
+    async def _failing_evaluation():
+        raise RuntimeError("error")
+
+    dispatcher.add_evaluation("BTC/USDT", _failing_evaluation)
+    dispatcher.add_evaluation("ETH/USDT", evaluations.get("ETH/USDT"))
+    await dispatcher.wait_for_evaluations()
+    assert evaluations.completed == ["ETH/USDT"]
+
+
+async def test_stop():
+    dispatcher = evaluations_dispatcher.BatchedEvaluationsDispatcher(5, 0)
+    evaluations = _Evaluations()
+    dispatcher.add_evaluation("BTC/USDT", evaluations.get("BTC/USDT", duration=1))
+    await asyncio.sleep(0.01)
+    dispatcher.add_evaluation("ETH/USDT", evaluations.get("ETH/USDT"))
+    await dispatcher.stop()
+    assert evaluations.completed == []
+    assert dispatcher.get_pending_evaluations_count() == 0
+    await dispatcher.wait_for_evaluations()
@@ -27,7 +27,38 @@ import octobot_trading.api as trading_api
 import tentacles.Evaluator.Util as EvaluatorUtil
 
 
-class RSIMomentumEvaluator(evaluators.TAEvaluator):
+def _get_rsi_values(streaming_indicators, exchange_id, symbol, time_frame, symbol_candles, candle_data, period_length,
+                    include_in_construction):
+    # RSI values are shared with other evaluators using the same RSI on the same candles
+    time_candles = trading_api.get_symbol_time_candles(symbol_candles, time_frame,
+                                                       include_in_construction=include_in_construction)
+    return EvaluatorUtil.get_shared_indicators_cache().get_or_compute(
+        exchange_id, symbol, time_frame,
+        EvaluatorUtil.IndicatorsCache.get_candle_key(time_candles, candle_data),
+        "rsi", (enums.PriceIndexes.IND_PRICE_CLOSE.name, period_length),
+        lambda: streaming_indicators.update_from_candles(
+            exchange_id, symbol, time_frame, EvaluatorUtil.StreamingRSI, (period_length, ),
+            time_candles, candle_data, include_in_construction=include_in_construction
+        )
+    )
+
+
+class StreamingIndicatorsEvaluatorMixin:
+    """
+    Releases the streaming indicators of evaluators holding them in self.streaming_indicators
+    """
+
+    async def reset_evaluation(self, cryptocurrency, symbol, time_frame):
+        # indicators are seeded again from candles on the next evaluation
+        self.streaming_indicators.remove_indicators(symbol=symbol, time_frame=time_frame)
+        await super().reset_evaluation(cryptocurrency, symbol, time_frame)
+
+    async def stop(self) -> None:
+        self.streaming_indicators.clear()
+        await super().stop()
+
+
+class RSIMomentumEvaluator(StreamingIndicatorsEvaluatorMixin, evaluators.TAEvaluator):
     PERIOD_LENGTH = "period_length"
     TREND_CHANGE_IDENTIFIER = "trend_change_identifier"
     LONG_THRESHOLD = "long_threshold"
@@ -42,6 +73,7 @@ class RSIMomentumEvaluator(evaluators.TAEvaluator):
         self.is_trend_change_identifier = True
         self.short_term_averages = [7, 5, 4, 3, 2, 1]
         self.long_term_averages = [40, 30, 20, 15, 10]
+        self.streaming_indicators = EvaluatorUtil.StreamingIndicators()
 
     def init_user_inputs(self, inputs: dict) -> None:
         """
@@ -95,15 +127,20 @@ class RSIMomentumEvaluator(evaluators.TAEvaluator):
 
     async def ohlcv_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, candle, inc_in_construction_data):
-        candle_data = trading_api.get_symbol_close_candles(self.get_exchange_symbol_data(exchange, exchange_id, symbol),
-                                                           time_frame,
+        symbol_candles = self.get_exchange_symbol_data(exchange, exchange_id, symbol)
+        candle_data = trading_api.get_symbol_close_candles(symbol_candles, time_frame,
                                                            include_in_construction=inc_in_construction_data)
-        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle)
+        rsi_v = None
+        if candle_data is not None and len(candle_data) > self.period_length:
+            rsi_v = _get_rsi_values(self.streaming_indicators, exchange_id, symbol, time_frame, symbol_candles,
+                                    candle_data, self.period_length, inc_in_construction_data)
+        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle, rsi_v=rsi_v)
 
-    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle):
+    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle, rsi_v=None):
         updated_value = False
         if candle_data is not None and len(candle_data) > self.period_length:
-            rsi_v = tulipy.rsi(candle_data, period=self.period_length)
+            if rsi_v is None:
+                rsi_v = tulipy.rsi(candle_data, period=self.period_length)
             if len(rsi_v) and not math.isnan(rsi_v[-1]):
                 if self.is_trend_change_identifier:
                     long_trend = EvaluatorUtil.TrendAnalysis.get_trend(rsi_v, self.long_term_averages)
@@ -153,7 +190,7 @@ class RSIMomentumEvaluator(evaluators.TAEvaluator):
 
 
 # double RSI analysis
-class RSIWeightMomentumEvaluator(evaluators.TAEvaluator):
+class RSIWeightMomentumEvaluator(StreamingIndicatorsEvaluatorMixin, evaluators.TAEvaluator):
     PERIOD = "period"
     SLOW_EVAL_COUNT = "slow_eval_count"
     FAST_EVAL_COUNT = "fast_eval_count"
@@ -175,6 +212,7 @@ class RSIWeightMomentumEvaluator(evaluators.TAEvaluator):
         self.slow_eval_count = 16
         self.fast_eval_count = 4
         self.weights = []
+        self.streaming_indicators = EvaluatorUtil.StreamingIndicators()
 
     def _init_fast_threshold(self, inputs, indexes, fast_threshold, price_weight, volume_weight):
         self.UI.user_input(self.WEIGHTS, enums.UserInputTypes.OBJECT, None, inputs,
@@ -246,12 +284,13 @@ class RSIWeightMomentumEvaluator(evaluators.TAEvaluator):
             fast_threshold[self.FAST_THRESHOLDS] = sorted(fast_threshold[self.FAST_THRESHOLDS],
                                                           key=lambda a: a[self.FAST_THRESHOLD])
 
-    def _get_rsi_averages(self, symbol_candles, time_frame, include_in_construction):
+    def _get_rsi_averages(self, exchange_id, symbol, symbol_candles, time_frame, include_in_construction):
         # compute the slow and fast RSI average
         candle_data = trading_api.get_symbol_close_candles(symbol_candles, time_frame,
                                                            include_in_construction=include_in_construction)
         if len(candle_data) > self.period_length:
-            rsi_v = tulipy.rsi(candle_data, period=self.period_length)
+            rsi_v = _get_rsi_values(self.streaming_indicators, exchange_id, symbol, time_frame, symbol_candles,
+                                    candle_data, self.period_length, include_in_construction)
             rsi_v = data_util.drop_nan(rsi_v)
             if len(rsi_v):
                 slow_average = numpy.mean(rsi_v[-self.slow_eval_count:])
@@ -283,7 +322,7 @@ class RSIWeightMomentumEvaluator(evaluators.TAEvaluator):
         try:
             symbol_candles = self.get_exchange_symbol_data(exchange, exchange_id, symbol)
             # compute the slow and fast RSI average
-            slow_rsi, fast_rsi, rsi_v = self._get_rsi_averages(symbol_candles, time_frame,
+            slow_rsi, fast_rsi, rsi_v = self._get_rsi_averages(exchange_id, symbol, symbol_candles, time_frame,
                                                                include_in_construction=inc_in_construction_data)
             current_candle_time = trading_api.get_symbol_time_candles(symbol_candles, time_frame,
                                                                       include_in_construction=inc_in_construction_data)[
@@ -315,11 +354,13 @@ class RSIWeightMomentumEvaluator(evaluators.TAEvaluator):
 
 
 # bollinger_bands
-class BBMomentumEvaluator(evaluators.TAEvaluator):
+class BBMomentumEvaluator(StreamingIndicatorsEvaluatorMixin, evaluators.TAEvaluator):
 
     def __init__(self, tentacles_setup_config):
         super().__init__(tentacles_setup_config)
         self.period_length = 20
+        # only the last bands values are used
+        self.streaming_indicators = EvaluatorUtil.StreamingIndicators(history_size=1)
 
     def init_user_inputs(self, inputs: dict) -> None:
         self.period_length = self.UI.user_input("period_length", enums.UserInputTypes.INT, self.period_length,
@@ -328,17 +369,28 @@ class BBMomentumEvaluator(evaluators.TAEvaluator):
 
     async def ohlcv_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, candle, inc_in_construction_data):
-        candle_data = trading_api.get_symbol_close_candles(self.get_exchange_symbol_data(exchange, exchange_id, symbol),
+        symbol_candles = self.get_exchange_symbol_data(exchange, exchange_id, symbol)
+        candle_data = trading_api.get_symbol_close_candles(symbol_candles,
                                                            time_frame,
                                                            self.period_length,
                                                            include_in_construction=inc_in_construction_data)
-        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle)
-
-    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle):
+        bands = None
+        if len(candle_data) >= self.period_length:
+            # bollinger bands only depend on the last period_length candles
+            bands = self.streaming_indicators.update_from_candles(
+                exchange_id, symbol, time_frame, EvaluatorUtil.StreamingBBands, (self.period_length, 2),
+                trading_api.get_symbol_time_candles(symbol_candles, time_frame, self.period_length,
+                                                    include_in_construction=inc_in_construction_data),
+                candle_data, include_in_construction=inc_in_construction_data
+            )
+        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle, bands=bands)
+
+    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle, bands=None):
         self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
         if len(candle_data) >= self.period_length:
             # compute bollinger bands
-            lower_band, middle_band, upper_band = tulipy.bbands(candle_data, self.period_length, 2)
+            lower_band, middle_band, upper_band = tulipy.bbands(candle_data, self.period_length, 2) \
+                if bands is None else bands
 
             # if close to lower band => low value => bad,
             # therefore if close to middle, value is keeping up => good
@@ -456,11 +508,12 @@ class EMAMomentumEvaluator(evaluators.TAEvaluator):
 
 
 # ADX --> trend_strength
-class ADXMomentumEvaluator(evaluators.TAEvaluator):
+class ADXMomentumEvaluator(StreamingIndicatorsEvaluatorMixin, evaluators.TAEvaluator):
 
     def __init__(self, tentacles_setup_config):
         super().__init__(tentacles_setup_config)
         self.period_length = 14
+        self.streaming_indicators = EvaluatorUtil.StreamingIndicators()
 
     def init_user_inputs(self, inputs: dict) -> None:
         self.period_length = self.UI.user_input("period_length", enums.UserInputTypes.INT, self.period_length,
@@ -484,22 +537,50 @@ class ADXMomentumEvaluator(evaluators.TAEvaluator):
                                                                include_in_construction=inc_in_construction_data)
             low_candles = trading_api.get_symbol_low_candles(symbol_candles, time_frame,
                                                              include_in_construction=inc_in_construction_data)
-            await self.evaluate(cryptocurrency, symbol, time_frame, close_candles, high_candles, low_candles, candle)
+            time_candles = trading_api.get_symbol_time_candles(symbol_candles, time_frame,
+                                                               include_in_construction=inc_in_construction_data)
+            indicators = (
+                self.streaming_indicators.update_from_candles(
+                    exchange_id, symbol, time_frame, EvaluatorUtil.StreamingADX, (self.period_length, ),
+                    time_candles, high_candles, low_candles, close_candles,
+                    include_in_construction=inc_in_construction_data
+                ),
+                self.streaming_indicators.update_from_candles(
+                    exchange_id, symbol, time_frame, EvaluatorUtil.StreamingEMA, (2, ),
+                    time_candles, close_candles, include_in_construction=inc_in_construction_data
+                ),
+                self.streaming_indicators.update_from_candles(
+                    exchange_id, symbol, time_frame, EvaluatorUtil.StreamingEMA, (20, ),
+                    time_candles, close_candles, include_in_construction=inc_in_construction_data
+                ),
+            )
+            await self.evaluate(cryptocurrency, symbol, time_frame, close_candles, high_candles, low_candles, candle,
+                                indicators=indicators)
         else:
             self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
             await self.evaluation_completed(cryptocurrency, symbol, time_frame,
                                             eval_time=evaluators_util.get_eval_time(full_candle=candle,
                                                                                     time_frame=time_frame))
 
-    async def evaluate(self, cryptocurrency, symbol, time_frame, close_candles, high_candles, low_candles, candle):
+    async def evaluate(self, cryptocurrency, symbol, time_frame, close_candles, high_candles, low_candles, candle,
+                       indicators=None):
+        """
+        :param indicators: optional pre-computed (adx, instant_ema, slow_ema) values
+        """
         self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
         if len(close_candles) >= self._get_minimal_data():
             min_adx = 7.5
             max_adx = 45
             neutral_adx = 25
-            adx = tulipy.adx(high_candles, low_candles, close_candles, self.period_length)
-            instant_ema = data_util.drop_nan(tulipy.ema(close_candles, 2))
-            slow_ema = data_util.drop_nan(tulipy.ema(close_candles, 20))
+            if indicators is None:
+                indicators = (
+                    tulipy.adx(high_candles, low_candles, close_candles, self.period_length),
+                    tulipy.ema(close_candles, 2),
+                    tulipy.ema(close_candles, 20),
+                )
+            adx, instant_ema, slow_ema = indicators
+            instant_ema = data_util.drop_nan(instant_ema)
+            slow_ema = data_util.drop_nan(slow_ema)
             adx = data_util.drop_nan(adx)
 
             if len(adx):
@@ -539,13 +620,14 @@ class ADXMomentumEvaluator(evaluators.TAEvaluator):
                                                                                 time_frame=time_frame))
 
 
-class MACDMomentumEvaluator(evaluators.TAEvaluator):
+class MACDMomentumEvaluator(StreamingIndicatorsEvaluatorMixin, evaluators.TAEvaluator):
     def __init__(self, tentacles_setup_config):
         super().__init__(tentacles_setup_config)
         self.previous_note = None
         self.long_period_length = 26
         self.short_period_length = 12
         self.signal_period_length = 9
+        self.streaming_indicators = EvaluatorUtil.StreamingIndicators()
 
     def init_user_inputs(self, inputs: dict) -> None:
         self.short_period_length = self.UI.user_input(
@@ -598,16 +680,27 @@ class MACDMomentumEvaluator(evaluators.TAEvaluator):
 
     async def ohlcv_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, candle, inc_in_construction_data):
-        candle_data = trading_api.get_symbol_close_candles(self.get_exchange_symbol_data(exchange, exchange_id, symbol),
+        symbol_candles = self.get_exchange_symbol_data(exchange, exchange_id, symbol)
+        candle_data = trading_api.get_symbol_close_candles(symbol_candles,
                                                            time_frame,
                                                            include_in_construction=inc_in_construction_data)
-        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle)
-
-    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle):
+        macd_values = None
+        if len(candle_data) > self.long_period_length:
+            macd_values = self.streaming_indicators.update_from_candles(
+                exchange_id, symbol, time_frame, EvaluatorUtil.StreamingMACD,
+                (self.short_period_length, self.long_period_length, self.signal_period_length),
+                trading_api.get_symbol_time_candles(symbol_candles, time_frame,
+                                                    include_in_construction=inc_in_construction_data),
+                candle_data, include_in_construction=inc_in_construction_data
+            )
+        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle, macd_values=macd_values)
+
+    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle, macd_values=None):
         self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
         if len(candle_data) > self.long_period_length:
             macd, macd_signal, macd_hist = tulipy.macd(candle_data, self.short_period_length,
-                                                       self.long_period_length, self.signal_period_length)
+                                                       self.long_period_length, self.signal_period_length) \
+                if macd_values is None else macd_values
 
             # on macd hist => M pattern: bearish movement, W pattern: bullish movement
             #                 max on hist: optimal sell or buy
@@ -639,12 +732,13 @@ class MACDMomentumEvaluator(evaluators.TAEvaluator):
                                                                                 time_frame=time_frame))
 
 
-class KlingerOscillatorMomentumEvaluator(evaluators.TAEvaluator):
+class KlingerOscillatorMomentumEvaluator(StreamingIndicatorsEvaluatorMixin, evaluators.TAEvaluator):
     def __init__(self, tentacles_setup_config):
         super().__init__(tentacles_setup_config)
         self.short_period = 35  # standard with klinger
         self.long_period = 55  # standard with klinger
         self.ema_signal_period = 13  # standard ema signal for klinger
+        self.streaming_indicators = EvaluatorUtil.StreamingIndicators()
 
     def init_user_inputs(self, inputs: dict) -> None:
         self.short_period = self.UI.user_input("short_period", enums.UserInputTypes.INT, self.short_period,
@@ -671,8 +765,15 @@ class KlingerOscillatorMomentumEvaluator(evaluators.TAEvaluator):
                                                                  include_in_construction=inc_in_construction_data)
             volume_candles = trading_api.get_symbol_volume_candles(symbol_candles, time_frame,
                                                                    include_in_construction=inc_in_construction_data)
+            kvo = self.streaming_indicators.update_from_candles(
+                exchange_id, symbol, time_frame, EvaluatorUtil.StreamingKVO, (self.short_period, self.long_period),
+                trading_api.get_symbol_time_candles(symbol_candles, time_frame,
+                                                    include_in_construction=inc_in_construction_data),
+                high_candles, low_candles, close_candles, volume_candles,
+                include_in_construction=inc_in_construction_data
+            )
             await self.evaluate(cryptocurrency, symbol, time_frame, high_candles, low_candles,
-                                close_candles, volume_candles, candle)
+                                close_candles, volume_candles, candle, kvo=kvo)
         else:
             self.eval_note = commons_constants.START_PENDING_EVAL_NOTE
             await self.evaluation_completed(cryptocurrency, symbol, time_frame,
@@ -680,14 +781,15 @@ class KlingerOscillatorMomentumEvaluator(evaluators.TAEvaluator):
                                                                                     time_frame=time_frame))
 
     async def evaluate(self, cryptocurrency, symbol, time_frame, high_candles, low_candles,
-                       close_candles, volume_candles, candle):
+                       close_candles, volume_candles, candle, kvo=None):
         eval_proposition = commons_constants.START_PENDING_EVAL_NOTE
-        kvo = tulipy.kvo(high_candles,
-                         low_candles,
-                         close_candles,
-                         volume_candles,
-                         self.short_period,
-                         self.long_period)
+        if kvo is None:
+            kvo = tulipy.kvo(high_candles,
+                             low_candles,
+                             close_candles,
+                             volume_candles,
+                             self.short_period,
+                             self.long_period)
         kvo = data_util.drop_nan(kvo)
         if len(kvo) >= self.ema_signal_period:
             kvo_ema = tulipy.ema(kvo, self.ema_signal_period)
@@ -719,12 +821,13 @@ class KlingerOscillatorMomentumEvaluator(evaluators.TAEvaluator):
                                                                                 time_frame=time_frame))
 
 
-class KlingerOscillatorReversalConfirmationMomentumEvaluator(evaluators.TAEvaluator):
+class KlingerOscillatorReversalConfirmationMomentumEvaluator(StreamingIndicatorsEvaluatorMixin, evaluators.TAEvaluator):
     def __init__(self, tentacles_setup_config):
         super().__init__(tentacles_setup_config)
         self.short_period = 35  # standard with klinger
         self.long_period = 55  # standard with klinger
         self.ema_signal_period = 13  # standard ema signal for klinger
+        self.streaming_indicators = EvaluatorUtil.StreamingIndicators()
 
     def init_user_inputs(self, inputs: dict) -> None:
         """
@@ -759,8 +862,15 @@ class KlingerOscillatorReversalConfirmationMomentumEvaluator(evaluators.TAEvalua
                                                                  include_in_construction=inc_in_construction_data)
             volume_candles = trading_api.get_symbol_volume_candles(symbol_candles, time_frame,
                                                                    include_in_construction=inc_in_construction_data)
+            kvo = self.streaming_indicators.update_from_candles(
+                exchange_id, symbol, time_frame, EvaluatorUtil.StreamingKVO, (self.short_period, self.long_period),
+                trading_api.get_symbol_time_candles(symbol_candles, time_frame,
+                                                    include_in_construction=inc_in_construction_data),
+                high_candles, low_candles, close_candles, volume_candles,
+                include_in_construction=inc_in_construction_data
+            )
             await self.evaluate(cryptocurrency, symbol, time_frame, high_candles, low_candles,
-                                close_candles, volume_candles, candle)
+                                close_candles, volume_candles, candle, kvo=kvo)
         else:
             self.eval_note = False
             await self.evaluation_completed(cryptocurrency, symbol, time_frame,
@@ -768,14 +878,15 @@ class KlingerOscillatorReversalConfirmationMomentumEvaluator(evaluators.TAEvalua
                                                                                     time_frame=time_frame))
 
     async def evaluate(self, cryptocurrency, symbol, time_frame, high_candles, low_candles,
-                       close_candles, volume_candles, candle):
+                       close_candles, volume_candles, candle, kvo=None):
         if len(high_candles) >= self.short_period:
-            kvo = tulipy.kvo(high_candles,
-                             low_candles,
-                             close_candles,
-                             volume_candles,
-                             self.short_period,
-                             self.long_period)
+            if kvo is None:
+                kvo = tulipy.kvo(high_candles,
+                                 low_candles,
+                                 close_candles,
+                                 volume_candles,
+                                 self.short_period,
+                                 self.long_period)
             kvo = data_util.drop_nan(kvo)
             if len(kvo) >= self.ema_signal_period:
 
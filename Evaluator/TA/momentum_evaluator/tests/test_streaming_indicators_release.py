@@ -0,0 +1,56 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import mock
+import pytest
+
+import octobot_evaluators.evaluators as evaluators
+import tentacles.Evaluator.TA as TA
+import tentacles.Evaluator.Util as EvaluatorUtil
+
+
+# All test coroutines will be treated as marked.
+pytestmark = pytest.mark.asyncio
+
+
+def _create_evaluator_with_indicators():
+    evaluator = TA.RSIMomentumEvaluator(mock.Mock())
+    for exchange_id, symbol, time_frame in (
+        ("exchange_id", "BTC/USDT", "1h"),
+        ("exchange_id", "BTC/USDT", "4h"),
+        ("exchange_id", "ETH/USDT", "1h"),
+        ("other_exchange_id", "BTC/USDT", "1h"),
+    ):
+        evaluator.streaming_indicators.get_indicator(exchange_id, symbol, time_frame, EvaluatorUtil.StreamingRSI, 14)
+    return evaluator
+
+
+async def test_reset_evaluation_removes_indicators():
+    evaluator = _create_evaluator_with_indicators()
+    with mock.patch.object(evaluators.TAEvaluator, "reset_evaluation", mock.AsyncMock()) as reset_evaluation_mock:
+        await evaluator.reset_evaluation("BTC", "BTC/USDT", "1h")
+        reset_evaluation_mock.assert_awaited_once_with("BTC", "BTC/USDT", "1h")
+    assert sorted(key[:3] for key in evaluator.streaming_indicators.indicators) == [
+        ("exchange_id", "BTC/USDT", "4h"),
+        ("exchange_id", "ETH/USDT", "1h"),
+    ]
+
+
+async def test_stop_clears_indicators():
+    evaluator = _create_evaluator_with_indicators()
+    with mock.patch.object(evaluators.TAEvaluator, "stop", mock.AsyncMock()) as stop_mock:
+        await evaluator.stop()
+        stop_mock.assert_awaited_once_with()
+    assert evaluator.streaming_indicators.indicators == {}
@@ -21,6 +21,7 @@ import octobot_commons.data_util as data_util
 import octobot_evaluators.evaluators as evaluators
 import octobot_evaluators.util as evaluators_util
 import octobot_trading.api as trading_api
+import tentacles.Evaluator.Util as EvaluatorUtil
 
 
 class StochasticRSIVolatilityEvaluator(evaluators.TAEvaluator):
@@ -50,15 +51,27 @@ class StochasticRSIVolatilityEvaluator(evaluators.TAEvaluator):
 
     async def ohlcv_callback(self, exchange: str, exchange_id: str,
                              cryptocurrency: str, symbol: str, time_frame, candle, inc_in_construction_data):
-        candle_data = trading_api.get_symbol_close_candles(self.get_exchange_symbol_data(exchange, exchange_id, symbol),
+        symbol_candles = self.get_exchange_symbol_data(exchange, exchange_id, symbol)
+        candle_data = trading_api.get_symbol_close_candles(symbol_candles,
                                                            time_frame,
                                                            include_in_construction=inc_in_construction_data)
-        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle)
+        candle_key = EvaluatorUtil.IndicatorsCache.get_candle_key(
+            trading_api.get_symbol_time_candles(symbol_candles, time_frame,
+                                                include_in_construction=inc_in_construction_data),
+            candle_data
+        )
+        await self.evaluate(cryptocurrency, symbol, time_frame, candle_data, candle,
+                            exchange_id=exchange_id, candle_key=candle_key)
 
-    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle):
+    async def evaluate(self, cryptocurrency, symbol, time_frame, candle_data, candle,
+                       exchange_id=None, candle_key=None):
         try:
             if len(candle_data) >= self.period * 2:
-                stochrsi_value = tulipy.stochrsi(data_util.drop_nan(candle_data), self.period)[-1]
+                stochrsi_value = EvaluatorUtil.get_shared_indicators_cache().get_or_compute(
+                    exchange_id, symbol, time_frame, candle_key, "stochrsi",
+                    (enums.PriceIndexes.IND_PRICE_CLOSE.name, self.period),
+                    lambda: tulipy.stochrsi(data_util.drop_nan(candle_data), self.period)
+                )[-1]
 
                 if stochrsi_value * self.TULIPY_INDICATOR_MULTIPLICATOR >= self.high_level:
                     self.eval_note = 1
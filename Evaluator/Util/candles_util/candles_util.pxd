@@ -16,9 +16,9 @@
 #  License along with this library.
 
 cimport numpy as np
-from math cimport mean
 
 cpdef object HL2(object high, object low)
 cpdef object HLC3(object high, object low, object close)
 cpdef object OHLC4(object open, object high, object low, object close)
-cpdef tuple HeikinAshi(object open, object high, object low, object close)
\ No newline at end of file
+cpdef tuple HeikinAshi(object open, object high, object low, object close)
+cpdef tuple ExtendedHeikinAshi(tuple heikin_ashi, object time, object open, object high, object low, object close)
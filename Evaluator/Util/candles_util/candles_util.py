@@ -15,7 +15,11 @@
 #  License along with this library.
 
 import numpy as np
-from octobot_commons.data_util import mean
+
+
+def _to_float_array(values):
+    return np.asarray(values, dtype=np.float64)
+
 
 class CandlesUtil:
 
@@ -27,8 +31,7 @@ class CandlesUtil:
         :param low: list of low
         :return: list of HL2
         """
-        return np.array(list(map((lambda candles_high, candles_low: mean([candles_high, candles_low])),
-                                                                candles_high, candles_low)))
+        return (_to_float_array(candles_high) + _to_float_array(candles_low)) / 2
 
     @staticmethod
     def HLC3(candles_high, candles_low, candles_close):
@@ -39,9 +42,7 @@ class CandlesUtil:
         :param close: list of close
         :return: list of HLC3
         """
-        return np.array(list(map((lambda candles_high, candles_low, candles_close:
-                            mean([candles_high, candles_low, candles_close])),
-                            candles_high, candles_low, candles_close)))
+        return (_to_float_array(candles_high) + _to_float_array(candles_low) + _to_float_array(candles_close)) / 3
 
     @staticmethod
     def OHLC4(candles_open, candles_high, candles_low, candles_close):
@@ -53,9 +54,8 @@ class CandlesUtil:
         :param close: list of close
         :return: list of OHLC4
         """
-        return np.array(list(map((lambda candles_open, candles_high, candles_low, candles_close:
-                            mean([candles_open, candles_high, candles_low, candles_close])),
-                            candles_open, candles_high, candles_low, candles_close)))
+        return (_to_float_array(candles_open) + _to_float_array(candles_high) +
+                _to_float_array(candles_low) + _to_float_array(candles_close)) / 4
 
     @staticmethod
     def HeikinAshi(candles_open, candles_high, candles_low, candles_close):
@@ -67,17 +67,65 @@ class CandlesUtil:
         :param close: list of close
         :return: HAopen, HAhigh, HAlow, HAclose
         """
-        haOpen, haHigh, haLow, haClose = [np.array([]) for i in range(4)]
-        for i, (open_value, high_value, low_value, close_value) \
-                            in enumerate(zip(candles_open, candles_high, candles_low, candles_close)):
-            if i == 0:
-                haOpen = np.append(haOpen, open_value)
-                haHigh = np.append(haHigh, high_value)
-                haLow = np.append(haLow, low_value)
-                haClose = np.append(haClose, close_value)
-                continue
-            haOpen = np.append(haOpen, mean([candles_open[i-1], candles_close[i-1]]))
-            haHigh = np.append(haHigh, high_value)
-            haLow = np.append(haLow, low_value)
-            haClose = np.append(haClose, mean([open_value, high_value, low_value, close_value]))
-        return haOpen, haHigh, haLow, haClose
\ No newline at end of file
+        candles_open = _to_float_array(candles_open)
+        candles_high = _to_float_array(candles_high)
+        candles_low = _to_float_array(candles_low)
+        candles_close = _to_float_array(candles_close)
+        if not len(candles_open):
+            return tuple(np.array([], dtype=np.float64) for _ in range(4))
+        haOpen = np.empty(len(candles_open), dtype=np.float64)
+        haOpen[0] = candles_open[0]
+        haOpen[1:] = (candles_open[:-1] + candles_close[:-1]) / 2
+        haClose = CandlesUtil.OHLC4(candles_open, candles_high, candles_low, candles_close)
+        haClose[0] = candles_close[0]
+        return haOpen, candles_high.copy(), candles_low.copy(), haClose
+
+    @staticmethod
+    def ExtendedHeikinAshi(heikin_ashi, candles_time, candles_open, candles_high, candles_low, candles_close):
+        """
+        Return the given HeikinAshi arrays extended to the given candles: only values of the candles that are
+        not already in heikin_ashi are computed. Previous values are identified by the time of their last candle
+        and can be shifted when candles are a sliding window. The previous last candle is always computed again
+        as it might have been an in-construction candle
+        :param heikin_ashi: HAopen, HAhigh, HAlow, HAclose and last candle time previously returned by
+        ExtendedHeikinAshi, or an empty tuple
+        :param time: list of candles time, including previous candles
+        :param open: list of open, including previous candles
+        :param high: list of high, including previous candles
+        :param low: list of low, including previous candles
+        :param close: list of close, including previous candles
+        :return: HAopen, HAhigh, HAlow, HAclose, last candle time
+        """
+        candles_time = _to_float_array(candles_time)
+        if not len(candles_time):
+            return CandlesUtil.HeikinAshi(candles_open, candles_high, candles_low, candles_close) + (None, )
+        last_candle_time = (float(candles_time[-1]), )
+        # count of candles of which previously computed values are still valid
+        valid_count = 0
+        first_previous_index = 0
+        if heikin_ashi and len(heikin_ashi[0]):
+            previous_last_time = heikin_ashi[4]
+            previous_last_index = int(np.searchsorted(candles_time, previous_last_time))
+            first_previous_index = len(heikin_ashi[0]) - 1 - previous_last_index
+            if previous_last_index < len(candles_time) and candles_time[previous_last_index] == previous_last_time \
+                    and first_previous_index >= 0:
+                # the previous last candle might have changed since it was computed: compute it again
+                valid_count = previous_last_index
+        if valid_count == 0:
+            return CandlesUtil.HeikinAshi(candles_open, candles_high, candles_low, candles_close) + last_candle_time
+        candles_open = _to_float_array(candles_open)
+        candles_close = _to_float_array(candles_close)
+        previous_values = tuple(
+            values[first_previous_index:first_previous_index + valid_count].copy()
+            for values in heikin_ashi[:4]
+        )
+        # the first candle has no previous candle
+        previous_values[0][0] = candles_open[0]
+        previous_values[3][0] = candles_close[0]
+        # the previous candle is required to compute the first new HAopen
+        new_values = CandlesUtil.HeikinAshi(candles_open[valid_count - 1:], candles_high[valid_count - 1:],
+                                            candles_low[valid_count - 1:], candles_close[valid_count - 1:])
+        return tuple(
+            np.concatenate((previous, values[1:]))
+            for previous, values in zip(previous_values, new_values)
+        ) + last_candle_time
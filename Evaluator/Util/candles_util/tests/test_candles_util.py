@@ -92,4 +92,93 @@ def test_HeikinAshi():
     np.testing.assert_array_equal(haLow, np.array([652.361, 293.607, 295.191, 893.255, 819.447, 647.016,
                                                 330.303, 472.415, 617.705], dtype=np.float64))
     np.testing.assert_array_equal(haClose, np.array([968.007, 396.6965, 410.34975, 504.77475, 712.11825,
-                                                593.9905, 382.4445, 352.09725000000003, 532.744], dtype=np.float64))
\ No newline at end of file
+                                                593.9905, 382.4445, 352.09725000000003, 532.744], dtype=np.float64))
+
+def test_HeikinAshi_empty():
+    for values in CandlesUtil.HeikinAshi([], [], [], []):
+        np.testing.assert_array_equal(values, np.array([], dtype=np.float64))
+
+
+def test_ExtendedHeikinAshi():
+    candles_time = np.arange(9, dtype=np.float64) * 60
+    candles_open = np.array([188.539, 334.682, 495.604, 638.736, 632.213, 705.675, 876.735, 69.951, 909.477])
+    candles_high = np.array([259.316, 843.705, 170.388, 318.961, 918.236, 585.595, 23.266, 657.422, 270.557])
+    candles_low = np.array([652.361, 293.607, 295.191, 893.255, 819.447, 647.016, 330.303, 472.415, 617.705])
+    candles_close = np.array([968.007, 114.792, 680.216, 168.147, 478.577, 437.676, 299.474, 208.601, 333.237])
+    expected = CandlesUtil.HeikinAshi(candles_open, candles_high, candles_low, candles_close)
+
+    heikin_ashi = CandlesUtil.ExtendedHeikinAshi((), candles_time[:1], candles_open[:1], candles_high[:1],
+                                                 candles_low[:1], candles_close[:1])
+    for index in range(2, len(candles_open) + 1):
+        heikin_ashi = CandlesUtil.ExtendedHeikinAshi(heikin_ashi, candles_time[:index], candles_open[:index],
+                                                     candles_high[:index], candles_low[:index],
+                                                     candles_close[:index])
+    for values, expected_values in zip(heikin_ashi[:4], expected):
+        np.testing.assert_array_equal(values, expected_values)
+    assert heikin_ashi[4:] == (candles_time[-1], )
+
+    # fewer candles than computed values: recompute
+    for values, expected_values in zip(
+        CandlesUtil.ExtendedHeikinAshi(heikin_ashi, candles_time[:3], candles_open[:3], candles_high[:3],
+                                       candles_low[:3], candles_close[:3]),
+        expected
+    ):
+        np.testing.assert_array_equal(values, expected_values[:3])
+
+
+def test_ExtendedHeikinAshi_updated_last_candle():
+    candles_time = np.arange(5, dtype=np.float64) * 60
+    candles_open = np.array([188.539, 334.682, 495.604, 638.736, 632.213])
+    candles_high = np.array([259.316, 843.705, 170.388, 318.961, 918.236])
+    candles_low = np.array([652.361, 293.607, 295.191, 893.255, 819.447])
+    candles_close = np.array([968.007, 114.792, 680.216, 168.147, 478.577])
+    heikin_ashi = CandlesUtil.ExtendedHeikinAshi((), candles_time, candles_open, candles_high,
+                                                 candles_low, candles_close)
+    # the in-construction last candle is updated: same candles count
+    updated_close = candles_close.copy()
+    updated_close[-1] = 500.1
+    updated_high = candles_high.copy()
+    updated_high[-1] = 950.2
+    heikin_ashi = CandlesUtil.ExtendedHeikinAshi(heikin_ashi, candles_time, candles_open, updated_high,
+                                                 candles_low, updated_close)
+    for values, expected_values in zip(
+        heikin_ashi, CandlesUtil.HeikinAshi(candles_open, updated_high, candles_low, updated_close)
+    ):
+        np.testing.assert_array_equal(values, expected_values)
+    assert heikin_ashi[4:] == (candles_time[-1], )
+    # only the high, low and open of the in-construction last candle are updated
+    updated_open = candles_open.copy()
+    updated_open[-1] = 640.3
+    updated_high[-1] = 990.4
+    updated_low = candles_low.copy()
+    updated_low[-1] = 410.5
+    heikin_ashi = CandlesUtil.ExtendedHeikinAshi(heikin_ashi, candles_time, updated_open, updated_high,
+                                                 updated_low, updated_close)
+    for values, expected_values in zip(
+        heikin_ashi, CandlesUtil.HeikinAshi(updated_open, updated_high, updated_low, updated_close)
+    ):
+        np.testing.assert_array_equal(values, expected_values)
+
+
+def test_ExtendedHeikinAshi_sliding_window():
+    candles_time = np.arange(9, dtype=np.float64) * 60
+    candles_open = np.array([188.539, 334.682, 495.604, 638.736, 632.213, 705.675, 876.735, 69.951, 909.477])
+    candles_high = np.array([259.316, 843.705, 170.388, 318.961, 918.236, 585.595, 23.266, 657.422, 270.557])
+    candles_low = np.array([652.361, 293.607, 295.191, 893.255, 819.447, 647.016, 330.303, 472.415, 617.705])
+    candles_close = np.array([968.007, 114.792, 680.216, 168.147, 478.577, 437.676, 299.474, 208.601, 333.237])
+    window = 5
+    heikin_ashi = CandlesUtil.ExtendedHeikinAshi((), candles_time[:window], candles_open[:window],
+                                                 candles_high[:window], candles_low[:window],
+                                                 candles_close[:window])
+    # fixed size window: candles count is unchanged
+    for start in range(1, len(candles_open) - window + 1):
+        window_slice = slice(start, start + window)
+        heikin_ashi = CandlesUtil.ExtendedHeikinAshi(heikin_ashi, candles_time[window_slice],
+                                                     candles_open[window_slice], candles_high[window_slice],
+                                                     candles_low[window_slice], candles_close[window_slice])
+        for values, expected_values in zip(
+            heikin_ashi,
+            CandlesUtil.HeikinAshi(candles_open[window_slice], candles_high[window_slice],
+                                   candles_low[window_slice], candles_close[window_slice])
+        ):
+            np.testing.assert_array_equal(values, expected_values)
@@ -0,0 +1 @@
+from .indicators_cache import IndicatorsCache, get_shared_indicators_cache
\ No newline at end of file
@@ -0,0 +1,116 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import collections
+
+
+class IndicatorsCache:
+    """
+    Per candle cache of computed indicators.
+    Values are stored by (exchange, symbol, time frame) series. Each series only keeps values computed for its
+    last candles: when a new candle key is received, values of the oldest candle of this series are evicted.
+    Cached values are shared between every user of the cache and should therefore never be modified in place.
+    """
+    DEFAULT_MAX_SERIES = 1000
+    # last closed candle and in construction candle
+    DEFAULT_MAX_CANDLES_BY_SERIES = 2
+    DEFAULT_MAX_VALUES_BY_CANDLE = 50
+
+    def __init__(self, max_series=DEFAULT_MAX_SERIES, max_candles_by_series=DEFAULT_MAX_CANDLES_BY_SERIES,
+                 max_values_by_candle=DEFAULT_MAX_VALUES_BY_CANDLE):
+        self.max_series = max_series
+        self.max_candles_by_series = max_candles_by_series
+        self.max_values_by_candle = max_values_by_candle
+        # (exchange, symbol, time_frame): {candle_key: {(indicator, params): value}}
+        self._series = collections.OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_candle_key(candle_times, values):
+        """
+        :return: a key identifying the last candle of the given values. The last value is part of the key as
+        in construction candles values change while their time remains the same.
+        """
+        if not len(candle_times) or not len(values):
+            return None
+        return candle_times[-1], len(values), values[-1]
+
+    def get_or_compute(self, exchange, symbol, time_frame, candle_key, indicator, params, compute_function):
+        """
+        :param candle_key: identifier of the last candle used to compute the indicator, usually its time.
+        When None, the value is not cached.
+        :param compute_function: called without arguments to compute the value on cache miss
+        :return: the cached or computed indicator value
+        """
+        if candle_key is None:
+            self.misses += 1
+            return compute_function()
+        series_key = (exchange, symbol, time_frame)
+        values_key = (indicator, params)
+        values = self._get_candle_values(series_key, candle_key)
+        try:
+            value = values[values_key]
+            self.hits += 1
+            return value
+        except KeyError:
+            self.misses += 1
+            value = compute_function()
+            if len(values) >= self.max_values_by_candle:
+                values.pop(next(iter(values)))
+            values[values_key] = value
+            return value
+
+    def _get_candle_values(self, series_key, candle_key):
+        try:
+            values_by_candle = self._series[series_key]
+            self._series.move_to_end(series_key)
+        except KeyError:
+            values_by_candle = self._series[series_key] = {}
+            if len(self._series) > self.max_series:
+                self._series.popitem(last=False)
+        try:
+            return values_by_candle[candle_key]
+        except KeyError:
+            # new candle: oldest candle values are evicted
+            if len(values_by_candle) >= self.max_candles_by_series:
+                values_by_candle.pop(next(iter(values_by_candle)))
+            values = values_by_candle[candle_key] = {}
+            return values
+
+    def remove_series(self, exchange=None, symbol=None, time_frame=None):
+        for key in [
+            key
+            for key in self._series
+            if (exchange is None or key[0] == exchange)
+            and (symbol is None or key[1] == symbol)
+            and (time_frame is None or key[2] == time_frame)
+        ]:
+            self._series.pop(key)
+
+    def clear(self):
+        self._series.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+_SHARED_INDICATORS_CACHE = IndicatorsCache()
+
+
+def get_shared_indicators_cache() -> IndicatorsCache:
+    """
+    :return: the indicators cache shared by evaluators and DSL operators
+    """
+    return _SHARED_INDICATORS_CACHE
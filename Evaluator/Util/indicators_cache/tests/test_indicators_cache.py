@@ -0,0 +1,78 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import numpy as np
+
+import tentacles.Evaluator.Util as EvaluatorUtil
+
+
+def _compute(calls, value):
+    def _compute_function():
+        calls.append(value)
+        return value
+    return _compute_function
+
+
+def test_get_candle_key():
+    assert EvaluatorUtil.IndicatorsCache.get_candle_key(np.array([]), np.array([])) is None
+    assert EvaluatorUtil.IndicatorsCache.get_candle_key(np.array([60, 120]), np.array([1.5, 2.5])) == (120, 2, 2.5)
+
+
+def test_get_or_compute():
+    cache = EvaluatorUtil.IndicatorsCache()
+    calls = []
+    assert cache.get_or_compute("exchange_id", "BTC/USDT", "1h", (60, 1, 1), "rsi", (14, ), _compute(calls, 1)) == 1
+    assert cache.get_or_compute("exchange_id", "BTC/USDT", "1h", (60, 1, 1), "rsi", (14, ), _compute(calls, 2)) == 1
+    # different params, symbol or candle
+    assert cache.get_or_compute("exchange_id", "BTC/USDT", "1h", (60, 1, 1), "rsi", (10, ), _compute(calls, 3)) == 3
+    assert cache.get_or_compute("exchange_id", "ETH/USDT", "1h", (60, 1, 1), "rsi", (14, ), _compute(calls, 4)) == 4
+    assert cache.get_or_compute("exchange_id", "BTC/USDT", "1h", (120, 2, 1), "rsi", (14, ), _compute(calls, 5)) == 5
+    # no candle key: not cached
+    assert cache.get_or_compute("exchange_id", "BTC/USDT", "1h", None, "rsi", (14, ), _compute(calls, 6)) == 6
+    assert cache.get_or_compute("exchange_id", "BTC/USDT", "1h", None, "rsi", (14, ), _compute(calls, 7)) == 7
+    assert calls == [1, 3, 4, 5, 6, 7]
+    assert cache.hits == 1
+    assert cache.misses == 6
+
+
+def test_candles_eviction():
+    cache = EvaluatorUtil.IndicatorsCache(max_candles_by_series=2)
+    calls = []
+    cache.get_or_compute("exchange_id", "BTC/USDT", "1h", (60, 1, 1), "rsi", (14, ), _compute(calls, 1))
+    cache.get_or_compute("exchange_id", "BTC/USDT", "1h", (60, 1, 2), "rsi", (14, ), _compute(calls, 2))
+    # both candles are kept
+    assert cache.get_or_compute("exchange_id", "BTC/USDT", "1h", (60, 1, 1), "rsi", (14, ), _compute(calls, 3)) == 1
+    assert cache.get_or_compute("exchange_id", "BTC/USDT", "1h", (60, 1, 2), "rsi", (14, ), _compute(calls, 4)) == 2
+    # new candle: oldest candle is evicted
+    cache.get_or_compute("exchange_id", "BTC/USDT", "1h", (120, 2, 1), "rsi", (14, ), _compute(calls, 5))
+    assert cache.get_or_compute("exchange_id", "BTC/USDT", "1h", (60, 1, 1), "rsi", (14, ), _compute(calls, 6)) == 6
+    assert calls == [1, 2, 5, 6]
+
+
+def test_series_eviction_and_removal():
+    cache = EvaluatorUtil.IndicatorsCache(max_series=2)
+    calls = []
+    cache.get_or_compute("exchange_id", "BTC/USDT", "1h", (60, 1, 1), "rsi", (14, ), _compute(calls, 1))
+    cache.get_or_compute("exchange_id", "ETH/USDT", "1h", (60, 1, 1), "rsi", (14, ), _compute(calls, 2))
+    # BTC/USDT is the most recently used series
+    cache.get_or_compute("exchange_id", "BTC/USDT", "1h", (60, 1, 1), "rsi", (14, ), _compute(calls, 3))
+    cache.get_or_compute("exchange_id", "SOL/USDT", "1h", (60, 1, 1), "rsi", (14, ), _compute(calls, 4))
+    assert cache.get_or_compute("exchange_id", "ETH/USDT", "1h", (60, 1, 1), "rsi", (14, ), _compute(calls, 5)) == 5
+    assert calls == [1, 2, 4, 5]
+    cache.remove_series(symbol="ETH/USDT")
+    assert cache.get_or_compute("exchange_id", "ETH/USDT", "1h", (60, 1, 1), "rsi", (14, ), _compute(calls, 6)) == 6
+    cache.clear()
+    assert cache.hits == cache.misses == 0
+    assert cache.get_or_compute("exchange_id", "BTC/USDT", "1h", (60, 1, 1), "rsi", (14, ), _compute(calls, 7)) == 7
@@ -0,0 +1,2 @@
+from .streaming_indicators import StreamingIndicators, StreamingIndicator, StreamingEMA, StreamingRSI, \
+    StreamingMACD, StreamingBBands, StreamingADX, StreamingKVO
\ No newline at end of file
@@ -0,0 +1,535 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import collections
+import math
+
+import numpy as np
+
+
+class HistoryBuffer:
+    """
+    Fixed size history of float values stored in a numpy array larger than the history: appending is amortized
+    O(1) and kept values are always contiguous so that they can be returned as a read-only view, without copy.
+    Returned views are never modified by the next history_size appends.
+    """
+    # kept values are moved back to the start of the array once its end is reached
+    CAPACITY_MULTIPLIER = 3
+
+    def __init__(self, size):
+        self.size = size
+        self._values = np.empty(size * self.CAPACITY_MULTIPLIER, dtype=np.float64)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self):
+        return self._end - self._start
+
+    def append(self, value):
+        if self._end == len(self._values):
+            kept_count = min(len(self), self.size - 1)
+            self._values[:kept_count] = self._values[self._end - kept_count:self._end]
+            self._start = 0
+            self._end = kept_count
+        self._values[self._end] = value
+        self._end += 1
+        if self._end - self._start > self.size:
+            self._start += 1
+
+    def clear(self):
+        self._start = 0
+        self._end = 0
+
+    def get_last_value(self):
+        return self._values[self._end - 1] if self._end > self._start else None
+
+    def get_values(self, count=None):
+        """
+        :param count: maximum number of values to return
+        :return: a read-only view of the last values
+        """
+        start = self._start if count is None else max(self._start, self._end - max(count, 0))
+        values = self._values[start:self._end]
+        values.flags.writeable = False
+        return values
+
+
+class StreamingIndicator:
+    """
+    Stateful indicator advanced one closed candle at a time.
+    Computations follow the tulipy (tulip indicators) algorithms step by step so that a state seeded from a
+    candles history and then advanced candle by candle gives the same values as tulipy on the full history.
+    Only the last history_size computed values are kept.
+    Returned values are views on the kept values: they should never be modified in place.
+    """
+    INPUTS_COUNT = 1
+    OUTPUTS_COUNT = 1
+    # same as the default maximum candles count kept in RAM for each symbol and time frame
+    DEFAULT_HISTORY_SIZE = 3000
+
+    def __init__(self, history_size=DEFAULT_HISTORY_SIZE):
+        self.history_size = history_size
+        self.histories = tuple(HistoryBuffer(history_size) for _ in range(self.OUTPUTS_COUNT))
+        self.last_candle_time = None
+        self.last_candle_values = None
+        self.count = 0
+
+    def get_start_offset(self):
+        """
+        :return: the number of inputs consumed before the first output, same as tulipy's start
+        """
+        raise NotImplementedError("get_start_offset is not implemented")
+
+    def reset(self):
+        for history in self.histories:
+            history.clear()
+        self.last_candle_time = None
+        self.last_candle_values = None
+        self.count = 0
+        self._reset_state()
+
+    def update(self, *values):
+        """
+        Advance the indicator with the given closed candle values
+        :return: the new indicator value(s) or None when not enough data has been received yet
+        """
+        state, output = self._next(*values)
+        self._set_state(state)
+        self.count += 1
+        if output is not None:
+            if self.OUTPUTS_COUNT == 1:
+                self.histories[0].append(output)
+            else:
+                for history, value in zip(self.histories, output):
+                    history.append(value)
+        return output
+
+    def preview(self, *values):
+        """
+        :return: the indicator value(s) the given candle values would produce, without advancing the indicator.
+        Used for in construction candles.
+        """
+        return self._next(*values)[1]
+
+    def seed(self, *inputs):
+        """
+        Reset the indicator and feed it with the given inputs
+        """
+        self.reset()
+        for values in zip(*inputs):
+            self.update(*values)
+
+    def update_from_candles(self, candle_times, *inputs, include_in_construction=False):
+        """
+        Synchronize the indicator with the given candles: only candles closed after the last processed one
+        are fed to the indicator. The indicator is seeded again when the last processed candle can't be found.
+        :param candle_times: candles open times
+        :param inputs: candles values arrays required by the indicator (ex: high, low, close)
+        :param include_in_construction: when True, the last candle is considered in construction and is only
+        previewed
+        :return: the indicator values, including the in construction candle preview if any. Like with tulipy,
+        len(candle_times) - start offset values are returned (at most history_size)
+        """
+        closed_count = len(candle_times) - 1 if include_in_construction else len(candle_times)
+        if closed_count > 0:
+            start_index = self._get_first_new_candle_index(candle_times, closed_count, inputs)
+            if start_index is None:
+                self.seed(*(values[:closed_count] for values in inputs))
+            else:
+                for index in range(start_index, closed_count):
+                    self.update(*(values[index] for values in inputs))
+            self.last_candle_time = candle_times[closed_count - 1]
+            self.last_candle_values = tuple(values[closed_count - 1] for values in inputs)
+        preview = None
+        if include_in_construction and len(candle_times) > closed_count:
+            preview = self.preview(*(values[-1] for values in inputs))
+        return self.get_values(preview, max(0, len(candle_times) - self.get_start_offset()))
+
+    def get_values(self, preview=None, count=None):
+        """
+        :param preview: value(s) to add at the end of the returned values
+        :param count: maximum number of values to return, including preview
+        :return: the kept indicator values as numpy arrays (a tuple of arrays for multiple outputs indicators)
+        """
+        if self.OUTPUTS_COUNT == 1:
+            return self._get_output_values(self.histories[0], preview, count)
+        if preview is None:
+            return tuple(self._get_output_values(history, None, count) for history in self.histories)
+        return tuple(
+            self._get_output_values(history, output_preview, count)
+            for history, output_preview in zip(self.histories, preview)
+        )
+
+    @staticmethod
+    def _get_output_values(history, preview, count):
+        if preview is None:
+            return history.get_values(count)
+        # closed candles values are shared: the in construction candle preview is added to a copy
+        return np.append(history.get_values(None if count is None else count - 1), preview)
+
+    def get_last_value(self):
+        if not len(self.histories[0]):
+            return None
+        if self.OUTPUTS_COUNT == 1:
+            return self.histories[0].get_last_value()
+        return tuple(history.get_last_value() for history in self.histories)
+
+    def _get_first_new_candle_index(self, candle_times, closed_count, inputs):
+        if self.last_candle_time is None:
+            return None
+        if candle_times[closed_count - 1] == self.last_candle_time:
+            # no new closed candle
+            last_index = closed_count - 1
+        elif closed_count > 1 and candle_times[closed_count - 2] == self.last_candle_time:
+            # most frequent case: one new closed candle
+            last_index = closed_count - 2
+        else:
+            last_index = int(np.searchsorted(candle_times[:closed_count], self.last_candle_time))
+            if last_index >= closed_count or candle_times[last_index] != self.last_candle_time:
+                return None
+        if tuple(values[last_index] for values in inputs) != self.last_candle_values:
+            # candles have been replaced: the indicator has to be seeded again
+            return None
+        return last_index + 1
+
+    def _next(self, *values):
+        """
+        :return: the (state, output) tuple resulting from the given values without modifying the indicator
+        """
+        raise NotImplementedError("_next is not implemented")
+
+    def _set_state(self, state):
+        raise NotImplementedError("_set_state is not implemented")
+
+    def _reset_state(self):
+        raise NotImplementedError("_reset_state is not implemented")
+
+
+class StreamingEMA(StreamingIndicator):
+    def __init__(self, period, history_size=StreamingIndicator.DEFAULT_HISTORY_SIZE):
+        self.period = period
+        self.multiplier = 2 / (period + 1)
+        self.value = None
+        super().__init__(history_size=history_size)
+
+    def get_start_offset(self):
+        return 0
+
+    def _next(self, value):
+        if self.count == 0:
+            return value, value
+        ema = (value - self.value) * self.multiplier + self.value
+        return ema, ema
+
+    def _set_state(self, state):
+        self.value = state
+
+    def _reset_state(self):
+        self.value = None
+
+
+class StreamingRSI(StreamingIndicator):
+    def __init__(self, period, history_size=StreamingIndicator.DEFAULT_HISTORY_SIZE):
+        self.period = period
+        self.multiplier = 1.0 / period
+        self.previous_value = None
+        self.smooth_up = 0
+        self.smooth_down = 0
+        super().__init__(history_size=history_size)
+
+    def get_start_offset(self):
+        return self.period
+
+    def _next(self, value):
+        if self.count == 0:
+            return (value, 0, 0), None
+        upward = value - self.previous_value if value > self.previous_value else 0
+        downward = self.previous_value - value if value < self.previous_value else 0
+        if self.count < self.period:
+            return (value, self.smooth_up + upward, self.smooth_down + downward), None
+        if self.count == self.period:
+            smooth_up = (self.smooth_up + upward) / self.period
+            smooth_down = (self.smooth_down + downward) / self.period
+        else:
+            smooth_up = (upward - self.smooth_up) * self.multiplier + self.smooth_up
+            smooth_down = (downward - self.smooth_down) * self.multiplier + self.smooth_down
+        return (value, smooth_up, smooth_down), 100.0 * (smooth_up / (smooth_up + smooth_down))
+
+    def _set_state(self, state):
+        self.previous_value, self.smooth_up, self.smooth_down = state
+
+    def _reset_state(self):
+        self.previous_value = None
+        self.smooth_up = 0
+        self.smooth_down = 0
+
+
+class StreamingMACD(StreamingIndicator):
+    OUTPUTS_COUNT = 3
+
+    def __init__(self, short_period, long_period, signal_period,
+                 history_size=StreamingIndicator.DEFAULT_HISTORY_SIZE):
+        self.short_period = short_period
+        self.long_period = long_period
+        self.signal_period = signal_period
+        self.short_multiplier = 2 / (short_period + 1)
+        self.long_multiplier = 2 / (long_period + 1)
+        self.signal_multiplier = 2 / (signal_period + 1)
+        if short_period == 12 and long_period == 26:
+            # tulipy uses these historical multipliers for the standard MACD
+            self.short_multiplier = 0.15
+            self.long_multiplier = 0.075
+        self.short_ema = None
+        self.long_ema = None
+        self.signal_ema = 0
+        super().__init__(history_size=history_size)
+
+    def get_start_offset(self):
+        return self.long_period - 1
+
+    def _next(self, value):
+        if self.count == 0:
+            return (value, value, 0), None
+        short_ema = (value - self.short_ema) * self.short_multiplier + self.short_ema
+        long_ema = (value - self.long_ema) * self.long_multiplier + self.long_ema
+        macd = short_ema - long_ema
+        signal_ema = macd if self.count == self.long_period - 1 else self.signal_ema
+        if self.count < self.long_period - 1:
+            return (short_ema, long_ema, signal_ema), None
+        signal_ema = (macd - signal_ema) * self.signal_multiplier + signal_ema
+        return (short_ema, long_ema, signal_ema), (macd, signal_ema, macd - signal_ema)
+
+    def _set_state(self, state):
+        self.short_ema, self.long_ema, self.signal_ema = state
+
+    def _reset_state(self):
+        self.short_ema = None
+        self.long_ema = None
+        self.signal_ema = 0
+
+
+class StreamingBBands(StreamingIndicator):
+    """
+    Outputs are (lower, middle, upper) like in tulipy
+    """
+    OUTPUTS_COUNT = 3
+    # running sums accumulate rounding errors: they are periodically recomputed from the window values
+    UPDATES_BEFORE_SUMS_RECOMPUTE = 1000
+
+    def __init__(self, period, stddev, history_size=StreamingIndicator.DEFAULT_HISTORY_SIZE):
+        self.period = period
+        self.stddev = stddev
+        self.scale = 1.0 / period
+        self.window = collections.deque(maxlen=period)
+        self.sum = 0
+        self.sum2 = 0
+        self.updates_since_sums_recompute = 0
+        super().__init__(history_size=history_size)
+
+    def get_start_offset(self):
+        return self.period - 1
+
+    def _next(self, value):
+        total = self.sum + value
+        total2 = self.sum2 + value * value
+        if self.count < self.period - 1:
+            return (value, total, total2), None
+        if self.count >= self.period:
+            removed = self.window[0]
+            total -= removed
+            total2 -= removed * removed
+        middle = total * self.scale
+        deviation = math.sqrt(max(total2 * self.scale - middle * middle, 0))
+        return (value, total, total2), (middle - self.stddev * deviation, middle, middle + self.stddev * deviation)
+
+    def _set_state(self, state):
+        value, self.sum, self.sum2 = state
+        self.window.append(value)
+        self.updates_since_sums_recompute += 1
+        if self.updates_since_sums_recompute >= self.UPDATES_BEFORE_SUMS_RECOMPUTE:
+            self.recompute_sums()
+
+    def recompute_sums(self):
+        self.sum = math.fsum(self.window)
+        self.sum2 = math.fsum(value * value for value in self.window)
+        self.updates_since_sums_recompute = 0
+
+    def _reset_state(self):
+        self.window.clear()
+        self.sum = 0
+        self.sum2 = 0
+        self.updates_since_sums_recompute = 0
+
+
+class StreamingADX(StreamingIndicator):
+    INPUTS_COUNT = 3
+
+    def __init__(self, period, history_size=StreamingIndicator.DEFAULT_HISTORY_SIZE):
+        self.period = period
+        self.multiplier = (period - 1) / period
+        self.inverted_period = 1.0 / period
+        self.previous_candle = None
+        self.atr = 0
+        self.dm_up = 0
+        self.dm_down = 0
+        self.adx = 0.0
+        super().__init__(history_size=history_size)
+
+    def get_start_offset(self):
+        return (self.period - 1) * 2
+
+    def _next(self, high, low, close):
+        if self.count == 0:
+            return ((high, low, close), 0, 0, 0, 0.0), None
+        previous_high, previous_low, previous_close = self.previous_candle
+        true_range = max(high - low, abs(high - previous_close), abs(low - previous_close))
+        direction_up = high - previous_high
+        direction_down = previous_low - low
+        if direction_up < 0:
+            direction_up = 0
+        elif direction_up > direction_down:
+            direction_down = 0
+        if direction_down < 0:
+            direction_down = 0
+        elif direction_down > direction_up:
+            direction_up = 0
+        if self.count < self.period:
+            atr = self.atr + true_range
+            dm_up = self.dm_up + direction_up
+            dm_down = self.dm_down + direction_down
+        else:
+            atr = self.atr * self.multiplier + true_range
+            dm_up = self.dm_up * self.multiplier + direction_up
+            dm_down = self.dm_down * self.multiplier + direction_down
+        if self.count < self.period - 1:
+            return ((high, low, close), atr, dm_up, dm_down, 0.0), None
+        di_up = dm_up / atr
+        di_down = dm_down / atr
+        dx = abs(di_up - di_down) / (di_up + di_down) * 100
+        # first adx value is the average of the first period dx values
+        dx_index = self.count - (self.period - 1)
+        output = None
+        if dx_index < self.period - 1:
+            adx = self.adx + dx
+        elif dx_index == self.period - 1:
+            adx = self.adx + dx
+            output = adx * self.inverted_period
+        else:
+            adx = self.adx * self.multiplier + dx
+            output = adx * self.inverted_period
+        return ((high, low, close), atr, dm_up, dm_down, adx), output
+
+    def _set_state(self, state):
+        self.previous_candle, self.atr, self.dm_up, self.dm_down, self.adx = state
+
+    def _reset_state(self):
+        self.previous_candle = None
+        self.atr = 0
+        self.dm_up = 0
+        self.dm_down = 0
+        self.adx = 0.0
+
+
+class StreamingKVO(StreamingIndicator):
+    INPUTS_COUNT = 4
+
+    def __init__(self, short_period, long_period, history_size=StreamingIndicator.DEFAULT_HISTORY_SIZE):
+        self.short_period = short_period
+        self.long_period = long_period
+        self.short_multiplier = 2 / (short_period + 1)
+        self.long_multiplier = 2 / (long_period + 1)
+        self.previous_candle = None
+        self.trend = -1
+        self.cm = 0
+        self.short_ema = 0
+        self.long_ema = 0
+        super().__init__(history_size=history_size)
+
+    def get_start_offset(self):
+        return 1
+
+    def _next(self, high, low, close, volume):
+        hlc = high + low + close
+        if self.count == 0:
+            return ((high, low, hlc), -1, 0, 0, 0), None
+        previous_high, previous_low, previous_hlc = self.previous_candle
+        dm = high - low
+        trend = self.trend
+        cm = self.cm
+        if hlc > previous_hlc and trend != 1:
+            trend = 1
+            cm = previous_high - previous_low
+        elif hlc < previous_hlc and trend != 0:
+            trend = 0
+            cm = previous_high - previous_low
+        cm += dm
+        volume_force = volume * abs(dm / cm * 2 - 1) * 100 * (1.0 if trend else -1.0)
+        if self.count == 1:
+            short_ema = long_ema = volume_force
+        else:
+            short_ema = (volume_force - self.short_ema) * self.short_multiplier + self.short_ema
+            long_ema = (volume_force - self.long_ema) * self.long_multiplier + self.long_ema
+        return ((high, low, hlc), trend, cm, short_ema, long_ema), short_ema - long_ema
+
+    def _set_state(self, state):
+        self.previous_candle, self.trend, self.cm, self.short_ema, self.long_ema = state
+
+    def _reset_state(self):
+        self.previous_candle = None
+        self.trend = -1
+        self.cm = 0
+        self.short_ema = 0
+        self.long_ema = 0
+
+
+class StreamingIndicators:
+    """
+    Holds streaming indicators by exchange, symbol, time frame, indicator and parameters
+    """
+
+    def __init__(self, history_size=StreamingIndicator.DEFAULT_HISTORY_SIZE):
+        self.history_size = history_size
+        self.indicators = {}
+
+    def get_indicator(self, exchange_id, symbol, time_frame, indicator_class, *params):
+        key = (exchange_id, symbol, time_frame, indicator_class, params)
+        try:
+            return self.indicators[key]
+        except KeyError:
+            indicator = indicator_class(*params, history_size=self.history_size)
+            self.indicators[key] = indicator
+            return indicator
+
+    def update_from_candles(self, exchange_id, symbol, time_frame, indicator_class, params, candle_times, *inputs,
+                            include_in_construction=False):
+        """
+        :return: the values of the given indicator synchronized with the given candles
+        """
+        return self.get_indicator(exchange_id, symbol, time_frame, indicator_class, *params).update_from_candles(
+            candle_times, *inputs, include_in_construction=include_in_construction
+        )
+
+    def remove_indicators(self, exchange_id=None, symbol=None, time_frame=None):
+        for key in [
+            key
+            for key in self.indicators
+            if (exchange_id is None or key[0] == exchange_id)
+            and (symbol is None or key[1] == symbol)
+            and (time_frame is None or key[2] == time_frame)
+        ]:
+            self.indicators.pop(key)
+
+    def clear(self):
+        self.indicators.clear()
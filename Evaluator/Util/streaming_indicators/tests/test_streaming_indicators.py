@@ -0,0 +1,179 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import math
+import mock
+import numpy as np
+import pytest
+import tulipy
+
+import tentacles.Evaluator.Util as EvaluatorUtil
+from tentacles.Evaluator.Util.streaming_indicators import streaming_indicators
+
+
+@pytest.fixture
+def candles():
+    random_generator = np.random.default_rng(42)
+    size = 300
+    close = np.cumsum(random_generator.normal(0, 1, size)) + 100
+    high = close + random_generator.random(size) * 2
+    low = close - random_generator.random(size) * 2
+    volume = random_generator.random(size) * 1000
+    times = np.arange(size, dtype=np.float64) * 60
+    return times, high, low, close, volume
+
+
+def _get_cases(high, low, close, volume):
+    return [
+        (EvaluatorUtil.StreamingEMA, (21, ), (close, ), lambda: tulipy.ema(close, 21)),
+        (EvaluatorUtil.StreamingRSI, (14, ), (close, ), lambda: tulipy.rsi(close, 14)),
+        (EvaluatorUtil.StreamingMACD, (12, 26, 9), (close, ), lambda: tulipy.macd(close, 12, 26, 9)),
+        (EvaluatorUtil.StreamingMACD, (5, 20, 4), (close, ), lambda: tulipy.macd(close, 5, 20, 4)),
+        (EvaluatorUtil.StreamingBBands, (20, 2), (close, ), lambda: tulipy.bbands(close, 20, 2)),
+        (EvaluatorUtil.StreamingADX, (14, ), (high, low, close), lambda: tulipy.adx(high, low, close, 14)),
+        (EvaluatorUtil.StreamingKVO, (35, 55), (high, low, close, volume),
+         lambda: tulipy.kvo(high, low, close, volume, 35, 55)),
+    ]
+
+
+def _assert_equal_values(values, expected_values):
+    if isinstance(expected_values, tuple):
+        assert len(values) == len(expected_values)
+        for output_values, expected_output_values in zip(values, expected_values):
+            np.testing.assert_array_equal(output_values, expected_output_values)
+    else:
+        np.testing.assert_array_equal(values, expected_values)
+
+
+def test_seed(candles):
+    _, high, low, close, volume = candles
+    for indicator_class, params, inputs, expected in _get_cases(high, low, close, volume):
+        indicator = indicator_class(*params)
+        indicator.seed(*inputs)
+        _assert_equal_values(indicator.get_values(), expected())
+
+
+def test_update_one_candle_at_a_time(candles):
+    times, high, low, close, volume = candles
+    for indicator_class, params, inputs, expected in _get_cases(high, low, close, volume):
+        indicator = indicator_class(*params)
+        indicator.seed(*(values[:100] for values in inputs))
+        for index in range(100, len(times)):
+            indicator.update(*(values[index] for values in inputs))
+        _assert_equal_values(indicator.get_values(), expected())
+
+
+def test_update_from_candles(candles):
+    times, high, low, close, volume = candles
+    indicators = EvaluatorUtil.StreamingIndicators()
+    for indicator_class, params, inputs, expected in _get_cases(high, low, close, volume):
+        for end_index in (2, 60, 61, 62, 200, 180, len(times)):
+            for include_in_construction in (True, False):
+                values = indicators.update_from_candles(
+                    "exchange_id", "BTC/USDT", "1h", indicator_class, params, times[:end_index],
+                    *(input_values[:end_index] for input_values in inputs),
+                    include_in_construction=include_in_construction
+                )
+                indicator = indicators.get_indicator("exchange_id", "BTC/USDT", "1h", indicator_class, *params)
+                # in construction candle is previewed only
+                assert indicator.last_candle_time == times[end_index - (2 if include_in_construction else 1)]
+        _assert_equal_values(values, expected())
+
+
+def test_update_from_candles_with_replaced_candles(candles):
+    times, _, _, close, _ = candles
+    indicators = EvaluatorUtil.StreamingIndicators()
+    indicators.update_from_candles("exchange_id", "BTC/USDT", "1h", EvaluatorUtil.StreamingRSI, (14, ), times, close)
+    updated_close = close * 2
+    np.testing.assert_array_equal(
+        indicators.update_from_candles(
+            "exchange_id", "BTC/USDT", "1h", EvaluatorUtil.StreamingRSI, (14, ), times, updated_close
+        ),
+        tulipy.rsi(updated_close, 14)
+    )
+
+
+def test_history_size(candles):
+    times, _, _, close, _ = candles
+    indicators = EvaluatorUtil.StreamingIndicators(history_size=10)
+    values = indicators.update_from_candles(
+        "exchange_id", "BTC/USDT", "1h", EvaluatorUtil.StreamingRSI, (14, ), times, close
+    )
+    np.testing.assert_array_equal(values, tulipy.rsi(close, 14)[-10:])
+    indicator = indicators.get_indicator("exchange_id", "BTC/USDT", "1h", EvaluatorUtil.StreamingRSI, 14)
+    assert len(indicator.histories[0]) == 10
+    indicators.remove_indicators(exchange_id="exchange_id")
+    assert indicators.indicators == {}
+
+
+def test_history_buffer():
+    history = streaming_indicators.HistoryBuffer(5)
+    assert len(history) == 0
+    assert history.get_last_value() is None
+    assert list(history.get_values()) == []
+    returned_values = []
+    for value in range(40):
+        history.append(value)
+        kept_values = history.get_values()
+        assert list(kept_values) == list(range(max(0, value - 4), value + 1))
+        assert history.get_last_value() == value
+        with pytest.raises(ValueError):
+            kept_values[0] = 0
+        returned_values.append((kept_values, list(kept_values)))
+        # returned values are not modified by the next history size appends
+        for previous_values, expected_values in returned_values[-6:]:
+            assert list(previous_values) == expected_values
+    assert list(history.get_values(2)) == [38, 39]
+    assert list(history.get_values(0)) == []
+    history.clear()
+    assert len(history) == 0
+
+
+def test_get_values_with_preview(candles):
+    times, _, _, close, _ = candles
+    indicator = EvaluatorUtil.StreamingRSI(14, history_size=10)
+    first_preview_values = indicator.update_from_candles(times[:50], close[:50], include_in_construction=True)
+    # history_size closed values and the in construction candle preview
+    expected_first_preview_values = tulipy.rsi(close[:50], 14)[-11:]
+    np.testing.assert_array_equal(first_preview_values, expected_first_preview_values)
+    updated_close = np.append(close[:49], close[49] * 2)
+    np.testing.assert_array_equal(
+        indicator.update_from_candles(times[:50], updated_close, include_in_construction=True),
+        tulipy.rsi(updated_close, 14)[-11:]
+    )
+    indicator.update_from_candles(times[:51], close[:51], include_in_construction=True)
+    # previously returned values are not modified by later previews and updates
+    np.testing.assert_array_equal(first_preview_values, expected_first_preview_values)
+
+
+def test_bbands_sums_recompute(candles):
+    _, _, _, close, _ = candles
+    indicator = EvaluatorUtil.StreamingBBands(20, 2)
+    indicator.seed(close[:100])
+    indicator.recompute_sums()
+    indicator.sum += 1
+    with mock.patch.object(EvaluatorUtil.StreamingBBands, "UPDATES_BEFORE_SUMS_RECOMPUTE", 10):
+        for value in close[100:109]:
+            indicator.update(value)
+        # drift is kept until sums are recomputed
+        assert indicator.sum != math.fsum(indicator.window)
+        indicator.update(close[109])
+    assert indicator.updates_since_sums_recompute == 0
+    assert indicator.sum == math.fsum(indicator.window)
+    assert indicator.sum2 == math.fsum(value * value for value in indicator.window)
+    for value in close[110:]:
+        indicator.update(value)
+    for values, expected_values in zip(indicator.get_values(), tulipy.bbands(close, 20, 2)):
+        np.testing.assert_allclose(values[-100:], expected_values[-100:])
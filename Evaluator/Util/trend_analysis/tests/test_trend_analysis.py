@@ -0,0 +1,98 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+
+import numpy as np
+
+from tentacles.Evaluator.Util import TrendAnalysis
+
+
+def test_get_trend():
+    up_data = np.arange(1, 101, dtype=np.float64)
+    # shorter averages are higher than longer ones
+    assert TrendAnalysis.get_trend(up_data, [5, 10, 20]) == -0.66
+    assert TrendAnalysis.get_trend(up_data[::-1], [5, 10, 20]) == 0.66
+    # nan values only impact the averages they are part of
+    up_data[0] = np.nan
+    assert TrendAnalysis.get_trend(up_data, [5, 10, 20]) == -0.66
+    # no data: averages are 0
+    assert TrendAnalysis.get_trend(np.array([]), [5, 10]) == 0.5
+
+
+def _get_previous_implementation_trend(data, averages_to_use):
+    trend = 0
+    inc = round(1 / len(averages_to_use), 2)
+    averages = []
+    for average_to_use in averages_to_use:
+        data_to_mean = data[-average_to_use:]
+        if len(data_to_mean):
+            averages.append(np.mean(data_to_mean))
+        else:
+            averages.append(0)
+    for a in range(0, len(averages) - 1):
+        if averages[a] - averages[a + 1] > 0:
+            trend -= inc
+        else:
+            trend += inc
+    return trend
+
+
+def test_get_trend_same_as_previous_implementation():
+    randomizer = np.random.default_rng(0)
+    inputs = [
+        # flat values: averages are only equal when computed exactly
+        np.full(100, 0.3),
+        np.full(100, 1 / 3),
+        np.full(100, 12345.6789),
+        np.full(7, 0.1),
+        # monotonic values
+        np.arange(1, 101, dtype=np.float64) * 0.1,
+        np.linspace(3, 1, 200),
+        # noisy values
+        randomizer.random(300),
+        np.full(150, 0.7) + randomizer.normal(0, 1e-12, 150),
+    ]
+    for data in inputs:
+        for averages_to_use in ([5, 10, 20], [2, 3], [10, 50, 100, 500], [1, 7]):
+            assert TrendAnalysis.get_trend(data, averages_to_use) == \
+                _get_previous_implementation_trend(data, averages_to_use), (data[:3], averages_to_use)
+    np.testing.assert_array_equal(
+        TrendAnalysis.get_batch_trend(np.array(inputs[:3]), [5, 10, 20]),
+        np.array([_get_previous_implementation_trend(data, [5, 10, 20]) for data in inputs[:3]])
+    )
+
+
+def test_get_batch_trend():
+    data = np.array([np.arange(1, 101), np.arange(100, 0, -1), np.ones(100)], dtype=np.float64)
+    np.testing.assert_array_equal(TrendAnalysis.get_batch_trend(data, [5, 10, 20]), np.array([-0.66, 0.66, 0.66]))
+
+
+def test_get_threshold_change_indexes():
+    assert TrendAnalysis.get_threshold_change_indexes(np.array([]), 0) == []
+    assert TrendAnalysis.get_threshold_change_indexes(np.array([1, 2, 3]), 0) == []
+    assert TrendAnalysis.get_threshold_change_indexes(np.array([-1, -2, -3]), 0) == [0]
+    assert TrendAnalysis.get_threshold_change_indexes(np.array([1, -1, 2, -1, -2, 3, 4, -1, -1, 5]), 0) == \
+        [1, 3, 4, 7, 9]
+    assert TrendAnalysis.get_threshold_change_indexes(np.array([-1, -1, 1, -1, 1, -1, -1]), 0) == [0, 1, 3, 5]
+    assert TrendAnalysis.get_threshold_change_indexes(np.array([-1, np.nan, -1, 1, np.nan]), 0) == [0, 2]
+
+
+def test_get_batch_threshold_change_indexes():
+    data = np.array([
+        [1, -1, 2, -1, -2, 3, 4, -1, -1, 5],
+        [1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
+        [-1, -1, 1, -1, 1, -1, -1, -1, -1, -1],
+    ])
+    assert TrendAnalysis.get_batch_threshold_change_indexes(data, 0) == [[1, 3, 4, 7, 9], [], [0, 1, 3, 5]]
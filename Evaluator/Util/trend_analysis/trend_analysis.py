@@ -23,26 +23,33 @@ class TrendAnalysis:
     # trend > 0 --> Up trend
     @staticmethod
     def get_trend(data, averages_to_use):
-        trend = 0
-        inc = round(1 / len(averages_to_use), 2)
-        averages = []
-
-        # Get averages
-        for average_to_use in averages_to_use:
-            data_to_mean = data[-average_to_use:]
-            if len(data_to_mean):
-                averages.append(np.mean(data_to_mean))
-            else:
-                averages.append(0)
-
-        for a in range(0, len(averages) - 1):
-            if averages[a] - averages[a + 1] > 0:
-                trend -= inc
-            else:
-                trend += inc
+        return TrendAnalysis.get_batch_trend(np.asarray(data, dtype=np.float64)[np.newaxis, :], averages_to_use)[0]
 
+    @staticmethod
+    def get_batch_trend(data, averages_to_use):
+        """
+        :param data: 2D array: one row of values by symbol
+        :return: the array of the trend of each row (see get_trend)
+        """
+        inc = round(1 / len(averages_to_use), 2)
+        averages = TrendAnalysis._get_batch_averages(np.asarray(data, dtype=np.float64), averages_to_use)
+        trend = np.zeros(len(averages))
+        for a in range(0, len(averages_to_use) - 1):
+            trend += np.where(averages[:, a] - averages[:, a + 1] > 0, -inc, inc)
         return trend
 
+    @staticmethod
+    def _get_batch_averages(data, averages_to_use):
+        # averages of the last values of each row, 0 when there is no value
+        values_count = data.shape[1]
+        averages = np.zeros((len(data), len(averages_to_use)))
+        for i, average_to_use in enumerate(averages_to_use):
+            start = slice(-average_to_use, None).indices(values_count)[0]
+            if start < values_count:
+                # mean of each window: differences of cumulative sums drift and would change comparisons
+                averages[:, i] = np.mean(data[:, start:], axis=1)
+        return averages
+
     @staticmethod
     def peak_has_been_reached_already(data, neutral_val=0):
         if len(data) > 1:
@@ -110,33 +117,45 @@ class TrendAnalysis:
 
     @staticmethod
     def get_threshold_change_indexes(data, threshold):
+        return TrendAnalysis.get_batch_threshold_change_indexes(
+            np.asarray(data, dtype=np.float64)[np.newaxis, :], threshold
+        )[0]
 
-        # sub threshold values
-        sub_threshold_indexes = np.where(data <= threshold)[0]
-
-        # remove consecutive sub-threshold values because they are not crosses
-        threshold_crossing_indexes = []
-        current_move_size = 1
-        for i, index in enumerate(sub_threshold_indexes):
-            if not len(threshold_crossing_indexes):
-                threshold_crossing_indexes.append(index)
-            else:
-                if threshold_crossing_indexes[-1] == index - current_move_size:
-                    current_move_size += 1
-                else:
-                    if sub_threshold_indexes[i-1] not in threshold_crossing_indexes:
-                        threshold_crossing_indexes.append(sub_threshold_indexes[i-1])
-                    if index not in threshold_crossing_indexes:
-                        threshold_crossing_indexes.append(index)
-                    current_move_size = 1
-        # add last index if data_frame ends above threshold and last threshold_crossing_indexes inferior
-        # to data_frame size
-        if len(sub_threshold_indexes) > 0 \
-                and sub_threshold_indexes[-1] < len(data) \
-                and data[-1] > threshold \
-                and sub_threshold_indexes[-1]+1 not in threshold_crossing_indexes:
-            threshold_crossing_indexes.append(sub_threshold_indexes[-1]+1)
+    @staticmethod
+    def get_batch_threshold_change_indexes(data, threshold):
+        """
+        :param data: 2D array: one row of values by symbol
+        :return: the list of the threshold change indexes of each row (see get_threshold_change_indexes)
+        """
+        data = np.asarray(data, dtype=np.float64)
+        rows_count, values_count = data.shape
+        # sub threshold moves start where sub threshold values begin and end where they stop
+        padded_sub_threshold = np.zeros((rows_count, values_count + 2), dtype=np.int8)
+        padded_sub_threshold[:, 1:-1] = data <= threshold
+        changes = np.diff(padded_sub_threshold, axis=1)
+        starts_rows, starts = np.nonzero(changes == 1)
+        ends = np.nonzero(changes == -1)[1] - 1
+        split_indexes = np.cumsum(np.bincount(starts_rows, minlength=rows_count))[:-1]
+        ends_above_threshold = data[:, -1] > threshold if values_count else np.zeros(rows_count, dtype=bool)
+        return [
+            TrendAnalysis._get_threshold_change_indexes_from_moves(row_starts, row_ends, ends_above)
+            for row_starts, row_ends, ends_above in zip(
+                np.split(starts, split_indexes), np.split(ends, split_indexes), ends_above_threshold
+            )
+        ]
 
+    @staticmethod
+    def _get_threshold_change_indexes_from_moves(starts, ends, ends_above_threshold):
+        if not len(starts):
+            return []
+        # start and end (when different from start) of each sub threshold move but the last one
+        change_indexes = np.column_stack((starts[:-1], ends[:-1])).ravel()
+        kept_indexes = np.column_stack((np.ones(len(starts) - 1, dtype=bool), ends[:-1] != starts[:-1])).ravel()
+        threshold_crossing_indexes = change_indexes[kept_indexes].tolist()
+        threshold_crossing_indexes.append(int(starts[-1]))
+        # add last index if data ends above threshold
+        if ends_above_threshold:
+            threshold_crossing_indexes.append(int(ends[-1]) + 1)
         return threshold_crossing_indexes
 
     @staticmethod
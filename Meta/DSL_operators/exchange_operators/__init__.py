@@ -19,6 +19,7 @@ import tentacles.Meta.DSL_operators.exchange_operators.exchange_public_data_oper
 from tentacles.Meta.DSL_operators.exchange_operators.exchange_public_data_operators import (
     OHLCVOperator,
     ExchangeDataDependency,
+    IndicatorsCacheKey,
     create_ohlcv_operators,
 )
 import tentacles.Meta.DSL_operators.exchange_operators.exchange_private_data_operators
@@ -31,6 +32,7 @@ from tentacles.Meta.DSL_operators.exchange_operators.exchange_private_data_opera
 __all__ = [
     "OHLCVOperator",
     "ExchangeDataDependency",
+    "IndicatorsCacheKey",
     "create_ohlcv_operators",
     "PortfolioOperator",
     "create_portfolio_operators",
@@ -19,11 +19,13 @@ import tentacles.Meta.DSL_operators.exchange_operators.exchange_public_data_oper
 from tentacles.Meta.DSL_operators.exchange_operators.exchange_public_data_operators.ohlcv_operators import (
     OHLCVOperator,
     ExchangeDataDependency,
+    IndicatorsCacheKey,
     create_ohlcv_operators,
 )
 
 __all__ = [
     "OHLCVOperator",
     "ExchangeDataDependency",
+    "IndicatorsCacheKey",
     "create_ohlcv_operators",
 ]
\ No newline at end of file
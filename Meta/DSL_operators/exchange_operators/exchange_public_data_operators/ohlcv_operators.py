@@ -42,10 +42,21 @@ class ExchangeDataDependency(dsl_interpreter.InterpreterDependency):
         return hash((self.exchange_manager_id, self.symbol, self.time_frame, self.data_source))
 
 
+@dataclasses.dataclass(frozen=True)
+class IndicatorsCacheKey:
+    exchange_manager_id: str
+    symbol: str
+    time_frame: str
+    candle_key: tuple
+    data_source: str
+
+
 class OHLCVOperator(exchange_operator.ExchangeOperator):
     def __init__(self, *parameters: dsl_interpreter.OperatorParameterType, **kwargs: typing.Any):
         super().__init__(*parameters, **kwargs)
         self.value: dsl_interpreter_operator.ComputedOperatorParameterType = exchange_operator.UNINITIALIZED_VALUE # type: ignore
+        # identifies self.value in indicators caches, None when self.value can't be cached
+        self.indicators_cache_key: typing.Optional[IndicatorsCacheKey] = None
 
     @staticmethod
     def get_library() -> str:
@@ -87,10 +98,16 @@ def create_ohlcv_operators(
     if exchange_manager is None and candle_manager_by_time_frame_by_symbol is None:
         raise octobot_commons.errors.InvalidParametersError("exchange_manager or candle_manager_by_time_frame_by_symbol must be provided")
 
+    # values by symbol, time frame, value type and limit, associated to the candles state they have been read from:
+    # candles are read once per candle (or kline update) and shared with every operator using them
+    candles_values_cache: typing.Dict[
+        tuple, typing.Tuple[tuple, np.ndarray, typing.Optional[IndicatorsCacheKey]]
+    ] = {}
+
     def _get_candles_values_with_latest_kline_if_available(
         input_symbol: typing.Optional[str], input_time_frame: typing.Optional[str],
         value_type: commons_enums.PriceIndexes, limit: int = -1
-    ) -> np.ndarray:
+    ) -> typing.Tuple[np.ndarray, typing.Optional[IndicatorsCacheKey]]:
         _symbol = input_symbol or symbol
         _time_frame = input_time_frame or time_frame
         if exchange_manager is None:
@@ -104,26 +121,45 @@ def create_ohlcv_operators(
             candles_manager = octobot_trading.api.get_symbol_candles_manager(
                 symbol_data, _time_frame
             )
+        kline = (_get_kline(symbol_data, _time_frame) if symbol_data is not None else None) or None
+        last_candle_time = candles_manager.time_candles[candles_manager.time_candles_index - 1]
+        candles_state = (
+            candles_manager.time_candles_index, last_candle_time, None if kline is None else tuple(kline)
+        )
+        cache_key = (_symbol, _time_frame, value_type, limit)
+        if (cached := candles_values_cache.get(cache_key)) is not None and cached[0] == candles_state:
+            return cached[1], cached[2]
+        candles_values, indicators_cache_key = _get_candles_values_with_kline(
+            candles_manager, kline, _symbol, _time_frame, value_type, limit, last_candle_time
+        )
+        candles_values_cache[cache_key] = (candles_state, candles_values, indicators_cache_key)
+        return candles_values, indicators_cache_key
+
+    def _get_candles_values_with_kline(
+        candles_manager: octobot_trading.exchange_data.CandlesManager, kline: typing.Optional[list],
+        _symbol: str, _time_frame: str, value_type: commons_enums.PriceIndexes, limit: int, last_candle_time: float
+    ) -> typing.Tuple[np.ndarray, typing.Optional[IndicatorsCacheKey]]:
         candles_values = _get_candles_values(candles_manager, value_type, limit)
-        if symbol_data is not None and (kline := _get_kline(symbol_data, _time_frame)):
+        if kline is not None:
             kline_time = kline[commons_enums.PriceIndexes.IND_PRICE_TIME.value]
-            last_candle_time = candles_manager.time_candles[candles_manager.time_candles_index - 1]
             if kline_time == last_candle_time:
                 # kline is an update of the last candle
-                return _adapt_last_candle_value(candles_manager, value_type, candles_values, kline)
+                candles_values = _adapt_last_candle_value(candles_manager, value_type, candles_values, kline)
+                return candles_values, _get_indicators_cache_key(exchange_manager, _symbol, _time_frame, value_type, candles_values, last_candle_time)
             else:
                 tf_seconds = commons_enums.TimeFramesMinutes[commons_enums.TimeFrames(_time_frame)] * octobot_commons.constants.MINUTE_TO_SECONDS
                 if kline_time == last_candle_time + tf_seconds:
                     # kline is a new candle
                     kline_value = kline[value_type.value]
-                    return np.append(candles_values[1:], kline_value)
+                    candles_values = np.append(candles_values[1:], kline_value)
+                    return candles_values, _get_indicators_cache_key(exchange_manager, _symbol, _time_frame, value_type, candles_values, kline_time)
                 else:
                     octobot_commons.logging.get_logger(OHLCVOperator.__name__).error(
                         f"{exchange_manager.exchange_name + '' if exchange_manager is not None else ''}{_symbol} {_time_frame} "
                         f"kline time ({kline_time}) is not equal to last candle time not the last time + {_time_frame} "
                         f"({last_candle_time} + {tf_seconds}) seconds. Kline has been ignored."
                     )
-        return candles_values
+        return candles_values, _get_indicators_cache_key(exchange_manager, _symbol, _time_frame, value_type, candles_values, last_candle_time)
 
     def _get_dependencies() -> typing.List[ExchangeDataDependency]:
         return [
@@ -142,7 +178,9 @@ def create_ohlcv_operators(
 
         async def pre_compute(self) -> None:
             await super().pre_compute()
-            self.value = _get_candles_values_with_latest_kline_if_available(*self.get_symbol_and_time_frame(), self.PRICE_INDEX, -1)
+            self.value, self.indicators_cache_key = _get_candles_values_with_latest_kline_if_available(
+                *self.get_symbol_and_time_frame(), self.PRICE_INDEX, -1
+            )
     
     class _OpenPriceOperator(_LocalOHLCVOperator):
         DESCRIPTION = "Returns the candle's open price as array of floats"
@@ -206,6 +244,22 @@ def create_ohlcv_operators(
 
     return [_OpenPriceOperator, _HighPriceOperator, _LowPriceOperator, _ClosePriceOperator, _VolumePriceOperator, _TimePriceOperator]
 
+def _get_indicators_cache_key(
+    exchange_manager: typing.Optional[octobot_trading.exchanges.ExchangeManager],
+    symbol: str, time_frame: str, value_type: commons_enums.PriceIndexes, values: np.ndarray, last_time: float
+) -> typing.Optional[IndicatorsCacheKey]:
+    if exchange_manager is None or not len(values):
+        return None
+    return IndicatorsCacheKey(
+        exchange_manager_id=octobot_trading.api.get_exchange_manager_id(exchange_manager),
+        symbol=symbol,
+        time_frame=time_frame,
+        # last value is part of the key as in construction candles are updated by klines
+        candle_key=(last_time, len(values), values[-1]),
+        data_source=value_type.name,
+    )
+
+
 def _get_kline(
     symbol_data: octobot_trading.exchange_data.ExchangeSymbolData, _time_frame: str
 ) -> typing.Optional[list]:
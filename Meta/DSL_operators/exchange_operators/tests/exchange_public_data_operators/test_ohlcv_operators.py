@@ -247,3 +247,36 @@ async def test_ohlcv_operators_dependencies(interpreter, operator, exchange_mana
         #     data_source=octobot_trading.constants.OHLCV_CHANNEL
         # ),
     ]
+
+
+@pytest.mark.asyncio
+async def test_ohlcv_operators_values_are_read_once_per_candle(
+    interpreter_with_exchange_manager_and_new_candle_klines, exchange_manager_with_candles_and_new_candle_klines,
+    historical_prices, historical_volume, historical_times
+):
+    candles_manager = octobot_trading.api.get_symbol_candles_manager(
+        octobot_trading.api.get_symbol_data(exchange_manager_with_candles_and_new_candle_klines, SYMBOL), TIME_FRAME
+    )
+    kline_adapted_close = _adapted_for_kline(historical_prices, "close", 3600)
+    with mock.patch.object(
+        ohlcv_operators, "_get_candles_values", mock.Mock(wraps=ohlcv_operators._get_candles_values)
+    ) as _get_candles_values_mock:
+        assert await interpreter_with_exchange_manager_and_new_candle_klines.interprete("close[-1] - close[-2]") == \
+            kline_adapted_close[-1] - kline_adapted_close[-2]
+        assert np.array_equal(
+            await interpreter_with_exchange_manager_and_new_candle_klines.interprete("close"), kline_adapted_close
+        )
+        # read once for all the close operators of every interpretation
+        _get_candles_values_mock.assert_called_once()
+        # other values and symbols are read separately
+        assert np.array_equal(
+            await interpreter_with_exchange_manager_and_new_candle_klines.interprete("close('ETH/USDT') + volume"),
+            _adapted_for_kline(historical_prices / 2, "close", 3600)
+            + np.append(historical_volume[1:], historical_volume[-1] + KLINE_SIGNATURE)
+        )
+        assert _get_candles_values_mock.call_count == 3
+
+        # new candle: read again
+        candles_manager.time_candles = np.append(historical_times[1:], historical_times[-1] + 3600)
+        await interpreter_with_exchange_manager_and_new_candle_klines.interprete("close")
+        assert _get_candles_values_mock.call_count == 4
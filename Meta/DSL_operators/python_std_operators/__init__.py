@@ -78,6 +78,19 @@ import tentacles.Meta.DSL_operators.python_std_operators.base_iterable_operators
 from tentacles.Meta.DSL_operators.python_std_operators.base_iterable_operators import (
     ListOperator,
 )
+import tentacles.Meta.DSL_operators.python_std_operators.array_operands as dsl_interpreter_array_operands
+from tentacles.Meta.DSL_operators.python_std_operators.array_operands import (
+    has_array_operand,
+    align_array_operands,
+    get_latest_value,
+    to_python_value,
+)
+import tentacles.Meta.DSL_operators.python_std_operators.common_subexpressions as dsl_interpreter_common_subexpressions
+from tentacles.Meta.DSL_operators.python_std_operators.common_subexpressions import (
+    SharedSubexpressionOperator,
+    CommonSubexpressionsInterpreter,
+    share_common_subexpressions,
+)
 
 __all__ = [
     "AddOperator",
@@ -116,4 +129,11 @@ __all__ = [
     "SubscriptOperator",
     "SliceOperator",
     "ListOperator",
+    "has_array_operand",
+    "align_array_operands",
+    "get_latest_value",
+    "to_python_value",
+    "SharedSubexpressionOperator",
+    "CommonSubexpressionsInterpreter",
+    "share_common_subexpressions",
 ]
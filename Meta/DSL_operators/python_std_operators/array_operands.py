@@ -0,0 +1,68 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring
+#  Drakkar-Software OctoBot-Commons
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import numpy as np
+
+
+def has_array_operand(*operands) -> bool:
+    """
+    :return: True when at least one of the operands is a numpy array, in which case operations should
+    be computed element-wise instead of using python truthiness
+    """
+    return any(isinstance(operand, np.ndarray) for operand in operands)
+
+
+def align_array_operands(*operands) -> list:
+    """
+    Align time series arrays of different lengths on their most recent values: indicators results are
+    shorter than their input by their warmup period but always end at the latest candle.
+    :return: the operands where each array is trimmed to the shortest array length by removing its oldest values
+    """
+    arrays_lengths = [len(operand) for operand in operands if isinstance(operand, np.ndarray) and operand.ndim == 1]
+    if not arrays_lengths or min(arrays_lengths) == max(arrays_lengths):
+        return list(operands)
+    length = min(arrays_lengths)
+    return [
+        operand[len(operand) - length:] if isinstance(operand, np.ndarray) and operand.ndim == 1 else operand
+        for operand in operands
+    ]
+
+
+def get_latest_value(value):
+    """
+    :return: the most recent value of a time series array, other values are returned as is
+    """
+    if isinstance(value, np.ndarray):
+        if value.ndim != 1 or value.size == 0:
+            raise ValueError(
+                f"Can't get the latest value of an array of shape {value.shape}: expected a non-empty time series"
+            )
+        return value[-1]
+    return value
+
+
+def to_python_value(value):
+    """
+    Materialize numpy values computed by operators into python values. Operators pass numpy arrays to each
+    other without copying them: call this only once on the final result of an expression.
+    """
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return [to_python_value(element) for element in value]
+    return value
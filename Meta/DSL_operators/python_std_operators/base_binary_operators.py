@@ -19,6 +19,8 @@ import ast
 import octobot_commons.dsl_interpreter.operators.binary_operator as dsl_interpreter_binary_operator
 import octobot_commons.dsl_interpreter.operator as dsl_interpreter_operator
 
+import tentacles.Meta.DSL_operators.python_std_operators.array_operands as array_operands
+
 
 class AddOperator(dsl_interpreter_binary_operator.BinaryOperator):
     NAME = "+"
@@ -30,7 +32,7 @@ class AddOperator(dsl_interpreter_binary_operator.BinaryOperator):
         return ast.Add.__name__
 
     def compute(self) -> dsl_interpreter_operator.ComputedOperatorParameterType:
-        left, right = self.get_computed_left_and_right_parameters()
+        left, right = array_operands.align_array_operands(*self.get_computed_left_and_right_parameters())
         return left + right
 
 
@@ -44,7 +46,7 @@ class SubOperator(dsl_interpreter_binary_operator.BinaryOperator):
         return ast.Sub.__name__
 
     def compute(self) -> dsl_interpreter_operator.ComputedOperatorParameterType:
-        left, right = self.get_computed_left_and_right_parameters()
+        left, right = array_operands.align_array_operands(*self.get_computed_left_and_right_parameters())
         return left - right
 
 
@@ -58,7 +60,7 @@ class MultOperator(dsl_interpreter_binary_operator.BinaryOperator):
         return ast.Mult.__name__
 
     def compute(self) -> dsl_interpreter_operator.ComputedOperatorParameterType:
-        left, right = self.get_computed_left_and_right_parameters()
+        left, right = array_operands.align_array_operands(*self.get_computed_left_and_right_parameters())
         return left * right
 
 
@@ -72,7 +74,7 @@ class DivOperator(dsl_interpreter_binary_operator.BinaryOperator):
         return ast.Div.__name__
 
     def compute(self) -> dsl_interpreter_operator.ComputedOperatorParameterType:
-        left, right = self.get_computed_left_and_right_parameters()
+        left, right = array_operands.align_array_operands(*self.get_computed_left_and_right_parameters())
         return left / right
 
 
@@ -86,7 +88,7 @@ class FloorDivOperator(dsl_interpreter_binary_operator.BinaryOperator):
         return ast.FloorDiv.__name__
 
     def compute(self) -> dsl_interpreter_operator.ComputedOperatorParameterType:
-        left, right = self.get_computed_left_and_right_parameters()
+        left, right = array_operands.align_array_operands(*self.get_computed_left_and_right_parameters())
         return left // right
 
 
@@ -100,7 +102,7 @@ class ModOperator(dsl_interpreter_binary_operator.BinaryOperator):
         return ast.Mod.__name__
 
     def compute(self) -> dsl_interpreter_operator.ComputedOperatorParameterType:
-        left, right = self.get_computed_left_and_right_parameters()
+        left, right = array_operands.align_array_operands(*self.get_computed_left_and_right_parameters())
         return left % right
 
 
@@ -114,5 +116,5 @@ class PowOperator(dsl_interpreter_binary_operator.BinaryOperator):
         return ast.Pow.__name__
 
     def compute(self) -> dsl_interpreter_operator.ComputedOperatorParameterType:
-        left, right = self.get_computed_left_and_right_parameters()
+        left, right = array_operands.align_array_operands(*self.get_computed_left_and_right_parameters())
         return left**right
@@ -19,6 +19,8 @@ import ast
 import octobot_commons.dsl_interpreter.operators.compare_operator as dsl_interpreter_compare_operator
 import octobot_commons.dsl_interpreter.operator as dsl_interpreter_operator
 
+import tentacles.Meta.DSL_operators.python_std_operators.array_operands as array_operands
+
 
 class EqOperator(dsl_interpreter_compare_operator.CompareOperator):
     NAME = "=="
@@ -30,7 +32,7 @@ class EqOperator(dsl_interpreter_compare_operator.CompareOperator):
         return ast.Eq.__name__
 
     def compute(self) -> dsl_interpreter_operator.ComputedOperatorParameterType:
-        left, right = self.get_computed_left_and_right_parameters()
+        left, right = array_operands.align_array_operands(*self.get_computed_left_and_right_parameters())
         return left == right
 
 
@@ -44,7 +46,7 @@ class NotEqOperator(dsl_interpreter_compare_operator.CompareOperator):
         return ast.NotEq.__name__
 
     def compute(self) -> dsl_interpreter_operator.ComputedOperatorParameterType:
-        left, right = self.get_computed_left_and_right_parameters()
+        left, right = array_operands.align_array_operands(*self.get_computed_left_and_right_parameters())
         return left != right
 
 
@@ -58,7 +60,7 @@ class LtOperator(dsl_interpreter_compare_operator.CompareOperator):
         return ast.Lt.__name__
 
     def compute(self) -> dsl_interpreter_operator.ComputedOperatorParameterType:
-        left, right = self.get_computed_left_and_right_parameters()
+        left, right = array_operands.align_array_operands(*self.get_computed_left_and_right_parameters())
         return left < right
 
 
@@ -72,7 +74,7 @@ class LtEOperator(dsl_interpreter_compare_operator.CompareOperator):
         return ast.LtE.__name__
 
     def compute(self) -> dsl_interpreter_operator.ComputedOperatorParameterType:
-        left, right = self.get_computed_left_and_right_parameters()
+        left, right = array_operands.align_array_operands(*self.get_computed_left_and_right_parameters())
         return left <= right
 
 
@@ -86,7 +88,7 @@ class GtOperator(dsl_interpreter_compare_operator.CompareOperator):
         return ast.Gt.__name__
 
     def compute(self) -> dsl_interpreter_operator.ComputedOperatorParameterType:
-        left, right = self.get_computed_left_and_right_parameters()
+        left, right = array_operands.align_array_operands(*self.get_computed_left_and_right_parameters())
         return left > right
 
 
@@ -100,7 +102,7 @@ class GtEOperator(dsl_interpreter_compare_operator.CompareOperator):
         return ast.GtE.__name__
 
     def compute(self) -> dsl_interpreter_operator.ComputedOperatorParameterType:
-        left, right = self.get_computed_left_and_right_parameters()
+        left, right = array_operands.align_array_operands(*self.get_computed_left_and_right_parameters())
         return left >= right
 
 
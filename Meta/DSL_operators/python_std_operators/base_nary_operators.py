@@ -15,16 +15,21 @@
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
 import ast
+import functools
+
+import numpy as np
 
 import octobot_commons.dsl_interpreter.operators.n_ary_operator as dsl_interpreter_n_ary_operator
 import octobot_commons.dsl_interpreter.operator as dsl_interpreter_operator
 
+import tentacles.Meta.DSL_operators.python_std_operators.array_operands as array_operands
+
 
 class AndOperator(dsl_interpreter_n_ary_operator.NaryOperator):
     MIN_PARAMS = 1
     MAX_PARAMS = None
     NAME = "and"
-    DESCRIPTION = "Logical AND operator. Returns True if all operands are truthy, otherwise returns False."
+    DESCRIPTION = "Logical AND operator. Returns True if all operands are truthy, otherwise returns False. Applied element-wise on arrays."
     EXAMPLE = "True and False"
 
     @staticmethod
@@ -33,6 +38,9 @@ class AndOperator(dsl_interpreter_n_ary_operator.NaryOperator):
 
     def compute(self) -> dsl_interpreter_operator.ComputedOperatorParameterType:
         operands = self.get_computed_parameters()
+        if array_operands.has_array_operand(*operands):
+            # element-wise and on the most recent values of each array
+            return functools.reduce(np.logical_and, array_operands.align_array_operands(*operands))
         return all(operands)
 
 
@@ -40,7 +48,7 @@ class OrOperator(dsl_interpreter_n_ary_operator.NaryOperator):
     MIN_PARAMS = 1
     MAX_PARAMS = None
     NAME = "or"
-    DESCRIPTION = "Logical OR operator. Returns True if any operand is truthy, otherwise returns False."
+    DESCRIPTION = "Logical OR operator. Returns True if any operand is truthy, otherwise returns False. Applied element-wise on arrays."
     EXAMPLE = "True or False"
 
     @staticmethod
@@ -49,4 +57,7 @@ class OrOperator(dsl_interpreter_n_ary_operator.NaryOperator):
 
     def compute(self) -> dsl_interpreter_operator.ComputedOperatorParameterType:
         operands = self.get_computed_parameters()
+        if array_operands.has_array_operand(*operands):
+            # element-wise or on the most recent values of each array
+            return functools.reduce(np.logical_or, array_operands.align_array_operands(*operands))
         return any(operands)
@@ -16,9 +16,13 @@
 #  License along with this library.
 import ast
 
+import numpy as np
+
 import octobot_commons.dsl_interpreter.operators.unary_operator as dsl_interpreter_unary_operator
 import octobot_commons.dsl_interpreter.operator as dsl_interpreter_operator
 
+import tentacles.Meta.DSL_operators.python_std_operators.array_operands as array_operands
+
 
 class UAddOperator(dsl_interpreter_unary_operator.UnaryOperator):
     NAME = "+"
@@ -50,7 +54,7 @@ class USubOperator(dsl_interpreter_unary_operator.UnaryOperator):
 
 class NotOperator(dsl_interpreter_unary_operator.UnaryOperator):
     NAME = "not"
-    DESCRIPTION = "Logical NOT operator. Returns True if the operand is falsy, False if it is truthy."
+    DESCRIPTION = "Logical NOT operator. Returns True if the operand is falsy, False if it is truthy. Applied element-wise on arrays."
     EXAMPLE = "not True"
 
     @staticmethod
@@ -59,6 +63,8 @@ class NotOperator(dsl_interpreter_unary_operator.UnaryOperator):
 
     def compute(self) -> dsl_interpreter_operator.ComputedOperatorParameterType:
         operand = self.get_computed_operand()
+        if array_operands.has_array_operand(operand):
+            return np.logical_not(operand)
         return not operand
 
 
@@ -73,5 +79,7 @@ class InvertOperator(dsl_interpreter_unary_operator.UnaryOperator):
 
     def compute(self) -> dsl_interpreter_operator.ComputedOperatorParameterType:
         operand = self.get_computed_operand()
+        if array_operands.has_array_operand(operand):
+            return np.logical_not(operand)
         return not operand  # ~operand has been deprecated in favor of "not"
         # return ~operand
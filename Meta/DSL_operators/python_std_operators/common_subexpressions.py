@@ -0,0 +1,158 @@
+# pylint: disable=missing-class-docstring,missing-function-docstring
+#  Drakkar-Software OctoBot-Commons
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import ast
+import collections
+import typing
+
+import octobot_commons.constants
+import octobot_commons.dsl_interpreter as dsl_interpreter
+
+
+class Evaluation:
+    """
+    Identifies the current evaluation of an expression: shared subexpressions are computed once per evaluation
+    """
+    def __init__(self):
+        self.index: int = 0
+
+    def start(self):
+        self.index += 1
+
+
+class SharedSubexpressionOperator(dsl_interpreter.Operator):
+    """
+    Wraps an operator found several times in the same expression, such as close() and rsi(close(), 14) in
+    "rsi(close(), 14) > 70 and rsi(close(), 14) < 90". Its value is pre-computed and computed once per evaluation
+    and shared with every operator using it.
+    """
+    def __init__(self, operator: dsl_interpreter.Operator, evaluation: Evaluation):
+        super().__init__(operator)
+        self.operator: dsl_interpreter.Operator = operator
+        self.evaluation: Evaluation = evaluation
+        self._pre_computed_evaluation_index: typing.Optional[int] = None
+        self._computed_evaluation_index: typing.Optional[int] = None
+        self._value: dsl_interpreter.ComputedOperatorParameterType = None
+
+    @staticmethod
+    def get_name() -> str:
+        return "shared_subexpression"
+
+    @staticmethod
+    def get_library() -> str:
+        # not an operator of the DSL: should not be included in the get_all_operators function return values
+        return octobot_commons.constants.CONTEXTUAL_OPERATORS_LIBRARY
+
+    def __getattr__(self, name: str) -> typing.Any:
+        # expose the wrapped operator attributes, such as its indicators_cache_key
+        if name == "operator":
+            raise AttributeError(name)
+        return getattr(self.operator, name)
+
+    async def pre_compute(self) -> None:
+        if self._pre_computed_evaluation_index != self.evaluation.index:
+            self._pre_computed_evaluation_index = self.evaluation.index
+            await self.operator.pre_compute()
+
+    def compute(self) -> dsl_interpreter.ComputedOperatorParameterType:
+        if self._computed_evaluation_index != self.evaluation.index:
+            self._value = self.operator.compute()
+            self._computed_evaluation_index = self.evaluation.index
+        return self._value
+
+
+def _get_subexpression_key(parameter: dsl_interpreter.OperatorParameterType) -> typing.Hashable:
+    if isinstance(parameter, dsl_interpreter.Operator):
+        return (
+            type(parameter),
+            tuple(_get_subexpression_key(sub_parameter) for sub_parameter in parameter.parameters),
+            tuple((key, _get_subexpression_key(value)) for key, value in sorted(parameter.kwargs.items())),
+        )
+    if isinstance(parameter, ast.AST):
+        # subscripting contexts
+        return type(parameter)
+    try:
+        hash(parameter)
+    except TypeError:
+        # unhashable values are never shared
+        return type(parameter), id(parameter)
+    return type(parameter), parameter
+
+
+def _count_subexpressions(
+    operator: dsl_interpreter.Operator, keys: dict[int, typing.Hashable], counts: collections.Counter
+) -> typing.Hashable:
+    for parameter in operator.parameters:
+        if isinstance(parameter, dsl_interpreter.Operator):
+            _count_subexpressions(parameter, keys, counts)
+    key = keys[id(operator)] = _get_subexpression_key(operator)
+    counts[key] += 1
+    return key
+
+
+def _share_subexpressions(
+    operator: dsl_interpreter.Operator, keys: dict[int, typing.Hashable], counts: collections.Counter,
+    shared_operators: dict[typing.Hashable, SharedSubexpressionOperator], evaluation: Evaluation
+) -> dsl_interpreter.Operator:
+    key = keys[id(operator)]
+    if key in shared_operators:
+        return shared_operators[key]
+    operator.parameters = tuple(
+        _share_subexpressions(parameter, keys, counts, shared_operators, evaluation)
+        if isinstance(parameter, dsl_interpreter.Operator) else parameter
+        for parameter in operator.parameters
+    )
+    if counts[key] > 1:
+        shared_operators[key] = SharedSubexpressionOperator(operator, evaluation)
+        return shared_operators[key]
+    return operator
+
+
+def share_common_subexpressions(
+    operator_tree_or_constant: typing.Union[
+        dsl_interpreter.Operator, dsl_interpreter.ComputedOperatorParameterType
+    ],
+    evaluation: Evaluation
+) -> typing.Union[dsl_interpreter.Operator, dsl_interpreter.ComputedOperatorParameterType]:
+    """
+    :return: the given operator tree where operators with the same type and parameters are replaced by the
+    same SharedSubexpressionOperator
+    """
+    if not isinstance(operator_tree_or_constant, dsl_interpreter.Operator):
+        return operator_tree_or_constant
+    keys = {}
+    counts = collections.Counter()
+    _count_subexpressions(operator_tree_or_constant, keys, counts)
+    return _share_subexpressions(operator_tree_or_constant, keys, counts, {}, evaluation)
+
+
+class CommonSubexpressionsInterpreter(dsl_interpreter.Interpreter):
+    """
+    Interpreter computing repeated subexpressions only once per evaluation
+    """
+    def __init__(self, operators: typing.List[typing.Type[dsl_interpreter.Operator]]):
+        super().__init__(operators)
+        self.evaluation: Evaluation = Evaluation()
+
+    def _parse_expression(self, expression: str):
+        super()._parse_expression(expression)
+        self._operator_tree_or_constant = share_common_subexpressions(
+            self._operator_tree_or_constant, self.evaluation
+        )
+
+    async def compute_expression(self) -> dsl_interpreter.ComputedOperatorParameterType:
+        self.evaluation.start()
+        return await super().compute_expression()
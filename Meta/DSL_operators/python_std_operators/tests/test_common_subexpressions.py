@@ -0,0 +1,83 @@
+#  Drakkar-Software OctoBot-Commons
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import mock
+import pytest
+import octobot_commons.dsl_interpreter as dsl_interpreter
+
+import tentacles.Meta.DSL_operators.python_std_operators as python_std_operators
+
+
+@pytest.fixture
+def interpreter():
+    return python_std_operators.CommonSubexpressionsInterpreter(dsl_interpreter.get_all_operators())
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("expression", [
+    "(1 + 2) * (1 + 2)",
+    "(1 + 2) * (1 + 3) - (1 + 2)",
+    "max(sqrt(9), abs(-4), 3 + 6) + max(sqrt(9), abs(-4), 3 + 6)",
+    "[1, 2, 3][0:2][0] + [1, 2, 3][0:2][-1]",
+    "1 < 2 and 2 < 3 and 1 < 2",
+    "(1 + True) * (1 + 1)",
+    "1 + 1.5 + 1.5",
+    "mean(1, 2) if mean(1, 2) > 1 else 0",
+])
+async def test_same_results_as_interpreter(interpreter, expression):
+    assert await interpreter.interprete(expression) == \
+        await dsl_interpreter.Interpreter(dsl_interpreter.get_all_operators()).interprete(expression)
+
+
+def test_share_common_subexpressions(interpreter):
+    interpreter.prepare("(1 + 2) * (1 + 2) - (1 + 3)")
+    sub_operator = interpreter._operator_tree_or_constant
+    mult_operator, add_operator = sub_operator.parameters
+    assert isinstance(mult_operator.parameters[0], python_std_operators.SharedSubexpressionOperator)
+    assert mult_operator.parameters[0] is mult_operator.parameters[1]
+    # different parameters: not shared
+    assert isinstance(add_operator, python_std_operators.AddOperator)
+    assert add_operator.parameters == (1, 3)
+
+    # constants of different types are not shared
+    interpreter.prepare("(1 + True) * (1 + 1)")
+    left, right = interpreter._operator_tree_or_constant.parameters
+    assert isinstance(left, python_std_operators.AddOperator)
+    assert isinstance(right, python_std_operators.AddOperator)
+
+    # nothing to share
+    interpreter.prepare("1")
+    assert interpreter._operator_tree_or_constant == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_subexpressions_are_computed_once_per_evaluation(interpreter):
+    interpreter.prepare("sqrt(2 ** 4) + sqrt(2 ** 4) * sqrt(2 ** 4)")
+    with mock.patch.object(
+        python_std_operators.SqrtOperator, "compute", mock.Mock(return_value=4)
+    ) as compute_mock, mock.patch.object(
+        python_std_operators.PowOperator, "pre_compute", mock.AsyncMock()
+    ) as pre_compute_mock:
+        assert await interpreter.compute_expression() == 20
+        compute_mock.assert_called_once()
+        pre_compute_mock.assert_awaited_once()
+        # computed again on the next evaluation
+        assert await interpreter.compute_expression() == 20
+        assert compute_mock.call_count == 2
+        assert pre_compute_mock.await_count == 2
+
+
+def test_shared_subexpression_operator_is_not_a_dsl_operator():
+    assert python_std_operators.SharedSubexpressionOperator not in dsl_interpreter.get_all_operators()
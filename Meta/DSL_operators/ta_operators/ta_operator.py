@@ -16,6 +16,8 @@
 #  License along with this library.
 import octobot_commons.dsl_interpreter.operators.call_operator as dsl_interpreter_call_operator
 
+import tentacles.Evaluator.Util as EvaluatorUtil
+
 
 TA_LIBRARY = "ta"
 
@@ -28,3 +30,16 @@ class TAOperator(dsl_interpreter_call_operator.CallOperator):
         Get the library of the operator.
         """
         return TA_LIBRARY
+
+    def get_cached_or_compute(self, indicator: str, params: tuple, compute_function):
+        """
+        Use the shared indicators cache when the data parameter comes from candles (its operator then
+        exposes an indicators_cache_key), otherwise compute the value.
+        """
+        cache_key = getattr(self.parameters[0], "indicators_cache_key", None) if self.parameters else None
+        if cache_key is None:
+            return compute_function()
+        return EvaluatorUtil.get_shared_indicators_cache().get_or_compute(
+            cache_key.exchange_manager_id, cache_key.symbol, cache_key.time_frame, cache_key.candle_key,
+            indicator, (cache_key.data_source, *params), compute_function
+        )
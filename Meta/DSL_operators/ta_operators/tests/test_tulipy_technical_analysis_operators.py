@@ -13,9 +13,11 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import numpy as np
 import pytest
 
 import octobot_commons.errors
+import tentacles.Meta.DSL_operators.python_std_operators as python_std_operators
 from tentacles.Meta.DSL_operators.exchange_operators.tests import (
     historical_prices,
     historical_volume,
@@ -82,8 +84,8 @@ async def test_operator_converted_tulipy_error(interpreter, operator, dynamic_pa
 
 @pytest.mark.asyncio
 async def test_operator_operations(interpreter):
-    # ensure the output is a list and can be used in arithmetic operations
-    assert isinstance(await interpreter.interprete("rsi(close, 14)"), list)
+    # ensure the output is a numpy array and can be used in arithmetic operations
+    assert isinstance(await interpreter.interprete("rsi(close, 14)"), np.ndarray)
     assert await interpreter.interprete("round(rsi(close, 26)[-1], 2)") == 74.3
     assert await interpreter.interprete("round(rsi(close, 14)[-1], 2)") == 67.55
     assert await interpreter.interprete("round(rsi(close, 26)[-1] - rsi(close, 14)[-1], 2)") == 6.74
@@ -97,6 +99,44 @@ async def test_operator_operations(interpreter):
     assert await interpreter.interprete("round(ma(close, 14)[-1]*0.7 + vwma(close, volume, 14)[-1]*0.3, 2)") == 92.48
 
 
+@pytest.mark.asyncio
+async def test_operator_operations_on_different_lengths(interpreter):
+    rsi_14 = await interpreter.interprete("rsi(close, 14)")
+    rsi_20 = await interpreter.interprete("rsi(close, 20)")
+    ma = await interpreter.interprete("ma(close, 20)")
+    assert len(rsi_14) == 18
+    assert len(rsi_20) == 12
+    assert len(ma) == 13
+    # arrays are aligned on their most recent values
+    difference = await interpreter.interprete("rsi(close, 14) - rsi(close, 20)")
+    assert isinstance(difference, np.ndarray)
+    assert difference.tolist() == (rsi_14[-12:] - rsi_20).tolist()
+    assert (await interpreter.interprete("rsi(close, 14) > rsi(close, 20)")).tolist() == \
+        (rsi_14[-12:] > rsi_20).tolist()
+    assert (await interpreter.interprete("rsi(close, 14) > 70 and ma(close, 20) > 90")).tolist() == \
+        np.logical_and(rsi_14[-13:] > 70, ma > 90).tolist()
+    assert (await interpreter.interprete("rsi(close, 14) > 70 or ma(close, 20) > 90")).tolist() == \
+        np.logical_or(rsi_14[-13:] > 70, ma > 90).tolist()
+    assert (await interpreter.interprete("rsi(close, 20) > 70 and ma(close, 20) > 90 and rsi(close, 14) > 0")).tolist() \
+        == np.logical_and(rsi_20 > 70, ma[-12:] > 90).tolist()
+    # same lengths: nothing to align
+    assert (await interpreter.interprete("rsi(close, 14) - rsi(close, 14)")).tolist() == [0] * 18
+
+
+@pytest.mark.asyncio
+async def test_operator_latest_value(interpreter):
+    assert (await interpreter.interprete("rsi(close, 14) > 100")).tolist() == [False] * 18
+    assert python_std_operators.get_latest_value(await interpreter.interprete("rsi(close, 14) > 100")) == False
+    assert python_std_operators.get_latest_value(await interpreter.interprete("rsi(close, 14) > 60")) == True
+    assert round(python_std_operators.get_latest_value(await interpreter.interprete("rsi(close, 14)")), 2) == 67.55
+    with pytest.raises(ValueError):
+        python_std_operators.get_latest_value(np.array([]))
+    with pytest.raises(ValueError):
+        python_std_operators.get_latest_value(np.array([[1.0], [2.0]]))
+    assert python_std_operators.get_latest_value(1) == 1
+    assert python_std_operators.get_latest_value([1, 2]) == [1, 2]
+
+
 @pytest.mark.asyncio
 async def test_rsi_operator(interpreter):
     rsi = await interpreter.interprete("rsi(close, 14)")
@@ -200,3 +240,30 @@ async def test_ema_operator(interpreter):
         86.76, 87.39, 87.92, 88.45, 88.99, 89.38, 89.75, 89.97, 90.24, 90.5, 
         90.66, 90.81
     ]
+
+
+@pytest.mark.asyncio
+async def test_operator_array_operations(interpreter):
+    rsi = await interpreter.interprete("rsi(close, 14)")
+    ma = await interpreter.interprete("ma(close, 14)")
+    # arithmetic and comparison operators are applied element-wise on arrays
+    spread = await interpreter.interprete("ma(close, 14) - vwma(close, volume, 14)")
+    assert isinstance(spread, np.ndarray)
+    assert np.array_equal(spread, ma - await interpreter.interprete("vwma(close, volume, 14)"))
+    assert np.array_equal(await interpreter.interprete("rsi(close, 14) / 100"), rsi / 100)
+    assert np.array_equal(await interpreter.interprete("rsi(close, 14) > 80"), rsi > 80)
+    assert np.array_equal(await interpreter.interprete("ma(close, 14)[-3:] < [90, 92, 93]"), ma[-3:] < [90, 92, 93])
+    # logical operators are also applied element-wise on arrays
+    assert np.array_equal(
+        await interpreter.interprete("rsi(close, 14) > 70 and rsi(close, 14) < 85"), (rsi > 70) & (rsi < 85)
+    )
+    assert np.array_equal(
+        await interpreter.interprete("rsi(close, 14) < 70 or rsi(close, 14) > 85"), (rsi < 70) | (rsi > 85)
+    )
+    assert np.array_equal(await interpreter.interprete("not rsi(close, 14) > 80"), rsi <= 80)
+    assert await interpreter.interprete("rsi(close, 14)[-1] > 60 and ma(close, 14)[-1] > 90") is True
+    # results are materialized as python values only when required
+    materialized = python_std_operators.to_python_value(await interpreter.interprete("rsi(close, 14) > 80"))
+    assert materialized == [bool(value > 80) for value in rsi]
+    assert all(type(value) is bool for value in materialized)
+    assert type(python_std_operators.to_python_value(await interpreter.interprete("rsi(close, 14)[-1]"))) is float
@@ -23,6 +23,7 @@ import octobot_commons.dsl_interpreter as dsl_interpreter
 
 
 def _to_numpy_array(data):
+    # numpy arrays computed by other operators are used as is: results are never copied between operators
     if isinstance(data, list):
         return np.array(data, dtype=np.float64)
     elif isinstance(data, tuple):
@@ -73,7 +74,10 @@ class RSIOperator(ta_operator.TAOperator):
     @converted_tulipy_error
     def compute(self) -> dsl_interpreter.ComputedOperatorParameterType:
         operands = self.get_computed_parameters()
-        return list(tulipy.rsi(_to_numpy_array(operands[0]), period=_to_int(operands[1])))
+        period = _to_int(operands[1])
+        return self.get_cached_or_compute(
+            "rsi", (period, ), lambda: tulipy.rsi(_to_numpy_array(operands[0]), period=period)
+        )
 
 
 class MACDOperator(ta_operator.TAOperator):
@@ -96,10 +100,14 @@ class MACDOperator(ta_operator.TAOperator):
     @converted_tulipy_error
     def compute(self) -> dsl_interpreter.ComputedOperatorParameterType:
         operands = self.get_computed_parameters()
-        macd, macd_signal, macd_hist = tulipy.macd(
-            _to_numpy_array(operands[0]), short_period=_to_int(operands[1]), long_period=_to_int(operands[2]), signal_period=_to_int(operands[3])
+        short_period, long_period, signal_period = _to_int(operands[1]), _to_int(operands[2]), _to_int(operands[3])
+        macd, macd_signal, macd_hist = self.get_cached_or_compute(
+            "macd", (short_period, long_period, signal_period),
+            lambda: tulipy.macd(
+                _to_numpy_array(operands[0]), short_period=short_period, long_period=long_period, signal_period=signal_period
+            )
         )
-        return list(macd_hist)
+        return macd_hist
 
 
 class MAOperator(ta_operator.TAOperator):
@@ -120,7 +128,10 @@ class MAOperator(ta_operator.TAOperator):
     @converted_tulipy_error
     def compute(self) -> dsl_interpreter.ComputedOperatorParameterType:
         operands = self.get_computed_parameters()
-        return list(tulipy.sma(_to_numpy_array(operands[0]), period=_to_int(operands[1])))
+        period = _to_int(operands[1])
+        return self.get_cached_or_compute(
+            "sma", (period, ), lambda: tulipy.sma(_to_numpy_array(operands[0]), period=period)
+        )
 
 
 class EMAOperator(ta_operator.TAOperator):
@@ -141,7 +152,10 @@ class EMAOperator(ta_operator.TAOperator):
     @converted_tulipy_error
     def compute(self) -> dsl_interpreter.ComputedOperatorParameterType:
         operands = self.get_computed_parameters()
-        return list(tulipy.ema(_to_numpy_array(operands[0]), period=_to_int(operands[1])))
+        period = _to_int(operands[1])
+        return self.get_cached_or_compute(
+            "ema", (period, ), lambda: tulipy.ema(_to_numpy_array(operands[0]), period=period)
+        )
 
 
 class VWMAOperator(ta_operator.TAOperator):
@@ -163,4 +177,4 @@ class VWMAOperator(ta_operator.TAOperator):
     @converted_tulipy_error
     def compute(self) -> dsl_interpreter.ComputedOperatorParameterType:
         operands = self.get_computed_parameters()
-        return list(tulipy.vwma(_to_numpy_array(operands[0]), _to_numpy_array(operands[1]), period=_to_int(operands[2])))
+        return tulipy.vwma(_to_numpy_array(operands[0]), _to_numpy_array(operands[1]), period=_to_int(operands[2]))
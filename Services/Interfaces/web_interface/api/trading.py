@@ -21,11 +21,28 @@ import tentacles.Services.Interfaces.web_interface.login as login
 import tentacles.Services.Interfaces.web_interface.models as models
 
 
+DUMPED_DATA_UPDATE_ARGS = ("since_version", "cursor", "limit")
+
+
+def _get_dumped_data_update(get_update):
+    # since_version: only return changes from this version, cursor and limit: paginate elements
+    try:
+        return flask.jsonify(get_update(
+            since_version=flask.request.args.get("since_version", type=int),
+            cursor=flask.request.args.get("cursor"),
+            limit=flask.request.args.get("limit", models.DEFAULT_DUMPS_PAGE_SIZE, type=int),
+        ))
+    except ValueError:
+        return util.get_rest_reply(flask.jsonify("invalid cursor or limit"), 400)
+
+
 def register(blueprint):
     @blueprint.route("/orders", methods=['GET', 'POST'])
     @login.login_required_when_activated
     def orders():
         if flask.request.method == 'GET':
+            if any(arg in flask.request.args for arg in DUMPED_DATA_UPDATE_ARGS):
+                return _get_dumped_data_update(models.get_orders_data_update)
             return flask.jsonify(models.get_all_orders_data())
         elif flask.request.method == "POST":
             result = ""
@@ -45,6 +62,8 @@ def register(blueprint):
     @blueprint.route("/trades", methods=['GET'])
     @login.login_required_when_activated
     def trades():
+        if any(arg in flask.request.args for arg in DUMPED_DATA_UPDATE_ARGS):
+            return _get_dumped_data_update(models.get_trades_data_update)
         return flask.jsonify(models.get_all_trades_data())
 
 
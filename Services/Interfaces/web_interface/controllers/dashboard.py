@@ -32,6 +32,25 @@ def register(blueprint):
                                                                     backtesting=in_backtesting,
                                                                     ignore_orders=not display_orders))
 
+    @blueprint.route('/dashboard/currency_price_graph_candles/<exchange_id>/<symbol>/<time_frame>')
+    @login.login_required_when_activated
+    def currency_price_graph_candles(exchange_id, symbol, time_frame):
+        # only return candles from the since timestamp: the client already has the previous ones
+        since = flask.request.args.get("since", 0, type=float)
+        candles = models.get_currency_price_graph_candles_since(exchange_id,
+                                                               models.get_value_from_dict_or_string(symbol),
+                                                               time_frame,
+                                                               since)
+        if candles is None or "error" in candles:
+            return flask.jsonify(candles)
+        if flask.request.args.get("format") == models.CANDLES_BINARY_FORMAT:
+            return flask.Response(
+                models.get_candles_binary_payload(candles),
+                mimetype="application/octet-stream",
+                headers={"X-Candles-Columns": ",".join(name for name, _ in models.CANDLES_COLUMNS)}
+            )
+        return flask.jsonify(models.get_candles_columns_payload(candles))
+
 
     @blueprint.route('/dashboard/first_symbol')
     @login.login_required_when_activated
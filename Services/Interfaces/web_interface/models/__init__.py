@@ -189,11 +189,17 @@ from tentacles.Services.Interfaces.web_interface.models.dashboard import (
     get_value_from_dict_or_string,
     format_trades,
     format_orders,
+    format_order_update,
     get_first_exchange_data,
     get_watched_symbol_data,
     get_startup_messages,
     get_first_symbol_data,
     get_currency_price_graph_update,
+    get_currency_price_graph_candles_since,
+    get_candles_columns_payload,
+    get_candles_binary_payload,
+    CANDLES_BINARY_FORMAT,
+    CANDLES_COLUMNS,
 )
 from tentacles.Services.Interfaces.web_interface.models.interface_settings import (
     add_watched_symbol,
@@ -274,6 +280,12 @@ from tentacles.Services.Interfaces.web_interface.models.trading import (
     get_pnl_history,
     get_all_orders_data,
     get_all_trades_data,
+    record_order_change,
+    record_trade_change,
+    get_orders_data_update,
+    get_trades_data_update,
+    get_dumped_data_versions,
+    DEFAULT_DUMPS_PAGE_SIZE,
     get_all_positions_data,
     clear_exchanges_orders_history,
     clear_exchanges_trades_history,
@@ -407,10 +419,16 @@ __all__ = [
     "get_value_from_dict_or_string",
     "format_trades",
     "format_orders",
+    "format_order_update",
     "get_first_exchange_data",
     "get_watched_symbol_data",
     "get_first_symbol_data",
     "get_currency_price_graph_update",
+    "get_currency_price_graph_candles_since",
+    "get_candles_columns_payload",
+    "get_candles_binary_payload",
+    "CANDLES_BINARY_FORMAT",
+    "CANDLES_COLUMNS",
     "get_watched_symbols",
     "get_startup_messages",
     "add_watched_symbol",
@@ -482,6 +500,12 @@ __all__ = [
     "get_pnl_history",
     "get_all_orders_data",
     "get_all_trades_data",
+    "record_order_change",
+    "record_trade_change",
+    "get_orders_data_update",
+    "get_trades_data_update",
+    "get_dumped_data_versions",
+    "DEFAULT_DUMPS_PAGE_SIZE",
     "get_all_positions_data",
     "clear_exchanges_orders_history",
     "clear_exchanges_trades_history",
@@ -25,10 +25,21 @@ import tentacles.Services.Interfaces.web_interface.models.interface_settings as
 import tentacles.Services.Interfaces.web_interface.enums as enums
 import octobot_commons.timestamp_util as timestamp_util
 import octobot_commons.enums as commons_enums
+import octobot_commons.constants as commons_constants
 import octobot_commons.symbols as commons_symbols
 
 GET_SYMBOL_SEPARATOR = "|"
 DISPLAY_CANCELLED_TRADES = False
+CANDLES_BINARY_FORMAT = "binary"
+# columns of incremental candles, in binary payloads order
+CANDLES_COLUMNS = (
+    (enums.PriceStrings.STR_PRICE_TIME.value, commons_enums.PriceIndexes.IND_PRICE_TIME.value),
+    (enums.PriceStrings.STR_PRICE_OPEN.value, commons_enums.PriceIndexes.IND_PRICE_OPEN.value),
+    (enums.PriceStrings.STR_PRICE_HIGH.value, commons_enums.PriceIndexes.IND_PRICE_HIGH.value),
+    (enums.PriceStrings.STR_PRICE_LOW.value, commons_enums.PriceIndexes.IND_PRICE_LOW.value),
+    (enums.PriceStrings.STR_PRICE_CLOSE.value, commons_enums.PriceIndexes.IND_PRICE_CLOSE.value),
+    (enums.PriceStrings.STR_PRICE_VOL.value, commons_enums.PriceIndexes.IND_PRICE_VOL.value),
+)
 
 
 def parse_get_symbol(get_symbol):
@@ -88,11 +99,13 @@ def format_orders(order, min_order_time):
     price_key = "price"
     description_key = "description"
     order_side_key = "order_side"
+    id_key = "id"
     formatted_orders = {
         time_key: [],
         price_key: [],
         description_key: [],
-        order_side_key: []
+        order_side_key: [],
+        id_key: [],
     }
     for order in order:
         if order.creation_time > trading_constants.MINIMUM_VAL_TRADE_TIME:
@@ -108,9 +121,29 @@ def format_orders(order, min_order_time):
                 f"at {order.origin_price}"
             )
             formatted_orders[order_side_key].append(order.side.value)
+            formatted_orders[id_key].append(order.order_id)
     return formatted_orders
 
 
+def format_order_update(exchange_manager, dict_order) -> dict:
+    """
+    :return: the updated order when it is still open and the id of the order to remove otherwise
+    """
+    orders = []
+    removed_orders = []
+    if dict_order is not None:
+        order_id = dict_order.get(trading_enums.ExchangeConstantsOrderColumns.ID.value)
+        order = exchange_manager.exchange_personal_data.orders_manager.orders.get(order_id)
+        if order is not None and order.status == trading_enums.OrderStatus.OPEN:
+            orders.append(order)
+        else:
+            removed_orders.append(order_id)
+    return {
+        "orders": format_orders(orders, 0),
+        "removed_orders": removed_orders,
+    }
+
+
 def _remove_invalid_chars(string):
     return string.split("[")[0]
 
@@ -309,3 +342,70 @@ def get_currency_price_graph_update(exchange_id, symbol, time_frame, list_arrays
             else:
                 return {"error": f"no data for {parsed_symbol}"}
     return None
+
+
+def _get_candles_since(symbol_data, time_frame, since):
+    time_index = commons_enums.PriceIndexes.IND_PRICE_TIME.value
+    last_candle_time = trading_api.get_symbol_historical_candles(symbol_data, time_frame, limit=1)[time_index][-1]
+    time_frame_seconds = commons_enums.TimeFramesMinutes[commons_enums.TimeFrames(time_frame)] * \
+        commons_constants.MINUTE_TO_SECONDS
+    # candles are at least time_frame_seconds apart: only fetch the candles that can be more recent than since
+    limit = int((last_candle_time - since) // time_frame_seconds) + 1
+    if limit <= 0:
+        return {index: np.array([], dtype=np.float64) for _, index in CANDLES_COLUMNS}
+    candles = trading_api.get_symbol_historical_candles(symbol_data, time_frame, limit=limit)
+    # the candle at since is included: it might have been updated since the client received it
+    first_index = int(np.searchsorted(candles[time_index], since, side="left"))
+    return {index: candles[index][first_index:] for _, index in CANDLES_COLUMNS}
+
+
+def get_currency_price_graph_candles_since(exchange_id, symbol, time_frame, since):
+    """
+    :return: the candles starting from the since timestamp (included) and the current kline as columns of
+    numpy arrays by PriceStrings, timestamps are kept as raw epoch seconds
+    """
+    parsed_symbol = commons_symbols.parse_symbol(parse_get_symbol(symbol))
+    exchange_manager = trading_api.get_exchange_manager_from_exchange_id(exchange_id)
+    symbol_id = str(parsed_symbol)
+    try:
+        time_frame = _ensure_time_frame(time_frame)
+        symbol_data = trading_api.get_symbol_data(exchange_manager, symbol_id, allow_creation=False)
+        candles = _get_candles_since(symbol_data, time_frame, since)
+        time_index = commons_enums.PriceIndexes.IND_PRICE_TIME.value
+        if trading_api.has_symbol_klines(symbol_data, time_frame):
+            kline = trading_api.get_symbol_klines(symbol_data, time_frame)
+            # add kline as the last (current) candle that is not yet in history
+            if math.nan not in kline and kline[time_index] >= since and (
+                len(candles[time_index]) == 0 or candles[time_index][-1] != kline[time_index]
+            ):
+                candles = {index: np.append(values, kline[index]) for index, values in candles.items()}
+        return {
+            name: candles[index]
+            for name, index in CANDLES_COLUMNS
+        }
+    except IndexError:
+        # no candle yet
+        return None
+    except KeyError:
+        traded_pairs = trading_api.get_trading_pairs(exchange_manager)
+        if not traded_pairs or symbol_id in traded_pairs:
+            # not started yet
+            return None
+        return {"error": f"no data for {parsed_symbol}"}
+
+
+def get_candles_columns_payload(candles: dict) -> dict:
+    return {
+        name: values.tolist()
+        for name, values in candles.items()
+    }
+
+
+def get_candles_binary_payload(candles: dict) -> bytes:
+    """
+    :return: the candles columns, in CANDLES_COLUMNS order, as contiguous little-endian float64 values
+    """
+    return np.concatenate([
+        np.asarray(candles[name], dtype="<f8")
+        for name, _ in CANDLES_COLUMNS
+    ]).tobytes()
@@ -13,14 +13,19 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import collections
 import decimal
+import heapq
+import threading
 import time
+import typing
 import sortedcontainers
 
 import octobot_services.interfaces.util as interfaces_util
 import octobot_trading.api as trading_api
 import octobot_trading.enums as trading_enums
 import octobot_trading.errors as trading_errors
+import octobot_trading.personal_data as trading_personal_data
 import octobot_commons.enums as commons_enums
 import octobot_commons.constants as commons_constants
 import octobot_commons.logging as logging
@@ -204,20 +209,20 @@ def _is_valid_pnl(pnl):
         return False
 
 
-def _get_pnl_history(exchange, quote, symbol, since):
+def _get_pnl_history_exchange_managers(exchange):
     if exchange:
-        return {
-            exchange: _get_valid_pnl_history(
-                dashboard.get_first_exchange_data(exchange, trading_exchange_only=True)[0],
-                quote, symbol, since
-            )
-        }
-    history = {}
-    for exchange_manager in configuration.get_live_trading_enabled_exchange_managers():
-        history[trading_api.get_exchange_name(exchange_manager)] = _get_valid_pnl_history(
-            exchange_manager, quote, symbol, since
-        )
-    return history
+        return [(exchange, dashboard.get_first_exchange_data(exchange, trading_exchange_only=True)[0])]
+    return [
+        (trading_api.get_exchange_name(exchange_manager), exchange_manager)
+        for exchange_manager in configuration.get_live_trading_enabled_exchange_managers()
+    ]
+
+
+def _get_pnl_history(exchange, quote, symbol, since):
+    return {
+        exchange_name: _get_valid_pnl_history(exchange_manager, quote, symbol, since)
+        for exchange_name, exchange_manager in _get_pnl_history_exchange_managers(exchange)
+    }
 
 
 def get_pnl_history_symbols(exchange=None, quote=None, symbol=None, since=None):
@@ -233,7 +238,11 @@ def _convert_timestamp(timestamp):
     return timestamp_util.convert_timestamp_to_datetime(timestamp, time_format='%Y-%m-%d %H:%M:%S', local_timezone=True)
 
 
-def get_pnl_history(exchange=None, quote=None, symbol=None, since=None, scale=None):
+class PnlHistoryAggregator:
+    """
+    Completed trades PnL of an exchange aggregated by scaled close time. Only the PnL of the trades added since
+    the previous update are computed, the whole history is only recomputed when trades are removed or reset.
+    """
     ENTRY_PRICE = "en_p"
     EXIT_PRICE = "ex_p"
     ENTRY_TIME = "en_t"
@@ -255,78 +264,263 @@ def get_pnl_history(exchange=None, quote=None, symbol=None, since=None, scale=No
     CURRENCY = "c"
     SYMBOL = "s"
     TRADES_COUNT = "tc"
-    pnl_history = {}
-    use_detailed_history = not(scale)
-    scale_seconds = commons_enums.TimeFramesMinutes[commons_enums.TimeFrames(scale)] * \
-        commons_constants.MINUTE_TO_SECONDS if scale else 1
+
+    def __init__(self, exchange_name, quote, symbol, since, scale):
+        self.exchange_name = exchange_name
+        self.quote = quote
+        self.symbol = symbol
+        self.since = since
+        self.use_detailed_history = not scale
+        self.scale_seconds = commons_enums.TimeFramesMinutes[commons_enums.TimeFrames(scale)] * \
+            commons_constants.MINUTE_TO_SECONDS if scale else 1
+        # aggregated values by scaled close time
+        self.pnl_history = {}
+        self.invalid_pnl_entry_ids = set()
+        self._trades = None
+        self._trades_count = 0
+        self._last_trade_id = None
+        self._trades_by_order_id = {}
+        self._exits_by_entry_id = {}
+        # entry trade order id: (scaled close time, values) of its completed PnL
+        self._pnl_by_entry_id = {}
+        # scaled close time: entry trade order ids of its completed PnLs, in insertion order
+        self._entry_ids_by_scaled_time = {}
+        # formatted values by scaled close time, skipped values are not included
+        self._rows = sortedcontainers.SortedDict()
+        self._history = None
+
+    def update(self, trades: dict):
+        """
+        Aggregates the PnL of the trades added to trades since the previous update
+        :param trades: the exchange trades by trade id, oldest first
+        """
+        new_trades = self._get_new_trades(trades)
+        if new_trades is None:
+            self._reset(trades)
+            new_trades = self._get_new_trades(trades)
+        updated_entry_ids = {}
+        for trade in new_trades:
+            if not self._is_included(trade):
+                continue
+            self._trades_by_order_id[trade.origin_order_id] = trade
+            if trade.origin_order_id in self._exits_by_entry_id:
+                updated_entry_ids[trade.origin_order_id] = None
+            for entry_id in trade.associated_entry_ids or []:
+                if entry_id not in self._exits_by_entry_id:
+                    self._exits_by_entry_id[entry_id] = []
+                self._exits_by_entry_id[entry_id].append(trade)
+                updated_entry_ids[entry_id] = None
+        updated_scaled_times = set()
+        for entry_id in updated_entry_ids:
+            updated_scaled_times.update(self._update_entry_pnl(entry_id))
+        for scaled_time in updated_scaled_times:
+            self._aggregate(scaled_time)
+            if (row := self._get_row(scaled_time, self.pnl_history.get(scaled_time), self.use_detailed_history)) \
+                    is None:
+                self._rows.pop(scaled_time, None)
+            else:
+                self._rows[scaled_time] = row
+        if updated_scaled_times:
+            self._history = None
+
+    def get_history(self) -> list:
+        if self._history is None:
+            self._history = list(self._rows.values())
+        return self._history
+
+    @classmethod
+    def merge_history(cls, aggregators) -> list:
+        pnl_history = {}
+        for aggregator in aggregators:
+            for scaled_time, value in aggregator.pnl_history.items():
+                pnl_history[scaled_time] = cls._add_value(pnl_history.get(scaled_time), value)
+        use_detailed_history = all(aggregator.use_detailed_history for aggregator in aggregators)
+        return [
+            row
+            for t in sorted(pnl_history)
+            if (row := cls._get_row(t, pnl_history[t], use_detailed_history)) is not None
+        ]
+
+    @classmethod
+    def _get_row(cls, t, pnl, use_detailed_history):
+        if pnl is None or (
+            # skip 0 value pnl in detailed history
+            use_detailed_history and not (pnl[cls.PNL] or pnl.get(cls.DETAILS, {}).get(cls.SPECIAL_FEES, 0))
+        ):
+            return None
+        return {
+            cls.EXIT_TIME: t,
+            cls.EXIT_DATE: _convert_timestamp(t),
+            cls.PNL: float(pnl[cls.PNL]),
+            cls.PNL_AMOUNT: float(pnl[cls.PNL_AMOUNT]),
+            cls.QUOTE: pnl[cls.QUOTE],
+            cls.TRADES_COUNT: pnl[cls.TRADES_COUNT],
+            cls.DETAILS: pnl[cls.DETAILS],
+        }
+
+    def _get_new_trades(self, trades: dict):
+        """
+        :return: the trades added since the previous update, None when trades have been removed or reset
+        """
+        if trades is not self._trades:
+            return None
+        new_trades = []
+        for trade_id in reversed(trades):
+            if trade_id == self._last_trade_id:
+                break
+            new_trades.append(trades[trade_id])
+        else:
+            if self._last_trade_id is not None:
+                # the last known trade has been removed
+                return None
+        if len(trades) != self._trades_count + len(new_trades):
+            # oldest trades have been removed
+            return None
+        if new_trades:
+            self._last_trade_id = new_trades[0].trade_id
+        self._trades_count = len(trades)
+        return new_trades[::-1]
+
+    def _reset(self, trades: dict):
+        self.pnl_history = {}
+        self.invalid_pnl_entry_ids = set()
+        self._trades = trades
+        self._trades_count = 0
+        self._last_trade_id = None
+        self._trades_by_order_id = {}
+        self._exits_by_entry_id = {}
+        self._pnl_by_entry_id = {}
+        self._entry_ids_by_scaled_time = {}
+        self._rows = sortedcontainers.SortedDict()
+        self._history = None
+
+    def _is_included(self, trade) -> bool:
+        # same filter as trading_api.get_completed_pnl_history
+        if trade.status is trading_enums.OrderStatus.CANCELED:
+            return False
+        if self.since is not None and not (trade.executed_time >= self.since or trade.canceled_time >= self.since):
+            return False
+        if self.quote is not None and commons_symbols.parse_symbol(trade.symbol).quote != self.quote:
+            return False
+        return self.symbol is None or trade.symbol == self.symbol
+
+    def _update_entry_pnl(self, entry_id) -> list:
+        """
+        :return: the scaled close times of the previous and the updated PnL of entry_id
+        """
+        updated_scaled_times = []
+        self.invalid_pnl_entry_ids.discard(entry_id)
+        if entry_id in self._pnl_by_entry_id:
+            previous_scaled_time, _ = self._pnl_by_entry_id.pop(entry_id)
+            self._entry_ids_by_scaled_time[previous_scaled_time].pop(entry_id)
+            updated_scaled_times.append(previous_scaled_time)
+        if entry_id not in self._trades_by_order_id:
+            return updated_scaled_times
+        historical_pnl = trading_personal_data.TradePnl(
+            [self._trades_by_order_id[entry_id]], self._exits_by_entry_id[entry_id]
+        )
+        if not _is_valid_pnl(historical_pnl):
+            return updated_scaled_times
+        try:
+            close_time = historical_pnl.get_close_time()
+            scaled_time = close_time - (close_time % self.scale_seconds)
+            value = self._get_value(historical_pnl)
+        except trading_errors.IncompletePNLError:
+            self.invalid_pnl_entry_ids.add(entry_id)
+            return updated_scaled_times
+        self._pnl_by_entry_id[entry_id] = (scaled_time, value)
+        if scaled_time not in self._entry_ids_by_scaled_time:
+            self._entry_ids_by_scaled_time[scaled_time] = {}
+        self._entry_ids_by_scaled_time[scaled_time][entry_id] = None
+        updated_scaled_times.append(scaled_time)
+        return updated_scaled_times
+
+    def _aggregate(self, scaled_time):
+        value = None
+        for entry_id in self._entry_ids_by_scaled_time.get(scaled_time, {}):
+            value = self._add_value(value, self._pnl_by_entry_id[entry_id][1])
+        if value is None:
+            self.pnl_history.pop(scaled_time, None)
+            self._entry_ids_by_scaled_time.pop(scaled_time, None)
+        else:
+            self.pnl_history[scaled_time] = value
+
+    @classmethod
+    def _add_value(cls, aggregated_value, value) -> dict:
+        if aggregated_value is None:
+            return dict(value)
+        aggregated_value[cls.PNL] += value[cls.PNL]
+        aggregated_value[cls.PNL_AMOUNT] += value[cls.PNL_AMOUNT]
+        aggregated_value[cls.TRADES_COUNT] += value[cls.TRADES_COUNT]
+        if value[cls.DETAILS] is not None:
+            aggregated_value[cls.DETAILS] = value[cls.DETAILS]
+        return aggregated_value
+
+    def _get_value(self, historical_pnl) -> dict:
+        pnl, _ = historical_pnl.get_profits()
+        return {
+            self.PNL: pnl,
+            self.PNL_AMOUNT: historical_pnl.get_closed_close_value(),
+            self.QUOTE: historical_pnl.entries[0].market,
+            self.TRADES_COUNT: len(historical_pnl.entries) + len(historical_pnl.closes),
+            self.DETAILS: self._get_details(historical_pnl) if self.use_detailed_history else None,
+        }
+
+    def _get_details(self, historical_pnl) -> dict:
+        return {
+            self.ENTRY_TIME: historical_pnl.get_entry_time(),
+            self.ENTRY_DATE: _convert_timestamp(historical_pnl.get_entry_time()),
+            self.ENTRY_PRICE: float(historical_pnl.get_entry_price()),
+            self.EXIT_PRICE: float(historical_pnl.get_close_price()),
+            self.ENTRY_SIDE: historical_pnl.entries[0].side.value,
+            self.EXIT_SIDE: historical_pnl.closes[0].side.value,
+            self.ENTRY_AMOUNT: historical_pnl.get_total_entry_quantity(),
+            self.EXIT_AMOUNT: historical_pnl.get_total_close_quantity(),
+            self.SYMBOL: historical_pnl.entries[0].symbol,
+            self.FEES: float(historical_pnl.get_paid_regular_fees_in_quote()),
+            self.SPECIAL_FEES: [
+                {
+                    self.CURRENCY: currency,
+                    self.FEES: float(value),
+                }
+                for currency, value in historical_pnl.get_paid_special_fees_by_currency().items()
+            ],
+            self.BASE: historical_pnl.entries[0].currency,
+            self.EXCHANGE: self.exchange_name,
+        }
+
+
+# PnL history aggregators by exchange id, exchange name and filters, least recently used first
+_PNL_HISTORY_AGGREGATORS = collections.OrderedDict()
+MAX_PNL_HISTORY_AGGREGATORS = 32
+
+
+def _get_updated_pnl_history_aggregator(exchange_name, exchange_manager, quote, symbol, since, scale):
+    key = (trading_api.get_exchange_manager_id(exchange_manager), exchange_name, quote, symbol, since, scale)
+    if key in _PNL_HISTORY_AGGREGATORS:
+        _PNL_HISTORY_AGGREGATORS.move_to_end(key)
+    else:
+        _PNL_HISTORY_AGGREGATORS[key] = PnlHistoryAggregator(exchange_name, quote, symbol, since, scale)
+        if len(_PNL_HISTORY_AGGREGATORS) > MAX_PNL_HISTORY_AGGREGATORS:
+            _PNL_HISTORY_AGGREGATORS.popitem(last=False)
+    aggregator = _PNL_HISTORY_AGGREGATORS[key]
+    aggregator.update(exchange_manager.exchange_personal_data.trades_manager.trades)
+    return aggregator
+
+
+def get_pnl_history(exchange=None, quote=None, symbol=None, since=None, scale=None):
     symbol = symbol or None
     # set quote filter to None when symbol is not provided
     quote = None if symbol else quote
-    history_by_exchange = _get_pnl_history(exchange, quote, symbol, since)
-    invalid_pnls = 0
-    for exchange_name, historical_pnl_elements in history_by_exchange.items():
-        for historical_pnl in historical_pnl_elements:
-            try:
-                close_time = historical_pnl.get_close_time()
-                scaled_time = close_time - (close_time % scale_seconds)
-                pnl, pnl_p = historical_pnl.get_profits()
-                pnl_a = historical_pnl.get_closed_close_value()
-                if scaled_time not in pnl_history:
-                    pnl_history[scaled_time] = {
-                        PNL: pnl,
-                        PNL_AMOUNT: pnl_a,
-                        QUOTE: historical_pnl.entries[0].market,
-                        TRADES_COUNT: len(historical_pnl.entries) + len(historical_pnl.closes),
-                        DETAILS: None
-                    }
-                else:
-                    pnl_val = pnl_history[scaled_time]
-                    pnl_val[PNL] += pnl
-                    pnl_val[PNL_AMOUNT] += pnl_a
-                    pnl_val[TRADES_COUNT] += len(historical_pnl.entries) + len(historical_pnl.closes)
-                if use_detailed_history:
-                    pnl_history[scaled_time][DETAILS] = {
-                        ENTRY_TIME: historical_pnl.get_entry_time(),
-                        ENTRY_DATE: _convert_timestamp(historical_pnl.get_entry_time()),
-                        ENTRY_PRICE: float(historical_pnl.get_entry_price()),
-                        EXIT_PRICE: float(historical_pnl.get_close_price()),
-                        ENTRY_SIDE: historical_pnl.entries[0].side.value,
-                        EXIT_SIDE: historical_pnl.closes[0].side.value,
-                        ENTRY_AMOUNT: historical_pnl.get_total_entry_quantity(),
-                        EXIT_AMOUNT: historical_pnl.get_total_close_quantity(),
-                        SYMBOL: historical_pnl.entries[0].symbol,
-                        FEES: float(historical_pnl.get_paid_regular_fees_in_quote()),
-                        SPECIAL_FEES: [
-                            {
-                                CURRENCY: currency,
-                                FEES: float(value),
-                            }
-                            for currency, value in historical_pnl.get_paid_special_fees_by_currency().items()
-                        ],
-                        BASE: historical_pnl.entries[0].currency,
-                        EXCHANGE: exchange_name,
-                    }
-            except trading_errors.IncompletePNLError:
-                invalid_pnls += 1
-    if invalid_pnls:
+    aggregators = [
+        _get_updated_pnl_history_aggregator(exchange_name, exchange_manager, quote, symbol, since, scale)
+        for exchange_name, exchange_manager in _get_pnl_history_exchange_managers(exchange)
+    ]
+    if invalid_pnls := sum(len(aggregator.invalid_pnl_entry_ids) for aggregator in aggregators):
         logging.get_logger("TradingModel").warning(f"{invalid_pnls} invalid TradePNLs in history")
-    return sorted(
-        [
-            {
-                EXIT_TIME: t,
-                EXIT_DATE: _convert_timestamp(t),
-                PNL: float(pnl[PNL]),
-                PNL_AMOUNT: float(pnl[PNL_AMOUNT]),
-                QUOTE: pnl[QUOTE],
-                TRADES_COUNT: pnl[TRADES_COUNT],
-                DETAILS: pnl[DETAILS],
-            }
-            for t, pnl in pnl_history.items()
-            # skip 0 value pnl in detailed history
-            if not use_detailed_history or (pnl[PNL] or pnl.get(DETAILS, {}).get(SPECIAL_FEES, 0))
-        ],
-        key=lambda x: x[EXIT_TIME]
-    )
+    if len(aggregators) == 1:
+        return aggregators[0].get_history()
+    return PnlHistoryAggregator.merge_history(aggregators)
 
 
 def _get_dumped_data(real, simulated, dump_func):
@@ -343,6 +537,130 @@ def _get_dumped_data(real, simulated, dump_func):
     ]
 
 
+class DumpedElementsJournal:
+    """
+    Versions of the orders or trades changes notified to the web interface, used to only send the elements
+    changed since the version a client already has
+    """
+    MAX_CHANGES = 10000
+
+    def __init__(self):
+        # start from the current time in milliseconds to keep versions increasing across restarts
+        self.version = int(time.time() * 1000)
+        # changes after this version are known
+        self.oldest_version = self.version
+        # element id: version of its latest change, oldest change first
+        self._version_by_id = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def record_change(self, element_id):
+        with self._lock:
+            self.version += 1
+            self._version_by_id[element_id] = self.version
+            self._version_by_id.move_to_end(element_id)
+            if len(self._version_by_id) > self.MAX_CHANGES:
+                _, self.oldest_version = self._version_by_id.popitem(last=False)
+
+    def get_version(self) -> int:
+        with self._lock:
+            return self.version
+
+    def get_changed_ids(self, since_version) -> (int, typing.Optional[set]):
+        """
+        :return: the current version and the ids of the elements changed after since_version,
+        None when changes since this version are unknown
+        """
+        with self._lock:
+            if not self.oldest_version <= since_version <= self.version:
+                return self.version, None
+            changed_ids = set()
+            for element_id in reversed(self._version_by_id):
+                if self._version_by_id[element_id] <= since_version:
+                    break
+                changed_ids.add(element_id)
+            return self.version, changed_ids
+
+
+ORDERS_JOURNAL = DumpedElementsJournal()
+TRADES_JOURNAL = DumpedElementsJournal()
+DEFAULT_DUMPS_PAGE_SIZE = 100
+CURSOR_SEPARATOR = ":"
+ELEMENTS = "elements"
+NEXT_CURSOR = "next_cursor"
+VERSION = "version"
+UPDATED = "updated"
+REMOVED = "removed"
+RESET = "reset"
+
+
+def _get_order_key(order):
+    return order.creation_time or 0, order.order_id
+
+
+def _get_trade_key(trade):
+    return trade.executed_time or 0, trade.trade_id
+
+
+def _parse_cursor(cursor) -> tuple:
+    element_time, element_id = cursor.split(CURSOR_SEPARATOR, 1)
+    return float(element_time), element_id
+
+
+def _get_dumped_data_update(
+    get_elements, get_elements_by_ids, dump_func, key_func, journal, since_version, cursor, limit
+) -> dict:
+    """
+    :param get_elements_by_ids: returns the real and simulated elements of the given ids, only used to get changes
+    :return: when since_version is given, the elements added or updated and the ids of the elements removed since
+    since_version, reset is True when these changes are unknown and elements should be fetched again.
+    Otherwise, the limit most recent elements older than the cursor and the cursor of the next page.
+    :raise ValueError: when the cursor is invalid or limit is not positive
+    """
+    if limit < 1:
+        raise ValueError(f"limit should be positive, got {limit}")
+    # read versions before elements: changes happening meanwhile will also be in the next delta
+    if since_version is None:
+        version = journal.get_version()
+    else:
+        version, changed_ids = journal.get_changed_ids(since_version)
+        if changed_ids is None:
+            return {VERSION: version, UPDATED: [], REMOVED: [], RESET: True}
+        # only changed elements are looked up
+        real, simulated = get_elements_by_ids(changed_ids) if changed_ids else ([], [])
+        updated = []
+        existing_ids = set()
+        for element, is_simulated in [(element, False) for element in real] + \
+                [(element, True) for element in simulated]:
+            existing_ids.add(key_func(element)[1])
+            if (dumped := dump_func(element, is_simulated)) is not None:
+                updated.append(dumped)
+        return {
+            VERSION: version,
+            UPDATED: updated,
+            REMOVED: list(changed_ids - existing_ids),
+            RESET: False,
+        }
+    real, simulated = get_elements()
+    elements = [(element, False) for element in real] + [(element, True) for element in simulated]
+    if cursor:
+        cursor_key = _parse_cursor(cursor)
+        elements = [element for element in elements if key_func(element[0]) < cursor_key]
+    page = heapq.nlargest(limit, elements, key=lambda element: key_func(element[0]))
+    next_cursor = None
+    if len(page) == limit and len(elements) > limit:
+        last_time, last_id = key_func(page[-1][0])
+        next_cursor = f"{last_time}{CURSOR_SEPARATOR}{last_id}"
+    return {
+        VERSION: version,
+        ELEMENTS: [
+            dumped
+            for element, is_simulated in page
+            if (dumped := dump_func(element, is_simulated)) is not None
+        ],
+        NEXT_CURSOR: next_cursor,
+    }
+
+
 SYMBOL = "symbol"
 TYPE = "type"
 PRICE = "price"
@@ -396,6 +714,47 @@ def get_all_orders_data():
     return _get_dumped_data(*interfaces_util.get_all_open_orders(), _dump_order)
 
 
+def record_order_change(order_id):
+    ORDERS_JOURNAL.record_change(order_id)
+
+
+def _get_elements_by_ids(element_ids, get_exchange_elements_by_id) -> (list, list):
+    """
+    :param get_exchange_elements_by_id: returns the elements of an exchange manager by id
+    :return: the real and simulated elements of the given ids
+    """
+    real_elements = []
+    simulated_elements = []
+    for exchange_manager in interfaces_util.get_exchange_managers():
+        if trading_api.is_trader_existing_and_enabled(exchange_manager):
+            elements = simulated_elements if trading_api.is_trader_simulated(exchange_manager) else real_elements
+            elements_by_id = get_exchange_elements_by_id(exchange_manager)
+            elements.extend(
+                element
+                for element_id in element_ids
+                if (element := elements_by_id.get(element_id)) is not None
+            )
+    return real_elements, simulated_elements
+
+
+def _get_open_orders_by_ids(order_ids) -> (list, list):
+    real_orders, simulated_orders = _get_elements_by_ids(
+        order_ids, lambda exchange_manager: exchange_manager.exchange_personal_data.orders_manager.orders
+    )
+    # same as trading_api.get_open_orders
+    return (
+        [order for order in real_orders if order.status == trading_enums.OrderStatus.OPEN],
+        [order for order in simulated_orders if order.status == trading_enums.OrderStatus.OPEN],
+    )
+
+
+def get_orders_data_update(since_version=None, cursor=None, limit=DEFAULT_DUMPS_PAGE_SIZE):
+    return _get_dumped_data_update(
+        interfaces_util.get_all_open_orders, _get_open_orders_by_ids, _dump_order, _get_order_key, ORDERS_JOURNAL,
+        since_version, cursor, limit
+    )
+
+
 def _convert_amount(exchange_manager, amount, currency):
     multiplier = trading_api.get_currency_ref_market_value(exchange_manager, currency)
     if multiplier is None:
@@ -431,6 +790,35 @@ def get_all_trades_data(independent_backtesting=None):
     return _get_dumped_data(*interfaces_util.get_trades_history(independent_backtesting=independent_backtesting), _dump_trade)
 
 
+def record_trade_change(trade_id):
+    TRADES_JOURNAL.record_change(trade_id)
+
+
+def _get_trades_by_ids(trade_ids) -> (list, list):
+    real_trades, simulated_trades = _get_elements_by_ids(
+        trade_ids, lambda exchange_manager: exchange_manager.exchange_personal_data.trades_manager.trades
+    )
+    # same as interfaces_util.get_trades_history
+    return (
+        [trade for trade in real_trades if trade.status is not trading_enums.OrderStatus.CANCELED],
+        [trade for trade in simulated_trades if trade.status is not trading_enums.OrderStatus.CANCELED],
+    )
+
+
+def get_trades_data_update(since_version=None, cursor=None, limit=DEFAULT_DUMPS_PAGE_SIZE):
+    return _get_dumped_data_update(
+        interfaces_util.get_trades_history, _get_trades_by_ids, _dump_trade, _get_trade_key, TRADES_JOURNAL,
+        since_version, cursor, limit
+    )
+
+
+def get_dumped_data_versions() -> dict:
+    return {
+        "orders_version": ORDERS_JOURNAL.get_version(),
+        "trades_version": TRADES_JOURNAL.get_version(),
+    }
+
+
 def _get_market(symbol_str):
     symbol = commons_symbols.parse_symbol(symbol_str)
     return symbol.settlement_asset or symbol.quote
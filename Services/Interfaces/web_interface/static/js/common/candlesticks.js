@@ -249,7 +249,8 @@ function create_orders(orders, trader, firstTime, lastTime){
                   symbol: "star-diamond",
               },
               xaxis: 'x',
-              yaxis: 'y2'
+              yaxis: 'y2',
+              meta: isDefined(orders.id) ? orders.id[index] : undefined,
             }
         });
     }else{
@@ -257,6 +258,17 @@ function create_orders(orders, trader, firstTime, lastTime){
     }
 }
 
+function update_orders(displayed_orders, updated_orders, removed_order_ids, lastTime){
+    const replaced_order_ids = new Set(removed_order_ids);
+    updated_orders.forEach((plotted_order) => replaced_order_ids.add(plotted_order.meta));
+    const kept_orders = displayed_orders.filter((plotted_order) => !replaced_order_ids.has(plotted_order.meta));
+    kept_orders.forEach((plotted_order) => {
+        // keep orders lines up to the last candle
+        plotted_order.x[plotted_order.x.length - 1] = lastTime;
+    });
+    return kept_orders.concat(updated_orders);
+}
+
 function update_trades(trades, trader_name, reference_trades){
     if(isDefined(reference_trades) && isDefined(reference_trades.y)){
         if(isDefined(trades.time) && trades.time.length){
@@ -328,6 +340,17 @@ function create_layout(graph_title){
     };
 }
 
+function create_plotly_config(){
+    return {
+        staticPlot: isMobileDisplay(),
+        scrollZoom: false,
+        modeBarButtonsToRemove: ["select2d", "lasso2d", "toggleSpikelines"],
+        responsive: true,
+        showEditInChartStudio: true,
+        displaylogo: false // no logo to avoid 'rel="noopener noreferrer"' security issue (see https://webhint.io/docs/user-guide/hints/hint-disown-opener/)
+    };
+}
+
 function push_new_candle(price_trace, volume_trace, candles, candle_index, last_candle_time){
     price_trace.x.push(last_candle_time);
     price_trace.open.push(candles["open"][candle_index]);
@@ -340,6 +363,90 @@ function push_new_candle(price_trace, volume_trace, candles, candle_index, last_
     volume_trace.marker.color.push(vol_color);
 }
 
+const _pad_time_unit = (value) => {
+    return `${value}`.padStart(2, "0");
+}
+
+function format_candle_time(timestamp){
+    // same format as the server side formatted candles times: "%y-%m-%d %H:%M:%S" in local time
+    const date = new Date(timestamp * 1000);
+    return `${_pad_time_unit(date.getFullYear() % 100)}-${_pad_time_unit(date.getMonth() + 1)}-`
+        + `${_pad_time_unit(date.getDate())} ${_pad_time_unit(date.getHours())}:`
+        + `${_pad_time_unit(date.getMinutes())}:${_pad_time_unit(date.getSeconds())}`;
+}
+
+function parse_candle_time(formatted_time){
+    const [date, time] = formatted_time.split(" ");
+    const [year, month, day] = date.split("-").map(Number);
+    const [hours, minutes, seconds] = time.split(":").map(Number);
+    return new Date(2000 + year, month - 1, day, hours, minutes, seconds).getTime() / 1000;
+}
+
+function update_symbol_price_graph_candles(element_id, exchange_id, symbol, time_frame, callback=undefined){
+    const graph = document.getElementById(element_id);
+    if(graph === null || !isDefined(graph.layout) || !isDefined(graph.data) || graph.data.length < 2
+        || graph.data[1].x.length === 0){
+        // graph is not displayed yet
+        if(isDefined(callback)){
+            callback(false);
+        }
+        return;
+    }
+    const price_trace = graph.data[1];
+    // candles at and after the last displayed one: the last displayed candle might have been updated
+    const since = parse_candle_time(price_trace.x[price_trace.x.length - 1]);
+    const ajax_url = "/dashboard/currency_price_graph_candles/" + exchange_id + "/"
+        + symbol.replace(new RegExp("/","g"), "|") + "/" + time_frame + "?since=" + since;
+    $.ajax({
+        url: ajax_url,
+        type: "GET",
+        dataType: "json",
+        success: function(candles, status){
+            const updated = candles !== null && !("error" in candles)
+                && update_candlestick_graph_candles(element_id, candles);
+            if(isDefined(callback)){
+                callback(updated);
+            }
+        },
+        error: function(result, status, error){
+            window.console&&console.error(error, result, status);
+            if(isDefined(callback)){
+                callback(false);
+            }
+        }
+    });
+}
+
+function update_candlestick_graph_candles(element_id, candles){
+    // candles are the columnar candles of /dashboard/currency_price_graph_candles with raw epoch times
+    const graph = document.getElementById(element_id);
+    if(!isDefined(graph.layout) || !isDefined(candles.time) || candles.time.length === 0){
+        return false;
+    }
+    const volume_trace = graph.data[0];
+    const price_trace = graph.data[1];
+    const prev_last_time = price_trace.x[price_trace.x.length - 1];
+    for(let candle_index=0; candle_index<candles.time.length; candle_index++){
+        const candle_time = format_candle_time(candles.time[candle_index]);
+        const displayed_index = price_trace.x.lastIndexOf(candle_time);
+        if(displayed_index === -1){
+            push_new_candle(price_trace, volume_trace, candles, candle_index, candle_time);
+        }else{
+            update_last_candle(price_trace, volume_trace, candles, displayed_index, candle_index);
+        }
+    }
+    const last_time = price_trace.x[price_trace.x.length - 1];
+    graph.data.slice(4).forEach((plotted_order) => {
+        // keep orders lines up to the last candle
+        if(plotted_order.x[plotted_order.x.length - 1] === prev_last_time){
+            plotted_order.x[plotted_order.x.length - 1] = last_time;
+        }
+    });
+    graph.layout.datarevision = graph.layout.datarevision + 1;
+    Plotly.react(element_id, graph.data, graph.layout, create_plotly_config());
+    return true;
+}
+
 function create_or_update_candlestick_graph(element_id, symbol_price_data, symbol, exchange_name, time_frame, replace=false){
     if (symbol_price_data) {
         const candles = symbol_price_data["candles"];
@@ -417,16 +524,14 @@ function create_or_update_candlestick_graph(element_id, symbol_price_data, symbo
         const lastTime = price_trace.x[price_trace.x.length - 1];
         const firstTime = price_trace.x[0];
         plotted_orders = create_orders(orders, isSimulated ? "Simulator": "Real trader", firstTime, lastTime);
+        if(prev_layout && !replace && isDefined(symbol_price_data["removed_orders"])){
+            // orders update: only updated and removed orders are given, keep the other displayed orders
+            plotted_orders = update_orders(prev_data.data.slice(4), plotted_orders,
+                symbol_price_data["removed_orders"], lastTime);
+        }
 
         const data = [volume_trace, price_trace, real_trader_trades, simulator_trades, ...plotted_orders];
-        const plotlyConfig = {
-            staticPlot: isMobileDisplay(),
-            scrollZoom: false,
-            modeBarButtonsToRemove: ["select2d", "lasso2d", "toggleSpikelines"],
-            responsive: true,
-            showEditInChartStudio: true,
-            displaylogo: false // no logo to avoid 'rel="noopener noreferrer"' security issue (see https://webhint.io/docs/user-guide/hints/hint-disown-opener/)
-        };
+        const plotlyConfig = create_plotly_config();
         if(replace){
             Plotly.newPlot(element_id, data, layout, plotlyConfig);
         }else{
@@ -103,26 +103,21 @@ $(document).ready(function () {
         }
     }
 
-    const onGraphUpdate = (data) => {
+    const onGraphUpdate = () => {
         if (onGraphUpdateCallback !== undefined){
             onGraphUpdateCallback();
         }
-        update_graph(data);
     }
 
     function handle_graph_update() {
-        socket.on('candle_graph_update_data', function (data) {
-            onGraphUpdate(data);
-        });
         socket.on('new_data', function (data) {
             debounce(
-                () => update_graph(data, false),
+                () => update_graph(data),
                 500
             );
         });
         socket.on('error', function (data) {
             if ("missing exchange manager" === data) {
-                socket.off("candle_graph_update_data");
                 socket.off("new_data");
                 socket.off("error");
                 socket.off("profitability");
@@ -145,31 +140,35 @@ $(document).ready(function () {
         return found_update_detail;
     }
 
-    function update_graph(data, re_update = true) {
+    function update_graph(data) {
         const candle_data = data.data;
-        let update_detail = undefined;
-        if (isDefined(data.request)) {
-            update_detail = data.request;
-            // ensure candles are from the right timeframe
-            const client_update_detail = _find_symbol_details(candle_data.symbol, candle_data.exchange_id);
-            if(typeof client_update_detail !== "undefined"
-                && update_detail.time_frame !== client_update_detail.time_frame){
-                // wrong time frame: don't update and don't ask for more update
-                return
-            }
-        } else {
-            update_detail = _find_symbol_details(candle_data.symbol, candle_data.exchange_id);
-        }
+        const update_detail = _find_symbol_details(candle_data.symbol, candle_data.exchange_id);
         if (isDefined(update_detail)) {
             get_symbol_price_graph(update_detail.elem_id, update_details.exchange_id, "",
                 "", update_details.time_frame, shouldDisplayOrders(), get_in_backtesting_mode(),
                 false, true, 0, candle_data);
-            if (re_update) {
+        }
+    }
+
+    function refresh_graph_candles(update_detail, refresh_id) {
+        if (update_detail.refresh_id !== refresh_id) {
+            // graph has been reloaded: its own refresh is scheduled
+            return;
+        }
+        // only fetch the candles that are not yet displayed
+        update_symbol_price_graph_candles(update_detail.elem_id, update_detail.exchange_id, update_detail.symbol,
+            update_detail.time_frame, function (updated) {
+                if (update_detail.refresh_id !== refresh_id) {
+                    // graph has been reloaded meanwhile: drop this update
+                    return;
+                }
+                if (updated) {
+                    onGraphUpdate();
+                }
                 setTimeout(function () {
-                    socket.emit("candle_graph_update", update_detail);
+                    refresh_graph_candles(update_detail, refresh_id);
                 }, price_graph_update_interval);
-            }
-        }
+            });
     }
 
     function init_updater(exchange_id, symbol, time_frame, elem_id) {
@@ -185,10 +184,11 @@ $(document).ready(function () {
             }else{
                 update_detail.time_frame = time_frame;
             }
+            // stop the previous refresh of this graph if any
+            update_detail.refresh_id = isDefined(update_detail.refresh_id) ? update_detail.refresh_id + 1 : 0;
+            const refresh_id = update_detail.refresh_id;
             setTimeout(function () {
-                    if (isDefined(socket)) {
-                        socket.emit("candle_graph_update", update_detail);
-                    }
+                    refresh_graph_candles(update_detail, refresh_id);
                 },
                 3000);
         }
@@ -0,0 +1,171 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import contextlib
+import decimal
+import math
+import mock
+import numpy as np
+import types
+
+import octobot_commons.enums as commons_enums
+import octobot_trading.enums as trading_enums
+import tentacles.Services.Interfaces.web_interface.enums as enums
+import tentacles.Services.Interfaces.web_interface.models.dashboard as dashboard
+
+TIME_FRAME = commons_enums.TimeFrames.ONE_HOUR.value
+TIME_FRAME_SECONDS = 3600
+START_TIME = 1700000000 - 1700000000 % TIME_FRAME_SECONDS
+CANDLES_COUNT = 10
+TIME = enums.PriceStrings.STR_PRICE_TIME.value
+CLOSE = enums.PriceStrings.STR_PRICE_CLOSE.value
+
+
+def _get_candles(count):
+    times = np.array([START_TIME + i * TIME_FRAME_SECONDS for i in range(count)], dtype=np.float64)
+    closes = np.arange(count, dtype=np.float64) + 100
+    return {
+        commons_enums.PriceIndexes.IND_PRICE_TIME.value: times,
+        commons_enums.PriceIndexes.IND_PRICE_OPEN.value: closes - 1,
+        commons_enums.PriceIndexes.IND_PRICE_HIGH.value: closes + 2,
+        commons_enums.PriceIndexes.IND_PRICE_LOW.value: closes - 2,
+        commons_enums.PriceIndexes.IND_PRICE_CLOSE.value: closes,
+        commons_enums.PriceIndexes.IND_PRICE_VOL.value: closes * 10,
+    }
+
+
+def _get_kline(kline_time, close):
+    return [kline_time, close - 1, close + 2, close - 2, close, close * 10]
+
+
+@contextlib.contextmanager
+def _symbol_data(candles, kline=None):
+    def get_symbol_historical_candles(symbol_data, time_frame, limit=-1):
+        # as CandlesManager.get_symbol_prices
+        if not len(candles[commons_enums.PriceIndexes.IND_PRICE_TIME.value]):
+            raise IndexError
+        return {index: values[-limit:] for index, values in candles.items()}
+
+    with mock.patch.object(dashboard.trading_api, "get_exchange_manager_from_exchange_id", mock.Mock()), \
+            mock.patch.object(dashboard.trading_api, "get_symbol_data", mock.Mock()), \
+            mock.patch.object(dashboard.trading_api, "get_symbol_historical_candles",
+                              mock.Mock(side_effect=get_symbol_historical_candles)) as historical_candles_mock, \
+            mock.patch.object(dashboard.trading_api, "has_symbol_klines", mock.Mock(return_value=kline is not None)), \
+            mock.patch.object(dashboard.trading_api, "get_symbol_klines", mock.Mock(return_value=kline)):
+        yield historical_candles_mock
+
+
+def _get_candles_since(since):
+    return dashboard.get_currency_price_graph_candles_since("exchange_id", "BTC|USDT", TIME_FRAME, since)
+
+
+def _times(start_index, end_index):
+    return [START_TIME + i * TIME_FRAME_SECONDS for i in range(start_index, end_index)]
+
+
+def test_get_currency_price_graph_candles_since_cached_range():
+    candles = _get_candles(CANDLES_COUNT)
+    with _symbol_data(candles) as historical_candles_mock:
+        # since before the cached candles: every candle
+        result = _get_candles_since(START_TIME - 10 * TIME_FRAME_SECONDS)
+        assert [name for name, _ in dashboard.CANDLES_COLUMNS] == list(result)
+        assert result[TIME].tolist() == _times(0, CANDLES_COUNT)
+        for name, index in dashboard.CANDLES_COLUMNS:
+            assert result[name].tolist() == candles[index].tolist()
+        # since inside the cached candles: candles from since, included
+        historical_candles_mock.reset_mock()
+        result = _get_candles_since(START_TIME + 6 * TIME_FRAME_SECONDS)
+        assert result[TIME].tolist() == _times(6, CANDLES_COUNT)
+        assert result[CLOSE].tolist() == [106, 107, 108, 109]
+        # only the required candles are fetched
+        assert historical_candles_mock.mock_calls[-1].kwargs["limit"] == 4
+        # since between candles times
+        result = _get_candles_since(START_TIME + 6 * TIME_FRAME_SECONDS + 1)
+        assert result[TIME].tolist() == _times(7, CANDLES_COUNT)
+        # since after the cached candles
+        result = _get_candles_since(START_TIME + CANDLES_COUNT * TIME_FRAME_SECONDS)
+        assert all(len(values) == 0 for values in result.values())
+        assert list(result) == [name for name, _ in dashboard.CANDLES_COLUMNS]
+
+
+def test_get_currency_price_graph_candles_since_in_construction_candle():
+    candles = _get_candles(CANDLES_COUNT)
+    last_candle_time = START_TIME + (CANDLES_COUNT - 1) * TIME_FRAME_SECONDS
+    # the in construction candle is the last historical candle: it is re-sent from its time, without duplicate
+    with _symbol_data(candles, kline=_get_kline(last_candle_time, 109)):
+        result = _get_candles_since(last_candle_time)
+        assert result[TIME].tolist() == [last_candle_time]
+        assert result[CLOSE].tolist() == [109]
+        result = _get_candles_since(START_TIME)
+        assert result[TIME].tolist() == _times(0, CANDLES_COUNT)
+    # the in construction candle is not in history yet: it is added as the last candle
+    next_candle_time = last_candle_time + TIME_FRAME_SECONDS
+    with _symbol_data(candles, kline=_get_kline(next_candle_time, 150)):
+        result = _get_candles_since(last_candle_time)
+        assert result[TIME].tolist() == [last_candle_time, next_candle_time]
+        assert result[CLOSE].tolist() == [109, 150]
+        assert result[enums.PriceStrings.STR_PRICE_VOL.value].tolist() == [1090, 1500]
+        result = _get_candles_since(next_candle_time)
+        assert result[TIME].tolist() == [next_candle_time]
+        # kline older than since
+        result = _get_candles_since(next_candle_time + 1)
+        assert all(len(values) == 0 for values in result.values())
+    # not initialized kline
+    with _symbol_data(candles, kline=_get_kline(next_candle_time, math.nan)):
+        result = _get_candles_since(last_candle_time)
+        assert result[TIME].tolist() == [last_candle_time]
+
+
+def test_get_currency_price_graph_candles_since_empty_result():
+    # no candle yet
+    with _symbol_data(_get_candles(0)):
+        assert _get_candles_since(START_TIME) is None
+    # no candle since
+    with _symbol_data(_get_candles(CANDLES_COUNT)):
+        result = _get_candles_since(START_TIME + 100 * TIME_FRAME_SECONDS)
+        assert list(result) == [name for name, _ in dashboard.CANDLES_COLUMNS]
+        assert all(len(values) == 0 for values in result.values())
+        # empty columns are still serializable
+        assert dashboard.get_candles_columns_payload(result) == {name: [] for name in result}
+        assert dashboard.get_candles_binary_payload(result) == b""
+
+
+def _order(order_id, status):
+    return types.SimpleNamespace(
+        order_id=order_id, status=status, creation_time=START_TIME, origin_price=decimal.Decimal(100),
+        origin_quantity=decimal.Decimal(1), quantity_currency="BTC", order_type=trading_enums.TraderOrderType.BUY_LIMIT,
+        side=trading_enums.TradeOrderSide.BUY,
+    )
+
+
+def test_format_order_update():
+    orders = [_order("open", trading_enums.OrderStatus.OPEN), _order("filled", trading_enums.OrderStatus.FILLED)]
+    exchange_manager = types.SimpleNamespace(exchange_personal_data=types.SimpleNamespace(
+        orders_manager=types.SimpleNamespace(orders={order.order_id: order for order in orders})
+    ))
+    id_key = trading_enums.ExchangeConstantsOrderColumns.ID.value
+    # open order: only this order is sent
+    update = dashboard.format_order_update(exchange_manager, {id_key: "open"})
+    assert update["orders"]["id"] == ["open"]
+    assert update["orders"]["price"] == [100.0]
+    assert update["removed_orders"] == []
+    # closed or unknown orders are removed
+    for order_id in ("filled", "unknown"):
+        update = dashboard.format_order_update(exchange_manager, {id_key: order_id})
+        assert update["orders"]["id"] == []
+        assert update["removed_orders"] == [order_id]
+    # no updated order
+    update = dashboard.format_order_update(exchange_manager, None)
+    assert (update["orders"]["id"], update["removed_orders"]) == ([], [])
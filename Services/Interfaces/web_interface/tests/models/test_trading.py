@@ -0,0 +1,557 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import collections
+import contextlib
+import decimal
+import random
+import types
+import mock
+import pytest
+
+import octobot_commons.enums as commons_enums
+import octobot_commons.constants as commons_constants
+import octobot_trading.enums as trading_enums
+import octobot_trading.errors as trading_errors
+import octobot_trading.personal_data as trading_personal_data
+import tentacles.Services.Interfaces.web_interface.models.trading as trading
+
+START_TIME = 1700000000
+SYMBOLS = ["BTC/USDT", "ETH/USDT", "ETH/BTC"]
+PNL_HISTORY_FILTERS = [
+    {},
+    {"scale": commons_enums.TimeFrames.ONE_DAY.value},
+    {"scale": commons_enums.TimeFrames.ONE_WEEK.value, "symbol": "BTC/USDT"},
+    {"scale": commons_enums.TimeFrames.ONE_HOUR.value, "quote": "USDT"},
+    {"symbol": "ETH/USDT", "since": START_TIME + 50 * 3600},
+]
+
+
+def _exchange_manager():
+    return types.SimpleNamespace(
+        id=str(random.random()),
+        exchange_personal_data=types.SimpleNamespace(trades_manager=trading_personal_data.TradesManager(mock.Mock()))
+    )
+
+
+@contextlib.contextmanager
+def _exchange_managers(exchange_managers):
+    exchange_name_by_exchange_manager_id = {
+        exchange_manager.id: f"exchange_{index}" for index, exchange_manager in enumerate(exchange_managers)
+    }
+    trading._PNL_HISTORY_AGGREGATORS.clear()
+    try:
+        with mock.patch.object(trading.configuration, "get_live_trading_enabled_exchange_managers",
+                               mock.Mock(return_value=exchange_managers)), \
+                mock.patch.object(trading.trading_api, "get_exchange_name",
+                                  mock.Mock(side_effect=lambda exchange_manager:
+                                            exchange_name_by_exchange_manager_id[exchange_manager.id])), \
+                mock.patch.object(trading.trading_api, "get_exchange_manager_id",
+                                  mock.Mock(side_effect=lambda exchange_manager: exchange_manager.id)):
+            yield
+    finally:
+        trading._PNL_HISTORY_AGGREGATORS.clear()
+
+
+class _TradesGenerator:
+    def __init__(self, seed):
+        self.rand = random.Random(seed)
+        self.count = 0
+
+    def add_trades(self, exchange_manager, count):
+        trades = exchange_manager.exchange_personal_data.trades_manager.trades
+        for _ in range(count):
+            index = self.count
+            self.count += 1
+            symbol = self.rand.choice(SYMBOLS)
+            is_exit = index > 3 and self.rand.random() < 0.5
+            # a few trades are from the same order
+            origin_order_id = f"order_{index if self.rand.random() < 0.9 else max(0, index - 1)}"
+            trade = _trade(
+                f"trade_{index}", origin_order_id, symbol,
+                START_TIME + index * 3600 * self.rand.random() * 5,
+                decimal.Decimal(str(100 + self.rand.random())),
+                trading_enums.TradeOrderSide.SELL if is_exit else trading_enums.TradeOrderSide.BUY,
+                associated_entry_ids=[f"order_{self.rand.randrange(max(1, index - 10), index)}"] if is_exit else None,
+                status=trading_enums.OrderStatus.CANCELED if self.rand.random() < 0.05
+                else trading_enums.OrderStatus.FILLED
+            )
+            trades[trade.trade_id] = trade
+
+
+def _trade(trade_id, origin_order_id, symbol, executed_time, executed_price, side,
+           associated_entry_ids=None, status=trading_enums.OrderStatus.FILLED, quantity=decimal.Decimal(1)):
+    base, quote = symbol.split("/")
+    return types.SimpleNamespace(
+        trade_id=trade_id, origin_order_id=origin_order_id, associated_entry_ids=associated_entry_ids,
+        status=status, symbol=symbol, executed_time=executed_time, canceled_time=0,
+        executed_price=executed_price, executed_quantity=quantity, fee=None, side=side,
+        market=quote, currency=base, origin_quantity=quantity, origin_price=executed_price,
+    )
+
+
+def _get_previous_implementation_pnl_history(exchange=None, quote=None, symbol=None, since=None, scale=None):
+    # get_pnl_history before PnlHistoryAggregator: every PnL is computed from the whole trades history
+    aggregator = trading.PnlHistoryAggregator
+    pnl_history = {}
+    use_detailed_history = not scale
+    scale_seconds = commons_enums.TimeFramesMinutes[commons_enums.TimeFrames(scale)] * \
+        commons_constants.MINUTE_TO_SECONDS if scale else 1
+    symbol = symbol or None
+    quote = None if symbol else quote
+    for exchange_name, historical_pnl_elements in trading._get_pnl_history(exchange, quote, symbol, since).items():
+        for historical_pnl in historical_pnl_elements:
+            try:
+                close_time = historical_pnl.get_close_time()
+                scaled_time = close_time - (close_time % scale_seconds)
+                pnl, _ = historical_pnl.get_profits()
+                pnl_a = historical_pnl.get_closed_close_value()
+                trades_count = len(historical_pnl.entries) + len(historical_pnl.closes)
+                if scaled_time not in pnl_history:
+                    pnl_history[scaled_time] = {
+                        aggregator.PNL: pnl,
+                        aggregator.PNL_AMOUNT: pnl_a,
+                        aggregator.QUOTE: historical_pnl.entries[0].market,
+                        aggregator.TRADES_COUNT: trades_count,
+                        aggregator.DETAILS: None
+                    }
+                else:
+                    pnl_val = pnl_history[scaled_time]
+                    pnl_val[aggregator.PNL] += pnl
+                    pnl_val[aggregator.PNL_AMOUNT] += pnl_a
+                    pnl_val[aggregator.TRADES_COUNT] += trades_count
+                if use_detailed_history:
+                    pnl_history[scaled_time][aggregator.DETAILS] = {
+                        aggregator.ENTRY_TIME: historical_pnl.get_entry_time(),
+                        aggregator.ENTRY_DATE: trading._convert_timestamp(historical_pnl.get_entry_time()),
+                        aggregator.ENTRY_PRICE: float(historical_pnl.get_entry_price()),
+                        aggregator.EXIT_PRICE: float(historical_pnl.get_close_price()),
+                        aggregator.ENTRY_SIDE: historical_pnl.entries[0].side.value,
+                        aggregator.EXIT_SIDE: historical_pnl.closes[0].side.value,
+                        aggregator.ENTRY_AMOUNT: historical_pnl.get_total_entry_quantity(),
+                        aggregator.EXIT_AMOUNT: historical_pnl.get_total_close_quantity(),
+                        aggregator.SYMBOL: historical_pnl.entries[0].symbol,
+                        aggregator.FEES: float(historical_pnl.get_paid_regular_fees_in_quote()),
+                        aggregator.SPECIAL_FEES: [
+                            {
+                                aggregator.CURRENCY: currency,
+                                aggregator.FEES: float(value),
+                            }
+                            for currency, value in historical_pnl.get_paid_special_fees_by_currency().items()
+                        ],
+                        aggregator.BASE: historical_pnl.entries[0].currency,
+                        aggregator.EXCHANGE: exchange_name,
+                    }
+            except trading_errors.IncompletePNLError:
+                pass
+    return sorted(
+        [
+            {
+                aggregator.EXIT_TIME: t,
+                aggregator.EXIT_DATE: trading._convert_timestamp(t),
+                aggregator.PNL: float(pnl[aggregator.PNL]),
+                aggregator.PNL_AMOUNT: float(pnl[aggregator.PNL_AMOUNT]),
+                aggregator.QUOTE: pnl[aggregator.QUOTE],
+                aggregator.TRADES_COUNT: pnl[aggregator.TRADES_COUNT],
+                aggregator.DETAILS: pnl[aggregator.DETAILS],
+            }
+            for t, pnl in pnl_history.items()
+            if not use_detailed_history or (
+                pnl[aggregator.PNL] or pnl.get(aggregator.DETAILS, {}).get(aggregator.SPECIAL_FEES, 0)
+            )
+        ],
+        key=lambda x: x[aggregator.EXIT_TIME]
+    )
+
+
+def _assert_same_as_previous_implementation() -> int:
+    history_length = 0
+    for pnl_history_filter in PNL_HISTORY_FILTERS:
+        pnl_history = trading.get_pnl_history(**pnl_history_filter)
+        assert pnl_history == _get_previous_implementation_pnl_history(**pnl_history_filter)
+        history_length += len(pnl_history)
+    return history_length
+
+
+def test_get_pnl_history_same_as_previous_implementation():
+    exchange_manager = _exchange_manager()
+    trades_manager = exchange_manager.exchange_personal_data.trades_manager
+    trades_generator = _TradesGenerator(1)
+    with _exchange_managers([exchange_manager]):
+        assert _assert_same_as_previous_implementation() == 0
+        trades_generator.add_trades(exchange_manager, 200)
+        assert _assert_same_as_previous_implementation() > 0
+        # incremental updates
+        for count in (37, 1, 0, 5):
+            trades_generator.add_trades(exchange_manager, count)
+            _assert_same_as_previous_implementation()
+        # trimmed history
+        for _ in range(20):
+            trades_manager.trades.popitem(last=False)
+        _assert_same_as_previous_implementation()
+        trades_generator.add_trades(exchange_manager, 10)
+        _assert_same_as_previous_implementation()
+        # removed last trades
+        for _ in range(3):
+            trades_manager.trades.popitem(last=True)
+        _assert_same_as_previous_implementation()
+        # reset history
+        trades_manager.trades = collections.OrderedDict()
+        assert _assert_same_as_previous_implementation() == 0
+        trades_generator.add_trades(exchange_manager, 50)
+        _assert_same_as_previous_implementation()
+
+
+def test_get_pnl_history_merged_exchanges_same_as_previous_implementation():
+    exchange_managers = [_exchange_manager(), _exchange_manager()]
+    trades_generator = _TradesGenerator(2)
+    with _exchange_managers(exchange_managers):
+        for count in (100, 20, 1):
+            for exchange_manager in exchange_managers:
+                trades_generator.add_trades(exchange_manager, count)
+            assert _assert_same_as_previous_implementation() > 0
+        # one aggregator by exchange and filter
+        assert len(trading._PNL_HISTORY_AGGREGATORS) == len(exchange_managers) * len(PNL_HISTORY_FILTERS)
+
+
+def test_merge_history():
+    exchange_managers = [_exchange_manager(), _exchange_manager()]
+    trades_generator = _TradesGenerator(3)
+    for exchange_manager in exchange_managers:
+        trades_generator.add_trades(exchange_manager, 100)
+    for scale in (None, commons_enums.TimeFrames.ONE_DAY.value):
+        aggregators = []
+        for index, exchange_manager in enumerate(exchange_managers):
+            aggregator = trading.PnlHistoryAggregator(f"exchange_{index}", None, None, None, scale)
+            aggregator.update(exchange_manager.exchange_personal_data.trades_manager.trades)
+            aggregators.append(aggregator)
+        merged_history = trading.PnlHistoryAggregator.merge_history(aggregators)
+        with _exchange_managers(exchange_managers):
+            assert merged_history == _get_previous_implementation_pnl_history(scale=scale)
+        # merging does not change aggregated values
+        assert trading.PnlHistoryAggregator.merge_history(aggregators) == merged_history
+        assert trading.PnlHistoryAggregator.merge_history(aggregators[:1]) == aggregators[0].get_history()
+    assert trading.PnlHistoryAggregator.merge_history([]) == []
+
+
+def test_get_new_trades():
+    trades = collections.OrderedDict()
+    aggregator = trading.PnlHistoryAggregator("exchange", None, None, None, None)
+    # unknown trades dict
+    assert aggregator._get_new_trades(trades) is None
+    aggregator.update(trades)
+    assert aggregator._get_new_trades(trades) == []
+    new_trades = [
+        _trade(f"trade_{index}", f"order_{index}", "BTC/USDT", START_TIME + index,
+               decimal.Decimal(100), trading_enums.TradeOrderSide.BUY)
+        for index in range(5)
+    ]
+    for trade in new_trades[:3]:
+        trades[trade.trade_id] = trade
+    assert aggregator._get_new_trades(trades) == new_trades[:3]
+    assert aggregator._get_new_trades(trades) == []
+    trades[new_trades[3].trade_id] = new_trades[3]
+    assert aggregator._get_new_trades(trades) == new_trades[3:4]
+    # removed last known trade
+    trades.popitem(last=True)
+    assert aggregator._get_new_trades(trades) is None
+    aggregator.update(trades)
+    assert aggregator._get_new_trades(trades) == []
+    # trimmed oldest trades, with or without new trades
+    trades.popitem(last=False)
+    assert aggregator._get_new_trades(trades) is None
+    aggregator.update(trades)
+    trades.popitem(last=False)
+    trades[new_trades[4].trade_id] = new_trades[4]
+    assert aggregator._get_new_trades(trades) is None
+    aggregator.update(trades)
+    assert aggregator._get_new_trades(trades) == []
+    # replaced trades dict, even with the same content
+    assert aggregator._get_new_trades(collections.OrderedDict(trades)) is None
+
+
+def test_update_exit_for_existing_entry():
+    exchange_manager = _exchange_manager()
+    trades = exchange_manager.exchange_personal_data.trades_manager.trades
+    aggregator = trading.PnlHistoryAggregator("exchange_0", None, None, None, commons_enums.TimeFrames.ONE_HOUR.value)
+
+    def _add_trade(trade):
+        trades[trade.trade_id] = trade
+        aggregator.update(trades)
+        return aggregator.get_history()
+
+    hour_start = START_TIME - START_TIME % 3600
+    assert _add_trade(_trade("entry", "entry_order", "BTC/USDT", hour_start + 10, decimal.Decimal(100),
+                             trading_enums.TradeOrderSide.BUY, quantity=decimal.Decimal(2))) == []
+    history = _add_trade(_trade("exit_1", "exit_order_1", "BTC/USDT", hour_start + 20, decimal.Decimal(110),
+                                trading_enums.TradeOrderSide.SELL, associated_entry_ids=["entry_order"]))
+    assert [(row[aggregator.EXIT_TIME], row[aggregator.TRADES_COUNT]) for row in history] == [(hour_start, 2)]
+    first_exit_pnl = history[0][aggregator.PNL]
+    # another exit of the same entry in the same hour: the entry PnL is aggregated again
+    history = _add_trade(_trade("exit_2", "exit_order_2", "BTC/USDT", hour_start + 30, decimal.Decimal(120),
+                                trading_enums.TradeOrderSide.SELL, associated_entry_ids=["entry_order"]))
+    assert [(row[aggregator.EXIT_TIME], row[aggregator.TRADES_COUNT]) for row in history] == [(hour_start, 3)]
+    assert history[0][aggregator.PNL] > first_exit_pnl
+    # another exit one hour later: the entry PnL is closed in this hour
+    history = _add_trade(_trade("exit_3", "exit_order_3", "BTC/USDT", hour_start + 3600, decimal.Decimal(90),
+                                trading_enums.TradeOrderSide.SELL, associated_entry_ids=["entry_order"]))
+    assert [(row[aggregator.EXIT_TIME], row[aggregator.TRADES_COUNT]) for row in history] == \
+        [(hour_start + 3600, 4)]
+    with _exchange_managers([exchange_manager]):
+        assert history == _get_previous_implementation_pnl_history(scale=commons_enums.TimeFrames.ONE_HOUR.value)
+
+
+@pytest.mark.parametrize("scale", [None, commons_enums.TimeFrames.ONE_DAY.value])
+def test_update_returns_cached_history(scale):
+    exchange_manager = _exchange_manager()
+    trades = exchange_manager.exchange_personal_data.trades_manager.trades
+    _TradesGenerator(4).add_trades(exchange_manager, 100)
+    aggregator = trading.PnlHistoryAggregator("exchange", None, None, None, scale)
+    aggregator.update(trades)
+    history = aggregator.get_history()
+    # nothing changed: the same history is returned
+    aggregator.update(trades)
+    assert aggregator.get_history() is history
+
+
+def test_update_entry_after_its_exit():
+    exchange_manager = _exchange_manager()
+    trades = exchange_manager.exchange_personal_data.trades_manager.trades
+    aggregator = trading.PnlHistoryAggregator("exchange_0", None, None, None, None)
+    exit_trade = _trade("exit", "exit_order", "BTC/USDT", START_TIME + 20, decimal.Decimal(110),
+                        trading_enums.TradeOrderSide.SELL, associated_entry_ids=["entry_order"])
+    trades[exit_trade.trade_id] = exit_trade
+    aggregator.update(trades)
+    assert aggregator.get_history() == []
+    entry_trade = _trade("entry", "entry_order", "BTC/USDT", START_TIME + 10, decimal.Decimal(100),
+                         trading_enums.TradeOrderSide.BUY)
+    trades[entry_trade.trade_id] = entry_trade
+    aggregator.update(trades)
+    assert [row[aggregator.TRADES_COUNT] for row in aggregator.get_history()] == [2]
+    with _exchange_managers([exchange_manager]):
+        assert aggregator.get_history() == _get_previous_implementation_pnl_history()
+
+
+def test_dumped_elements_journal():
+    journal = trading.DumpedElementsJournal()
+    initial_version = journal.get_version()
+    assert journal.get_changed_ids(initial_version) == (initial_version, set())
+    journal.record_change("a")
+    journal.record_change("b")
+    journal.record_change("a")
+    assert journal.get_version() == initial_version + 3
+    assert journal.get_changed_ids(initial_version) == (initial_version + 3, {"a", "b"})
+    # "a" latest change is after "b" one
+    assert journal.get_changed_ids(initial_version + 2) == (initial_version + 3, {"a"})
+    assert journal.get_changed_ids(initial_version + 3) == (initial_version + 3, set())
+    # unknown versions
+    assert journal.get_changed_ids(initial_version + 4) == (initial_version + 3, None)
+    assert journal.get_changed_ids(initial_version - 1) == (initial_version + 3, None)
+
+
+def test_dumped_elements_journal_eviction():
+    with mock.patch.object(trading.DumpedElementsJournal, "MAX_CHANGES", 3):
+        journal = trading.DumpedElementsJournal()
+        initial_version = journal.get_version()
+        for element_id in ("a", "b", "c"):
+            journal.record_change(element_id)
+        assert journal.get_changed_ids(initial_version) == (initial_version + 3, {"a", "b", "c"})
+        # updating a known element does not evict changes
+        journal.record_change("a")
+        assert journal.get_changed_ids(initial_version) == (initial_version + 4, {"a", "b", "c"})
+        journal.record_change("d")
+        # "b" change is evicted: changes are only known from its version
+        assert journal.oldest_version == initial_version + 2
+        assert journal.get_changed_ids(initial_version) == (initial_version + 5, None)
+        assert journal.get_changed_ids(initial_version + 1) == (initial_version + 5, None)
+        assert journal.get_changed_ids(initial_version + 2) == (initial_version + 5, {"a", "c", "d"})
+
+
+def _element(element_id, element_time):
+    return types.SimpleNamespace(element_id=element_id, element_time=element_time)
+
+
+def _dump_element(element, is_simulated):
+    if element.element_id == "invalid":
+        return None
+    return {"id": element.element_id, "simulated": is_simulated}
+
+
+def _get_element_key(element):
+    return element.element_time, element.element_id
+
+
+def _get_elements_by_ids(elements):
+    return lambda element_ids: tuple(
+        [element for element in side_elements if element.element_id in element_ids]
+        for side_elements in elements
+    )
+
+
+def _get_dumped_data_update(elements, journal, since_version=None, cursor=None, limit=trading.DEFAULT_DUMPS_PAGE_SIZE):
+    return trading._get_dumped_data_update(
+        lambda: elements, _get_elements_by_ids(elements), _dump_element, _get_element_key, journal,
+        since_version, cursor, limit
+    )
+
+
+def test_get_dumped_data_update_changes():
+    journal = trading.DumpedElementsJournal()
+    real = [_element("real_1", 1), _element("real_2", 2), _element("invalid", 3)]
+    simulated = [_element("simulated_1", 1)]
+    initial_version = journal.get_version()
+    update = _get_dumped_data_update((real, simulated), journal, since_version=initial_version)
+    assert update == {
+        trading.VERSION: initial_version, trading.UPDATED: [], trading.REMOVED: [], trading.RESET: False
+    }
+    for element_id in ("real_1", "simulated_1", "removed", "invalid"):
+        journal.record_change(element_id)
+    update = _get_dumped_data_update((real, simulated), journal, since_version=initial_version)
+    assert update[trading.VERSION] == initial_version + 4
+    assert update[trading.UPDATED] == [
+        {"id": "real_1", "simulated": False}, {"id": "simulated_1", "simulated": True}
+    ]
+    # changed ids that are not in elements anymore are removed, elements failing to be dumped are skipped
+    assert update[trading.REMOVED] == ["removed"]
+    assert update[trading.RESET] is False
+    # only changes after since_version
+    update = _get_dumped_data_update((real, simulated), journal, since_version=initial_version + 3)
+    assert (update[trading.UPDATED], update[trading.REMOVED]) == ([], [])
+    update = _get_dumped_data_update((real, simulated), journal, since_version=initial_version + 2)
+    assert (update[trading.UPDATED], update[trading.REMOVED]) == ([], ["removed"])
+
+
+@pytest.mark.parametrize("since_version_delta", [-1, 5])
+def test_get_dumped_data_update_unknown_version(since_version_delta):
+    journal = trading.DumpedElementsJournal()
+    initial_version = journal.get_version()
+    journal.record_change("real_1")
+    get_elements = mock.Mock(return_value=([_element("real_1", 1)], []))
+    get_elements_by_ids = mock.Mock(return_value=([_element("real_1", 1)], []))
+    update = trading._get_dumped_data_update(
+        get_elements, get_elements_by_ids, _dump_element, _get_element_key, journal,
+        initial_version + since_version_delta, None, 10
+    )
+    # changes are unknown: elements should be fetched again
+    assert update == {
+        trading.VERSION: initial_version + 1, trading.UPDATED: [], trading.REMOVED: [], trading.RESET: True
+    }
+    get_elements.assert_not_called()
+    get_elements_by_ids.assert_not_called()
+
+
+def test_get_dumped_data_update_changes_only_looks_up_changed_elements():
+    journal = trading.DumpedElementsJournal()
+    initial_version = journal.get_version()
+    get_elements = mock.Mock(return_value=([_element("real_1", 1), _element("real_2", 2)], []))
+    get_elements_by_ids = mock.Mock(return_value=([_element("real_1", 1)], []))
+    update = trading._get_dumped_data_update(
+        get_elements, get_elements_by_ids, _dump_element, _get_element_key, journal, initial_version, None, 10
+    )
+    # no change: nothing is looked up
+    assert (update[trading.UPDATED], update[trading.REMOVED]) == ([], [])
+    get_elements_by_ids.assert_not_called()
+    journal.record_change("real_1")
+    update = trading._get_dumped_data_update(
+        get_elements, get_elements_by_ids, _dump_element, _get_element_key, journal, initial_version, None, 10
+    )
+    assert update[trading.UPDATED] == [{"id": "real_1", "simulated": False}]
+    get_elements_by_ids.assert_called_once_with({"real_1"})
+    get_elements.assert_not_called()
+
+
+def _orders_exchange_manager(orders, is_simulated):
+    return types.SimpleNamespace(
+        is_simulated=is_simulated,
+        exchange_personal_data=types.SimpleNamespace(
+            orders_manager=types.SimpleNamespace(orders={order.order_id: order for order in orders}),
+        )
+    )
+
+
+def test_get_open_orders_by_ids():
+    open_order = types.SimpleNamespace(order_id="open", status=trading_enums.OrderStatus.OPEN)
+    closed_order = types.SimpleNamespace(order_id="closed", status=trading_enums.OrderStatus.CLOSED)
+    simulated_order = types.SimpleNamespace(order_id="simulated", status=trading_enums.OrderStatus.OPEN)
+    exchange_managers = [
+        _orders_exchange_manager([open_order, closed_order], False),
+        _orders_exchange_manager([simulated_order], True),
+    ]
+    with mock.patch.object(trading.interfaces_util, "get_exchange_managers",
+                           mock.Mock(return_value=exchange_managers)), \
+            mock.patch.object(trading.trading_api, "is_trader_existing_and_enabled", mock.Mock(return_value=True)), \
+            mock.patch.object(trading.trading_api, "is_trader_simulated",
+                              mock.Mock(side_effect=lambda exchange_manager: exchange_manager.is_simulated)):
+        assert trading._get_open_orders_by_ids({"open", "closed", "simulated", "unknown"}) == (
+            [open_order], [simulated_order]
+        )
+        assert trading._get_open_orders_by_ids({"closed"}) == ([], [])
+
+
+def test_get_dumped_data_update_reset_after_eviction():
+    with mock.patch.object(trading.DumpedElementsJournal, "MAX_CHANGES", 2):
+        journal = trading.DumpedElementsJournal()
+        initial_version = journal.get_version()
+        for element_id in ("a", "b", "c"):
+            journal.record_change(element_id)
+        update = _get_dumped_data_update(([_element("a", 1)], []), journal, since_version=initial_version)
+        assert update[trading.RESET] is True
+        assert update[trading.VERSION] == initial_version + 3
+        # from the returned version, changes are known again
+        update = _get_dumped_data_update(([_element("a", 1)], []), journal, since_version=update[trading.VERSION])
+        assert update[trading.RESET] is False
+
+
+def _get_all_pages(elements, journal, limit) -> list:
+    pages = []
+    cursor = None
+    while True:
+        update = _get_dumped_data_update(elements, journal, cursor=cursor, limit=limit)
+        assert update[trading.VERSION] == journal.get_version()
+        pages.append([dumped["id"] for dumped in update[trading.ELEMENTS]])
+        if (cursor := update[trading.NEXT_CURSOR]) is None:
+            return pages
+
+
+def test_get_dumped_data_update_pages():
+    journal = trading.DumpedElementsJournal()
+    # several elements share the same time
+    real = [_element(f"real_{index}", 100 + index // 3) for index in range(7)]
+    simulated = [_element(f"simulated_{index}", 100 + index) for index in range(2)]
+    expected_ids = [
+        element.element_id for element in sorted(real + simulated, key=_get_element_key, reverse=True)
+    ]
+    assert _get_all_pages((real, simulated), journal, 100) == [expected_ids]
+    for limit in range(1, 11):
+        pages = _get_all_pages((real, simulated), journal, limit)
+        # most recent first, each element once
+        assert sum(pages, []) == expected_ids
+        assert all(len(page) == limit for page in pages[:-1])
+        # no empty last page when the elements count is a multiple of limit
+        assert 0 < len(pages[-1]) <= limit
+        assert len(pages) == -(-len(expected_ids) // limit)
+    # no element
+    assert _get_all_pages(([], []), journal, 5) == [[]]
+
+
+def test_get_dumped_data_update_invalid_arguments():
+    journal = trading.DumpedElementsJournal()
+    elements = ([_element("real_1", 1)], [])
+    with pytest.raises(ValueError):
+        _get_dumped_data_update(elements, journal, cursor="invalid")
+    with pytest.raises(ValueError):
+        _get_dumped_data_update(elements, journal, cursor="abc:real_1")
+    with pytest.raises(ValueError):
+        _get_dumped_data_update(elements, journal, limit=0)
@@ -27,6 +27,7 @@ import octobot_services.constants as services_constants
 import octobot_services.interfaces as services_interfaces
 import octobot_services.interfaces.util as interfaces_util
 import octobot_trading.api as trading_api
+import octobot_trading.enums as trading_enums
 import octobot.configuration_manager as configuration_manager
 import octobot.enums
 import tentacles.Services.Interfaces.web_interface.constants as constants
@@ -40,6 +41,7 @@ import tentacles.Services.Interfaces.web_interface as web_interface_root
 import tentacles.Services.Interfaces.web_interface.controllers
 import tentacles.Services.Interfaces.web_interface.advanced_controllers
 import tentacles.Services.Interfaces.web_interface.api
+import tentacles.Services.Interfaces.web_interface.models as models
 import tentacles.Services.Services_bases as Service_bases
 import octobot_tentacles_manager.api
 
@@ -131,6 +133,7 @@ class WebInterface(services_interfaces.AbstractWebInterface):
 
     @staticmethod
     async def _web_trades_callback(exchange: str, exchange_id: str, cryptocurrency: str, symbol: str, trade, old_trade):
+        models.record_trade_change(trade.get(trading_enums.ExchangeConstantsOrderColumns.ID.value))
         web_interface_root.send_new_trade(
             trade,
             exchange_id,
@@ -140,6 +143,7 @@ class WebInterface(services_interfaces.AbstractWebInterface):
     @staticmethod
     async def _web_orders_callback(exchange: str, exchange_id: str, cryptocurrency: str, symbol: str, order,
                                    update_type, is_from_bot):
+        models.record_order_change(order.get(trading_enums.ExchangeConstantsOrderColumns.ID.value))
         web_interface_root.send_order_update(order, exchange_id, symbol)
 
     @staticmethod
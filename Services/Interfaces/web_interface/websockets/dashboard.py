@@ -60,10 +60,13 @@ class DashboardNamespace(websockets.AbstractWebSocketNamespaceNotifier):
         exchange_manager = octobot_trading_api.get_exchange_manager_from_exchange_id(exchange_id)
         return {
             "trades": models.format_trades(trades),
-            "orders": models.format_orders(octobot_trading_api.get_open_orders(exchange_manager, symbol=symbol), 0),
+            # only the updated order is sent: clients update their displayed orders from it
+            **models.format_order_update(exchange_manager, order),
             "simulated": octobot_trading_api.is_trader_simulated(exchange_manager),
             "symbol": symbol,
-            "exchange_id": exchange_id
+            "exchange_id": exchange_id,
+            # clients having orders and trades lists can fetch their changes using orders_update and trades_update
+            **models.get_dumped_data_versions(),
         }
 
     @websockets.websocket_with_login_required_when_activated
@@ -83,6 +86,35 @@ class DashboardNamespace(websockets.AbstractWebSocketNamespaceNotifier):
                 self.logger.exception(e, True, f"Error when sending web notification: {e}")
         return False
 
+    @staticmethod
+    def _get_int_arg(data, key, default):
+        # as flask request args with type=int: invalid values are replaced by default
+        try:
+            return int(data[key])
+        except (KeyError, TypeError, ValueError):
+            return default
+
+    def _emit_dumped_data_update(self, event, get_update, data):
+        try:
+            flask_socketio.emit(event, {
+                "request": data,
+                "data": get_update(
+                    since_version=self._get_int_arg(data, "since_version", None),
+                    cursor=data.get("cursor"),
+                    limit=self._get_int_arg(data, "limit", models.DEFAULT_DUMPS_PAGE_SIZE),
+                )
+            })
+        except ValueError:
+            flask_socketio.emit("error", "invalid cursor or limit")
+
+    @websockets.websocket_with_login_required_when_activated
+    def on_orders_update(self, data):
+        self._emit_dumped_data_update("orders_update_data", models.get_orders_data_update, data)
+
+    @websockets.websocket_with_login_required_when_activated
+    def on_trades_update(self, data):
+        self._emit_dumped_data_update("trades_update_data", models.get_trades_data_update, data)
+
     @websockets.websocket_with_login_required_when_activated
     def on_candle_graph_update(self, data):
         try:
@@ -36,6 +36,8 @@ import octobot_commons.configuration.fields_utils as fields_utils
 import octobot.constants as constants
 import octobot.community as community
 
+import tentacles.Services.Services_bases.gpt_service.gpt_responses_cache as gpt_responses_cache
+
 
 NO_SYSTEM_PROMPT_MODELS = [
     "o1-mini",
@@ -48,12 +50,19 @@ MINIMAL_PARAMS_MODELS = [
 ]
 SYSTEM = "system"
 USER = "user"
+OPENAI_PROVIDER = "openai"
+CUSTOM_LLM_PROVIDER = "custom"
+# set to 0 to disable GPT responses cache
+ENV_GPT_RESPONSES_CACHE_TTL = "GPT_RESPONSES_CACHE_TTL"
+ENV_GPT_RESPONSES_CACHE_MAX_SIZE = "GPT_RESPONSES_CACHE_MAX_SIZE"
 
 
 class GPTService(services.AbstractService):
     BACKTESTING_ENABLED = True
     DEFAULT_MODEL = "gpt-3.5-turbo"
     NO_TOKEN_LIMIT_VALUE = -1
+    DEFAULT_RESPONSES_CACHE_TTL = commons_constants.DAYS_TO_SECONDS * 7
+    DEFAULT_RESPONSES_CACHE_MAX_SIZE = 10000
 
     def get_fields_description(self):
         if self._env_secret_key is None:
@@ -88,6 +97,24 @@ class GPTService(services.AbstractService):
         self._daily_tokens_limit: int = self._env_daily_token_limit
         self.consumed_daily_tokens: int = 1
         self.last_consumed_token_date: datetime.date = None
+        # estimated tokens of pending requests: concurrent requests can't exceed the daily tokens limit
+        self.reserved_daily_tokens: int = 0
+        self._last_request_tokens: int = 0
+        self.responses_cache_ttl: float = float(os.getenv(
+            ENV_GPT_RESPONSES_CACHE_TTL, self.DEFAULT_RESPONSES_CACHE_TTL
+        ))
+        self.responses_cache_max_size: int = int(os.getenv(
+            ENV_GPT_RESPONSES_CACHE_MAX_SIZE, self.DEFAULT_RESPONSES_CACHE_MAX_SIZE
+        ))
+        self.responses_cache_path: str = os.path.join(
+            commons_constants.USER_FOLDER, commons_constants.CACHE_FOLDER, self.get_name(), "responses.db"
+        )
+        self._responses_cache: typing.Optional[gpt_responses_cache.GPTResponsesCache] = None
+        # reused between requests to keep HTTP connections alive
+        self._client: typing.Optional[openai.AsyncOpenAI] = None
+        self._client_params: typing.Optional[tuple] = None
+        # used when a custom base url is used without api key
+        self._random_api_key: str = uuid.uuid4().hex
 
     @staticmethod
     def create_message(role, content, model: str = None):
@@ -126,11 +153,60 @@ class GPTService(services.AbstractService):
             return signal
         return await self._get_signal_from_gpt(messages, model, max_tokens, n, stop, temperature)
 
-    def _get_client(self) -> openai.AsyncOpenAI:
-        return openai.AsyncOpenAI(
-            api_key=self._get_api_key(),
-            base_url=self._get_base_url(),
-        )
+    async def _get_client(self) -> openai.AsyncOpenAI:
+        client_params = (self._get_api_key(), self._get_base_url())
+        if self._client is None or client_params != self._client_params:
+            await self._close_client()
+            self._client = openai.AsyncOpenAI(
+                api_key=client_params[0],
+                base_url=client_params[1],
+            )
+            self._client_params = client_params
+        return self._client
+
+    async def _close_client(self):
+        if self._client is None:
+            return
+        client = self._client
+        self._client = None
+        self._client_params = None
+        try:
+            await client.close()
+        except Exception as err:
+            self.logger.exception(err, True, f"Error when closing GPT client: {err}")
+
+    def _get_llm_provider(self) -> str:
+        return CUSTOM_LLM_PROVIDER if self._get_base_url() else OPENAI_PROVIDER
+
+    def _get_responses_cache(self) -> typing.Optional[gpt_responses_cache.GPTResponsesCache]:
+        if self.responses_cache_ttl <= 0 or self.responses_cache_max_size <= 0:
+            return None
+        if self._responses_cache is None:
+            self._responses_cache = gpt_responses_cache.GPTResponsesCache(
+                self.responses_cache_path, self.responses_cache_ttl, self.responses_cache_max_size
+            )
+        return self._responses_cache
+
+    async def _get_cached_response(self, cache_key: str) -> typing.Optional[str]:
+        if (responses_cache := self._get_responses_cache()) is None:
+            return None
+        try:
+            return await responses_cache.get(cache_key)
+        except Exception as err:
+            self.logger.exception(err, True, f"Error when reading GPT responses cache: {err}")
+            return None
+
+    async def _cache_response(self, cache_key: str, response: str):
+        if (responses_cache := self._get_responses_cache()) is None:
+            return
+        try:
+            await responses_cache.set(cache_key, response)
+        except Exception as err:
+            self.logger.exception(err, True, f"Error when updating GPT responses cache: {err}")
+
+    async def clear_responses_cache(self):
+        if (responses_cache := self._get_responses_cache()) is not None:
+            await responses_cache.clear()
 
     def _is_of_series(self, model: str, series: str) -> bool:
         if model.startswith(series) and len(model) > 1:
@@ -160,16 +236,26 @@ class GPTService(services.AbstractService):
         stop=None,
         temperature=0.5
     ):
+        model = model or self.model
+        client = await self._get_client()
+        # responses from different LLM providers or urls are not shared
+        cache_key = gpt_responses_cache.GPTResponsesCache.get_key(
+            self._get_llm_provider(), str(client.base_url), model, messages,
+            max_tokens=max_tokens, n=n, stop=stop, temperature=temperature
+        )
+        if (cached_response := await self._get_cached_response(cache_key)) is not None:
+            # no token is consumed
+            return cached_response
         self._ensure_rate_limit()
+        reserved_tokens = self._reserve_tokens()
         try:
-            model = model or self.model
             supports_params = not self._is_minimal_params_model(model)
             if not supports_params:
                 self.logger.info(
                     f"The {model} model does not support every required parameter, results might not be as accurate "
                     f"as with other models."
                 )
-            completions = await self._get_client().chat.completions.create(
+            completions = await client.chat.completions.create(
                 model=model,
                 max_completion_tokens=max_tokens,
                 n=n,
@@ -178,7 +264,10 @@ class GPTService(services.AbstractService):
                 messages=messages
             )
             self._update_token_usage(completions.usage.total_tokens)
-            return completions.choices[0].message.content
+            response = completions.choices[0].message.content
+            if response is not None:
+                await self._cache_response(cache_key, response)
+            return response
         except (
             openai.BadRequestError, openai.UnprocessableEntityError # error in request
         )as err:
@@ -201,6 +290,8 @@ class GPTService(services.AbstractService):
             raise errors.InvalidRequestError(
                 f"Unexpected error when running request with model {model}: {err}"
             ) from err
+        finally:
+            self.reserved_daily_tokens -= reserved_tokens
 
     def _get_signal_from_stored_signals(
         self,
@@ -327,12 +418,23 @@ class GPTService(services.AbstractService):
             self.last_consumed_token_date = datetime.date.today()
         if self._daily_tokens_limit == self.NO_TOKEN_LIMIT_VALUE:
             return
-        if self.consumed_daily_tokens >= self._daily_tokens_limit:
+        if self.consumed_daily_tokens + self.reserved_daily_tokens >= self._daily_tokens_limit:
+            reserved_tokens = (
+                f", {self.reserved_daily_tokens} reserved by pending requests" if self.reserved_daily_tokens else ""
+            )
             raise errors.RateLimitError(
-                f"Daily rate limit reached (used {self.consumed_daily_tokens} out of {self._daily_tokens_limit})"
+                f"Daily rate limit reached (used {self.consumed_daily_tokens} out of {self._daily_tokens_limit}"
+                f"{reserved_tokens})"
             )
 
+    def _reserve_tokens(self) -> int:
+        # pending requests are expected to consume as many tokens as the last request
+        reserved_tokens = self._last_request_tokens
+        self.reserved_daily_tokens += reserved_tokens
+        return reserved_tokens
+
     def _update_token_usage(self, consumed_tokens):
+        self._last_request_tokens = consumed_tokens
         self.consumed_daily_tokens += consumed_tokens
         self.logger.debug(f"Consumed {consumed_tokens} tokens. {self.consumed_daily_tokens} consumed tokens today.")
 
@@ -382,7 +484,7 @@ class GPTService(services.AbstractService):
             return key
         if self._get_base_url():
             # no key and custom base url: use random key
-            return uuid.uuid4().hex
+            return self._random_api_key
         return key
 
     def _get_base_url(self):
@@ -400,7 +502,8 @@ class GPTService(services.AbstractService):
                 return
             if self._get_base_url():
                 self.logger.info(f"Using custom LLM url: {self._get_base_url()}")
-            fetched_models = await self._get_client().models.list()
+            client = await self._get_client()
+            fetched_models = await client.models.list()
             if fetched_models.data:
                 self.logger.info(f"Fetched {len(fetched_models.data)} models")
                 self.models = [d.id for d in fetched_models.data]
@@ -438,4 +541,7 @@ class GPTService(services.AbstractService):
         return not self.config
 
     async def stop(self):
-        pass
+        await self._close_client()
+        if self._responses_cache is not None:
+            await self._responses_cache.close()
+            self._responses_cache = None
@@ -0,0 +1,120 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import hashlib
+import json
+import os
+import time
+import typing
+
+import aiosqlite
+
+
+class GPTResponsesCache:
+    """
+    Persistent cache of GPT responses stored in a SQLite file.
+    Responses are identified by a hash of their request content: identical requests share the same response
+    until it expires.
+    """
+    TABLE = "responses"
+    KEY_COLUMN = "key"
+    RESPONSE_COLUMN = "response"
+    CREATION_TIME_COLUMN = "created_at"
+
+    def __init__(self, file_path: str, ttl: float, max_size: int):
+        self.file_path: str = file_path
+        # seconds after which a cached response expires
+        self.ttl: float = ttl
+        # maximum number of cached responses, oldest responses are removed first
+        self.max_size: int = max_size
+        self._connection: typing.Optional[aiosqlite.Connection] = None
+        self._connection_lock: asyncio.Lock = asyncio.Lock()
+
+    @staticmethod
+    def get_key(provider: str, base_url: str, model: str, messages: list, **request_params) -> str:
+        """
+        :return: a hash identifying a request from the LLM it is sent to and its content
+        """
+        return hashlib.sha256(
+            json.dumps(
+                {"provider": provider, "base_url": base_url, "model": model, "messages": messages, **request_params},
+                sort_keys=True, default=str
+            ).encode()
+        ).hexdigest()
+
+    async def get(self, key: str) -> typing.Optional[str]:
+        connection = await self._get_connection()
+        async with connection.execute(
+            f"SELECT {self.RESPONSE_COLUMN} FROM {self.TABLE} "
+            f"WHERE {self.KEY_COLUMN} = ? AND {self.CREATION_TIME_COLUMN} >= ?",
+            (key, time.time() - self.ttl)
+        ) as cursor:
+            row = await cursor.fetchone()
+        return None if row is None else row[0]
+
+    async def set(self, key: str, response: str):
+        connection = await self._get_connection()
+        await connection.execute(
+            f"INSERT OR REPLACE INTO {self.TABLE} "
+            f"({self.KEY_COLUMN}, {self.RESPONSE_COLUMN}, {self.CREATION_TIME_COLUMN}) VALUES (?, ?, ?)",
+            (key, response, time.time())
+        )
+        await self._remove_outdated_responses(connection)
+        await connection.commit()
+
+    async def clear(self):
+        connection = await self._get_connection()
+        await connection.execute(f"DELETE FROM {self.TABLE}")
+        await connection.commit()
+
+    async def close(self):
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    async def _get_connection(self) -> aiosqlite.Connection:
+        async with self._connection_lock:
+            if self._connection is None:
+                if directory := os.path.dirname(self.file_path):
+                    os.makedirs(directory, exist_ok=True)
+                connection = await aiosqlite.connect(self.file_path)
+                await connection.execute(
+                    f"CREATE TABLE IF NOT EXISTS {self.TABLE} ("
+                    f"{self.KEY_COLUMN} TEXT PRIMARY KEY, "
+                    f"{self.RESPONSE_COLUMN} TEXT NOT NULL, "
+                    f"{self.CREATION_TIME_COLUMN} REAL NOT NULL)"
+                )
+                await connection.execute(
+                    f"CREATE INDEX IF NOT EXISTS {self.TABLE}_{self.CREATION_TIME_COLUMN} "
+                    f"ON {self.TABLE} ({self.CREATION_TIME_COLUMN})"
+                )
+                await self._remove_outdated_responses(connection)
+                await connection.commit()
+                self._connection = connection
+            return self._connection
+
+    async def _remove_outdated_responses(self, connection: aiosqlite.Connection):
+        # expired responses
+        await connection.execute(
+            f"DELETE FROM {self.TABLE} WHERE {self.CREATION_TIME_COLUMN} < ?", (time.time() - self.ttl, )
+        )
+        # oldest responses above max size
+        await connection.execute(
+            f"DELETE FROM {self.TABLE} WHERE {self.KEY_COLUMN} IN ("
+            f"SELECT {self.KEY_COLUMN} FROM {self.TABLE} ORDER BY {self.CREATION_TIME_COLUMN} DESC LIMIT -1 OFFSET ?"
+            f")",
+            (self.max_size, )
+        )
@@ -0,0 +1,219 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import asyncio
+import time
+
+import aiohttp.web
+import mock
+import pytest
+import pytest_asyncio
+
+import octobot_commons.logging as commons_logging
+import octobot_services.constants as services_constants
+import octobot_services.errors as services_errors
+
+import tentacles.Services.Services_bases.gpt_service.gpt as gpt
+import tentacles.Services.Services_bases.gpt_service.gpt_responses_cache as gpt_responses_cache
+
+pytestmark = pytest.mark.asyncio
+
+
+class StubOpenAIServer:
+    def __init__(self):
+        self.completion_requests = []
+        self.client_addresses = set()
+        self.runner = None
+        self.url = None
+
+    async def start(self):
+        app = aiohttp.web.Application()
+        app.router.add_post("/v1/chat/completions", self._chat_completion)
+        self.runner = aiohttp.web.AppRunner(app)
+        await self.runner.setup()
+        site = aiohttp.web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/v1"
+
+    async def stop(self):
+        await self.runner.cleanup()
+
+    async def _chat_completion(self, request):
+        body = await request.json()
+        self.completion_requests.append(body)
+        self.client_addresses.add(request.transport.get_extra_info("peername"))
+        return aiohttp.web.json_response({
+            "id": f"chatcmpl-{len(self.completion_requests)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body["model"],
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": f"up 70% ({body['messages'][-1]['content']})"},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 10, "completion_tokens": 5, "total_tokens": 15},
+        })
+
+
+@pytest_asyncio.fixture
+async def stub_server():
+    server = StubOpenAIServer()
+    await server.start()
+    try:
+        yield server
+    finally:
+        await server.stop()
+
+
+@pytest_asyncio.fixture
+async def service(stub_server, tmp_path):
+    gpt_service = gpt.GPTService()
+    gpt_service.logger = commons_logging.get_logger(gpt_service.get_name())
+    gpt_service.config = {
+        services_constants.CONFIG_CATEGORY_SERVICES: {
+            services_constants.CONFIG_GPT: {
+                services_constants.CONIG_OPENAI_SECRET_KEY: "",
+                services_constants.CONIG_LLM_CUSTOM_BASE_URL: stub_server.url,
+            }
+        }
+    }
+    gpt_service.responses_cache_path = str(tmp_path / "responses.db")
+    try:
+        yield gpt_service
+    finally:
+        await gpt_service.stop()
+
+
+def _get_messages(content):
+    return [
+        gpt.GPTService.create_message(gpt.SYSTEM, "Predict the next move"),
+        gpt.GPTService.create_message(gpt.USER, content),
+    ]
+
+
+async def test_get_chat_completion_reuses_client(service, stub_server):
+    client = await service._get_client()
+    for index in range(3):
+        assert await service.get_chat_completion(_get_messages(f"candles {index}")) == f"up 70% (candles {index})"
+    assert await service._get_client() is client
+    assert len(stub_server.completion_requests) == 3
+    # HTTP connection is kept alive between requests
+    assert len(stub_server.client_addresses) == 1
+    assert service.consumed_daily_tokens == 45
+
+
+async def test_get_chat_completion_uses_responses_cache(service, stub_server, tmp_path):
+    messages = _get_messages("candles")
+    assert await service.get_chat_completion(messages) == "up 70% (candles)"
+    assert await service.get_chat_completion(messages) == "up 70% (candles)"
+    assert len(stub_server.completion_requests) == 1
+    assert service.consumed_daily_tokens == 15
+    # different request parameters
+    assert await service.get_chat_completion(messages, temperature=0.1) == "up 70% (candles)"
+    assert len(stub_server.completion_requests) == 2
+
+    # cache is persisted
+    await service.stop()
+    other_service = gpt.GPTService()
+    other_service.logger = service.logger
+    other_service.config = service.config
+    other_service.responses_cache_path = service.responses_cache_path
+    try:
+        assert await other_service.get_chat_completion(messages) == "up 70% (candles)"
+        assert len(stub_server.completion_requests) == 2
+        await other_service.clear_responses_cache()
+        assert await other_service.get_chat_completion(messages) == "up 70% (candles)"
+        assert len(stub_server.completion_requests) == 3
+    finally:
+        await other_service.stop()
+
+
+async def test_get_chat_completion_with_updated_client_params(service, stub_server):
+    messages = _get_messages("candles")
+    assert await service.get_chat_completion(messages) == "up 70% (candles)"
+    client = await service._get_client()
+    other_server = StubOpenAIServer()
+    await other_server.start()
+    try:
+        service.config[services_constants.CONFIG_CATEGORY_SERVICES][services_constants.CONFIG_GPT][
+            services_constants.CONIG_LLM_CUSTOM_BASE_URL
+        ] = other_server.url
+        with mock.patch.object(client, "close", mock.AsyncMock(wraps=client.close)) as close_mock:
+            # responses from another url are not shared
+            assert await service.get_chat_completion(messages) == "up 70% (candles)"
+            # previous client is closed
+            close_mock.assert_awaited_once()
+        assert await service._get_client() is not client
+        assert len(stub_server.completion_requests) == 1
+        assert len(other_server.completion_requests) == 1
+    finally:
+        await other_server.stop()
+
+
+async def test_get_chat_completion_without_responses_cache(service, stub_server):
+    service.responses_cache_ttl = 0
+    messages = _get_messages("candles")
+    assert await service.get_chat_completion(messages) == "up 70% (candles)"
+    assert await service.get_chat_completion(messages) == "up 70% (candles)"
+    assert len(stub_server.completion_requests) == 2
+    assert service._responses_cache is None
+
+
+async def test_concurrent_requests_respect_daily_tokens_limit(service, stub_server):
+    service.apply_daily_token_limit_if_possible(40)
+    assert await service.get_chat_completion(_get_messages("candles 0")) == "up 70% (candles 0)"
+    assert service.consumed_daily_tokens == 15
+    results = await asyncio.gather(
+        *(service.get_chat_completion(_get_messages(f"candles {index}")) for index in range(1, 4)),
+        return_exceptions=True
+    )
+    # the 3rd concurrent request would exceed the limit
+    assert results[:2] == ["up 70% (candles 1)", "up 70% (candles 2)"]
+    assert isinstance(results[2], services_errors.RateLimitError)
+    assert len(stub_server.completion_requests) == 3
+    assert service.consumed_daily_tokens == 45
+    assert service.reserved_daily_tokens == 0
+    with pytest.raises(services_errors.RateLimitError):
+        await service.get_chat_completion(_get_messages("candles 4"))
+
+
+async def test_responses_cache_ttl_and_max_size(tmp_path):
+    cache = gpt_responses_cache.GPTResponsesCache(str(tmp_path / "cache" / "responses.db"), 10, 2)
+    try:
+        messages = [{"role": "user", "content": "1"}]
+        key_1 = cache.get_key("openai", "https://api.openai.com/v1", "model", messages, temperature=0.5)
+        assert key_1 == cache.get_key("openai", "https://api.openai.com/v1", "model", messages, temperature=0.5)
+        assert key_1 != cache.get_key("openai", "https://api.openai.com/v1", "model", messages, temperature=0.1)
+        assert key_1 != cache.get_key("openai", "https://api.openai.com/v1", "other_model", messages, temperature=0.5)
+        assert key_1 != cache.get_key("openai", "http://localhost/v1", "model", messages, temperature=0.5)
+        assert key_1 != cache.get_key("custom", "https://api.openai.com/v1", "model", messages, temperature=0.5)
+        assert await cache.get(key_1) is None
+        with mock.patch.object(time, "time", mock.Mock(return_value=1000)):
+            await cache.set(key_1, "response 1")
+            await cache.set("key_2", "response 2")
+            assert await cache.get(key_1) == "response 1"
+            await cache.set("key_3", "response 3")
+            # max size reached: oldest response is removed
+            assert await cache.get(key_1) is None
+            assert await cache.get("key_2") == "response 2"
+            assert await cache.get("key_3") == "response 3"
+        with mock.patch.object(time, "time", mock.Mock(return_value=1011)):
+            # expired responses
+            assert await cache.get("key_2") is None
+            assert await cache.get("key_3") is None
+    finally:
+        await cache.close()
@@ -94,6 +94,28 @@ class SkippedAction(Exception):
     pass
 
 
+@dataclasses.dataclass
+class OwnOrdersSummary:
+    buy_orders_count: int = 0
+    sell_orders_count: int = 0
+    max_buy_price: typing.Optional[decimal.Decimal] = None
+    min_sell_price: typing.Optional[decimal.Decimal] = None
+
+    @classmethod
+    def from_orders(cls, orders: list[trading_personal_data.Order]):
+        summary = cls()
+        for order in orders:
+            if order.side == trading_enums.TradeOrderSide.BUY:
+                summary.buy_orders_count += 1
+                if summary.max_buy_price is None or order.origin_price > summary.max_buy_price:
+                    summary.max_buy_price = order.origin_price
+            elif order.side == trading_enums.TradeOrderSide.SELL:
+                summary.sell_orders_count += 1
+                if summary.min_sell_price is None or order.origin_price < summary.min_sell_price:
+                    summary.min_sell_price = order.origin_price
+        return summary
+
+
 class MarketMakingTradingMode(trading_modes.AbstractTradingMode):
     REQUIRE_TRADES_HISTORY = False   # set True when this trading mode needs the trade history to operate
     SUPPORTS_INITIAL_PORTFOLIO_OPTIMIZATION = False  # set True when self._optimize_initial_portfolio is implemented
@@ -104,6 +126,8 @@ class MarketMakingTradingMode(trading_modes.AbstractTradingMode):
     BIDS_COUNT = "bids_count"
     ASKS_COUNT = "asks_count"
     REFERENCE_EXCHANGE = "reference_exchange"
+    REFERENCE_PRICE_UPDATE_MIN_INTERVAL = "reference_price_update_min_interval"
+    REFERENCE_PRICE_UPDATE_MIN_CHANGE = "reference_price_update_min_change"
     LOCAL_EXCHANGE_PRICE = "local"
 
     MIN_SPREAD_DESC = "Min spread %: Percentage of the current price to use as bid-ask spread."
@@ -115,6 +139,15 @@ class MarketMakingTradingMode(trading_modes.AbstractTradingMode):
         f"This exchange need to have a trading market for the selected traded pair. Example: \"binance\". "
         f"Use \"{LOCAL_EXCHANGE_PRICE}\" to use the current exchange price."
     )
+    REFERENCE_PRICE_UPDATE_MIN_INTERVAL_DESC = (
+        "Reference price check interval: Minimum number of seconds between two reference price checks. When "
+        "price updates are received in between, the latest price is checked at the end of the interval. Not applied "
+        "in backtesting."
+    )
+    REFERENCE_PRICE_UPDATE_MIN_CHANGE_DESC = (
+        "Reference price min change %: Ignore reference price updates changing the price by less than this "
+        "percentage since the last reference price check."
+    )
 
     def init_user_inputs(self, inputs: dict) -> None:
         """
@@ -147,6 +180,14 @@ class MarketMakingTradingMode(trading_modes.AbstractTradingMode):
             other_schema_values={"inputAttributes": {"placeholder": "binance"}},
             title=self.REFERENCE_EXCHANGE_DESC
         )
+        self.UI.user_input(
+            self.REFERENCE_PRICE_UPDATE_MIN_INTERVAL, commons_enums.UserInputTypes.FLOAT, 0, inputs,
+            min_val=0, title=self.REFERENCE_PRICE_UPDATE_MIN_INTERVAL_DESC,
+        )
+        self.UI.user_input(
+            self.REFERENCE_PRICE_UPDATE_MIN_CHANGE, commons_enums.UserInputTypes.FLOAT, 0, inputs,
+            min_val=0, max_val=100, title=self.REFERENCE_PRICE_UPDATE_MIN_CHANGE_DESC,
+        )
 
     def get_current_state(self) -> (str, float):
         order = self.producers[0].get_market_making_orders() if self.producers else []
@@ -254,6 +295,8 @@ class MarketMakingTradingMode(trading_modes.AbstractTradingMode):
     async def _order_notification_callback(
         self, exchange, exchange_id, cryptocurrency, symbol, order, update_type, is_from_bot
     ):
+        if self.producers:
+            self.producers[0].on_open_orders_update()
         if (
             order[trading_enums.ExchangeConstantsOrderColumns.STATUS.value] == trading_enums.OrderStatus.FILLED.value
             and order[trading_enums.ExchangeConstantsOrderColumns.TYPE.value] in (
@@ -504,6 +547,17 @@ class MarketMakingTradingModeProducer(trading_modes.AbstractTradingModeProducer)
         self.last_target_buy_orders_count: int = 0
         self.last_target_sell_orders_count: int = 0
 
+        # reference price updates are throttled: updates received within the min interval are coalesced into a
+        # single update at the end of the interval
+        self.reference_price_update_min_interval: float = 0
+        self.reference_price_update_min_change_ratio: decimal.Decimal = trading_constants.ZERO
+        self._last_reference_price_update_time: float = 0
+        self._scheduled_reference_price_update: typing.Optional[asyncio.TimerHandle] = None
+        self._last_checked_reference_price: typing.Optional[decimal.Decimal] = None
+        self._reference_exchange_id: typing.Optional[str] = None
+        # best bid / ask of open orders, reset on each open orders update
+        self._own_orders_summary: typing.Optional[OwnOrdersSummary] = None
+
         try:
             self._load_symbol_trading_config()
         except KeyError as e:
@@ -528,6 +582,12 @@ class MarketMakingTradingModeProducer(trading_modes.AbstractTradingModeProducer)
             self.symbol_trading_config[self.trading_mode.REFERENCE_EXCHANGE],
             self.symbol
         )
+        self.reference_price_update_min_interval = float(
+            self.symbol_trading_config.get(self.trading_mode.REFERENCE_PRICE_UPDATE_MIN_INTERVAL) or 0
+        )
+        self.reference_price_update_min_change_ratio = decimal.Decimal(str(
+            self.symbol_trading_config.get(self.trading_mode.REFERENCE_PRICE_UPDATE_MIN_CHANGE) or 0
+        )) / trading_constants.ONE_HUNDRED
         if len(self.exchange_manager.exchange_config.traded_symbols) > 1:
             error = (
                 f"Multiple trading pair is not supported on {self.trading_mode.get_name()}. "
@@ -563,6 +623,10 @@ class MarketMakingTradingModeProducer(trading_modes.AbstractTradingModeProducer)
             self.logger.debug(f"Initializing orders creation")
             await self._ensure_market_making_orders_and_reschedule()
 
+    async def stop(self):
+        self._cancel_scheduled_reference_price_update()
+        await super().stop()
+
     async def set_final_eval(self, matrix_id: str, cryptocurrency: str, symbol: str, time_frame, trigger_source: str):
         # nothing to do: this is not a strategy related trading mode
         pass
@@ -1222,56 +1286,100 @@ class MarketMakingTradingModeProducer(trading_modes.AbstractTradingModeProducer)
     def _is_missing_open_orders(
         self, sided_orders: list[trading_personal_data.Order], side: trading_enums.TradeOrderSide
     ) -> bool:
-        if not sided_orders:
+        return self._is_missing_open_orders_count(len(sided_orders), side)
+
+    def _is_missing_open_orders_count(self, sided_orders_count: int, side: trading_enums.TradeOrderSide) -> bool:
+        if not sided_orders_count:
             # no orders on this side: orders are missing
             return True
         if (last_target_orders_count := (
             self.last_target_buy_orders_count
             if side == trading_enums.TradeOrderSide.BUY
             else self.last_target_sell_orders_count
-        )) and (len(sided_orders) < last_target_orders_count) and not self._is_previous_plan_still_processing():
+        )) and (sided_orders_count < last_target_orders_count) and not self._is_previous_plan_still_processing():
             self.logger.info(
-                f"Missing {last_target_orders_count - len(sided_orders)} {self.symbol} {side.value} "
+                f"Missing {last_target_orders_count - sided_orders_count} {self.symbol} {side.value} "
                 f"orders [{self.exchange_manager.exchange_name}], last target count: {last_target_orders_count}"
             )
             # at least one order is missing compared to the last check
             return True
         return False
 
+    def _get_own_orders_summary(self) -> OwnOrdersSummary:
+        if self._own_orders_summary is None:
+            self._own_orders_summary = OwnOrdersSummary.from_orders(self.get_market_making_orders())
+        return self._own_orders_summary
+
+    def on_open_orders_update(self):
+        # open orders changed: best bid / ask will be computed again when required
+        self._own_orders_summary = None
+
     async def on_new_reference_price(self, reference_price: decimal.Decimal) -> bool:
         trigger = False
-        open_orders = self.get_market_making_orders()
-        buy_orders = [
-            order
-            for order in open_orders
-            if order.side == trading_enums.TradeOrderSide.BUY
-        ]
-        if self._is_missing_open_orders(buy_orders, trading_enums.TradeOrderSide.BUY):
+        summary = self._get_own_orders_summary()
+        if self._is_missing_open_orders_count(summary.buy_orders_count, trading_enums.TradeOrderSide.BUY):
             trigger = True
-        else:
-            max_buy_price = max(order.origin_price for order in buy_orders)
-            if max_buy_price > reference_price:
-                trigger = True
-        sell_orders = [
-            order
-            for order in open_orders
-            if order.side == trading_enums.TradeOrderSide.SELL
-        ]
-        if self._is_missing_open_orders(sell_orders, trading_enums.TradeOrderSide.SELL):
+        elif summary.max_buy_price > reference_price:
+            trigger = True
+        if self._is_missing_open_orders_count(summary.sell_orders_count, trading_enums.TradeOrderSide.SELL):
+            trigger = True
+        elif summary.min_sell_price < reference_price:
             trigger = True
-        else:
-            min_sell_price = min(order.origin_price for order in sell_orders)
-            if min_sell_price < reference_price:
-                trigger = True
         return trigger
 
     async def _on_reference_price_update(self):
         trigger = False
         if reference_price := await self._get_reference_price():
+            self._last_checked_reference_price = reference_price
             trigger = await self.on_new_reference_price(reference_price)
         if trigger:
             await self._ensure_market_making_orders(f"reference price update: {float(reference_price)}")
 
+    def _is_negligible_reference_price_change(self, price) -> bool:
+        if not self.reference_price_update_min_change_ratio or not self._last_checked_reference_price or not price:
+            return False
+        return (
+            abs(decimal.Decimal(str(price)) - self._last_checked_reference_price) / self._last_checked_reference_price
+            < self.reference_price_update_min_change_ratio
+        )
+
+    def _is_throttled_reference_price_update(self) -> bool:
+        if not self.reference_price_update_min_interval or trading_api.get_is_backtesting(self.exchange_manager):
+            # process every update in order
+            return False
+        current_time = self.exchange_manager.exchange.get_exchange_current_time()
+        elapsed_time = current_time - self._last_reference_price_update_time
+        if elapsed_time < self.reference_price_update_min_interval:
+            # the latest reference price will be checked at the end of the min interval
+            self._schedule_reference_price_update(self.reference_price_update_min_interval - elapsed_time)
+            return True
+        self._last_reference_price_update_time = current_time
+        self._cancel_scheduled_reference_price_update()
+        return False
+
+    def _schedule_reference_price_update(self, delay: float):
+        if self._scheduled_reference_price_update is None:
+            self._scheduled_reference_price_update = asyncio.get_event_loop().call_later(
+                delay,
+                self._trigger_scheduled_reference_price_update
+            )
+
+    def _cancel_scheduled_reference_price_update(self):
+        if self._scheduled_reference_price_update is not None:
+            self._scheduled_reference_price_update.cancel()
+            self._scheduled_reference_price_update = None
+
+    def _trigger_scheduled_reference_price_update(self):
+        asyncio.create_task(self._on_scheduled_reference_price_update())
+
+    async def _on_scheduled_reference_price_update(self):
+        self._scheduled_reference_price_update = None
+        if self.should_stop:
+            return
+        # the reference price is read when checking it: the latest received price is used
+        self._last_reference_price_update_time = self.exchange_manager.exchange.get_exchange_current_time()
+        await self._on_reference_price_update()
+
     async def order_filled_callback(self, order: dict):
         self.logger.info(
             f"Triggering {self.symbol} [{self.exchange_manager.exchange_name}] order update an order got filled: "
@@ -1293,6 +1401,8 @@ class MarketMakingTradingModeProducer(trading_modes.AbstractTradingModeProducer)
         :param mark_price: updated mark price
         :return: None
         """
+        if self._is_negligible_reference_price_change(mark_price) or self._is_throttled_reference_price_update():
+            return
         await self._on_reference_price_update()
 
     async def _subscribe_to_exchange_mark_price(self, exchange_id: str, exchange_manager):
@@ -1323,9 +1433,7 @@ class MarketMakingTradingModeProducer(trading_modes.AbstractTradingModeProducer)
     async def _get_reference_price(self) -> decimal.Decimal:
         local_exchange_name = self.exchange_manager.exchange_name
         price = trading_constants.ZERO
-        for exchange_id in trading_api.get_all_exchange_ids_with_same_matrix_id(
-            local_exchange_name, self.exchange_manager.id
-        ):
+        for exchange_id in self._get_reference_price_candidate_exchange_ids(local_exchange_name):
             exchange_manager = trading_api.get_exchange_manager_from_exchange_id(exchange_id)
             if exchange_manager.trading_modes and exchange_manager is not self.exchange_manager:
                 await self.sent_once_critical_notification(
@@ -1340,6 +1448,8 @@ class MarketMakingTradingModeProducer(trading_modes.AbstractTradingModeProducer)
                 continue
             if exchange_id not in self.subscribed_exchange_ids:
                 await self._subscribe_to_exchange_mark_price(exchange_id, exchange_manager)
+            # reference exchange found: no need to look for it next time
+            self._reference_exchange_id = exchange_id
             try:
                 price, updated = trading_personal_data.get_potentially_outdated_price(
                     exchange_manager, self.reference_price.pair
@@ -1362,3 +1472,11 @@ class MarketMakingTradingModeProducer(trading_modes.AbstractTradingModeProducer)
                     f"it's probably initializing"
                 )
         return price
+
+    def _get_reference_price_candidate_exchange_ids(self, local_exchange_name: str) -> list[str]:
+        exchange_ids = trading_api.get_all_exchange_ids_with_same_matrix_id(
+            local_exchange_name, self.exchange_manager.id
+        )
+        if self._reference_exchange_id in exchange_ids:
+            return [self._reference_exchange_id]
+        return exchange_ids
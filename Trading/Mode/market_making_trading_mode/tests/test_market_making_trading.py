@@ -13,6 +13,7 @@
 #
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
+import asyncio
 import decimal
 import contextlib
 import mock
@@ -336,3 +337,111 @@ async def test_handle_market_making_orders_missing_funds_for_buy_orders():
             ])
             _get_reference_price_mock.reset_mock()
             submit_trading_evaluation_mock.reset_mock()
+
+
+async def test_on_new_reference_price():
+    symbol = "BTC/USDT"
+    async with _get_tools(symbol) as (producer, consumer, exchange_manager):
+        buy_order = mock.Mock(side=trading_enums.TradeOrderSide.BUY, origin_price=decimal.Decimal(990))
+        sell_order = mock.Mock(side=trading_enums.TradeOrderSide.SELL, origin_price=decimal.Decimal(1010))
+        with mock.patch.object(
+            producer, "get_market_making_orders", mock.Mock(return_value=[buy_order, sell_order])
+        ) as get_market_making_orders_mock:
+            producer.on_open_orders_update()
+            assert await producer.on_new_reference_price(decimal.Decimal(1000)) is False
+            # sell order bellow reference price
+            assert await producer.on_new_reference_price(decimal.Decimal(1020)) is True
+            # buy order above reference price
+            assert await producer.on_new_reference_price(decimal.Decimal(980)) is True
+            # best bid and ask are computed once until open orders are updated
+            get_market_making_orders_mock.assert_called_once()
+
+            producer.on_open_orders_update()
+            get_market_making_orders_mock.return_value = [buy_order]
+            # missing sell order
+            assert await producer.on_new_reference_price(decimal.Decimal(1000)) is True
+            assert get_market_making_orders_mock.call_count == 2
+
+
+async def test_mark_price_callback_throttled_updates():
+    symbol = "BTC/USDT"
+    async with _get_tools(symbol) as (producer, consumer, exchange_manager):
+        with mock.patch.object(
+            producer, "_on_reference_price_update", mock.AsyncMock()
+        ) as _on_reference_price_update_mock:
+            # no min interval: every update is processed inline, in order
+            for price in (1000, 1001, 1002):
+                await producer._mark_price_callback("binance", exchange_manager.id, "BTC", symbol, price)
+            assert _on_reference_price_update_mock.await_count == 3
+            _on_reference_price_update_mock.reset_mock()
+
+            # backtesting: min interval is not applied
+            producer.reference_price_update_min_interval = 10
+            for price in (1000, 1001):
+                await producer._mark_price_callback("binance", exchange_manager.id, "BTC", symbol, price)
+            assert _on_reference_price_update_mock.await_count == 2
+            _on_reference_price_update_mock.reset_mock()
+
+            # live trading: updates within the min interval of exchange time are skipped
+            with mock.patch.object(trading_api, "get_is_backtesting", mock.Mock(return_value=False)), \
+                    mock.patch.object(exchange_manager.exchange, "get_exchange_current_time",
+                                      mock.Mock(return_value=1000)) as get_exchange_current_time_mock:
+                for price in (1000, 1001, 1002):
+                    await producer._mark_price_callback("binance", exchange_manager.id, "BTC", symbol, price)
+                _on_reference_price_update_mock.assert_awaited_once()
+                get_exchange_current_time_mock.return_value = 1010
+                await producer._mark_price_callback("binance", exchange_manager.id, "BTC", symbol, 1003)
+                assert _on_reference_price_update_mock.await_count == 2
+            _on_reference_price_update_mock.reset_mock()
+
+            # price changes bellow min change are ignored
+            producer.reference_price_update_min_interval = 0
+            producer.reference_price_update_min_change_ratio = decimal.Decimal("0.01")
+            producer._last_checked_reference_price = decimal.Decimal(1000)
+            await producer._mark_price_callback("binance", exchange_manager.id, "BTC", symbol, 1005)
+            _on_reference_price_update_mock.assert_not_awaited()
+            await producer._mark_price_callback("binance", exchange_manager.id, "BTC", symbol, 1020)
+            _on_reference_price_update_mock.assert_awaited_once()
+
+
+async def test_mark_price_callback_throttled_updates_burst_ending_inside_interval():
+    symbol = "BTC/USDT"
+    async with _get_tools(symbol) as (producer, consumer, exchange_manager):
+        producer.reference_price_update_min_interval = 10
+        with mock.patch.object(
+            producer, "_on_reference_price_update", mock.AsyncMock()
+        ) as _on_reference_price_update_mock, \
+                mock.patch.object(trading_api, "get_is_backtesting", mock.Mock(return_value=False)), \
+                mock.patch.object(exchange_manager.exchange, "get_exchange_current_time",
+                                  mock.Mock(return_value=1000)) as get_exchange_current_time_mock, \
+                mock.patch.object(asyncio.get_event_loop(), "call_later", mock.Mock()) as call_later_mock:
+            await producer._mark_price_callback("binance", exchange_manager.id, "BTC", symbol, 1000)
+            _on_reference_price_update_mock.assert_awaited_once()
+            call_later_mock.assert_not_called()
+            # burst ending inside the min interval
+            for current_time, price in ((1002, 1001), (1004, 1002), (1006, 1003)):
+                get_exchange_current_time_mock.return_value = current_time
+                await producer._mark_price_callback("binance", exchange_manager.id, "BTC", symbol, price)
+            _on_reference_price_update_mock.assert_awaited_once()
+            # a single update is scheduled at the end of the interval
+            call_later_mock.assert_called_once_with(8, producer._trigger_scheduled_reference_price_update)
+            assert producer._scheduled_reference_price_update is call_later_mock.return_value
+            # end of the interval: the latest price is checked
+            get_exchange_current_time_mock.return_value = 1010
+            await producer._on_scheduled_reference_price_update()
+            assert _on_reference_price_update_mock.await_count == 2
+            assert producer._scheduled_reference_price_update is None
+            assert producer._last_reference_price_update_time == 1010
+            # the next interval starts from the scheduled update
+            get_exchange_current_time_mock.return_value = 1015
+            await producer._mark_price_callback("binance", exchange_manager.id, "BTC", symbol, 1004)
+            assert _on_reference_price_update_mock.await_count == 2
+            assert call_later_mock.call_count == 2
+            call_later_mock.assert_called_with(5, producer._trigger_scheduled_reference_price_update)
+            scheduled_update = producer._scheduled_reference_price_update
+            # a processed update cancels the scheduled one
+            get_exchange_current_time_mock.return_value = 1020
+            await producer._mark_price_callback("binance", exchange_manager.id, "BTC", symbol, 1005)
+            assert _on_reference_price_update_mock.await_count == 3
+            scheduled_update.cancel.assert_called_once()
+            assert producer._scheduled_reference_price_update is None
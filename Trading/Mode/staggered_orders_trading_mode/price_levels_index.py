@@ -0,0 +1,83 @@
+# Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import bisect
+import decimal
+import typing
+
+
+def get_order_price(order) -> decimal.Decimal:
+    return order.origin_price
+
+
+def get_trade_price(trade) -> decimal.Decimal:
+    return trade.origin_price or trade.executed_price
+
+
+class PriceLevelsIndex:
+    """
+    Orders or trades sorted by price: elements in a price window are found in O(log(n)) instead of scanning
+    every element. Elements of a window are always returned in their order in the indexed list, so that
+    "first matching element" lookups give the same result as a scan of this list.
+    """
+
+    def __init__(self, elements: list, get_price: typing.Callable):
+        # keep a reference to the indexed list: it identifies this index
+        self.elements = elements
+        prices = [get_price(element) for element in elements]
+        self._positions = sorted(range(len(elements)), key=prices.__getitem__)
+        self._prices = [prices[position] for position in self._positions]
+
+    def get_positions(self, lower_bound, higher_bound, include_bounds=True) -> list[int]:
+        """
+        :return: the sorted positions in the indexed list of elements which price is between the given bounds
+        """
+        if include_bounds:
+            start = bisect.bisect_left(self._prices, lower_bound)
+            end = bisect.bisect_right(self._prices, higher_bound)
+        else:
+            start = bisect.bisect_right(self._prices, lower_bound)
+            end = bisect.bisect_left(self._prices, higher_bound)
+        return sorted(self._positions[start:end])
+
+    def get_first_position(
+        self, lower_bound, higher_bound, include_bounds=True, predicate: typing.Optional[typing.Callable] = None
+    ) -> typing.Optional[int]:
+        """
+        :return: the position of the first element which price is between the given bounds and matching predicate
+        """
+        for position in self.get_positions(lower_bound, higher_bound, include_bounds=include_bounds):
+            if predicate is None or predicate(self.elements[position]):
+                return position
+        return None
+
+    def get_first(
+        self, lower_bound, higher_bound, include_bounds=True, predicate: typing.Optional[typing.Callable] = None
+    ):
+        """
+        :return: the first element which price is between the given bounds and matching predicate
+        """
+        position = self.get_first_position(lower_bound, higher_bound, include_bounds=include_bounds, predicate=predicate)
+        return None if position is None else self.elements[position]
+
+    def get_first_of(self, *positions: typing.Optional[int]):
+        """
+        :return: the first element among the given positions, None positions are ignored
+        """
+        found_positions = [position for position in positions if position is not None]
+        return self.elements[min(found_positions)] if found_positions else None
+
+    def __len__(self):
+        return len(self._positions)
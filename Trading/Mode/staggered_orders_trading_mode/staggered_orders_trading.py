@@ -15,10 +15,12 @@
 #  You should have received a copy of the GNU Lesser General Public
 #  License along with this library.
 import collections
+import contextlib
 import enum
 import dataclasses
 import math
 import asyncio
+import bisect
 import decimal
 import typing
 
@@ -38,6 +40,8 @@ import octobot_trading.errors as trading_errors
 import octobot_trading.exchanges.util as exchange_util
 import octobot_trading.signals as signals
 
+import tentacles.Trading.Mode.staggered_orders_trading_mode.price_levels_index as price_levels_index
+
 
 class StrategyModes(enum.Enum):
     NEUTRAL = "neutral"
@@ -595,6 +599,8 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
         self._use_recent_trades_for_order_restore = False
         self._already_created_init_orders = False
         self.compensate_for_missed_mirror_order = False
+        # price levels indexes by indexed list id, only set while analysing orders and trades
+        self._price_levels_indexes = None
 
         self.healthy = False
 
@@ -1434,28 +1440,35 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
         now_selling = missing_order_side is trading_enums.TradeOrderSide.BUY
         mirror_order_price = missing_order_price + price_increment if now_selling \
             else missing_order_price - price_increment
-        for trade in sorted_trades:
-            # use origin price if available, otherwise use executed price which is less accurate as it 
-            # might be different from initial order's origin price
-            lower_window = (trade.origin_price or trade.executed_price) - price_window
-            higher_window = (trade.origin_price or trade.executed_price) + price_window
-            if lower_window < mirror_order_price < higher_window and trade.side is not missing_order_side:
-                # found mirror order fill
-                break
-            if lower_window < missing_order_price < higher_window and trade.side is missing_order_side:
-                # found missing order in trades before mirror order: this missing order has been filled but not yet 
-                # replaced by a mirror order
-                return trade
-        return None
+        # use origin price if available, otherwise use executed price which is less accurate as it
+        # might be different from initial order's origin price
+        trades_index = self._get_price_levels_index(sorted_trades, price_levels_index.get_trade_price)
+        mirror_trade_position = trades_index.get_first_position(
+            mirror_order_price - price_window, mirror_order_price + price_window, include_bounds=False,
+            predicate=lambda trade: trade.side is not missing_order_side
+        )
+        missing_order_trade_position = trades_index.get_first_position(
+            missing_order_price - price_window, missing_order_price + price_window, include_bounds=False,
+            predicate=lambda trade: trade.side is missing_order_side
+        )
+        if missing_order_trade_position is None or (
+            mirror_trade_position is not None and mirror_trade_position < missing_order_trade_position
+        ):
+            # no missing order fill or found mirror order fill first
+            return None
+        # found missing order in trades before mirror order: this missing order has been filled but not yet
+        # replaced by a mirror order
+        return sorted_trades[missing_order_trade_position]
 
     def _find_missing_mirror_order_fills(self, sorted_trades, missing_orders):
         trades_with_missing_mirror_order_fills = []
-        
-        for missing_order_price, missing_order_side in missing_orders:
-            if trade := self._get_just_filled_unmirrored_missing_order_trade(
-                sorted_trades, missing_order_price, missing_order_side
-            ):
-                trades_with_missing_mirror_order_fills.append(trade)
+
+        with self._price_levels_indexes_cache():
+            for missing_order_price, missing_order_side in missing_orders:
+                if trade := self._get_just_filled_unmirrored_missing_order_trade(
+                    sorted_trades, missing_order_price, missing_order_side
+                ):
+                    trades_with_missing_mirror_order_fills.append(trade)
 
         if trades_with_missing_mirror_order_fills:
 
@@ -1876,7 +1889,10 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
         if not sorted_orders:
             return None, self.NEW, None
         # check if orders are staggered orders
-        return self._bootstrap_parameters(sorted_orders, recently_closed_trades, lower_bound, higher_bound, current_price)
+        with self._price_levels_indexes_cache():
+            return self._bootstrap_parameters(
+                sorted_orders, recently_closed_trades, lower_bound, higher_bound, current_price
+            )
 
     def _create_orders(self, lower_bound, upper_bound, side, sorted_orders,
                        current_price, missing_orders, state, allowed_funds, ignore_available_funds, recent_trades) -> list[OrderData]:
@@ -1911,10 +1927,11 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
             )
         if state == self.FILL:
             # complete missing orders
-            orders = self._fill_missing_orders(
-                lower_bound, upper_bound, side, sorted_orders, current_price, missing_orders, selling,
-                order_limiting_currency, order_limiting_currency_amount, currency, recent_trades
-            )
+            with self._price_levels_indexes_cache():
+                orders = self._fill_missing_orders(
+                    lower_bound, upper_bound, side, sorted_orders, current_price, missing_orders, selling,
+                    order_limiting_currency, order_limiting_currency_amount, currency, recent_trades
+                )
             return orders
         if state == self.ERROR:
             self.logger.error(f"Impossible to create {self.ORDERS_DESC} orders for {self.symbol} when incompatible "
@@ -1949,18 +1966,12 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
         if missing_orders and [o for o in missing_orders if o[1] is side]:
             max_quant_per_order = order_limiting_currency_amount / len([o for o in missing_orders if o[1] is side])
             missing_orders_around_spread = []
+            sorted_orders_prices = [o.origin_price for o in sorted_orders]
             for missing_order_price, missing_order_side in missing_orders:
                 if missing_order_side == side:
-                    previous_o = None
-                    following_o = None
-                    for o in sorted_orders:
-                        if previous_o is None:
-                            previous_o = o
-                        elif o.origin_price > missing_order_price:
-                            following_o = o
-                            break
-                        else:
-                            previous_o = o
+                    previous_o, following_o = self._get_surrounding_orders(
+                        sorted_orders, sorted_orders_prices, missing_order_price
+                    )
                     if following_o is None or previous_o.side == following_o.side:
                         decimal_missing_order_price = decimal.Decimal(str(missing_order_price))
                         # missing order between similar orders
@@ -2040,6 +2051,16 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
                             )
         return orders
 
+    @staticmethod
+    def _get_surrounding_orders(sorted_orders, sorted_orders_prices, price):
+        # previous order is the last order at or bellow price (or the first order), following order is the first
+        # order above price
+        if not sorted_orders:
+            return None, None
+        following_index = max(bisect.bisect_right(sorted_orders_prices, price), 1)
+        following_order = sorted_orders[following_index] if following_index < len(sorted_orders) else None
+        return sorted_orders[following_index - 1], following_order
+
     def _get_surrounded_missing_order_quantity(
         self, previous_order, following_order, max_quant_per_order, order_price, recent_trades,
             current_price, sorted_orders, side
@@ -2120,14 +2141,11 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
 
     def _get_quantity_from_existing_orders(self, price, sorted_orders, selling):
         increment_window = self.flat_increment / 4
-        price_window_lower_bound = price - increment_window
-        price_window_higher_bound = price + increment_window
-        for order in sorted_orders:
-            if price_window_lower_bound <= order.origin_price <= price_window_higher_bound and (
-                order.side is (trading_enums.TradeOrderSide.SELL if selling else trading_enums.TradeOrderSide.BUY)
-            ):
-                return order.origin_quantity
-        return None
+        side = trading_enums.TradeOrderSide.SELL if selling else trading_enums.TradeOrderSide.BUY
+        order = self._get_price_levels_index(sorted_orders, price_levels_index.get_order_price).get_first(
+            price - increment_window, price + increment_window, predicate=lambda o: o.side is side
+        )
+        return None if order is None else order.origin_quantity
 
     def _get_quantity_from_existing_boundary_orders(self, price, sorted_orders, selling):
         # Should be the last attempt: compute price from existing orders using cost
@@ -2159,23 +2177,47 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
         increment_window = self.flat_increment / 4
         price_window_lower_bound = price - increment_window
         price_window_higher_bound = price + increment_window
-        for trade in trades:
-            is_sell_trade = trade.side == trading_enums.TradeOrderSide.SELL
-            trade_price = trade.origin_price or trade.executed_price
-            if is_sell_trade == selling:
-                # same side
-                if price_window_lower_bound <= trade_price <= price_window_higher_bound:
-                    # found the exact same trade
-                    return trade
-            else:
-                # different side: use spread to compute mirror order price
-                price_increment = self.flat_spread - self.flat_increment
-                mirror_order_price = (trade_price - price_increment) \
-                    if is_sell_trade else (trade_price + price_increment)
-                if price_window_lower_bound <= mirror_order_price <= price_window_higher_bound:
-                    # found mirror trade
-                    return trade
-        return None
+        trades_index = self._get_price_levels_index(trades, price_levels_index.get_trade_price)
+        # same side: found the exact same trade
+        same_trade_position = trades_index.get_first_position(
+            price_window_lower_bound, price_window_higher_bound,
+            predicate=lambda trade: (trade.side == trading_enums.TradeOrderSide.SELL) == selling
+        )
+        mirror_trade_position = None
+        if self.flat_spread is not None:
+            # different side: use spread to compute mirror order price, which is
+            # trade_price - price_increment for sell trades and trade_price + price_increment for buy trades
+            price_increment = self.flat_spread - self.flat_increment
+            mirror_delta = -price_increment if selling else price_increment
+            mirror_trade_position = trades_index.get_first_position(
+                price_window_lower_bound + mirror_delta, price_window_higher_bound + mirror_delta,
+                predicate=lambda trade: (trade.side == trading_enums.TradeOrderSide.SELL) != selling
+            )
+        return trades_index.get_first_of(same_trade_position, mirror_trade_position)
+
+    @contextlib.contextmanager
+    def _price_levels_indexes_cache(self):
+        # open orders and recent trades lists are not modified while being analysed: index them only once
+        if self._price_levels_indexes is not None:
+            # already caching
+            yield
+            return
+        self._price_levels_indexes = {}
+        try:
+            yield
+        finally:
+            self._price_levels_indexes = None
+
+    def _get_price_levels_index(self, elements, get_price) -> price_levels_index.PriceLevelsIndex:
+        if self._price_levels_indexes is None:
+            return price_levels_index.PriceLevelsIndex(elements, get_price)
+        # the index references its list: this list id can't be reused while the index is cached
+        index = self._price_levels_indexes.get(id(elements))
+        if index is None or index.elements is not elements or len(index) != len(elements):
+            index = self._price_levels_indexes[id(elements)] = price_levels_index.PriceLevelsIndex(
+                elements, get_price
+            )
+        return index
 
     def _get_maximum_traded_funds(self, allowed_funds, total_available_funds, currency, selling, ignore_available_funds):
         to_trade_funds = total_available_funds
@@ -2455,11 +2497,8 @@ class StaggeredOrdersTradingModeProducer(trading_modes.AbstractTradingModeProduc
             return len(recently_closed_trades)
         else:
             inc = self.flat_spread * decimal.Decimal("1.5")
-            for trade in recently_closed_trades:
-                trade_price = trade.origin_price or trade.executed_price
-                if trade_price - inc <= price <= trade_price + inc:
-                    return True
-        return False
+            trades_index = self._get_price_levels_index(recently_closed_trades, price_levels_index.get_trade_price)
+            return bool(trades_index.get_positions(price - inc, price + inc))
 
     @staticmethod
     def _spread_in_recently_closed_order(min_amount, max_amount, sorted_closed_orders):
@@ -0,0 +1,68 @@
+#  Drakkar-Software OctoBot-Tentacles
+#  Copyright (c) Drakkar-Software, All rights reserved.
+#
+#  This library is free software; you can redistribute it and/or
+#  modify it under the terms of the GNU Lesser General Public
+#  License as published by the Free Software Foundation; either
+#  version 3.0 of the License, or (at your option) any later version.
+#
+#  This library is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the GNU
+#  Lesser General Public License for more details.
+#
+#  You should have received a copy of the GNU Lesser General Public
+#  License along with this library.
+import decimal
+import mock
+
+import octobot_trading.enums as trading_enums
+
+import tentacles.Trading.Mode.staggered_orders_trading_mode.price_levels_index as price_levels_index
+
+
+def _order(price, side=trading_enums.TradeOrderSide.BUY):
+    return mock.Mock(origin_price=decimal.Decimal(str(price)), side=side)
+
+
+def _trade(origin_price, executed_price):
+    return mock.Mock(
+        origin_price=None if origin_price is None else decimal.Decimal(str(origin_price)),
+        executed_price=decimal.Decimal(str(executed_price))
+    )
+
+
+def test_get_positions():
+    orders = [_order(price) for price in (12, 10, 11, 10, 15)]
+    index = price_levels_index.PriceLevelsIndex(orders, price_levels_index.get_order_price)
+    assert len(index) == 5
+    # positions are in indexed list order
+    assert index.get_positions(decimal.Decimal(10), decimal.Decimal(12)) == [0, 1, 2, 3]
+    assert index.get_positions(decimal.Decimal(10), decimal.Decimal(12), include_bounds=False) == [2]
+    assert index.get_positions(decimal.Decimal(13), decimal.Decimal(14)) == []
+    assert index.get_positions(decimal.Decimal(15), decimal.Decimal(20)) == [4]
+
+
+def test_get_first():
+    orders = [
+        _order(11, trading_enums.TradeOrderSide.SELL),
+        _order(10),
+        _order(10, trading_enums.TradeOrderSide.SELL),
+    ]
+    index = price_levels_index.PriceLevelsIndex(orders, price_levels_index.get_order_price)
+    assert index.get_first(decimal.Decimal(9), decimal.Decimal(11)) is orders[0]
+    assert index.get_first(
+        decimal.Decimal(9), decimal.Decimal(10), predicate=lambda o: o.side is trading_enums.TradeOrderSide.SELL
+    ) is orders[2]
+    assert index.get_first_position(decimal.Decimal(9), decimal.Decimal(10)) == 1
+    assert index.get_first(decimal.Decimal(12), decimal.Decimal(13)) is None
+    assert index.get_first_of(None, 2, 1) is orders[1]
+    assert index.get_first_of(None, None) is None
+
+
+def test_trades_index():
+    trades = [_trade(None, 10), _trade(12, 10)]
+    index = price_levels_index.PriceLevelsIndex(trades, price_levels_index.get_trade_price)
+    # origin price is used when available
+    assert index.get_positions(decimal.Decimal(9), decimal.Decimal(11)) == [0]
+    assert index.get_positions(decimal.Decimal(9), decimal.Decimal(12)) == [0, 1]